@@ -0,0 +1,160 @@
+"""
+Rutas de API para transcribir documentos subidos (TXT, Markdown, DOCX, EPUB).
+
+Endpoints:
+    POST /{format}: Transcribe el documento del cuerpo de la petición a
+        un formato paginado para impresora Braille (brf o pef)
+
+El documento se envía como cuerpo binario (no multipart), con el
+Content-Type del formato o, si no es concluyente (ej.
+application/octet-stream), con su nombre en `?filename=`:
+
+    curl -X POST --data-binary @manual.docx \\
+         -H "Content-Type: application/vnd.openxmlformats-officedocument.wordprocessingml.document" \\
+         "http://localhost:8000/api/v1/generation/documents/brf?cells_per_line=32"
+
+Flujo:
+    1. El cuerpo se recibe por fragmentos en un archivo temporal (en
+       memoria hasta INGEST_SPOOL_BYTES, después en disco), con un máximo
+       de INGEST_MAX_UPLOAD_BYTES
+    2. Se valida la estructura del documento (ver ingest.DocumentReader)
+       y, en txt y md, su codificación
+    3. Se genera la primera página antes de responder, para que un error
+       de contenido al principio del documento sea un 400
+    4. La respuesta se produce en streaming: bloques extraídos →
+       PackedTranslator → páginas BRF/PEF, sin tener nunca el documento
+       completo en memoria
+"""
+
+import itertools
+import posixpath
+from tempfile import SpooledTemporaryFile
+from typing import Annotated, Iterator, Literal, Optional
+
+from fastapi import APIRouter, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
+
+from app.config import settings
+from app.exceptions import ValidationError
+from app.logger import get_logger
+from app.metrics import stage_timer, observe_input_size
+from app.utils import content_disposition
+from app.api.services.embosser import BrailleBRFGenerator, BraillePEFGenerator
+from app.api.services.ingest import DocumentReader, detect_document_type
+from app.api.services.renderers import get_renderer
+
+
+logger = get_logger(__name__)
+router = APIRouter()
+
+DocumentFormat = Literal["brf", "pef"]
+
+
+class DocumentQuery(BaseModel):
+    """Parámetros de transcripción de un documento."""
+
+    filename: Optional[str] = Field(default=None, max_length=255, description="Nombre del archivo subido (detecta el tipo por extensión)")
+    title: Optional[str] = Field(default=None, max_length=200, description="Título del documento (PEF; Default: nombre del archivo)")
+    cells_per_line: Optional[int] = Field(default=None, ge=10, le=100, description="Celdas por línea")
+    lines_per_page: Optional[int] = Field(default=None, ge=5, le=100, description="Líneas por página")
+
+
+async def _spool_body(request: Request) -> SpooledTemporaryFile:
+    """
+    Recibe el cuerpo de la petición en un archivo temporal.
+
+    Raises:
+        ValidationError: Cuerpo vacío o mayor que INGEST_MAX_UPLOAD_BYTES
+    """
+    limit = settings.ingest_max_upload_bytes
+    too_large = ValidationError(f"El documento excede {limit} bytes", code="DOCUMENT_TOO_LARGE")
+    declared = request.headers.get("content-length", "")
+    if declared.isdigit() and int(declared) > limit:
+        raise too_large
+
+    upload = SpooledTemporaryFile(max_size=settings.ingest_spool_bytes)
+    size = 0
+    try:
+        async for chunk in request.stream():
+            size += len(chunk)
+            if size > limit:
+                raise too_large
+            upload.write(chunk)
+        if not size:
+            raise ValidationError("El documento está vacío")
+    except BaseException:
+        upload.close()
+        raise
+    upload.seek(0)
+    return upload
+
+
+def _open_document(upload: SpooledTemporaryFile, doc_type: str) -> DocumentReader:
+    """Valida el documento (estructura y codificación) antes de responder."""
+    reader = DocumentReader(upload, doc_type)
+    reader.check_encoding()
+    return reader
+
+
+def _iter_and_close(chunks: Iterator[bytes], reader: DocumentReader) -> Iterator[bytes]:
+    """Recorre la salida y libera el archivo temporal al terminar (o al cortarse)."""
+    try:
+        yield from chunks
+    finally:
+        reader.close()
+
+
+@router.post("/{fmt}")
+async def transcribe_document(fmt: DocumentFormat, request: Request,
+                              query: Annotated[DocumentQuery, Query()]):
+    """
+    Transcribe un documento subido a BRF o PEF.
+
+    Returns:
+        StreamingResponse: Documento Braille paginado
+
+    Raises:
+        ValidationError: Tipo de documento no soportado, documento vacío,
+            inválido o demasiado grande
+
+    Examples:
+        POST /api/v1/generation/documents/pef?filename=libro.epub&title=Libro
+        (cuerpo: el archivo EPUB)
+    """
+    doc_type = detect_document_type(query.filename, request.headers.get("content-type"))
+    upload = await _spool_body(request)
+    size = upload.seek(0, 2)
+    upload.seek(0)
+    try:
+        with stage_timer("validation"):
+            reader = await run_in_threadpool(_open_document, upload, doc_type)
+    except BaseException:
+        upload.close()
+        raise
+    observe_input_size("documents", size)
+
+    renderer = get_renderer(fmt)
+    stem = posixpath.splitext(posixpath.basename((query.filename or "documento").replace("\\", "/")))[0]
+    if fmt == "brf":
+        generator = BrailleBRFGenerator(query.cells_per_line, query.lines_per_page)
+        chunks = generator.iter_brf(reader.iter_text())
+    else:
+        generator = BraillePEFGenerator(query.cells_per_line, query.lines_per_page,
+                                        title=query.title or stem)
+        chunks = generator.iter_pef(reader.iter_text())
+    try:
+        first = await run_in_threadpool(next, chunks, b"")
+    except BaseException:
+        reader.close()
+        raise
+    chunks = itertools.chain([first], chunks)
+
+    return StreamingResponse(
+        _iter_and_close(chunks, reader),
+        media_type=renderer.media_type,
+        headers={
+            "Content-Disposition": content_disposition(f"braille_{stem}.{renderer.extension}")
+        }
+    )
@@ -4,27 +4,66 @@ Rutas de API para generación de representaciones visuales de Braille.
 Endpoints:
     POST /image: Genera PNG con visualización Braille
     POST /pdf: Genera PDF con señalética Braille
+    POST /layout: Índice de líneas y páginas para el paginador del frontend
+    POST /image/pages?page=N: Genera el PNG de una página de un documento maquetado
+    POST /tiff: Genera TIFF multipágina de un documento maquetado
+    POST /svg: Genera SVG vectorial (símbolos reutilizados por celda)
+    POST /stl: Genera placa táctil imprimible en 3D (STL binario)
+    POST /kit: Genera un kit de etiquetas en varios formatos (ZIP en streaming)
+    POST /brf: Genera BRF (ASCII Braille) para impresoras Braille
+    POST /pef: Genera PEF (XML) para impresoras Braille
+    GET /image, /pdf, /svg, /stl, /brf: Variantes cacheables con los
+        parámetros en la query (ETag, Cache-Control immutable y 304)
 
 Características:
-    - Streaming de respuestas para eficiencia
+    - Respuestas binarias con Content-Length y sin copias intermedias: en
+      un solo cuerpo o, si son grandes, en trozos de RESPONSE_CHUNK_SIZE
+      (vistas memoryview sobre el mismo buffer)
+    - Streaming de los formatos de texto (SVG, BRF, PEF) y del kit ZIP
+    - Peticiones idénticas simultáneas comparten un único renderizado
+    - Perfiles de geometría con nombre (campo "profile", ver geometry.py)
+    - Imágenes antialiasadas a varias resoluciones (campo "dpi")
     - Content-Disposition para descarga automática
     - Validación de entrada
     - Manejo profesional de errores
 """
 
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import StreamingResponse
+import inspect
+from typing import Annotated, Any, Dict, List, Literal, Optional
+
+from fastapi import APIRouter, Header, HTTPException, Query
+from fastapi.responses import Response, StreamingResponse
 from pydantic import BaseModel, Field
 
 from app.config import settings
-from app.logger import get_logger
+from app.http_cache import cache_headers, etag_matches, make_etag, not_modified
+from app.logger import get_logger, log_event
+from app.metrics import stage_timer, observe_input_size
+from app.utils import content_disposition, iter_chunks
 from app.exceptions import ValidationError, GenerationError
-from app.api.services.generator import generate_braille_image, generate_braille_pdf
+from app.api.services.generator import (
+    BASE_DPI,
+    BrailleImageGenerator,
+    generate_braille_image,
+    generate_braille_pdf,
+)
+from app.api.services.embosser import BrailleBRFGenerator, BraillePEFGenerator
+from app.api.services.geometry import available_profiles, get_profile
+from app.api.services.svg import BrailleSVGGenerator
+from app.api.services.layout import get_layout
+from app.api.services.kit import KitEntry, entry_name, iter_kit
+from app.api.services.renderers import get_renderer
+from app.api.services.singleflight import SingleFlight
+from app.api.services.workers import render_pool
 
 
 logger = get_logger(__name__)
 router = APIRouter()
 
+# Coalescencia de renderizados idénticos en curso (por endpoint)
+image_flight = SingleFlight("image")
+pdf_flight = SingleFlight("pdf")
+
 
 class GenerationRequest(BaseModel):
     """Solicitud de generación de imagen PNG con Braille."""
@@ -32,6 +71,8 @@ class GenerationRequest(BaseModel):
     text: str = Field(..., min_length=1, max_length=500, description="Texto a convertir a Braille")
     include_text: bool = Field(default=True, description="Incluir texto original en la imagen")
     mirror: bool = Field(default=False, description="Generar imagen en modo espejo")
+    profile: Optional[str] = Field(default=None, max_length=50, description="Perfil de geometría (ver /formats)")
+    dpi: Optional[int] = Field(default=None, ge=72, le=1200, description="Resolución en dpi (ver /formats)")
 
 
 class PDFGenerationRequest(BaseModel):
@@ -40,6 +81,112 @@ class PDFGenerationRequest(BaseModel):
     text: str = Field(..., min_length=1, max_length=500, description="Texto a convertir a Braille")
     title: str = Field(default="Señalética Braille", description="Título del documento PDF")
     mirror: bool = Field(default=False, description="Generar PDF en modo espejo")
+    profile: Optional[str] = Field(default=None, max_length=50, description="Perfil de geometría (ver /formats)")
+
+
+class PagedImageRequest(BaseModel):
+    """Solicitud de imagen paginada (PNG por página o TIFF)."""
+    
+    text: str = Field(..., min_length=1, description="Texto a convertir a Braille")
+    mirror: bool = Field(default=False, description="Generar páginas en modo espejo")
+    cells_per_line: Optional[int] = Field(default=None, ge=5, le=100, description="Celdas por línea")
+    lines_per_page: Optional[int] = Field(default=None, ge=1, le=100, description="Líneas por página")
+    profile: Optional[str] = Field(default=None, max_length=50, description="Perfil de geometría (ver /formats)")
+    dpi: Optional[int] = Field(default=None, ge=72, le=1200, description="Resolución en dpi (ver /formats)")
+
+
+class SVGGenerationRequest(BaseModel):
+    """Solicitud de generación de SVG vectorial con Braille."""
+    
+    text: str = Field(..., min_length=1, description="Texto a convertir a Braille")
+    mirror: bool = Field(default=False, description="Generar SVG en modo espejo")
+    units: Literal["px", "mm"] = Field(default="px", description="Geometría: px (como PNG) o mm (como PDF)")
+    show_empty: bool = Field(default=True, description="Dibujar el contorno de los puntos inactivos")
+    profile: Optional[str] = Field(default=None, max_length=50, description="Perfil de geometría (ver /formats)")
+
+
+class STLGenerationRequest(BaseModel):
+    """Solicitud de generación de placa táctil STL."""
+    
+    text: str = Field(..., min_length=1, description="Texto a convertir a Braille")
+    cells_per_line: Optional[int] = Field(default=None, ge=1, le=100, description="Celdas por línea de la placa")
+
+
+KitFormat = Literal["png", "pdf", "tiff", "svg", "stl", "brf", "pef"]
+KitLabel = Annotated[str, Field(min_length=1, max_length=500)]
+
+
+class KitRequest(BaseModel):
+    """Solicitud de un kit de señalética (varias etiquetas y formatos)."""
+    
+    labels: List[KitLabel] = Field(..., min_length=1, description="Textos de las etiquetas")
+    formats: List[KitFormat] = Field(default=["png", "pdf"], min_length=1, description="Formatos por etiqueta")
+    include_text: bool = Field(default=True, description="Incluir texto original (PNG)")
+    mirror: bool = Field(default=False, description="Modo espejo (PNG, PDF, SVG)")
+    profile: Optional[str] = Field(default=None, max_length=50, description="Perfil de geometría (PNG, PDF, TIFF, SVG)")
+    dpi: Optional[int] = Field(default=None, ge=72, le=1200, description="Resolución en dpi (PNG, TIFF)")
+
+
+def _kit_options(fmt: str, label: str, request: KitRequest) -> Dict[str, Any]:
+    """Argumentos del renderer para una entrada del kit."""
+    if fmt == "png":
+        return {"mirror": request.mirror, "include_text": request.include_text,
+                "profile": request.profile, "dpi": request.dpi}
+    if fmt in ("pdf", "tiff", "svg"):
+        options: Dict[str, Any] = {"mirror": request.mirror, "profile": request.profile}
+        if fmt == "pdf":
+            options["title"] = label
+        if fmt == "tiff":
+            options["dpi"] = request.dpi
+        return options
+    if fmt == "pef":
+        return {"title": label}
+    return {}
+
+
+class EmbosserRequest(BaseModel):
+    """Solicitud de generación para impresora Braille (BRF / PEF)."""
+    
+    text: str = Field(..., min_length=1, description="Texto a convertir a Braille")
+    title: str = Field(default="Señalética Braille", description="Título del documento (PEF)")
+    cells_per_line: Optional[int] = Field(default=None, ge=10, le=100, description="Celdas por línea")
+    lines_per_page: Optional[int] = Field(default=None, ge=5, le=100, description="Líneas por página")
+
+
+def _download(content: bytes, media_type: str, filename: str,
+              headers: Optional[Dict[str, str]] = None) -> Response:
+    """
+    Respuesta de descarga de un contenido ya renderizado.
+    
+    El contenido se envía tal cual, sin envolverlo en un BytesIO: hasta
+    RESPONSE_CHUNK_SIZE en un único cuerpo; por encima, como trozos
+    memoryview del mismo objeto con Content-Length explícito, para que el
+    servidor no tenga que acumular una segunda copia en su buffer de
+    escritura.
+    """
+    headers = {"Content-Disposition": content_disposition(filename), **(headers or {})}
+    if len(content) <= settings.response_chunk_size:
+        return Response(content, media_type=media_type, headers=headers)
+    headers["Content-Length"] = str(len(content))
+    return StreamingResponse(
+        iter_chunks(content, settings.response_chunk_size),
+        media_type=media_type,
+        headers=headers,
+    )
+
+
+def _validate_long_text(request: BaseModel, endpoint: str) -> None:
+    with stage_timer("validation"):
+        if not request.text.strip():
+            raise ValidationError("El texto no puede estar vacío")
+        
+        if len(request.text) > settings.max_text_length:
+            raise ValidationError(
+                f"Texto excede límite de {settings.max_text_length} caracteres"
+            )
+        if getattr(request, "profile", None) or getattr(request, "dpi", None):
+            BrailleImageGenerator(profile=request.profile, dpi=getattr(request, "dpi", None))
+    observe_input_size(endpoint, len(request.text))
 
 
 @router.post("/image")
@@ -52,7 +199,7 @@ async def generate_image(request: GenerationRequest):
     
     Características:
         - Renderizado en memoria (sin archivos temporales)
-        - Streaming response para eficiencia
+        - Respuesta con Content-Length, sin copias intermedias
         - Descarga automática con nombre sugerido
         - Fondo blanco, ideal para impresión
     
@@ -62,7 +209,7 @@ async def generate_image(request: GenerationRequest):
             - include_text: Incluir texto original como encabezado
     
     Returns:
-        StreamingResponse: Imagen PNG binaria
+        Response: Imagen PNG binaria (con Content-Length)
             - Content-Type: image/png
             - Content-Disposition: attachment; filename=braille_[...].png
     
@@ -78,38 +225,48 @@ async def generate_image(request: GenerationRequest):
     """
     try:
         # Validación
-        if not request.text or not request.text.strip():
-            raise ValidationError("El texto no puede estar vacío")
+        with stage_timer("validation"):
+            if not request.text or not request.text.strip():
+                raise ValidationError("El texto no puede estar vacío")
+            
+            if len(request.text) > settings.max_text_length:
+                raise ValidationError(
+                    f"Texto excede límite de {settings.max_text_length} caracteres"
+                )
+            profile = get_profile(request.profile).name
+            dpi = BrailleImageGenerator(profile=profile, dpi=request.dpi).dpi
+        observe_input_size("image", len(request.text))
         
-        if len(request.text) > settings.max_text_length:
-            raise ValidationError(
-                f"Texto excede límite de {settings.max_text_length} caracteres"
-            )
+        log_event(logger, "Generación de imagen solicitada", sampled=True, text=request.text)
         
-        logger.info(f"Generación de imagen solicitada: '{request.text}'")
-        
-        # Generar imagen
-        image_buffer = generate_braille_image(request.text, request.include_text)
+        # Generar imagen en el pool de renderizado (no bloquea el event loop);
+        # las peticiones idénticas simultáneas esperan el mismo renderizado
+        renderer = get_renderer("png")
+        image_bytes = await image_flight.do(
+            (request.text, request.mirror, request.include_text, profile, dpi),
+            lambda: render_pool.run(
+                renderer.render_bytes,
+                request.text,
+                mirror=request.mirror,
+                include_text=request.include_text,
+                profile=profile,
+                dpi=dpi
+            )
+        )
         
         # Nombre de archivo sugerido
         filename = f"braille_{request.text[:10].replace(' ', '_')}.png"
         
-        logger.info(f"Imagen generada exitosamente: {len(image_buffer.getvalue())} bytes")
+        log_event(logger, "Imagen generada exitosamente", sampled=True, size_bytes=len(image_bytes))
         
-        return StreamingResponse(
-            image_buffer,
-            media_type="image/png",
-            headers={
-                "Content-Disposition": f"attachment; filename={filename}"
-            }
-        )
+        return _download(image_bytes, renderer.media_type, filename)
     
     except ValidationError:
         raise
     except GenerationError:
         raise
     except Exception as e:
-        logger.error(f"Error inesperado en generación de imagen: {str(e)}", exc_info=True)
+        logger.error("Error inesperado en generación de imagen: %s", e, exc_info=True)
         raise GenerationError(f"Error generando imagen: {str(e)}")
 
 
@@ -135,7 +292,7 @@ async def generate_pdf(request: PDFGenerationRequest):
             - title: Título del documento
     
     Returns:
-        StreamingResponse: Documento PDF binario
+        Response: Documento PDF binario (con Content-Length)
             - Content-Type: application/pdf
             - Content-Disposition: attachment; filename=braille_[...].pdf
     
@@ -151,41 +308,422 @@ async def generate_pdf(request: PDFGenerationRequest):
     """
     try:
         # Validación
-        if not request.text or not request.text.strip():
-            raise ValidationError("El texto no puede estar vacío")
+        with stage_timer("validation"):
+            if not request.text or not request.text.strip():
+                raise ValidationError("El texto no puede estar vacío")
+            
+            if len(request.text) > settings.max_text_length:
+                raise ValidationError(
+                    f"Texto excede límite de {settings.max_text_length} caracteres"
+                )
+            profile = get_profile(request.profile).name
+        observe_input_size("pdf", len(request.text))
         
-        if len(request.text) > settings.max_text_length:
-            raise ValidationError(
-                f"Texto excede límite de {settings.max_text_length} caracteres"
-            )
-        
-        logger.info(f"Generación de PDF solicitada: '{request.text}' con título '{request.title}'")
+        log_event(
+            logger, "Generación de PDF solicitada", sampled=True,
+            text=request.text, title=request.title
+        )
         
-        # Generar PDF
-        pdf_buffer = generate_braille_pdf(request.text, request.title)
+        # Generar PDF en el pool de renderizado (no bloquea el event loop);
+        # las peticiones idénticas simultáneas esperan el mismo renderizado
+        renderer = get_renderer("pdf")
+        pdf_bytes = await pdf_flight.do(
+            (request.text, request.mirror, request.title, profile),
+            lambda: render_pool.run(
+                renderer.render_bytes,
+                request.text,
+                mirror=request.mirror,
+                title=request.title,
+                profile=profile
+            )
+        )
         
         # Nombre de archivo sugerido
         filename = f"braille_{request.text[:10].replace(' ', '_')}.pdf"
         
-        logger.info(f"PDF generado exitosamente: {len(pdf_buffer.getvalue())} bytes")
+        log_event(logger, "PDF generado exitosamente", sampled=True, size_bytes=len(pdf_bytes))
         
-        return StreamingResponse(
-            pdf_buffer,
-            media_type="application/pdf",
-            headers={
-                "Content-Disposition": f"attachment; filename={filename}"
-            }
-        )
+        return _download(pdf_bytes, renderer.media_type, filename)
     
     except ValidationError:
         raise
     except GenerationError:
         raise
     except Exception as e:
-        logger.error(f"Error inesperado en generación de PDF: {str(e)}", exc_info=True)
+        logger.error("Error inesperado en generación de PDF: %s", e, exc_info=True)
         raise GenerationError(f"Error generando PDF: {str(e)}")
 
 
+@router.post("/layout")
+async def get_document_layout(request: PagedImageRequest):
+    """
+    Devuelve el índice de líneas y páginas de un documento.
+    
+    Usa la misma maquetación (y la misma caché) que /image/pages y /tiff,
+    así que el paginador puede pedir después cualquier página sin que el
+    documento se vuelva a maquetar.
+    
+    Returns:
+        JSON: Geometría, número de líneas y páginas y, por página, su
+        primera línea, su número de líneas y su tramo de celdas
+    
+    Examples:
+        POST /api/v1/generation/layout
+        {"text": "...", "cells_per_line": 30, "lines_per_page": 20}
+    """
+    _validate_long_text(request, "layout")
+    layout = await render_pool.run(
+        BrailleImageGenerator().layout, request.text, request.cells_per_line, request.lines_per_page
+    )
+    return layout.to_index()
+
+
+@router.post("/image/pages")
+async def generate_image_page(request: PagedImageRequest,
+                              page: int = Query(default=1, ge=1, description="Página (desde 1)")):
+    """
+    Genera el PNG de una página de un documento maquetado en líneas y páginas.
+    
+    Usa la misma maquetación que el PDF (cortes de línea por palabras) y
+    solo renderiza la página pedida.
+    
+    Returns:
+        Response: Imagen PNG con headers X-Page y X-Total-Pages
+    
+    Raises:
+        ValidationError: Texto vacío o demasiado largo
+        HTTPException: 404 si la página no existe
+    
+    Examples:
+        POST /api/v1/generation/image/pages?page=2
+        {"text": "...", "cells_per_line": 30, "lines_per_page": 20}
+    """
+    _validate_long_text(request, "image_page")
+    generator = BrailleImageGenerator(profile=request.profile, dpi=request.dpi)
+    layout = await render_pool.run(
+        generator.layout, request.text, request.cells_per_line, request.lines_per_page
+    )
+    if page > layout.page_count:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Página {page} fuera de rango (1-{layout.page_count})"
+        )
+    image_bytes = await render_pool.run(
+        lambda: generator.generate_page(layout, page, request.mirror).getvalue()
+    )
+    filename = f"braille_{request.text[:10].replace(' ', '_')}_p{page}.png"
+    
+    return _download(
+        image_bytes, "image/png", filename,
+        headers={"X-Page": str(page), "X-Total-Pages": str(layout.page_count)}
+    )
+
+
+@router.post("/tiff")
+async def generate_tiff(request: PagedImageRequest):
+    """
+    Genera un TIFF multipágina con todas las páginas del documento maquetado.
+    
+    Returns:
+        Response: Imagen TIFF (una imagen por página)
+    
+    Raises:
+        ValidationError: Texto vacío o demasiado largo
+    
+    Examples:
+        POST /api/v1/generation/tiff
+        {"text": "...", "lines_per_page": 10}
+    """
+    _validate_long_text(request, "tiff")
+    renderer = get_renderer("tiff")
+    tiff_bytes = await render_pool.run(
+        renderer.render_bytes,
+        request.text,
+        mirror=request.mirror,
+        cells_per_line=request.cells_per_line,
+        lines_per_page=request.lines_per_page,
+        profile=request.profile,
+        dpi=request.dpi,
+    )
+    filename = f"braille_{request.text[:10].replace(' ', '_')}.tiff"
+    
+    return _download(tiff_bytes, renderer.media_type, filename)
+
+
+@router.post("/svg")
+def generate_svg(request: SVGGenerationRequest):
+    """
+    Genera señalética Braille en SVG, apta para corte láser y rotulación.
+    
+    Cada celda distinta se define una vez como <symbol> y cada celda del
+    texto es un <use>; el documento se emite en streaming.
+    
+    Returns:
+        StreamingResponse: Documento SVG (image/svg+xml)
+    
+    Raises:
+        ValidationError: Texto vacío o demasiado largo
+    
+    Examples:
+        POST /api/v1/generation/svg
+        {"text": "Salida", "units": "mm", "show_empty": false}
+    """
+    _validate_long_text(request, "svg")
+    renderer = get_renderer("svg")
+    generator = BrailleSVGGenerator(request.units, request.show_empty, request.profile)
+    filename = f"braille_{request.text[:10].replace(' ', '_')}.svg"
+    
+    return StreamingResponse(
+        generator.iter_svg(request.text, mirror=request.mirror),
+        media_type=renderer.media_type,
+        headers={
+            "Content-Disposition": content_disposition(filename)
+        }
+    )
+
+
+@router.post("/stl")
+async def generate_stl(request: STLGenerationRequest):
+    """
+    Genera una placa táctil imprimible en 3D (STL binario).
+    
+    La malla (placa base y puntos en cúpula a dimensiones estándar) se
+    construye con NumPy en el pool de renderizado.
+    
+    Returns:
+        Response: Archivo STL binario (model/stl)
+    
+    Raises:
+        ValidationError: Texto vacío o demasiado largo
+    
+    Examples:
+        POST /api/v1/generation/stl
+        {"text": "Aula 12", "cells_per_line": 20}
+    """
+    _validate_long_text(request, "stl")
+    renderer = get_renderer("stl")
+    content = await render_pool.run(
+        renderer.render_bytes, request.text, cells_per_line=request.cells_per_line
+    )
+    filename = f"braille_{request.text[:10].replace(' ', '_')}.stl"
+    
+    return _download(content, renderer.media_type, filename)
+
+
+@router.post("/kit")
+async def generate_kit(request: KitRequest):
+    """
+    Genera un kit de señalética: cada etiqueta en cada formato, en un ZIP.
+    
+    Las entradas se renderizan en paralelo en el pool de renderizado y el
+    ZIP se emite a medida que terminan, sin mantener el archivo completo
+    en memoria. Las entradas fallidas se listan en ERRORES.txt.
+    
+    Returns:
+        StreamingResponse: Archivo ZIP (application/zip)
+    
+    Raises:
+        ValidationError: Demasiadas etiquetas o etiquetas vacías
+    
+    Examples:
+        POST /api/v1/generation/kit
+        {"labels": ["Baño", "Salida", "Piso 1"], "formats": ["png", "pdf"]}
+    """
+    with stage_timer("validation"):
+        if len(request.labels) > settings.kit_max_labels:
+            raise ValidationError(
+                f"El kit excede el límite de {settings.kit_max_labels} etiquetas"
+            )
+        if any(not label.strip() for label in request.labels):
+            raise ValidationError("Las etiquetas no pueden estar vacías")
+        if request.profile or request.dpi:
+            BrailleImageGenerator(profile=request.profile, dpi=request.dpi)
+    observe_input_size("kit", sum(len(label) for label in request.labels))
+    
+    formats = list(dict.fromkeys(request.formats))
+    entries = [
+        KitEntry(
+            entry_name(index, label, get_renderer(fmt).extension), fmt, label,
+            _kit_options(fmt, label, request)
+        )
+        for index, label in enumerate(request.labels, 1)
+        for fmt in formats
+    ]
+    
+    def render(entry: KitEntry):
+        return render_pool.run(
+            get_renderer(entry.format).render_bytes, entry.text, **entry.options
+        )
+    
+    log_event(logger, "Kit de señalética solicitado", labels=len(request.labels), formats=formats)
+    
+    return StreamingResponse(
+        iter_kit(entries, render),
+        media_type="application/zip",
+        headers={
+            "Content-Disposition": content_disposition("senaletica_braille.zip")
+        }
+    )
+
+
+@router.post("/brf")
+def generate_brf(request: EmbosserRequest):
+    """
+    Genera un archivo BRF (ASCII Braille norteamericano) para impresoras Braille.
+    
+    La salida se produce en streaming página a página, sin materializar el
+    documento completo en memoria.
+    
+    Returns:
+        StreamingResponse: Texto ASCII con CRLF por línea y form feed por página
+    
+    Raises:
+        ValidationError: Texto vacío o demasiado largo
+    
+    Examples:
+        POST /api/v1/generation/brf
+        {"text": "Salida de emergencia", "cells_per_line": 32}
+    """
+    _validate_long_text(request, "brf")
+    renderer = get_renderer("brf")
+    generator = BrailleBRFGenerator(request.cells_per_line, request.lines_per_page)
+    layout = get_layout(request.text, generator.cells_per_line, generator.lines_per_page)
+    filename = f"braille_{request.text[:10].replace(' ', '_')}.brf"
+    
+    return StreamingResponse(
+        generator.iter_brf(layout),
+        media_type=renderer.media_type,
+        headers={
+            "Content-Disposition": content_disposition(filename)
+        }
+    )
+
+
+@router.post("/pef")
+def generate_pef(request: EmbosserRequest):
+    """
+    Genera un documento PEF (Portable Embosser Format) para impresoras Braille.
+    
+    El XML se produce en streaming página a página.
+    
+    Returns:
+        StreamingResponse: Documento PEF 1.0 (UTF-8)
+    
+    Raises:
+        ValidationError: Texto vacío o demasiado largo
+    
+    Examples:
+        POST /api/v1/generation/pef
+        {"text": "Manual de uso", "title": "Manual"}
+    """
+    _validate_long_text(request, "pef")
+    renderer = get_renderer("pef")
+    generator = BraillePEFGenerator(request.cells_per_line, request.lines_per_page, title=request.title)
+    layout = get_layout(request.text, generator.cells_per_line, generator.lines_per_page)
+    filename = f"braille_{request.text[:10].replace(' ', '_')}.pef"
+    
+    return StreamingResponse(
+        generator.iter_pef(layout),
+        media_type=renderer.media_type,
+        headers={
+            "Content-Disposition": content_disposition(filename)
+        }
+    )
+
+
+# Variantes GET cacheables (parámetros en la query, ETag y 304).
+# Los handlers POST se capturan aquí porque /image y /pdf se redefinen más
+# abajo (rutas heredadas que FastAPI nunca atiende: gana la primera).
+_POST_HANDLERS = {
+    "png": generate_image,
+    "pdf": generate_pdf,
+    "svg": generate_svg,
+    "stl": generate_stl,
+    "brf": generate_brf,
+}
+
+
+async def _cached_get(fmt: str, query: BaseModel, if_none_match: Optional[str]) -> Response:
+    """
+    Atiende la variante GET de un formato con caché HTTP.
+    
+    El ETag depende solo de los parámetros y de las versiones (ver
+    app/http_cache.py), así que un If-None-Match vigente recibe 304 sin
+    validar ni renderizar; si no, se delega en el handler POST y se añaden
+    ETag y Cache-Control a su respuesta.
+    """
+    etag = make_etag(fmt, get_renderer(fmt).version, query.model_dump())
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    response = _POST_HANDLERS[fmt](query)
+    if inspect.isawaitable(response):
+        response = await response
+    response.headers.update(cache_headers(etag))
+    return response
+
+
+@router.get("/image")
+async def get_image(query: Annotated[GenerationRequest, Query()],
+                    if_none_match: Optional[str] = Header(default=None)):
+    """
+    Variante GET cacheable de POST /image.
+    
+    Examples:
+        GET /api/v1/generation/image?text=Salida&include_text=false
+    """
+    return await _cached_get("png", query, if_none_match)
+
+
+@router.get("/pdf")
+async def get_pdf(query: Annotated[PDFGenerationRequest, Query()],
+                  if_none_match: Optional[str] = Header(default=None)):
+    """
+    Variante GET cacheable de POST /pdf.
+    
+    Examples:
+        GET /api/v1/generation/pdf?text=Baño&title=Servicios
+    """
+    return await _cached_get("pdf", query, if_none_match)
+
+
+@router.get("/svg")
+async def get_svg(query: Annotated[SVGGenerationRequest, Query()],
+                  if_none_match: Optional[str] = Header(default=None)):
+    """
+    Variante GET cacheable de POST /svg.
+    
+    Examples:
+        GET /api/v1/generation/svg?text=Salida&units=mm
+    """
+    return await _cached_get("svg", query, if_none_match)
+
+
+@router.get("/stl")
+async def get_stl(query: Annotated[STLGenerationRequest, Query()],
+                  if_none_match: Optional[str] = Header(default=None)):
+    """
+    Variante GET cacheable de POST /stl.
+    
+    Examples:
+        GET /api/v1/generation/stl?text=Aula%2012
+    """
+    return await _cached_get("stl", query, if_none_match)
+
+
+@router.get("/brf")
+async def get_brf(query: Annotated[EmbosserRequest, Query()],
+                  if_none_match: Optional[str] = Header(default=None)):
+    """
+    Variante GET cacheable de POST /brf.
+    
+    (PEF no tiene variante GET: su metadato dc:date cambia cada día.)
+    
+    Examples:
+        GET /api/v1/generation/brf?text=Salida&cells_per_line=32
+    """
+    return await _cached_get("brf", query, if_none_match)
+
+
 @router.post("/image")
 async def generate_image(request: GenerationRequest):
     """
@@ -203,7 +741,7 @@ async def generate_image(request: GenerationRequest):
     
     Características:
         - Renderizado en memoria (sin archivos temporales)
-        - Streaming response para eficiencia
+        - Respuesta con Content-Length, sin copias intermedias
         - Content-Disposition con nombre sugerido de descarga
         - Puntos activos: círculos negros rellenos
         - Puntos inactivos: círculos grises con contorno
@@ -215,7 +753,7 @@ async def generate_image(request: GenerationRequest):
             - include_text (bool): Incluir texto original en imagen
     
     Returns:
-        StreamingResponse: Imagen PNG con:
+        Response: Imagen PNG con:
             - media_type: "image/png"
             - Content-Disposition: attachment; filename=braille_[...].png
             - Body: Datos PNG binarios
@@ -289,14 +827,7 @@ async def generate_image(request: GenerationRequest):
         # Generar imagen
         image_buffer = generate_braille_image(request.text, request.mirror, request.include_text)
         
-        # Retornar como respuesta de streaming
-        return StreamingResponse(
-            image_buffer,
-            media_type="image/png",
-            headers={
-                "Content-Disposition": f"attachment; filename=braille_{request.text[:10]}.png"
-            }
-        )
+        return _download(image_buffer.getvalue(), "image/png", f"braille_{request.text[:10]}.png")
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -353,7 +884,7 @@ async def generate_pdf(request: PDFGenerationRequest):
             - title (str): Título del documento
     
     Returns:
-        StreamingResponse: Documento PDF con:
+        Response: Documento PDF con:
             - media_type: "application/pdf"
             - Content-Disposition: attachment; filename=braille_[...].pdf
             - Body: Datos PDF binarios
@@ -449,14 +980,7 @@ async def generate_pdf(request: PDFGenerationRequest):
         # Generar PDF
         pdf_buffer = generate_braille_pdf(request.text, request.mirror, request.title)
         
-        # Retornar como respuesta de streaming
-        return StreamingResponse(
-            pdf_buffer,
-            media_type="application/pdf",
-            headers={
-                "Content-Disposition": f"attachment; filename=braille_{request.text[:10]}.pdf"
-            }
-        )
+        return _download(pdf_buffer.getvalue(), "application/pdf", f"braille_{request.text[:10]}.pdf")
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -578,8 +1102,53 @@ async def get_available_formats():
                 "endpoint": "/api/v1/generation/pdf",
                 "description": "Documento PDF con texto y Braille",
                 "use_case": "Impresión de señaléticas, carteles, etiquetas"
+            },
+            {
+                "name": "PNG paginado",
+                "endpoint": "/api/v1/generation/image/pages?page=N",
+                "description": "Una página de un documento maquetado",
+                "use_case": "Visor página a página de documentos largos"
+            },
+            {
+                "name": "TIFF",
+                "endpoint": "/api/v1/generation/tiff",
+                "description": "Documento maquetado completo, una imagen por página",
+                "use_case": "Impresión y archivo de documentos multipágina"
+            },
+            {
+                "name": "SVG",
+                "endpoint": "/api/v1/generation/svg",
+                "description": "Gráfico vectorial con símbolos reutilizados por celda",
+                "use_case": "Corte láser, rotulación, impresión a cualquier escala"
+            },
+            {
+                "name": "STL",
+                "endpoint": "/api/v1/generation/stl",
+                "description": "Placa táctil 3D con puntos en cúpula (STL binario)",
+                "use_case": "Impresión 3D de placas de señalética"
+            },
+            {
+                "name": "ZIP",
+                "endpoint": "/api/v1/generation/kit",
+                "description": "Kit de etiquetas en varios formatos (ZIP en streaming)",
+                "use_case": "Proyectos de señalética de edificios completos"
+            },
+            {
+                "name": "BRF",
+                "endpoint": "/api/v1/generation/brf",
+                "description": "ASCII Braille norteamericano (NABCC)",
+                "use_case": "Impresoras Braille (embossers)"
+            },
+            {
+                "name": "PEF",
+                "endpoint": "/api/v1/generation/pef",
+                "description": "Portable Embosser Format (XML)",
+                "use_case": "Impresoras Braille, intercambio de documentos Braille"
             }
         ],
+        "geometry_profiles": list(available_profiles()),
+        "default_geometry_profile": settings.default_geometry_profile,
+        "dpi": [BASE_DPI, *settings.image_dpi_values],
         "common_uses": [
             "Señalización en edificios públicos",
             "Etiquetas de productos",
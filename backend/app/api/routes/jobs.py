@@ -0,0 +1,173 @@
+"""
+Rutas de API para trabajos asíncronos de generación.
+
+Pensadas para documentos que no caben en el límite de /generation/pdf
+(500 caracteres) o que tardarían más que el timeout HTTP.
+
+Endpoints:
+    POST /: Encola un trabajo (202 + id)
+    GET /{job_id}: Estado y progreso (páginas renderizadas)
+    GET /{job_id}/result: Descarga el archivo generado
+
+Flujo:
+    1. POST /api/v1/generation/jobs {"text": "...", "title": "Libro"}
+       → 202 {"id": "ab12...", "status": "queued", ...}
+    2. GET /api/v1/generation/jobs/ab12... (repetir hasta "done")
+    3. GET /api/v1/generation/jobs/ab12.../result → PDF
+
+Formatos: pdf (por defecto), brf y pef (impresoras Braille).
+"""
+
+import os
+from typing import Any, Dict, Optional
+
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import FileResponse, JSONResponse
+from pydantic import BaseModel, Field
+
+from app.config import settings
+from app.logger import get_logger
+from app.metrics import stage_timer, observe_input_size
+from app.utils import client_key
+from app.exceptions import ValidationError
+from app.api.services.jobs import JOB_FORMATS
+from app.api.services.geometry import get_profile
+from app.api.services.renderers import get_renderer
+
+
+logger = get_logger(__name__)
+router = APIRouter()
+
+
+class JobRequest(BaseModel):
+    """Solicitud de generación asíncrona."""
+
+    text: str = Field(..., min_length=1, description="Texto a convertir a Braille")
+    format: str = Field(default="pdf", description="Formato de salida")
+    title: str = Field(default="Señalética Braille", description="Título del documento")
+    mirror: bool = Field(default=False, description="Generar en modo espejo (PDF)")
+    cells_per_line: Optional[int] = Field(default=None, ge=10, le=100, description="Celdas por línea (BRF/PEF)")
+    lines_per_page: Optional[int] = Field(default=None, ge=5, le=100, description="Líneas por página (BRF/PEF)")
+    profile: Optional[str] = Field(default=None, max_length=50, description="Perfil de geometría (PDF)")
+
+
+def _job_options(job_request: JobRequest) -> Dict[str, Any]:
+    """Argumentos del renderer según el formato del trabajo."""
+    if job_request.format == "pdf":
+        options = {"title": job_request.title, "mirror": job_request.mirror}
+        if job_request.profile:
+            options["profile"] = job_request.profile
+        return options
+    options = {
+        "cells_per_line": job_request.cells_per_line,
+        "lines_per_page": job_request.lines_per_page,
+    }
+    if job_request.format == "pef":
+        options["title"] = job_request.title
+    return options
+
+
+def _job_status(job: Dict[str, Any], request: Request) -> Dict[str, Any]:
+    """Representación pública de un trabajo."""
+    status = {
+        "id": job["id"],
+        "status": job["status"],
+        "format": job["format"],
+        "pages": job["pages"],
+        "created": job["created"],
+        "finished": job["finished"],
+        "error": job["error"],
+        "result_url": None,
+    }
+    if job["status"] == "done":
+        status["result_url"] = str(request.url_for("get_job_result", job_id=job["id"]))
+    return status
+
+
+def _get_job(request: Request, job_id: str) -> Dict[str, Any]:
+    job = request.app.state.jobs.store.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Trabajo no encontrado")
+    return job
+
+
+@router.post("", status_code=202)
+def create_job(job_request: JobRequest, request: Request):
+    """
+    Encola la generación de un documento grande.
+
+    Returns:
+        JSON (202): Estado inicial del trabajo, con header Location
+
+    Raises:
+        ValidationError: Texto vacío, demasiado largo o formato no soportado
+        RateLimitError: El cliente ya tiene demasiados trabajos activos (429)
+    """
+    with stage_timer("validation"):
+        if not job_request.text.strip():
+            raise ValidationError("El texto no puede estar vacío")
+
+        if len(job_request.text) > settings.jobs_max_text_length:
+            raise ValidationError(
+                f"Texto excede límite de {settings.jobs_max_text_length} caracteres"
+            )
+
+        if job_request.format not in JOB_FORMATS:
+            raise ValidationError(
+                f"Formato no soportado: {job_request.format} (disponibles: {', '.join(JOB_FORMATS)})"
+            )
+
+        if job_request.profile:
+            get_profile(job_request.profile)
+    observe_input_size("jobs", len(job_request.text))
+
+    job = request.app.state.jobs.submit(
+        client_key(request),
+        job_request.format,
+        job_request.text,
+        _job_options(job_request),
+    )
+    location = str(request.url_for("get_job", job_id=job["id"]))
+    return JSONResponse(
+        status_code=202,
+        content=_job_status(job, request),
+        headers={"Location": location}
+    )
+
+
+@router.get("/{job_id}")
+def get_job(job_id: str, request: Request):
+    """
+    Estado de un trabajo.
+
+    Returns:
+        JSON: {"id", "status", "format", "pages", "created", "finished",
+               "error", "result_url"}
+
+    Raises:
+        HTTPException(404): Trabajo inexistente o expirado
+    """
+    return _job_status(_get_job(request, job_id), request)
+
+
+@router.get("/{job_id}/result")
+def get_job_result(job_id: str, request: Request):
+    """
+    Descarga el resultado de un trabajo terminado.
+
+    El archivo se envía en streaming desde disco.
+
+    Raises:
+        HTTPException(404): Trabajo inexistente, expirado o sin archivo
+        HTTPException(409): El trabajo aún no terminó o falló
+    """
+    job = _get_job(request, job_id)
+    if job["status"] != "done":
+        detail = job["error"] if job["status"] == "failed" else "El trabajo aún no ha terminado"
+        raise HTTPException(status_code=409, detail=detail)
+
+    path = job["result"]
+    if not os.path.isfile(path):
+        raise HTTPException(status_code=404, detail="Resultado no encontrado")
+    renderer = get_renderer(job["format"])
+    return FileResponse(path, media_type=renderer.media_type, filename=job["filename"])
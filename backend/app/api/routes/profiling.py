@@ -0,0 +1,44 @@
+"""
+Rutas de API para consultar perfiles de peticiones.
+
+Solo se registran si PROFILING_ENABLED=true.
+
+Endpoints:
+    GET /: Lista los perfiles guardados
+    GET /{name}: Descarga un perfil en formato pstats
+"""
+
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import FileResponse
+
+from app.profiling import list_profiles, resolve_profile
+
+
+router = APIRouter()
+
+
+@router.get("")
+def get_profiles():
+    """
+    Lista los perfiles disponibles, del más reciente al más antiguo.
+
+    Returns:
+        JSON: {"profiles": [{"name", "size_bytes", "created"}, ...]}
+    """
+    return {"profiles": list_profiles()}
+
+
+@router.get("/{name}")
+def download_profile(name: str):
+    """
+    Descarga un perfil pstats.
+
+    Se abre con `python -m pstats <archivo>` o herramientas como snakeviz.
+
+    Raises:
+        HTTPException(404): Nombre inválido o perfil inexistente
+    """
+    path = resolve_profile(name)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Perfil no encontrado")
+    return FileResponse(path, media_type="application/octet-stream", filename=name)
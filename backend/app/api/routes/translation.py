@@ -4,6 +4,9 @@ Rutas de API para traducción Braille bidireccional.
 Endpoints:
     POST /to-braille: Español → Braille (transcripción)
     POST /to-text: Braille → Español (traducción inversa)
+    GET /to-braille?text=...: Variante cacheable (ETag, 304)
+    GET /to-text?cells=46|125|_|1: Variante cacheable (ETag, 304)
+    GET /table: Tablas de traducción activas, para traducir en el cliente
 
 Respuestas:
     - Format: JSON con metadata y resultados
@@ -11,9 +14,14 @@ Respuestas:
     - Validación: Entrada verificada contra limites configurables
 """
 
-from fastapi import APIRouter, HTTPException
+from typing import List, Optional
+
+from fastapi import APIRouter, Header, HTTPException, Query, Response
+from fastapi.responses import JSONResponse
 from app.config import settings
-from app.logger import get_logger
+from app.http_cache import cache_headers, etag_matches, make_etag, not_modified
+from app.logger import get_logger, log_event
+from app.metrics import stage_timer, observe_input_size
 from app.exceptions import ValidationError, TranslationError
 
 from app.schemas.translation import (
@@ -22,12 +30,20 @@ from app.schemas.translation import (
     ReverseTranslationRequest, 
     ReverseTranslationResponse
 )
-from app.api.services.translator import text_to_braille, braille_to_text
+from app.api.services.translator import (
+    TABLE_VERSION,
+    braille_to_text,
+    text_to_braille,
+    translation_table,
+)
 
 
 logger = get_logger(__name__)
 router = APIRouter()
 
+# Versión del formato de las respuestas JSON (forma parte del ETag)
+RESPONSE_VERSION = "1"
+
 
 @router.post("/to-braille", response_model=TranslationResponse)
 def translate_to_braille(request: TranslationRequest):
@@ -66,15 +82,17 @@ def translate_to_braille(request: TranslationRequest):
     """
     try:
         # Validar entrada
-        if not request.text or not request.text.strip():
-            raise ValidationError("El texto no puede estar vacío")
-        
-        if len(request.text) > settings.max_text_length:
-            raise ValidationError(
-                f"El texto excede la longitud máxima de {settings.max_text_length} caracteres"
-            )
+        with stage_timer("validation"):
+            if not request.text or not request.text.strip():
+                raise ValidationError("El texto no puede estar vacío")
+            
+            if len(request.text) > settings.max_text_length:
+                raise ValidationError(
+                    f"El texto excede la longitud máxima de {settings.max_text_length} caracteres"
+                )
+        observe_input_size("to-braille", len(request.text))
         
-        logger.info(f"Traducción a Braille solicitada: {len(request.text)} caracteres")
+        log_event(logger, "Traducción a Braille solicitada", sampled=True, chars=len(request.text))
         
         # Traducir
         braille_cells = text_to_braille(request.text)
@@ -91,7 +109,7 @@ def translate_to_braille(request: TranslationRequest):
             for cell in braille_cells
         )
         
-        logger.info(f"Traducción exitosa: {len(braille_cells)} celdas generadas")
+        log_event(logger, "Traducción exitosa", sampled=True, cells=len(braille_cells))
         
         return TranslationResponse(
             original_text=request.text,
@@ -104,7 +122,7 @@ def translate_to_braille(request: TranslationRequest):
     except TranslationError:
         raise
     except Exception as e:
-        logger.error(f"Error inesperado en traducción: {str(e)}", exc_info=True)
+        logger.error("Error inesperado en traducción: %s", e, exc_info=True)
         raise TranslationError(f"Error durante traducción: {str(e)}")
 
 
@@ -140,29 +158,31 @@ def translate_to_text(request: ReverseTranslationRequest):
     """
     try:
         # Validar entrada
-        if not request.braille_cells:
-            raise ValidationError("Las celdas Braille no pueden estar vacías")
-        
-        if len(request.braille_cells) > settings.max_braille_cells:
-            raise ValidationError(
-                f"Excede el límite de {settings.max_braille_cells} celdas"
-            )
-        
-        # Validar que cada celda sea válida
-        for i, cell in enumerate(request.braille_cells):
-            if not isinstance(cell, list):
-                raise ValidationError(f"Celda {i}: debe ser lista, recibido {type(cell)}")
-            if not all(1 <= p <= 6 for p in cell):
+        with stage_timer("validation"):
+            if not request.braille_cells:
+                raise ValidationError("Las celdas Braille no pueden estar vacías")
+            
+            if len(request.braille_cells) > settings.max_braille_cells:
                 raise ValidationError(
-                    f"Celda {i}: puntos deben estar entre 1-6, recibido {cell}"
+                    f"Excede el límite de {settings.max_braille_cells} celdas"
                 )
+            
+            # Validar que cada celda sea válida
+            for i, cell in enumerate(request.braille_cells):
+                if not isinstance(cell, list):
+                    raise ValidationError(f"Celda {i}: debe ser lista, recibido {type(cell)}")
+                if not all(1 <= p <= 6 for p in cell):
+                    raise ValidationError(
+                        f"Celda {i}: puntos deben estar entre 1-6, recibido {cell}"
+                    )
+        observe_input_size("to-text", len(request.braille_cells))
         
-        logger.info(f"Traducción inversa solicitada: {len(request.braille_cells)} celdas")
+        log_event(logger, "Traducción inversa solicitada", sampled=True, cells=len(request.braille_cells))
         
         # Traducir
         text = braille_to_text(request.braille_cells)
         
-        logger.info(f"Traducción inversa exitosa: '{text}'")
+        log_event(logger, "Traducción inversa exitosa", sampled=True, text=text)
         
         return ReverseTranslationResponse(translated_text=text)
     
@@ -171,7 +191,7 @@ def translate_to_text(request: ReverseTranslationRequest):
     except TranslationError:
         raise
     except Exception as e:
-        logger.error(f"Error inesperado en traducción inversa: {str(e)}", exc_info=True)
+        logger.error("Error inesperado en traducción inversa: %s", e, exc_info=True)
         raise TranslationError(f"Error durante traducción inversa: {str(e)}")
 
 @router.post("/to-text", response_model=ReverseTranslationResponse)
@@ -257,4 +277,93 @@ def translate_to_text(request: ReverseTranslationRequest):
         - Interfaces accesibles
     """
     text = braille_to_text(request.braille_cells)
-    return ReverseTranslationResponse(translated_text=text)
\ No newline at end of file
+    return ReverseTranslationResponse(translated_text=text)
+
+
+def _parse_cells(cells: str) -> List[List[int]]:
+    """
+    Celdas en el formato de braille_string_repr ("46|125|_|1").
+
+    Raises:
+        ValidationError: Si alguna celda no son dígitos 1-6 o "_"
+    """
+    parsed = []
+    for i, cell in enumerate(cells.split("|")):
+        if cell == "_":
+            parsed.append([])
+        elif cell and all("1" <= dot <= "6" for dot in cell):
+            parsed.append(sorted({int(dot) for dot in cell}))
+        else:
+            raise ValidationError(f"Celda {i}: se esperaban puntos 1-6 o '_', recibido {cell!r}")
+    if len(parsed) > settings.max_braille_cells:
+        raise ValidationError(f"Excede el límite de {settings.max_braille_cells} celdas")
+    return parsed
+
+
+@router.get("/to-braille", response_model=TranslationResponse)
+def get_to_braille(response: Response,
+                   text: str = Query(..., description="Texto a traducir"),
+                   if_none_match: Optional[str] = Header(default=None)):
+    """
+    Variante GET cacheable de POST /to-braille.
+
+    La respuesta lleva un ETag calculado a partir del texto y de la versión
+    de las tablas; con If-None-Match vigente se responde 304 sin traducir.
+
+    Examples:
+        GET /api/v1/translation/to-braille?text=Hola
+    """
+    etag = make_etag("to-braille", RESPONSE_VERSION, {"text": text})
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    result = translate_to_braille(TranslationRequest(text=text))
+    response.headers.update(cache_headers(etag))
+    return result
+
+
+@router.get("/to-text", response_model=ReverseTranslationResponse)
+def get_to_text(response: Response,
+                cells: str = Query(..., min_length=1, description='Celdas separadas por "|" ("_" = espacio)'),
+                if_none_match: Optional[str] = Header(default=None)):
+    """
+    Variante GET cacheable de POST /to-text.
+
+    Las celdas usan el formato de braille_string_repr de /to-braille.
+
+    Examples:
+        GET /api/v1/translation/to-text?cells=46|125|135|123|1
+    """
+    etag = make_etag("to-text", RESPONSE_VERSION, {"cells": cells})
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    result = ReverseTranslationResponse(translated_text=braille_to_text(_parse_cells(cells)))
+    response.headers.update(cache_headers(etag))
+    return result
+
+
+@router.get("/table")
+def get_translation_table(if_none_match: Optional[str] = Header(default=None)):
+    """
+    Tablas de traducción activas, para traducir en el cliente.
+
+    Permite que el frontend haga la vista previa sin una petición por
+    pulsación (ver translation_table() para el formato y las reglas). El
+    ETag es la versión de la tabla: el cliente guarda la copia y la
+    revalida con If-None-Match (304 mientras no cambie).
+
+    La conformidad de un cliente se comprueba con los casos de
+    tests/fixtures/translation_conformance.json.
+
+    Examples:
+        GET /api/v1/translation/table
+
+        Response:
+        {"version": "b461ed454c1bcebb", "forward": {"a": "1", ...},
+         "reverse": {"1": "a", ...}, "prefixes": {"number": "3456",
+         "capital": "46"}, "digits": {"1": "a", ...},
+         "number_separators": ".,"}
+    """
+    etag = f'"{TABLE_VERSION}"'
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag, immutable=False)
+    return JSONResponse(translation_table(), headers=cache_headers(etag, immutable=False))
@@ -0,0 +1,289 @@
+"""
+Formatos para impresoras Braille (embossers): BRF y PEF.
+
+Complementa a BrailleImageGenerator y BraillePDFGenerator (representaciones
+visuales) con salidas que una impresora Braille física entiende:
+
+    - BRF: ASCII Braille norteamericano (NABCC), un carácter ASCII por
+      celda, líneas terminadas en CRLF y páginas separadas por form feed
+    - PEF: Portable Embosser Format (XML, DAISY), celdas como caracteres
+      Unicode U+2800-U+283F agrupadas en <page>/<row>
+
+Ambos escritores son streaming: traducen el texto línea a línea a celdas
+empaquetadas (PackedTranslator), las parten en líneas de `cells_per_line`
+celdas y emiten cada página en cuanto está completa. La memoria usada es
+constante respecto al tamaño del documento.
+
+Maquetación:
+    - Los saltos de línea del texto original se respetan (párrafos)
+    - Las líneas largas se parten en el último espacio que cabe; una
+      palabra más larga que la línea se corta
+    - Las páginas tienen `lines_per_page` líneas
+
+Ejemplo:
+    >>> gen = BrailleBRFGenerator(cells_per_line=40, lines_per_page=25)
+    >>> for chunk in gen.iter_brf(open("libro.txt", encoding="utf-8")):
+    ...     embosser.write(chunk)
+"""
+
+import uuid
+from datetime import date
+from io import BytesIO
+from typing import Callable, Iterable, Iterator, List, Optional, Union
+
+from app.config import settings
+from app.metrics import stage_timer
+from app.utils import xml_escape
+from .layout import BrailleLayout, iter_line_spans
+from .translator import PackedTranslator
+
+
+# ASCII Braille norteamericano indexado por máscara de 6 bits (punto n → bit
+# n-1), es decir, en el orden de los patrones Unicode U+2800-U+283F
+BRF_ALPHABET = " A1B'K2L@CIF/MSP\"E3H9O6R^DJG>NTQ,*5<-U8V.%[$+X!&;:4\\0Z7(_?W]#Y)="
+BRF_TABLE = bytes.maketrans(bytes(range(64)), BRF_ALPHABET.encode("ascii"))
+
+# Celdas empaquetadas → patrones Unicode Braille (para PEF)
+UNICODE_TABLE = {mask: chr(0x2800 + mask) for mask in range(64)}
+
+PEF_NAMESPACE = "http://www.daisy.org/ns/2008/pef"
+
+TextSource = Union[str, Iterable[str], BrailleLayout]
+
+
+def _iter_text_lines(source: TextSource) -> Iterator[str]:
+    """Recorre las líneas de un texto o de un iterable de fragmentos."""
+    if isinstance(source, str):
+        source = (source,)
+    pending = ""
+    for chunk in source:
+        lines = (pending + chunk).split("\n")
+        pending = lines.pop()
+        yield from lines
+    # Un salto de línea final (habitual en archivos) no abre otra línea
+    if pending:
+        yield pending
+
+
+def wrap_cells(cells: bytes, width: int) -> Iterator[bytes]:
+    """
+    Parte una línea de celdas empaquetadas en líneas de hasta `width` celdas.
+
+    Corta en el último espacio (celda 0) que cabe en la línea y lo
+    descarta; si no hay espacio, corta la palabra.
+
+    Args:
+        cells (bytes): Celdas empaquetadas de un párrafo
+        width (int): Celdas por línea
+
+    Yields:
+        bytes: Líneas de como máximo `width` celdas
+    """
+    for start, end in iter_line_spans(cells, width):
+        yield cells[start:end]
+
+
+def iter_braille_pages(source: TextSource, cells_per_line: int,
+                       lines_per_page: int) -> Iterator[List[bytes]]:
+    """
+    Maqueta un texto en páginas de líneas de celdas empaquetadas.
+
+    Un texto o iterable se maqueta en streaming (memoria constante); una
+    BrailleLayout ya calculada (ver get_layout) se recorre tal cual y su
+    geometría prevalece. Ambos caminos producen los mismos cortes.
+
+    Args:
+        source: Texto completo, iterable de fragmentos (ej. un archivo) o
+            maquetación previa
+        cells_per_line (int): Celdas por línea
+        lines_per_page (int): Líneas por página
+
+    Yields:
+        List[bytes]: Líneas de cada página (la última puede ser más corta)
+    """
+    if isinstance(source, BrailleLayout):
+        yield from source.iter_pages()
+        return
+    if cells_per_line < 1 or lines_per_page < 1:
+        raise ValueError("cells_per_line y lines_per_page deben ser positivos")
+    translator = PackedTranslator()
+    page: List[bytes] = []
+    for text_line in _iter_text_lines(source):
+        # El salto de línea reinicia el modo numérico, igual que en
+        # text_to_braille, así que cada línea es independiente
+        cells = translator.feed(text_line.rstrip("\r"))
+        translator.feed("\n")
+        for line in wrap_cells(cells, cells_per_line):
+            page.append(line)
+            if len(page) == lines_per_page:
+                yield page
+                page = []
+    if page:
+        yield page
+
+
+class BrailleBRFGenerator:
+    """
+    Generador de archivos BRF (ASCII Braille) para impresoras Braille.
+
+    Formato de salida:
+        - Una celda por carácter ASCII (tabla NABCC)
+        - Líneas terminadas en CRLF
+        - Form feed (\\f) entre páginas
+
+    Ejemplo:
+        >>> gen = BrailleBRFGenerator(cells_per_line=32, lines_per_page=20)
+        >>> buffer = gen.generate_brf("Salida de emergencia")
+    """
+
+    def __init__(self, cells_per_line: Optional[int] = None, lines_per_page: Optional[int] = None):
+        """
+        Args:
+            cells_per_line (int): Celdas por línea (Default: EMBOSSER_CELLS_PER_LINE)
+            lines_per_page (int): Líneas por página (Default: EMBOSSER_LINES_PER_PAGE)
+        """
+        self.cells_per_line = cells_per_line or settings.embosser_cells_per_line
+        self.lines_per_page = lines_per_page or settings.embosser_lines_per_page
+
+    def iter_brf(self, source: TextSource,
+                 on_page: Optional[Callable[[int], None]] = None) -> Iterator[bytes]:
+        """
+        Produce el BRF página a página.
+
+        Args:
+            source: Texto completo, iterable de fragmentos o BrailleLayout
+            on_page (Callable[[int], None], optional): Se invoca con el
+                número de páginas emitidas tras cada página
+
+        Yields:
+            bytes: Contenido ASCII de cada página
+        """
+        pages = 0
+        for page in iter_braille_pages(source, self.cells_per_line, self.lines_per_page):
+            body = b"".join(line.translate(BRF_TABLE) + b"\r\n" for line in page)
+            yield body if pages == 0 else b"\f" + body
+            pages += 1
+            if on_page is not None:
+                on_page(pages)
+
+    def generate_brf(self, text: TextSource,
+                     on_page: Optional[Callable[[int], None]] = None) -> BytesIO:
+        """
+        Genera el BRF completo en memoria.
+
+        Returns:
+            BytesIO: Archivo BRF posicionado al inicio
+        """
+        buffer = BytesIO()
+        with stage_timer("rendering"):
+            for chunk in self.iter_brf(text, on_page=on_page):
+                buffer.write(chunk)
+        buffer.seek(0)
+        return buffer
+
+
+class BraillePEFGenerator:
+    """
+    Generador de documentos PEF (Portable Embosser Format, PEF 1.0).
+
+    Estructura:
+        <pef> → <head> (metadatos Dublin Core) → <body> → <volume>
+        → <section> → <page> → <row> (celdas Unicode Braille)
+
+    Ejemplo:
+        >>> gen = BraillePEFGenerator(title="Manual")
+        >>> buffer = gen.generate_pef("Texto del manual")
+    """
+
+    def __init__(self, cells_per_line: Optional[int] = None, lines_per_page: Optional[int] = None,
+                 title: str = "Señalética Braille", language: str = "es"):
+        """
+        Args:
+            cells_per_line (int): Celdas por fila (atributo `cols`)
+            lines_per_page (int): Filas por página (atributo `rows`)
+            title (str): Título del documento (dc:title)
+            language (str): Idioma del documento (dc:language)
+        """
+        self.cells_per_line = cells_per_line or settings.embosser_cells_per_line
+        self.lines_per_page = lines_per_page or settings.embosser_lines_per_page
+        self.title = title
+        self.language = language
+
+    def _header(self) -> str:
+        return (
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            f'<pef version="2008-1" xmlns="{PEF_NAMESPACE}">\n'
+            '  <head>\n'
+            '    <meta xmlns:dc="http://purl.org/dc/elements/1.1/">\n'
+            '      <dc:format>application/x-pef+xml</dc:format>\n'
+            f'      <dc:identifier>urn:uuid:{uuid.uuid4()}</dc:identifier>\n'
+            f'      <dc:title>{xml_escape(self.title)}</dc:title>\n'
+            f'      <dc:language>{xml_escape(self.language)}</dc:language>\n'
+            f'      <dc:date>{date.today().isoformat()}</dc:date>\n'
+            '    </meta>\n'
+            '  </head>\n'
+            '  <body>\n'
+            f'    <volume cols="{self.cells_per_line}" rows="{self.lines_per_page}" '
+            'rowgap="0" duplex="false">\n'
+            '      <section>\n'
+        )
+
+    def iter_pef(self, source: TextSource,
+                 on_page: Optional[Callable[[int], None]] = None) -> Iterator[bytes]:
+        """
+        Produce el XML PEF de forma incremental (cabecera, páginas, cierre).
+
+        Args:
+            source: Texto completo, iterable de fragmentos o BrailleLayout
+            on_page (Callable[[int], None], optional): Callback de progreso
+
+        Yields:
+            bytes: Fragmentos XML codificados en UTF-8
+        """
+        yield self._header().encode("utf-8")
+        pages = 0
+        for page in iter_braille_pages(source, self.cells_per_line, self.lines_per_page):
+            rows = "".join(
+                f"          <row>{line.decode('ascii').translate(UNICODE_TABLE)}</row>\n"
+                for line in page
+            )
+            yield f"        <page>\n{rows}        </page>\n".encode("utf-8")
+            pages += 1
+            if on_page is not None:
+                on_page(pages)
+        if pages == 0:
+            # PEF exige al menos una página por sección
+            yield b"        <page/>\n"
+        yield b"      </section>\n    </volume>\n  </body>\n</pef>\n"
+
+    def generate_pef(self, text: TextSource,
+                     on_page: Optional[Callable[[int], None]] = None) -> BytesIO:
+        """
+        Genera el PEF completo en memoria.
+
+        Returns:
+            BytesIO: Documento PEF posicionado al inicio
+        """
+        buffer = BytesIO()
+        with stage_timer("rendering"):
+            for chunk in self.iter_pef(text, on_page=on_page):
+                buffer.write(chunk)
+        buffer.seek(0)
+        return buffer
+
+
+# Funciones de conveniencia (registradas en renderers.py)
+def generate_braille_brf(text: TextSource, cells_per_line: Optional[int] = None,
+                         lines_per_page: Optional[int] = None,
+                         on_page: Optional[Callable[[int], None]] = None) -> BytesIO:
+    """Genera un BRF con la configuración indicada (o la por defecto)."""
+    generator = BrailleBRFGenerator(cells_per_line, lines_per_page)
+    return generator.generate_brf(text, on_page=on_page)
+
+
+def generate_braille_pef(text: TextSource, cells_per_line: Optional[int] = None,
+                         lines_per_page: Optional[int] = None, title: str = "Señalética Braille",
+                         on_page: Optional[Callable[[int], None]] = None) -> BytesIO:
+    """Genera un PEF con la configuración indicada (o la por defecto)."""
+    generator = BraillePEFGenerator(cells_per_line, lines_per_page, title=title)
+    return generator.generate_pef(text, on_page=on_page)
@@ -5,7 +5,9 @@ Proporciona servicios para generar visualizaciones de texto en Braille
 para uso en señaléticas accesibles, material educativo y documentación.
 
 Formatos Soportados:
-    - PNG: Imágenes rasterizadas con celdas Braille visuales
+    - PNG: Imágenes rasterizadas con celdas Braille visuales (una línea o
+      una página de un documento maquetado)
+    - TIFF: Documento maquetado completo, una imagen por página
     - PDF: Documentos de página completa con texto y Braille
 
 Características:
@@ -16,11 +18,29 @@ Características:
     - Soporte para títulos y textos descriptivos
 
 Configuración de Renderizado:
-    - CELL_WIDTH: Ancho de celda en píxeles (PNG) o milímetros (PDF)
-    - CELL_HEIGHT: Alto de celda en píxeles (PNG) o milímetros (PDF)
-    - DOT_RADIUS: Radio de puntos Braille
-    - MARGIN: Margen alrededor del contenido
-    - SPACING: Espacio entre celdas
+    - Perfiles de geometría con nombre (GEOMETRY_PROFILES, ver geometry.py):
+      tamaño de celda, radio, márgenes y espaciado en píxeles y milímetros,
+      con las posiciones de los puntos precalculadas
+    - CELL_WIDTH, CELL_HEIGHT, DOT_RADIUS, MARGIN, SPACING: valores del
+      perfil "standard" (se conservan por compatibilidad)
+    - Resolución (dpi): la geometría en píxeles de los perfiles está
+      definida a BASE_DPI; otras resoluciones (IMAGE_DPI_VALUES) la escalan
+
+Modos de imagen (IMAGE_MODE):
+    El contenido es solo blanco, negro y grises, así que no hace falta RGB:
+    - "L": escala de grises de 8 bits
+    - "P": paleta de 16 grises (PNG de 4 bits por píxel, con antialiasing)
+    - "1": blanco y negro (PNG de 1 bit, sin antialiasing)
+    - "RGB": color de 24 bits (formato histórico)
+    Los sprites se preparan en el modo de salida y la página se compone
+    directamente en él; la compresión PNG se ajusta con PNG_COMPRESS_LEVEL
+    y PNG_OPTIMIZE (ver benchmarks/bench_png.py).
+
+Antialiasing:
+    Las 64 celdas posibles se dibujan una sola vez por proceso y por
+    resolución a IMAGE_SUPERSAMPLING veces su tamaño y se reducen con un
+    filtro Lanczos; la composición de páginas solo pega esos sprites, así
+    que el sobremuestreo no cuesta nada por celda ni por petición.
 
 Ejemplo:
     >>> from generator import generate_braille_image
@@ -30,22 +50,114 @@ Ejemplo:
 Autor: Isaac
 """
 
-from typing import List, Tuple
+import threading
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple
 from io import BytesIO
-from PIL import Image, ImageDraw, ImageFont
-from reportlab.lib.pagesizes import letter, A4
-from reportlab.pdfgen import canvas
-from reportlab.lib.units import mm
 
-from .translator import text_to_braille
+# Pillow y ReportLab se importan de forma perezosa en el primer uso: los
+# workers de solo traducción y las herramientas CLI no pagan su coste de
+# arranque ni su memoria (ver renderers.py)
+if TYPE_CHECKING:
+    from PIL import Image, ImageDraw, ImageFont
+    from reportlab.pdfgen import canvas
+
+from .geometry import get_profile, pixel_offsets
+from .layout import BrailleLayout, get_layout
+from .translator import text_to_braille, text_to_packed
+from app.config import settings
+from app.exceptions import ValidationError
+from app.metrics import stage_timer, record_cache
 
 
-# Configuración de tamaños para renderizado
+# Configuración de tamaños para renderizado (perfil "standard")
 CELL_WIDTH = 40  # Ancho de cada celda Braille en píxeles
 CELL_HEIGHT = 60  # Alto de cada celda Braille en píxeles
 DOT_RADIUS = 6  # Radio de cada punto Braille
 MARGIN = 20  # Margen alrededor de la imagen
 SPACING = 10  # Espacio entre celdas
+LINE_SPACING = 20  # Espacio entre líneas (imágenes paginadas)
+TEXT_HEIGHT = 40  # Alto del encabezado de texto
+FONT_SIZE = 20  # Tamaño de la fuente del encabezado
+
+# Resolución a la que está definida la geometría en píxeles de los perfiles
+BASE_DPI = 72
+
+# Modos de imagen admitidos (ver IMAGE_MODE)
+IMAGE_MODES = ("RGB", "L", "P", "1")
+
+# Modo "P": 16 niveles de gris; el índice i es el gris i × 17
+PALETTE_LEVELS = 16
+GRAY_PALETTE = bytes(level * 17 for level in range(PALETTE_LEVELS) for _ in range(3))
+
+# Blanco de fondo en el lienzo de cada modo ("P" se compone sobre índices)
+_WHITE = {"RGB": (255, 255, 255), "L": 255, "P": PALETTE_LEVELS - 1, "1": 1}
+
+# Umbral del modo "1": el contorno gris de los puntos vacíos queda en negro
+BILEVEL_THRESHOLD = 192
+
+# Milímetro en puntos PDF (igual que reportlab.lib.units.mm, sin importarlo)
+mm = 72.0 / 2.54 * 0.1
+
+
+def cell_to_mask(cell: List[int]) -> int:
+    """
+    Convierte una celda [1, 2, 4] en su máscara de 6 bits (punto n → bit n-1).
+    
+    Example:
+        >>> cell_to_mask([1, 2, 4])
+        11
+    """
+    mask = 0
+    for dot in cell:
+        mask |= 1 << (dot - 1)
+    return mask
+
+
+def mask_to_cell(mask: int) -> List[int]:
+    """Convierte una máscara de 6 bits en la lista de puntos activos."""
+    return [dot for dot in range(1, 7) if mask & (1 << (dot - 1))]
+
+
+def mirror_mask(mask: int) -> int:
+    """Intercambia las columnas de puntos de una celda (1-2-3 ↔ 4-5-6)."""
+    return ((mask & 0b000111) << 3) | (mask >> 3)
+
+
+_font_cache: Dict[int, "ImageFont.ImageFont"] = {}
+_sprite_cache: Dict[Tuple[int, ...], List["Image.Image"]] = {}
+_cache_lock = threading.Lock()
+
+
+def load_font(size: int = 20):
+    """
+    Carga (una sola vez por tamaño) la fuente del encabezado de texto.
+    
+    Intenta "arial.ttf" y recurre a la fuente por defecto de PIL (al
+    tamaño pedido si la versión lo permite) si no está instalada. La
+    búsqueda en disco de la fuente es costosa, por lo que el resultado
+    se cachea por proceso.
+    
+    Args:
+        size (int): Tamaño de la fuente en puntos
+    
+    Returns:
+        Fuente de PIL lista para ImageDraw.text
+    """
+    font = _font_cache.get(size)
+    record_cache("font", font is not None)
+    if font is None:
+        from PIL import ImageFont
+        
+        try:
+            font = ImageFont.truetype("arial.ttf", size)
+        except OSError:
+            try:
+                # Pillow >= 10.1: fuente por defecto escalable (alta resolución)
+                font = ImageFont.load_default(size)
+            except TypeError:
+                font = ImageFont.load_default()
+        _font_cache[size] = font
+    return font
 
 
 class BrailleImageGenerator:
@@ -78,15 +190,32 @@ class BrailleImageGenerator:
         >>> # image_buffer es BytesIO que puede guardarse como PNG
     """
     
-    def __init__(self, cell_width: int = CELL_WIDTH, cell_height: int = CELL_HEIGHT):
+    def __init__(self, cell_width: Optional[int] = None, cell_height: Optional[int] = None,
+                 profile: Optional[str] = None, dpi: Optional[int] = None,
+                 mode: Optional[str] = None, compress_level: Optional[int] = None,
+                 optimize: Optional[bool] = None):
         """
         Inicializa el generador de imágenes PNG.
         
         Args:
             cell_width (int): Ancho de cada celda Braille en píxeles.
-                            Default: 40px
+                            Default: el del perfil (40px en "standard")
             cell_height (int): Alto de cada celda Braille en píxeles.
-                             Default: 60px
+                             Default: el del perfil (60px en "standard")
+            profile (str): Perfil de geometría (ver geometry.py).
+                         Default: DEFAULT_GEOMETRY_PROFILE
+            dpi (int): Resolución de salida; escala toda la geometría
+                     desde BASE_DPI. Default: BASE_DPI (72)
+            mode (str): Modo de imagen: "RGB", "L", "P" o "1".
+                      Default: IMAGE_MODE
+            compress_level (int): Nivel zlib del PNG (0-9).
+                                Default: PNG_COMPRESS_LEVEL
+            optimize (bool): Pasada extra del codificador PNG (más lenta).
+                           Default: PNG_OPTIMIZE
+        
+        Raises:
+            ValidationError: Si la resolución no está en IMAGE_DPI_VALUES
+            ValueError: Si el modo de imagen no está soportado
         
         Attributes:
             cell_width: Ancho configurado para renderizado
@@ -97,13 +226,41 @@ class BrailleImageGenerator:
         
         Note:
             Los valores por defecto producen celdas visibles y legibles.
-            Para impresión de alta calidad, aumentar cell_width/height.
+            Para impresión de alta calidad, usar dpi=300 o dpi=600.
         """
-        self.cell_width = cell_width
-        self.cell_height = cell_height
-        self.dot_radius = DOT_RADIUS
-        self.margin = MARGIN
-        self.spacing = SPACING
+        self.profile = get_profile(profile)
+        self.mode = mode or settings.image_mode
+        if self.mode not in IMAGE_MODES:
+            raise ValueError(f"Modo de imagen no soportado: {self.mode}")
+        self.compress_level = settings.png_compress_level if compress_level is None else compress_level
+        self.optimize = settings.png_optimize if optimize is None else optimize
+        self.dpi = dpi or BASE_DPI
+        if self.dpi != BASE_DPI and self.dpi not in settings.image_dpi_values:
+            raise ValidationError(
+                f"Resolución no soportada: {self.dpi} dpi "
+                f"(disponibles: {', '.join(map(str, settings.image_dpi_values))})",
+                code="UNSUPPORTED_DPI",
+            )
+        scale = self.dpi / BASE_DPI
+        
+        def scaled(value: int) -> int:
+            return round(value * scale)
+        
+        self.cell_width = scaled(cell_width or self.profile.cell_width)
+        self.cell_height = scaled(cell_height or self.profile.cell_height)
+        self.dot_radius = scaled(self.profile.dot_radius)
+        self.margin = scaled(self.profile.margin)
+        self.spacing = scaled(self.profile.spacing)
+        self.line_spacing = scaled(LINE_SPACING)
+        self.text_height = scaled(TEXT_HEIGHT)
+        self.font_size = scaled(FONT_SIZE)
+        
+        # Tabla de posiciones de los 6 puntos (la del perfil si no se
+        # personaliza el tamaño de celda ni la resolución)
+        if (self.cell_width, self.cell_height) == (self.profile.cell_width, self.profile.cell_height):
+            self.dot_offsets = self.profile.pixel_offsets
+        else:
+            self.dot_offsets = pixel_offsets(self.cell_width, self.cell_height)
     
     def _get_dot_position(self, dot_number: int) -> Tuple[int, int]:
         """
@@ -140,15 +297,9 @@ class BrailleImageGenerator:
             (26, 45)
         """
         # Posiciones en columnas
-        col = 0 if dot_number in [1, 2, 3] else 1
-        row = (dot_number - 1) % 3
-        
-        x = self.cell_width // 3 + col * (self.cell_width // 3)
-        y = self.cell_height // 4 + row * (self.cell_height // 4)
-        
-        return (x, y)
+        return self.dot_offsets[dot_number - 1]
     
-    def _draw_braille_cell(self, draw: ImageDraw.Draw, cell: List[int], 
+    def _draw_braille_cell(self, draw: "ImageDraw.ImageDraw", cell: List[int], 
                           offset_x: int, offset_y: int):
         """
         Dibuja una celda Braille individual en la imagen.
@@ -184,8 +335,7 @@ class BrailleImageGenerator:
             >>> # Dibuja una celda Braille con puntos 1, 2, 4 activos
         """
         # Dibujar todos los 6 puntos posibles (vacíos o llenos)
-        for dot in range(1, 7):
-            x, y = self._get_dot_position(dot)
+        for dot, (x, y) in enumerate(self.dot_offsets, 1):
             x += offset_x
             y += offset_y
             
@@ -205,6 +355,135 @@ class BrailleImageGenerator:
                     outline='gray'
                 )
     
+    def _render_sprites(self, factor: int) -> List["Image.Image"]:
+        """
+        Dibuja las 64 celdas con antialiasing por sobremuestreo.
+        
+        Solo hay dos puntos distintos (activo e inactivo): cada uno se dibuja
+        una vez a `factor` veces su tamaño y se reduce con Lanczos, y las
+        celdas se componen pegando esos dos parches (con "darker", para que
+        el fondo blanco de un parche no borre un punto vecino). Con factor 1
+        las celdas se dibujan directamente con _draw_braille_cell.
+        
+        Las celdas se dibujan en escala de grises ("L"); _cell_sprites las
+        convierte al modo de salida.
+        
+        Returns:
+            List[Image.Image]: Sprites indexados por máscara de 6 bits
+        """
+        from PIL import Image, ImageChops, ImageDraw
+        
+        size = (self.cell_width, self.cell_height)
+        if factor <= 1:
+            sprites = []
+            for mask in range(64):
+                sprite = Image.new('L', size, 'white')
+                self._draw_braille_cell(ImageDraw.Draw(sprite), mask_to_cell(mask), 0, 0)
+                sprites.append(sprite)
+            return sprites
+        
+        # Parche cuadrado con el punto centrado en su píxel central
+        pad = self.dot_radius + 1
+        side = 2 * pad + 1
+        center = pad * factor + factor // 2
+        radius = self.dot_radius * factor
+        patches = []
+        for fill, outline in (('white', 'gray'), ('black', 'black')):
+            large = Image.new('L', (side * factor, side * factor), 'white')
+            ImageDraw.Draw(large).ellipse(
+                [center - radius, center - radius, center + radius, center + radius],
+                fill=fill, outline=outline, width=factor,
+            )
+            patches.append(large.resize((side, side), Image.LANCZOS))
+        
+        sprites = []
+        for mask in range(64):
+            sprite = Image.new('L', size, 'white')
+            for dot, (x, y) in enumerate(self.dot_offsets):
+                box = (x - pad, y - pad, x - pad + side, y - pad + side)
+                patch = patches[(mask >> dot) & 1]
+                sprite.paste(ImageChops.darker(sprite.crop(box), patch), box[:2])
+            sprites.append(sprite)
+        return sprites
+    
+    def _cell_sprites(self) -> List["Image.Image"]:
+        """
+        Devuelve las 64 celdas posibles pre-renderizadas para esta geometría.
+        
+        Cada celda se dibuja una única vez por proceso, resolución y modo
+        (sobremuestreada, ver _render_sprites) y luego se pega en la imagen
+        final, en lugar de dibujar 6 elipses por celda en cada petición. El
+        atlas se comparte entre instancias con la misma geometría y,
+        precargado en el proceso padre, entre workers (copy-on-write).
+        
+        Los sprites están en el modo del lienzo (ver _new_canvas): en "P"
+        son imágenes "L" cuyos valores ya son índices de GRAY_PALETTE.
+        
+        Returns:
+            List[Image.Image]: Sprites indexados por máscara de 6 bits
+        """
+        factor = max(settings.image_supersampling, 1)
+        key = (self.dpi, self.cell_width, self.cell_height, self.dot_radius, factor, self.mode)
+        sprites = _sprite_cache.get(key)
+        record_cache("cell_sprites", sprites is not None)
+        if sprites is None:
+            with _cache_lock:
+                sprites = _sprite_cache.get(key)
+                if sprites is None:
+                    with stage_timer("sprites"):
+                        sprites = self._render_sprites(factor)
+                        if self.mode == "RGB":
+                            sprites = [sprite.convert("RGB") for sprite in sprites]
+                        elif self.mode == "P":
+                            step = 256 / PALETTE_LEVELS
+                            lut = [min(int(value / step + 0.5), PALETTE_LEVELS - 1) for value in range(256)]
+                            sprites = [sprite.point(lut) for sprite in sprites]
+                        elif self.mode == "1":
+                            lut = [255 if value >= BILEVEL_THRESHOLD else 0 for value in range(256)]
+                            sprites = [sprite.point(lut, "1") for sprite in sprites]
+                    _sprite_cache[key] = sprites
+        return sprites
+    
+    def _new_canvas(self, width: int, height: int) -> "Image.Image":
+        """Lienzo en blanco en el modo de composición ("L" para "P")."""
+        from PIL import Image
+        
+        return Image.new("L" if self.mode == "P" else self.mode, (width, height), _WHITE[self.mode])
+    
+    def _finish(self, img: "Image.Image") -> "Image.Image":
+        """
+        Convierte el lienzo al modo de salida.
+        
+        En "P" los valores del lienzo ya son índices de paleta: putpalette
+        cambia el modo sin recorrer los píxeles.
+        """
+        if self.mode == "P":
+            img.putpalette(GRAY_PALETTE)
+        return img
+    
+    def _encode_png(self, img: "Image.Image") -> BytesIO:
+        """Codifica una imagen como PNG con la compresión configurada."""
+        buffer = BytesIO()
+        with stage_timer("png_encode"):
+            img.save(buffer, format='PNG', dpi=(self.dpi, self.dpi),
+                     compress_level=self.compress_level, optimize=self.optimize)
+        buffer.seek(0)
+        return buffer
+    
+    def _check_size(self, width: int, height: int) -> None:
+        """
+        Rechaza imágenes por encima de IMAGE_MAX_PIXELS.
+        
+        Raises:
+            ValidationError: Si la imagen sería demasiado grande
+        """
+        if width * height > settings.image_max_pixels:
+            raise ValidationError(
+                f"La imagen ({width}×{height} px) excede el límite de "
+                f"{settings.image_max_pixels} píxeles; reducir la resolución o el texto",
+                code="IMAGE_TOO_LARGE",
+            )
+    
     def generate_image(self, text: str, include_text: bool = True, mirror: bool = False) -> BytesIO:
         """
         Genera una imagen PNG con representación visual de texto en Braille.
@@ -273,45 +552,130 @@ class BrailleImageGenerator:
                 for cell in braille_cells
             ]
         
-        # Calcular dimensiones de la imagen
-        num_cells = len(braille_cells)
-        img_width = (num_cells * (self.cell_width + self.spacing)) + (2 * self.margin)
-        img_height = self.cell_height + (2 * self.margin)
-        
-        if include_text:
-            img_height += 40  # Espacio extra para el texto
-        
-        # Crear imagen en blanco
-        img = Image.new('RGB', (img_width, img_height), 'white')
-        draw = ImageDraw.Draw(img)
+        from PIL import Image, ImageDraw
         
-        # Dibujar texto original si se solicita
-        if include_text:
-            try:
-                font = ImageFont.truetype("arial.ttf", 20)
-            except:
-                font = ImageFont.load_default()
+        with stage_timer("rendering"):
+            # Calcular dimensiones de la imagen
+            num_cells = len(braille_cells)
+            img_width = (num_cells * (self.cell_width + self.spacing)) + (2 * self.margin)
+            img_height = self.cell_height + (2 * self.margin)
             
-            text_bbox = draw.textbbox((0, 0), text, font=font)
-            text_width = text_bbox[2] - text_bbox[0]
-            text_x = (img_width - text_width) // 2
-            draw.text((text_x, self.margin), text, fill='black', font=font)
-        
-        # Dibujar cada celda Braille
-        y_offset = self.margin + (40 if include_text else 0)
-        for i, cell in enumerate(braille_cells):
-            x_offset = self.margin + i * (self.cell_width + self.spacing)
-            self._draw_braille_cell(draw, cell, x_offset, y_offset)
-        
-        # Si modo espejo, invertir la imagen
-        if mirror:
-            img = img.transpose(Image.FLIP_LEFT_RIGHT)
+            if include_text:
+                img_height += self.text_height  # Espacio extra para el texto
+            self._check_size(img_width, img_height)
+            
+            # Crear imagen en blanco
+            img = self._new_canvas(img_width, img_height)
+            draw = ImageDraw.Draw(img)
+            
+            # Dibujar texto original si se solicita
+            if include_text:
+                font = load_font(self.font_size)
+                
+                text_bbox = draw.textbbox((0, 0), text, font=font)
+                text_width = text_bbox[2] - text_bbox[0]
+                text_x = (img_width - text_width) // 2
+                draw.text((text_x, self.margin), text, fill=0, font=font)
+            
+            # Pegar cada celda Braille desde el atlas de sprites
+            sprites = self._cell_sprites()
+            y_offset = self.margin + (self.text_height if include_text else 0)
+            for i, cell in enumerate(braille_cells):
+                x_offset = self.margin + i * (self.cell_width + self.spacing)
+                img.paste(sprites[cell_to_mask(cell)], (x_offset, y_offset))
+            
+            # Si modo espejo, invertir la imagen
+            if mirror:
+                img = img.transpose(Image.FLIP_LEFT_RIGHT)
         
         # Guardar en BytesIO
+        return self._encode_png(self._finish(img))
+    
+    def layout(self, text: str, cells_per_line: Optional[int] = None,
+               lines_per_page: Optional[int] = None) -> BrailleLayout:
+        """
+        Maqueta el texto en páginas de imagen (con caché, ver get_layout).
+        
+        Args:
+            text (str): Texto en español
+            cells_per_line (int): Celdas por línea (Default: IMAGE_CELLS_PER_LINE)
+            lines_per_page (int): Líneas por página (Default: IMAGE_LINES_PER_PAGE)
+        
+        Returns:
+            BrailleLayout: Líneas y páginas del documento
+        """
+        return get_layout(
+            text,
+            cells_per_line or settings.image_cells_per_line,
+            lines_per_page or settings.image_lines_per_page,
+        )
+    
+    def render_page(self, layout: BrailleLayout, number: int, mirror: bool = False) -> "Image.Image":
+        """
+        Dibuja una página de la maquetación.
+        
+        Todas las páginas de un documento tienen el mismo tamaño (el de una
+        página completa), de modo que se pueden apilar en un TIFF. Solo se
+        pegan las celdas de la página pedida.
+        
+        Args:
+            layout (BrailleLayout): Maquetación del documento
+            number (int): Número de página (desde 1)
+            mirror (bool): Si True, invertir horizontalmente la página
+        
+        Returns:
+            Image.Image: Página en el modo de salida (IMAGE_MODE)
+        
+        Raises:
+            IndexError: Si la página no existe
+        """
+        from PIL import Image
+        
+        lines = layout.page(number)
+        pitch_x = self.cell_width + self.spacing
+        pitch_y = self.cell_height + self.line_spacing
+        img_width = 2 * self.margin + layout.cells_per_line * pitch_x - self.spacing
+        img_height = 2 * self.margin + layout.lines_per_page * pitch_y - self.line_spacing
+        self._check_size(img_width, img_height)
+        
+        with stage_timer("rendering"):
+            img = self._new_canvas(img_width, img_height)
+            sprites = self._cell_sprites()
+            for row, line in enumerate(lines):
+                y = self.margin + row * pitch_y
+                for col, mask in enumerate(line):
+                    img.paste(sprites[mask], (self.margin + col * pitch_x, y))
+            if mirror:
+                img = img.transpose(Image.FLIP_LEFT_RIGHT)
+        return self._finish(img)
+    
+    def generate_page(self, layout: BrailleLayout, number: int, mirror: bool = False) -> BytesIO:
+        """
+        Genera el PNG de una página sin renderizar las demás.
+        
+        Returns:
+            BytesIO: Imagen PNG posicionada al inicio
+        
+        Raises:
+            IndexError: Si la página no existe
+        """
+        return self._encode_png(self.render_page(layout, number, mirror))
+    
+    def generate_tiff(self, layout: BrailleLayout, mirror: bool = False) -> BytesIO:
+        """
+        Genera un TIFF multipágina (una imagen por página, compresión deflate).
+        
+        Returns:
+            BytesIO: Archivo TIFF posicionado al inicio
+        """
+        pages = [self.render_page(layout, number, mirror)
+                 for number in range(1, layout.page_count + 1)]
         buffer = BytesIO()
-        img.save(buffer, format='PNG')
+        with stage_timer("tiff_encode"):
+            pages[0].save(buffer, format='TIFF', save_all=True,
+                          append_images=pages[1:], compression='tiff_deflate',
+                          dpi=(self.dpi, self.dpi))
         buffer.seek(0)
-        
         return buffer
 
 
@@ -354,24 +718,67 @@ class BraillePDFGenerator:
         ...                                title="Señalética - Salida")
     """
     
-    def __init__(self, page_size=A4):
+    # Geometría de página (puntos PDF)
+    START_X = 100  # X de la primera celda de cada línea
+    RIGHT_MARGIN = 100  # Margen derecho que ninguna celda sobrepasa
+    FIRST_PAGE_TOP = 250  # Distancia del borde superior a la primera línea (página 1)
+    PAGE_TOP = 100  # Distancia del borde superior a la primera línea (resto)
+    BOTTOM_LIMIT = 50  # Y mínima de una línea
+    def __init__(self, page_size=None, profile: Optional[str] = None):
         """
         Inicializa el generador de PDF.
         
         Args:
-            page_size: Tamaño de página (Default: A4 = 210×297 mm)
+            page_size: Tamaño de página (Default: None → A4 = 210×297 mm)
                       Alternativas: letter, legal, A3, A5, etc.
+            profile (str): Perfil de geometría (ver geometry.py).
+                         Default: DEFAULT_GEOMETRY_PROFILE
         
         Attributes:
             page_size: Tupla (ancho, alto) del tamaño de página en puntos
+            cell_spacing: Avance entre celdas en puntos (15mm en "standard")
+            line_height: Avance entre líneas en puntos (30mm en "standard")
         
         Example:
             >>> from reportlab.lib.pagesizes import letter
             >>> gen = BraillePDFGenerator(page_size=letter)  # Tamaño US Letter
         """
+        if page_size is None:
+            from reportlab.lib.pagesizes import A4
+            page_size = A4
         self.page_size = page_size
+        self.profile = get_profile(profile)
+        self.cell_spacing = self.profile.cell_pitch
+        self.line_height = self.profile.line_pitch
     
-    def generate_pdf(self, text: str, title: str = "Señalética Braille", mirror: bool = False) -> BytesIO:
+    def layout(self, cells: bytes) -> BrailleLayout:
+        """
+        Maqueta las celdas según el tamaño de página.
+        
+        Con A4: 9 celdas por línea, 7 líneas en la primera página (debajo
+        del título y el texto) y 9 en las siguientes.
+        
+        Args:
+            cells (bytes): Celdas empaquetadas
+        
+        Returns:
+            BrailleLayout: Líneas y páginas del documento
+        """
+        width, height = self.page_size
+        usable = width - self.RIGHT_MARGIN - self.START_X
+        cells_per_line = max(int(usable // self.cell_spacing), 1)
+        
+        def lines_from(top: float) -> int:
+            return max(int((height - top - self.BOTTOM_LIMIT) // self.line_height) + 1, 1)
+        
+        return BrailleLayout(
+            cells, cells_per_line,
+            lines_per_page=lines_from(self.PAGE_TOP),
+            first_page_lines=lines_from(self.FIRST_PAGE_TOP),
+        )
+    
+    def generate_pdf(self, text: str, title: str = "Señalética Braille", mirror: bool = False,
+                     on_page: Optional[Callable[[int], None]] = None) -> BytesIO:
         """
         Genera un documento PDF con texto original y representación Braille.
         
@@ -383,9 +790,9 @@ class BraillePDFGenerator:
             5. Celdas Braille visuales (organizadas en filas)
             6. Pie de página: Generador + cantidad de celdas
         
-        Lógica de Saltos de Línea:
-            - Se detecta si celda siguiente cabe en línea actual
-            - Si no cabe: reiniciar línea en margen izquierdo
+        Lógica de Saltos de Línea (ver layout()):
+            - Las líneas se cortan en el último espacio que cabe antes del
+              margen derecho; una palabra más larga que la línea se corta
             - Si espacio vertical insuficiente: crear nueva página
             - Espaciado entre celdas: 15mm
             - Alto de línea: 30mm
@@ -397,6 +804,9 @@ class BraillePDFGenerator:
                         Aparece centrado en la parte superior.
             mirror (bool): Si True, generar PDF en modo espejo
                          (celdas invertidas horizontalmente) (Default: False)
+            on_page (Callable[[int], None], optional): Se invoca con el número
+                         de páginas completadas cada vez que se cierra una
+                         página (progreso de trabajos asíncronos)
         
         Returns:
             BytesIO: Buffer PDF en memoria, posicionado al inicio (seek(0)).
@@ -430,9 +840,13 @@ class BraillePDFGenerator:
             - Márgenes: 50 puntos (aproximadamente 18mm)
             - Fuentes: Helvetica (estándar, siempre disponible)
             - Modo espejo: Invierte las celdas Braille horizontalmente
+            - Salida determinista (invariant): sin fecha de creación ni ID
+              aleatorio, los mismos parámetros producen los mismos bytes
         """
+        from reportlab.pdfgen import canvas
+        
         buffer = BytesIO()
-        c = canvas.Canvas(buffer, pagesize=self.page_size)
+        c = canvas.Canvas(buffer, pagesize=self.page_size, invariant=1)
         width, height = self.page_size
         
         # Título
@@ -449,57 +863,47 @@ class BraillePDFGenerator:
         c.setFont("Helvetica", 18)
         c.drawCentredString(width / 2, height - 180, "Representación Braille:")
         
-        # Convertir a Braille
-        braille_cells = text_to_braille(text)
+        # Convertir a Braille (celdas empaquetadas)
+        braille_cells = text_to_packed(text)
         
-        # Si modo espejo, invertir cada celda
+        # Si modo espejo, invertir cada celda y también el orden de las celdas
         if mirror:
-            mirror_map = {1: 4, 2: 5, 3: 6, 4: 1, 5: 2, 6: 3}
-            braille_cells = [
-                sorted([mirror_map[dot] for dot in cell])
-                for cell in braille_cells
-            ]
-            # También invertir el orden de las celdas
-            braille_cells = braille_cells[::-1]
-
-        # Dibujar celdas Braille
-        start_x = 100
-        current_x = start_x
-        current_y = height - 250
-        cell_spacing = 15 * mm
-        line_height = 30 * mm
-        right_margin_limit = width - 100
-        
-        for cell in braille_cells:
-            
-            # Verificamos si la celda ACTUAL cabe, si no, salto de línea ANTES de dibujar
-            if current_x + cell_spacing > right_margin_limit:
-                current_x = start_x      # Reset a la izquierda
-                current_y -= line_height # Bajar una línea
-                
-                # Opcional: Si current_y es muy bajo, crear nueva página (c.showPage())
-                if current_y < 50: 
-                    c.showPage()
-                    current_y = height - 100
-                    current_x = start_x
+            braille_cells = bytes(mirror_mask(mask) for mask in reversed(braille_cells))
 
-            # Dibujar la celda en la posición actual
-            self._draw_braille_cell_pdf(c, cell, current_x, current_y)
-            
-            # Avanzar el cursor para la siguiente celda
-            current_x += cell_spacing
+        with stage_timer("rendering"):
+            # Saltos de línea y de página calculados por la maquetación
+            layout = self.layout(braille_cells)
+            start_x = self.START_X
+        
+            for number, page in enumerate(layout.iter_pages(), 1):
+                if number == 1:
+                    top = height - self.FIRST_PAGE_TOP
+                else:
+                    c.showPage()
+                    if on_page is not None:
+                        on_page(number - 1)
+                    top = height - self.PAGE_TOP
+                
+                for row, line in enumerate(page):
+                    y = top - row * self.line_height
+                    for col, mask in enumerate(line):
+                        self._draw_braille_mask_pdf(c, mask, start_x + col * self.cell_spacing, y)
+            pages = layout.page_count - 1
 
         # Información adicional
         c.setFont("Helvetica", 10)
         c.drawString(50, 50, f"Generado por: Transcriptor Braille")
         c.drawString(50, 35, f"Total de celdas: {len(braille_cells)}")
         
-        c.save()
+        with stage_timer("pdf_save"):
+            c.save()
         buffer.seek(0)
+        if on_page is not None:
+            on_page(pages + 1)
         
         return buffer
     
-    def _draw_braille_cell_pdf(self, c: canvas.Canvas, cell: List[int], 
+    def _draw_braille_cell_pdf(self, c: "canvas.Canvas", cell: List[int], 
                                x: float, y: float):
         """
         Dibuja una celda Braille individual en el canvas del PDF.
@@ -545,35 +949,31 @@ class BraillePDFGenerator:
             >>> gen._draw_braille_cell_pdf(c, [1, 2, 4], 100, 500)
             >>> c.save()
         """
-        dot_radius = 2 * mm
-        col_spacing = 5 * mm
-        row_spacing = 5 * mm
-        
-        # Posiciones de los 6 puntos
-        positions = [
-            (x, y),                              # Punto 1
-            (x, y - row_spacing),                # Punto 2
-            (x, y - 2 * row_spacing),            # Punto 3
-            (x + col_spacing, y),                # Punto 4
-            (x + col_spacing, y - row_spacing),  # Punto 5
-            (x + col_spacing, y - 2 * row_spacing)  # Punto 6
-        ]
-        
-        for dot_num in range(1, 7):
-            px, py = positions[dot_num - 1]
-            if dot_num in cell:
+        self._draw_braille_mask_pdf(c, cell_to_mask(cell), x, y)
+    
+    def _draw_braille_mask_pdf(self, c: "canvas.Canvas", mask: int, x: float, y: float):
+        """
+        Dibuja una celda dada por su máscara de 6 bits.
+        
+        Las posiciones de los puntos salen de la tabla precalculada del
+        perfil (point_offsets), sin recalcularlas por celda.
+        """
+        dot_radius = self.profile.dot_radius_pt
+        for dot, (dx, dy) in enumerate(self.profile.point_offsets):
+            if mask & (1 << dot):
                 # Punto lleno (activo)
                 c.setFillColorRGB(0, 0, 0)
-                c.circle(px, py, dot_radius, fill=1)
+                c.circle(x + dx, y + dy, dot_radius, fill=1)
             else:
                 # Punto vacío (contorno)
                 c.setStrokeColorRGB(0.5, 0.5, 0.5)
                 c.setFillColorRGB(1, 1, 1)
-                c.circle(px, py, dot_radius, fill=1, stroke=1)
+                c.circle(x + dx, y + dy, dot_radius, fill=1, stroke=1)
 
 
 # Funciones de conveniencia
-def generate_braille_image(text: str, mirror: bool = False, include_text: bool = True) -> BytesIO:
+def generate_braille_image(text: str, mirror: bool = False, include_text: bool = True,
+                           profile: Optional[str] = None, dpi: Optional[int] = None) -> BytesIO:
     """
     Función de conveniencia para generar imagen PNG con Braille.
     
@@ -588,6 +988,9 @@ def generate_braille_image(text: str, mirror: bool = False, include_text: bool =
         mirror (bool): Si generar en modo espejo (Default: False)
         include_text (bool): Si incluir el texto original en la imagen.
                             Default: True
+        profile (str, optional): Perfil de geometría (Default:
+                            DEFAULT_GEOMETRY_PROFILE)
+        dpi (int, optional): Resolución de salida (Default: BASE_DPI)
     
     Returns:
         BytesIO: Buffer de imagen PNG en memoria. Utilizable como:
@@ -604,14 +1007,35 @@ def generate_braille_image(text: str, mirror: bool = False, include_text: bool =
         ...     f.write(buffer.getvalue())
     
     Note:
-        - Usa configuración por defecto (40×60 píxeles por celda)
-        - Para personalizar, usar BrailleImageGenerator directamente
+        - El perfil "standard" usa 40×60 píxeles por celda
+        - Para tamaños de celda arbitrarios, usar BrailleImageGenerator directamente
     """
-    generator = BrailleImageGenerator()
+    generator = BrailleImageGenerator(profile=profile, dpi=dpi)
     return generator.generate_image(text, include_text, mirror)
 
 
-def generate_braille_pdf(text: str, mirror: bool = False, title: str = "Señalética Braille") -> BytesIO:
+def generate_braille_page(text: str, page: int = 1, mirror: bool = False,
+                          cells_per_line: Optional[int] = None,
+                          lines_per_page: Optional[int] = None,
+                          profile: Optional[str] = None, dpi: Optional[int] = None) -> BytesIO:
+    """Genera el PNG de una página del texto maquetado (ver BrailleImageGenerator.layout)."""
+    generator = BrailleImageGenerator(profile=profile, dpi=dpi)
+    layout = generator.layout(text, cells_per_line, lines_per_page)
+    return generator.generate_page(layout, page, mirror)
+
+
+def generate_braille_tiff(text: str, mirror: bool = False, cells_per_line: Optional[int] = None,
+                          lines_per_page: Optional[int] = None,
+                          profile: Optional[str] = None, dpi: Optional[int] = None) -> BytesIO:
+    """Genera un TIFF multipágina del texto maquetado."""
+    generator = BrailleImageGenerator(profile=profile, dpi=dpi)
+    layout = generator.layout(text, cells_per_line, lines_per_page)
+    return generator.generate_tiff(layout, mirror)
+
+
+def generate_braille_pdf(text: str, mirror: bool = False, title: str = "Señalética Braille",
+                         on_page: Optional[Callable[[int], None]] = None,
+                         profile: Optional[str] = None) -> BytesIO:
     """
     Función de conveniencia para generar PDF con Braille.
     
@@ -626,6 +1050,10 @@ def generate_braille_pdf(text: str, mirror: bool = False, title: str = "Señalé
         mirror (bool): Si generar en modo espejo (Default: False)
         title (str): Título del documento PDF.
                     Default: "Señalética Braille"
+        on_page (Callable[[int], None], optional): Callback de progreso por
+                    página (ver BraillePDFGenerator.generate_pdf)
+        profile (str, optional): Perfil de geometría (Default:
+                    DEFAULT_GEOMETRY_PROFILE)
     
     Returns:
         BytesIO: Buffer PDF en memoria. Utilizable como:
@@ -646,5 +1074,5 @@ def generate_braille_pdf(text: str, mirror: bool = False, title: str = "Señalé
         - Para tamaños personalizados, usar BraillePDFGenerator directamente
         - Ideal para impresión de señaléticas
     """
-    generator = BraillePDFGenerator()
-    return generator.generate_pdf(text, title, mirror)
+    generator = BraillePDFGenerator(profile=profile)
+    return generator.generate_pdf(text, title, mirror, on_page=on_page)
@@ -0,0 +1,150 @@
+"""
+Perfiles de geometría de celdas Braille.
+
+Cada perfil (definido en GEOMETRY_PROFILES, ver config.py) describe una
+celda en dos sistemas de coordenadas:
+
+    - Píxeles (PNG/TIFF/SVG "px"): tamaño de celda, radio, separación y margen
+    - Milímetros (PDF/SVG "mm"): distancia entre puntos, radio, paso de
+      celda y alto de línea
+
+Al cargarse, cada perfil precalcula una tabla con el desplazamiento de los
+6 puntos respecto al origen de la celda en ambos sistemas; los
+renderizadores indexan estas tablas en lugar de recalcular columna y fila
+por cada punto.
+
+Perfiles incluidos:
+    - standard: geometría histórica del PNG (40×60 px) y del PDF (puntos a 5 mm)
+    - jumbo: celdas ampliadas para baja visión
+    - marburg_medium: medidas físicas Marburg Medium (puntos a 2,5 mm, celda
+      de 6 mm, línea de 10 mm, punto de 1,5 mm)
+
+Uso:
+    profile = get_profile("jumbo")
+    x, y = profile.pixel_offsets[dot - 1]
+"""
+
+import threading
+from typing import Dict, Optional, Tuple
+
+from app.config import settings
+from app.exceptions import ValidationError
+
+
+# Milímetro en puntos PDF (igual que reportlab.lib.units.mm)
+MM = 72.0 / 2.54 * 0.1
+
+
+def pixel_offsets(cell_width: int, cell_height: int) -> Tuple[Tuple[int, int], ...]:
+    """
+    Posiciones (x, y) en píxeles de los puntos 1-6 dentro de una celda.
+
+    Columnas a 1/3 y 2/3 del ancho; filas a 1/4, 2/4 y 3/4 del alto.
+    """
+    col_px, row_px = cell_width // 3, cell_height // 4
+    return tuple(
+        (col_px + (dot // 3) * col_px, row_px + (dot % 3) * row_px) for dot in range(6)
+    )
+
+
+class GeometryProfile:
+    """
+    Geometría de celda con tablas de desplazamiento de puntos precalculadas.
+
+    Attributes:
+        name (str): Nombre del perfil
+        cell_width, cell_height (int): Tamaño de la celda en píxeles
+        dot_radius (int): Radio del punto en píxeles
+        spacing (int): Separación horizontal entre celdas en píxeles
+        margin (int): Margen de la imagen en píxeles
+        dot_spacing_mm (float): Distancia entre centros de puntos (mm)
+        dot_radius_mm (float): Radio del punto (mm)
+        cell_pitch_mm (float): Avance entre celdas consecutivas (mm)
+        line_pitch_mm (float): Avance entre líneas (mm)
+        pixel_offsets (Tuple): (x, y) en píxeles de cada punto 1-6 desde la
+            esquina superior izquierda de la celda
+        point_offsets (Tuple): (dx, dy) en puntos PDF de cada punto 1-6
+            desde el punto 1 (y crece hacia arriba, como en ReportLab)
+    """
+
+    __slots__ = (
+        "name", "cell_width", "cell_height", "dot_radius", "spacing", "margin",
+        "dot_spacing_mm", "dot_radius_mm", "cell_pitch_mm", "line_pitch_mm",
+        "pixel_offsets", "point_offsets",
+    )
+
+    def __init__(self, name: str, cell_width: int, cell_height: int, dot_radius: int,
+                 spacing: int, margin: int, dot_spacing_mm: float, dot_radius_mm: float,
+                 cell_pitch_mm: float, line_pitch_mm: float):
+        self.name = name
+        self.cell_width = int(cell_width)
+        self.cell_height = int(cell_height)
+        self.dot_radius = int(dot_radius)
+        self.spacing = int(spacing)
+        self.margin = int(margin)
+        self.dot_spacing_mm = float(dot_spacing_mm)
+        self.dot_radius_mm = float(dot_radius_mm)
+        self.cell_pitch_mm = float(cell_pitch_mm)
+        self.line_pitch_mm = float(line_pitch_mm)
+
+        # Puntos 1-3 en la columna izquierda, 4-6 en la derecha
+        self.pixel_offsets = pixel_offsets(self.cell_width, self.cell_height)
+        step = self.dot_spacing_mm * MM
+        self.point_offsets: Tuple[Tuple[float, float], ...] = tuple(
+            ((dot // 3) * step, -(dot % 3) * step) for dot in range(6)
+        )
+
+    @property
+    def cell_pitch(self) -> float:
+        """Avance entre celdas en puntos PDF."""
+        return self.cell_pitch_mm * MM
+
+    @property
+    def line_pitch(self) -> float:
+        """Avance entre líneas en puntos PDF."""
+        return self.line_pitch_mm * MM
+
+    @property
+    def dot_radius_pt(self) -> float:
+        """Radio del punto en puntos PDF."""
+        return self.dot_radius_mm * MM
+
+    def __repr__(self) -> str:
+        return f"GeometryProfile({self.name!r})"
+
+
+_profiles: Dict[str, GeometryProfile] = {}
+_lock = threading.Lock()
+
+
+def get_profile(name: Optional[str] = None) -> GeometryProfile:
+    """
+    Devuelve un perfil de geometría (construido una vez por proceso).
+
+    Args:
+        name (str, optional): Nombre del perfil (Default: DEFAULT_GEOMETRY_PROFILE)
+
+    Raises:
+        ValidationError: Si el perfil no existe en GEOMETRY_PROFILES
+    """
+    name = name or settings.default_geometry_profile
+    profile = _profiles.get(name)
+    if profile is None:
+        spec = settings.geometry_profiles.get(name)
+        if spec is None:
+            raise ValidationError(
+                f"Perfil de geometría desconocido: {name} "
+                f"(disponibles: {', '.join(available_profiles())})",
+                code="UNKNOWN_PROFILE",
+            )
+        with _lock:
+            profile = _profiles.get(name)
+            if profile is None:
+                profile = GeometryProfile(name, **spec)
+                _profiles[name] = profile
+    return profile
+
+
+def available_profiles() -> Tuple[str, ...]:
+    """Nombres de los perfiles configurados."""
+    return tuple(settings.geometry_profiles)
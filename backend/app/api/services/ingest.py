@@ -0,0 +1,590 @@
+"""
+Ingesta de documentos: extracción incremental de texto de TXT, Markdown,
+DOCX y EPUB.
+
+Los generadores aceptan un texto de hasta 500 caracteres; los documentos
+reales (manuales, libros) se suben como archivo. Este módulo convierte
+cada formato en bloques de texto (párrafos y encabezados) sin cargar el
+documento completo en memoria:
+
+    - txt: se decodifica por fragmentos (UTF-8, con o sin BOM); un txt en
+      disco puede leerse mapeado en memoria (iter_mapped_text)
+    - md: línea a línea; encabezados ATX (#) y setext (===, ---), listas,
+      citas y bloques de código; se eliminan las marcas de formato en línea
+    - docx: word/document.xml se analiza con un parser XML incremental
+      (sin árbol en memoria); los estilos Heading N / Título N y el nivel
+      de esquema (outlineLvl) marcan los encabezados
+    - epub: se lee el spine del paquete OPF y cada documento XHTML con el
+      mismo parser incremental; h1-h6 son encabezados y p, li, div, ...
+      párrafos
+
+DOCX y EPUB son ZIP: se leen miembro a miembro desde el archivo (que
+puede estar en disco) sin descomprimirlos completos.
+
+Los bloques se convierten en texto para el traductor en streaming y los
+generadores paginados (BrailleBRFGenerator, BraillePEFGenerator): un
+párrafo por línea y una línea en blanco antes y después de cada
+encabezado. El modo numérico y la maquetación se resuelven aguas abajo.
+
+Ejemplo:
+    >>> reader = DocumentReader(open("manual.docx", "rb"), "docx")
+    >>> for chunk in BrailleBRFGenerator().iter_brf(reader.iter_text()):
+    ...     embosser.write(chunk)
+"""
+
+import codecs
+import html.entities
+import mmap
+import os
+import posixpath
+import re
+import xml.etree.ElementTree as ET
+import zipfile
+from typing import BinaryIO, Dict, Iterator, List, NamedTuple, Optional
+from urllib.parse import unquote
+
+from app.config import settings
+from app.exceptions import ValidationError
+
+
+# Tipos de documento por extensión y por Content-Type
+DOCUMENT_EXTENSIONS: Dict[str, str] = {
+    ".txt": "txt",
+    ".md": "md",
+    ".markdown": "md",
+    ".docx": "docx",
+    ".epub": "epub",
+}
+DOCUMENT_MEDIA_TYPES: Dict[str, str] = {
+    "text/plain": "txt",
+    "text/markdown": "md",
+    "text/x-markdown": "md",
+    "application/vnd.openxmlformats-officedocument.wordprocessingml.document": "docx",
+    "application/epub+zip": "epub",
+}
+DOCUMENT_TYPES = ("txt", "md", "docx", "epub")
+
+# Bytes leídos por fragmento (archivo de texto o miembro del ZIP)
+READ_SIZE = 256 * 1024
+
+# Bytes decodificados por bloque de un archivo mapeado en memoria
+MAPPED_BLOCK_SIZE = 4 << 20
+
+# Tamaño máximo de los XML de metadatos de un EPUB (container.xml y el
+# paquete OPF), que se leen completos al validar el documento
+METADATA_MAX_BYTES = 1 << 20
+
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_CONTAINER = "{urn:oasis:names:tc:opendocument:xmlns:container}"
+_OPF = "{http://www.idpf.org/2007/opf}"
+
+# Estilos de encabezado de Word (ids en inglés y en la plantilla española)
+_DOCX_HEADING = re.compile(r"^(?:heading|t[ií]?tulo)\s*([1-6])$", re.IGNORECASE)
+_DOCX_TITLE = {"title", "ttulo", "titulo", "título"}
+
+_XHTML_MEDIA_TYPES = ("application/xhtml+xml", "text/html")
+_HTML_HEADINGS = {f"h{level}": level for level in range(1, 7)}
+_HTML_BLOCKS = {"p", "li", "dt", "dd", "blockquote", "pre", "div", "section",
+                "article", "aside", "td", "th", "caption", "figcaption", "body"}
+_HTML_SKIP = {"head", "script", "style"}
+# Entidades HTML (&nbsp;, &eacute;...). expat solo consulta parser.entity si
+# el DOCTYPE lleva identificador externo (PUBLIC o SYSTEM, como el XHTML 1.1
+# de EPUB 2); con <!DOCTYPE html> (EPUB 3) o sin DOCTYPE son un error
+_HTML_ENTITIES = {name: chr(code) for name, code in html.entities.name2codepoint.items()}
+
+_MD_ATX = re.compile(r"^ {0,3}(#{1,6})(?:\s+(.*?))?(?:\s+#+)?\s*$")
+_MD_SETEXT = re.compile(r"^ {0,3}(=+|-+)\s*$")
+_MD_FENCE = re.compile(r"^ {0,3}(```|~~~)")
+_MD_LIST = re.compile(r"^\s*(?:[-*+]|(\d+[.)]))\s+")
+_MD_QUOTE = re.compile(r"^\s*(?:>\s?)+")
+_MD_RULE = re.compile(r"^ {0,3}(?:[-*_]\s*){3,}$")
+_MD_IMAGE = re.compile(r"!\[([^\]]*)\]\([^)]*\)")
+_MD_LINK = re.compile(r"\[([^\]]+)\]\([^)]*\)")
+_MD_EMPHASIS = re.compile(r"\*\*|__|~~|`|\*|(?<!\w)_|_(?!\w)")
+_MD_HTML_TAG = re.compile(r"<[^>\n]+>")
+_WHITESPACE = re.compile(r"\s+")
+
+
+class Block(NamedTuple):
+    """Bloque de texto extraído de un documento."""
+
+    kind: str  # "heading" o "paragraph"
+    text: str
+    level: int = 0  # Nivel del encabezado (1-6); 0 en párrafos
+
+
+def detect_document_type(filename: Optional[str] = None,
+                         media_type: Optional[str] = None) -> str:
+    """
+    Determina el tipo de documento por Content-Type o, si no es concluyente,
+    por la extensión del nombre de archivo.
+
+    Raises:
+        ValidationError: Si no se reconoce el tipo
+    """
+    if media_type:
+        doc_type = DOCUMENT_MEDIA_TYPES.get(media_type.split(";")[0].strip().lower())
+        if doc_type:
+            return doc_type
+    if filename:
+        doc_type = DOCUMENT_EXTENSIONS.get(posixpath.splitext(filename.lower())[1])
+        if doc_type:
+            return doc_type
+    raise ValidationError(
+        f"Tipo de documento no soportado (disponibles: {', '.join(DOCUMENT_TYPES)})",
+        code="UNSUPPORTED_DOCUMENT",
+    )
+
+
+def _normalize(text: str) -> str:
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+def _iter_decoded(stream: BinaryIO) -> Iterator[str]:
+    """Decodifica un flujo UTF-8 por fragmentos (acepta BOM)."""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    try:
+        for data in iter(lambda: stream.read(READ_SIZE), b""):
+            text = decoder.decode(data)
+            if text:
+                yield text
+        tail = decoder.decode(b"", final=True)
+    except UnicodeDecodeError as exc:
+        raise _invalid_utf8(exc) from None
+    if tail:
+        yield tail
+
+
+def _invalid_utf8(exc: UnicodeDecodeError) -> ValidationError:
+    return ValidationError(f"El documento no es UTF-8 válido: {exc.reason}", code="INVALID_DOCUMENT")
+
+
+def iter_mapped_text(path, block_size: int = MAPPED_BLOCK_SIZE) -> Iterator[str]:
+    """
+    Decodifica un archivo de texto UTF-8 mapeado en memoria (con o sin BOM).
+
+    Cada bloque se decodifica directamente desde el mapa (mmap), sin
+    leerlo antes a un búfer, y sus páginas se descartan del proceso
+    (MADV_DONTNEED) en cuanto están decodificadas: la memoria residente
+    no depende del tamaño del archivo.
+
+    Args:
+        path: Ruta del archivo
+        block_size (int): Bytes por bloque (se redondea a páginas enteras)
+
+    Yields:
+        str: Texto de cada bloque; un carácter partido entre dos bloques
+            sale completo en el segundo
+
+    Raises:
+        ValidationError: Si el archivo no es UTF-8 válido
+    """
+    block_size = max(mmap.PAGESIZE, block_size - block_size % mmap.PAGESIZE)
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    with open(path, "rb") as file:
+        size = os.fstat(file.fileno()).st_size
+        if not size:
+            # mmap no admite archivos vacíos
+            return
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped, \
+                memoryview(mapped) as view:
+            if hasattr(mmap, "MADV_SEQUENTIAL"):
+                mapped.madvise(mmap.MADV_SEQUENTIAL)
+            for start in range(0, size, block_size):
+                # El bloque se libera antes de ceder el texto: cerrar el mapa
+                # falla si queda alguna vista abierta sobre él
+                with view[start:start + block_size] as block:
+                    try:
+                        text = decoder.decode(block)
+                    except UnicodeDecodeError as exc:
+                        raise _invalid_utf8(exc) from None
+                if hasattr(mmap, "MADV_DONTNEED"):
+                    mapped.madvise(mmap.MADV_DONTNEED, start, min(block_size, size - start))
+                if text:
+                    yield text
+    try:
+        tail = decoder.decode(b"", final=True)
+    except UnicodeDecodeError as exc:
+        raise _invalid_utf8(exc) from None
+    if tail:
+        yield tail
+
+
+def _iter_lines(stream: BinaryIO) -> Iterator[str]:
+    pending = ""
+    for chunk in _iter_decoded(stream):
+        lines = (pending + chunk).split("\n")
+        pending = lines.pop()
+        for line in lines:
+            yield line.rstrip("\r")
+    if pending:
+        yield pending.rstrip("\r")
+
+
+def _markdown_inline(text: str) -> str:
+    text = _MD_IMAGE.sub(r"\1", text)
+    text = _MD_LINK.sub(r"\1", text)
+    text = _MD_HTML_TAG.sub("", text)
+    return _normalize(_MD_EMPHASIS.sub("", text))
+
+
+def iter_markdown_blocks(stream: BinaryIO) -> Iterator[Block]:
+    """Bloques de un documento Markdown, línea a línea."""
+    paragraph: List[str] = []
+    fence: Optional[str] = None
+    in_quote = False
+
+    def flush() -> Iterator[Block]:
+        if paragraph:
+            text = _markdown_inline(" ".join(paragraph))
+            paragraph.clear()
+            if text:
+                yield Block("paragraph", text)
+
+    for line in _iter_lines(stream):
+        fence_match = _MD_FENCE.match(line)
+        if fence is not None:
+            # Código: cada línea es un párrafo, sin tocar las marcas
+            if fence_match and fence_match.group(1) == fence:
+                fence = None
+            elif line.strip():
+                yield Block("paragraph", _normalize(line))
+            continue
+        if fence_match:
+            yield from flush()
+            fence = fence_match.group(1)
+            continue
+
+        setext = _MD_SETEXT.match(line)
+        if setext and len(paragraph) == 1:
+            # "Título\n=====" (nivel 1) o "Título\n-----" (nivel 2)
+            text = _markdown_inline(paragraph.pop())
+            yield Block("heading", text, 1 if setext.group(1)[0] == "=" else 2)
+            continue
+        if not line.strip() or _MD_RULE.match(line):
+            yield from flush()
+            in_quote = False
+            continue
+        atx = _MD_ATX.match(line)
+        if atx:
+            yield from flush()
+            text = _markdown_inline(atx.group(2) or "")
+            if text:
+                yield Block("heading", text, len(atx.group(1)))
+            continue
+
+        quote = _MD_QUOTE.match(line)
+        if bool(quote) != in_quote:
+            # Entrar o salir de una cita corta el párrafo
+            yield from flush()
+            in_quote = bool(quote)
+        if quote:
+            line = line[quote.end():]
+        item = _MD_LIST.match(line)
+        if item:
+            # Cada elemento de lista es un párrafo; la numeración se conserva
+            yield from flush()
+            line = (item.group(1) + " " if item.group(1) else "") + line[item.end():]
+        paragraph.append(line.strip())
+    yield from flush()
+
+
+class _BlockCollector:
+    """
+    Base de los targets del parser XML: acumula el texto de los bloques
+    anidados en una pila y los emite al cerrarse.
+
+    Al abrirse un bloque dentro de otro, el texto pendiente del exterior
+    se emite antes, de modo que el orden del documento se conserva.
+    """
+
+    def __init__(self):
+        self.blocks: List[Block] = []
+        self._stack: List[List[str]] = []
+
+    def _open(self) -> None:
+        if self._stack:
+            self._emit(self._stack[-1], "paragraph", 0)
+        self._stack.append([])
+
+    def _close(self, kind: str, level: int = 0) -> None:
+        self._emit(self._stack.pop(), kind, level)
+
+    def _emit(self, parts: List[str], kind: str, level: int) -> None:
+        text = _normalize("".join(parts))
+        parts.clear()
+        if text:
+            self.blocks.append(Block(kind, text, level))
+
+    def _append(self, text: str) -> None:
+        if self._stack:
+            self._stack[-1].append(text)
+
+    def close(self) -> None:
+        return None
+
+
+class _DocxTarget(_BlockCollector):
+    """Target para word/document.xml (WordprocessingML)."""
+
+    def __init__(self):
+        super().__init__()
+        self._levels: List[int] = []
+        self._in_text = False
+
+    def start(self, tag: str, attrib: Dict[str, str]) -> None:
+        if tag == _W + "p":
+            self._open()
+            self._levels.append(0)
+        elif not self._levels:
+            return
+        elif tag == _W + "t":
+            self._in_text = True
+        elif tag in (_W + "tab", _W + "br", _W + "cr"):
+            self._append(" ")
+        elif tag == _W + "pStyle":
+            style = attrib.get(_W + "val", "")
+            match = _DOCX_HEADING.match(style)
+            if match:
+                self._levels[-1] = int(match.group(1))
+            elif style.lower() in _DOCX_TITLE:
+                self._levels[-1] = 1
+        elif tag == _W + "outlineLvl" and not self._levels[-1]:
+            value = attrib.get(_W + "val", "")
+            if value.isdigit() and int(value) < 6:
+                self._levels[-1] = int(value) + 1
+
+    def data(self, text: str) -> None:
+        if self._in_text:
+            self._append(text)
+
+    def end(self, tag: str) -> None:
+        if tag == _W + "t":
+            self._in_text = False
+        elif tag == _W + "p":
+            level = self._levels.pop()
+            self._close("heading" if level else "paragraph", level)
+
+
+class _XHTMLTarget(_BlockCollector):
+    """Target para los documentos XHTML de un EPUB."""
+
+    def __init__(self):
+        super().__init__()
+        self._skip = 0
+
+    def start(self, tag: str, attrib: Dict[str, str]) -> None:
+        name = tag.rsplit("}", 1)[-1].lower()
+        if name in _HTML_SKIP:
+            self._skip += 1
+        elif self._skip:
+            return
+        elif name in _HTML_HEADINGS or name in _HTML_BLOCKS:
+            self._open()
+        elif name == "br":
+            self._append(" ")
+
+    def data(self, text: str) -> None:
+        if not self._skip:
+            self._append(text)
+
+    def end(self, tag: str) -> None:
+        name = tag.rsplit("}", 1)[-1].lower()
+        if name in _HTML_SKIP:
+            self._skip -= 1
+        elif self._skip:
+            return
+        elif name in _HTML_HEADINGS:
+            self._close("heading", _HTML_HEADINGS[name])
+        elif name in _HTML_BLOCKS:
+            self._close("paragraph")
+
+
+def _iter_xml_blocks(stream: BinaryIO, target: _BlockCollector) -> Iterator[Block]:
+    """Analiza un XML por fragmentos y emite los bloques según se cierran."""
+    parser = ET.XMLParser(target=target)
+    parser.entity.update(_HTML_ENTITIES)
+    try:
+        for data in iter(lambda: stream.read(READ_SIZE), b""):
+            parser.feed(data)
+            yield from target.blocks
+            target.blocks.clear()
+        parser.close()
+    except ET.ParseError as exc:
+        raise ValidationError(f"XML inválido en el documento: {exc}", code="INVALID_DOCUMENT") from None
+    yield from target.blocks
+    target.blocks.clear()
+
+
+class DocumentReader:
+    """
+    Lector incremental de un documento subido.
+
+    Al construirlo se valida la estructura (ZIP, miembros necesarios,
+    tamaño descomprimido), de modo que los errores se detectan antes de
+    empezar a responder en streaming. El texto se extrae después, bloque
+    a bloque, al recorrer iter_blocks() o iter_text().
+    """
+
+    def __init__(self, source: BinaryIO, doc_type: str,
+                 max_uncompressed: Optional[int] = None):
+        """
+        Args:
+            source (BinaryIO): Archivo binario con posicionamiento (seek)
+            doc_type (str): Tipo de documento (ver DOCUMENT_TYPES)
+            max_uncompressed (int, optional): Límite de bytes descomprimidos
+                de DOCX/EPUB (Default: INGEST_MAX_UNCOMPRESSED_BYTES)
+
+        Raises:
+            ValidationError: Tipo no soportado o documento inválido
+        """
+        if doc_type not in DOCUMENT_TYPES:
+            raise ValidationError(f"Tipo de documento no soportado: {doc_type}",
+                                  code="UNSUPPORTED_DOCUMENT")
+        self.source = source
+        self.doc_type = doc_type
+        self.max_uncompressed = max_uncompressed or settings.ingest_max_uncompressed_bytes
+        self._zip: Optional[zipfile.ZipFile] = None
+        self._members: List[str] = []
+        if doc_type == "docx":
+            self._members = ["word/document.xml"]
+            self._open_zip()
+        elif doc_type == "epub":
+            self._open_zip()
+            self._members = self._epub_spine()
+        if self._zip is not None:
+            self._check_size()
+
+    def _open_zip(self) -> None:
+        try:
+            self._zip = zipfile.ZipFile(self.source)
+        except zipfile.BadZipFile:
+            raise ValidationError(f"El archivo no es un {self.doc_type.upper()} válido",
+                                  code="INVALID_DOCUMENT") from None
+        names = set(self._zip.namelist())
+        missing = [name for name in self._members if name not in names]
+        if missing:
+            raise ValidationError(f"Falta {missing[0]} en el {self.doc_type.upper()}",
+                                  code="INVALID_DOCUMENT")
+
+    def _read_xml(self, name: str) -> ET.Element:
+        """
+        Lee un XML de metadatos completo, tras comprobar su tamaño
+        descomprimido (declarado en el ZIP, que no deja leer más allá).
+        """
+        try:
+            size = self._zip.getinfo(name).file_size
+        except KeyError:
+            raise ValidationError(f"Falta {name} en el EPUB", code="INVALID_DOCUMENT") from None
+        limit = min(METADATA_MAX_BYTES, self.max_uncompressed)
+        if size > limit:
+            raise ValidationError(f"{name} descomprimido excede {limit} bytes",
+                                  code="DOCUMENT_TOO_LARGE")
+        try:
+            with self._zip.open(name) as member:
+                return ET.parse(member).getroot()
+        except ET.ParseError as exc:
+            raise ValidationError(f"XML inválido en {name}: {exc}", code="INVALID_DOCUMENT") from None
+
+    def _epub_spine(self) -> List[str]:
+        """Documentos XHTML del EPUB en orden de lectura (spine del OPF)."""
+        container = self._read_xml("META-INF/container.xml")
+        rootfile = container.find(f".//{_CONTAINER}rootfile")
+        if rootfile is None or not rootfile.get("full-path"):
+            raise ValidationError("El EPUB no declara su paquete OPF", code="INVALID_DOCUMENT")
+        opf_path = rootfile.get("full-path")
+        package = self._read_xml(opf_path)
+        base = posixpath.dirname(opf_path)
+        manifest = {
+            item.get("id"): posixpath.normpath(posixpath.join(base, unquote(item.get("href", ""))))
+            for item in package.iter(f"{_OPF}item")
+            if item.get("media-type") in _XHTML_MEDIA_TYPES
+        }
+        spine = [manifest[ref.get("idref")] for ref in package.iter(f"{_OPF}itemref")
+                 if ref.get("idref") in manifest]
+        if not spine:
+            raise ValidationError("El EPUB no tiene documentos de contenido", code="INVALID_DOCUMENT")
+        names = set(self._zip.namelist())
+        missing = [name for name in spine if name not in names]
+        if missing:
+            raise ValidationError(f"Falta {missing[0]} en el EPUB", code="INVALID_DOCUMENT")
+        return spine
+
+    def _check_size(self) -> None:
+        """
+        Rechaza bombas ZIP antes de descomprimir el contenido (los XML de
+        metadatos ya se comprobaron en _read_xml).
+        """
+        total = sum(self._zip.getinfo(name).file_size for name in self._members)
+        if total > self.max_uncompressed:
+            raise ValidationError(
+                f"El documento descomprimido excede {self.max_uncompressed} bytes",
+                code="DOCUMENT_TOO_LARGE",
+            )
+
+    def iter_blocks(self) -> Iterator[Block]:
+        """
+        Recorre los bloques del documento en orden.
+
+        En txt cada línea es un párrafo (las líneas vacías se conservan).
+
+        Raises:
+            ValidationError: Si el contenido no se puede decodificar o
+                analizar (ya en streaming)
+        """
+        if self.doc_type == "txt":
+            for line in _iter_lines(self.source):
+                yield Block("paragraph", line)
+        elif self.doc_type == "md":
+            yield from iter_markdown_blocks(self.source)
+        else:
+            target_class = _DocxTarget if self.doc_type == "docx" else _XHTMLTarget
+            for name in self._members:
+                with self._zip.open(name) as member:
+                    yield from _iter_xml_blocks(member, target_class())
+
+    def iter_text(self) -> Iterator[str]:
+        """
+        Texto del documento para el traductor, en fragmentos.
+
+        Un párrafo por línea; los encabezados van separados por líneas en
+        blanco. El txt se entrega tal cual, por fragmentos de READ_SIZE
+        (sin partirlo en líneas).
+
+        Yields:
+            str: Fragmentos de texto terminados en salto de línea (salvo,
+                en txt, el último)
+        """
+        if self.doc_type == "txt":
+            yield from _iter_decoded(self.source)
+            return
+        # Sin línea en blanco al principio ni repetida entre dos encabezados
+        blank = True
+        for block in self.iter_blocks():
+            heading = block.kind == "heading"
+            if heading and not blank:
+                yield "\n"
+            yield block.text + ("\n\n" if heading else "\n")
+            blank = heading
+
+    def check_encoding(self) -> None:
+        """
+        Comprueba que un txt o md es UTF-8 válido antes de recorrerlo.
+
+        Decodifica el archivo entero sin guardar el texto y vuelve al
+        principio. En DOCX y EPUB no aplica: el parser XML decodifica según
+        la declaración de cada documento.
+
+        Raises:
+            ValidationError: Si el archivo no es UTF-8 válido
+        """
+        if self.doc_type in ("txt", "md"):
+            for _ in _iter_decoded(self.source):
+                pass
+            self.source.seek(0)
+
+    def close(self) -> None:
+        """Cierra el ZIP (si lo hay) y el archivo de origen."""
+        if self._zip is not None:
+            self._zip.close()
+        self.source.close()
@@ -0,0 +1,445 @@
+"""
+Trabajos asíncronos de generación para documentos grandes.
+
+Un documento largo no se renderiza dentro del timeout de una petición
+HTTP. En su lugar, el cliente crea un trabajo, consulta su progreso y
+descarga el resultado cuando está listo:
+
+    POST /generation/jobs              → {"id": ..., "status": "queued"}
+    GET  /generation/jobs/{id}         → estado y páginas renderizadas
+    GET  /generation/jobs/{id}/result  → archivo generado
+
+Componentes:
+    - JobStore: estado en SQLite y texto de entrada y resultados en disco
+      (JOBS_DIR), de modo que los trabajos sobreviven a reinicios y se
+      comparten entre los procesos worker del servidor
+    - JobRunner: bucle asyncio por proceso que reclama trabajos pendientes
+      y los renderiza en un pool de hilos propio (JOBS_WORKERS)
+
+Ciclo de vida de un trabajo:
+    queued → running → done | failed
+
+Robustez:
+    - Reclamar un trabajo es atómico (BEGIN IMMEDIATE), por lo que varios
+      procesos pueden compartir el mismo directorio
+    - Un trabajo "running" sin progreso durante JOBS_STALE_AFTER segundos
+      (ej. el proceso murió) vuelve a la cola
+    - Al apagar un proceso, sus trabajos en curso vuelven a la cola
+    - Los resultados expiran JOBS_TTL_SECONDS después de terminar
+    - El texto no pasa por la base de datos: se guarda en JOBS_DIR/inputs
+      y se lee mapeado en memoria (ingest.iter_mapped_text); BRF y PEF lo
+      traducen por bloques, sin tener nunca el texto completo en memoria
+    - Cada cliente puede tener como máximo JOBS_MAX_PER_CLIENT trabajos
+      activos (queued + running); el exceso recibe 429
+
+Uso:
+    store = JobStore("jobs")
+    runner = JobRunner(store)
+    runner.start()                       # dentro del event loop
+    job = runner.submit("10.0.0.1", "pdf", "Texto...", {"title": "Libro"})
+"""
+
+import asyncio
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Set
+
+from app.config import settings
+from app.exceptions import RateLimitError
+from app.logger import get_logger, log_event
+from app.metrics import JOBS_FINISHED
+from app.api.services.ingest import iter_mapped_text
+from app.api.services.renderers import get_renderer
+from app.api.services.workers import WorkerPool
+
+
+logger = get_logger(__name__)
+
+# Formatos que admite la cola (deben aceptar `on_page` para el progreso)
+JOB_FORMATS = ("pdf", "brf", "pef")
+
+# Segundos sugeridos al cliente que excede su límite de trabajos activos
+RETRY_AFTER_SECONDS = 5
+
+# Frecuencia de la limpieza de resultados expirados y trabajos huérfanos
+MAINTENANCE_INTERVAL = 30.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    client TEXT NOT NULL,
+    format TEXT NOT NULL,
+    params TEXT NOT NULL,
+    status TEXT NOT NULL,
+    pages INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    result TEXT,
+    filename TEXT,
+    owner TEXT,
+    created REAL NOT NULL,
+    updated REAL NOT NULL,
+    finished REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, created);
+CREATE INDEX IF NOT EXISTS jobs_client ON jobs (client, status);
+"""
+
+
+class JobStore:
+    """
+    Almacén persistente de trabajos (SQLite + archivos de entrada y resultado).
+
+    Cada operación abre su propia conexión: es seguro usarlo desde varios
+    hilos y procesos a la vez.
+
+    Attributes:
+        directory (Path): Directorio raíz (base de datos y resultados)
+    """
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+        self.db_path = self.directory / "jobs.sqlite3"
+        self.results_dir = self.directory / "results"
+        self.inputs_dir = self.directory / "inputs"
+        self._initialized = False
+        self._init_lock = threading.Lock()
+
+    def _init(self) -> None:
+        with self._init_lock:
+            if self._initialized:
+                return
+            self.results_dir.mkdir(parents=True, exist_ok=True)
+            self.inputs_dir.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.db_path), timeout=30)
+            try:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.executescript(_SCHEMA)
+            finally:
+                conn.close()
+            self._initialized = True
+
+    @contextmanager
+    def _connect(self, write: bool = False) -> Iterator[sqlite3.Connection]:
+        """Conexión de corta duración; `write` abre una transacción inmediata."""
+        if not self._initialized:
+            self._init()
+        conn = sqlite3.connect(str(self.db_path), timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        try:
+            if write:
+                conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                if write:
+                    conn.execute("ROLLBACK")
+                raise
+            if write:
+                conn.execute("COMMIT")
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _to_dict(row: sqlite3.Row) -> Dict[str, Any]:
+        job = dict(row)
+        job["params"] = json.loads(job["params"])
+        return job
+
+    def create(self, client: str, fmt: str, text: str, options: Dict[str, Any],
+               max_active: int) -> Dict[str, Any]:
+        """
+        Encola un trabajo nuevo.
+
+        Args:
+            client (str): Clave del cliente (ver app.utils.client_key)
+            fmt (str): Formato de salida (uno de JOB_FORMATS)
+            text (str): Texto a renderizar
+            options (dict): Argumentos adicionales para el renderer
+            max_active (int): Máximo de trabajos activos por cliente
+
+        Returns:
+            dict: Trabajo creado
+
+        Raises:
+            RateLimitError: Si el cliente ya tiene `max_active` trabajos activos
+        """
+        if not self._initialized:
+            self._init()
+        now = time.time()
+        job_id = uuid.uuid4().hex
+        params = json.dumps({"preview": text[:10], "options": options}, ensure_ascii=False)
+        input_path = self.input_path(job_id)
+        input_path.write_bytes(text.encode("utf-8"))
+        try:
+            with self._connect(write=True) as conn:
+                (active,) = conn.execute(
+                    "SELECT COUNT(*) FROM jobs WHERE client = ? AND status IN ('queued', 'running')",
+                    (client,),
+                ).fetchone()
+                if active >= max_active:
+                    raise RateLimitError(
+                        f"Máximo de {max_active} trabajos activos por cliente",
+                        retry_after=RETRY_AFTER_SECONDS,
+                    )
+                conn.execute(
+                    "INSERT INTO jobs (id, client, format, params, status, created, updated) "
+                    "VALUES (?, ?, ?, ?, 'queued', ?, ?)",
+                    (job_id, client, fmt, params, now, now),
+                )
+                row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        except BaseException:
+            self.discard_input(job_id)
+            raise
+        return self._to_dict(row)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Devuelve un trabajo por id, o None si no existe (o expiró)."""
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._to_dict(row) if row is not None else None
+
+    def claim(self, owner: str, limit: int) -> List[Dict[str, Any]]:
+        """
+        Reclama de forma atómica hasta `limit` trabajos pendientes (FIFO).
+
+        Returns:
+            List[dict]: Trabajos marcados como "running" para `owner`
+        """
+        if limit <= 0:
+            return []
+        now = time.time()
+        with self._connect(write=True) as conn:
+            rows = conn.execute(
+                "SELECT * FROM jobs WHERE status = 'queued' ORDER BY created LIMIT ?",
+                (limit,),
+            ).fetchall()
+            conn.executemany(
+                "UPDATE jobs SET status = 'running', owner = ?, updated = ? WHERE id = ?",
+                [(owner, now, row["id"]) for row in rows],
+            )
+        return [self._to_dict(row) for row in rows]
+
+    def update_progress(self, job_id: str, owner: str, pages: int) -> None:
+        """Registra páginas renderizadas (y sirve de latido del trabajo)."""
+        with self._connect(write=True) as conn:
+            conn.execute(
+                "UPDATE jobs SET pages = ?, updated = ? WHERE id = ? AND owner = ? AND status = 'running'",
+                (pages, time.time(), job_id, owner),
+            )
+
+    def finish(self, job_id: str, owner: str, result: Path, filename: str) -> None:
+        """Marca un trabajo como terminado con su archivo de resultado."""
+        now = time.time()
+        with self._connect(write=True) as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = 'done', result = ?, filename = ?, updated = ?, finished = ? "
+                "WHERE id = ? AND owner = ? AND status = 'running'",
+                (str(result), filename, now, now, job_id, owner),
+            )
+        if cursor.rowcount:
+            self.discard_input(job_id)
+
+    def fail(self, job_id: str, owner: str, error: str) -> None:
+        """Marca un trabajo como fallido."""
+        now = time.time()
+        with self._connect(write=True) as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = 'failed', error = ?, updated = ?, finished = ? "
+                "WHERE id = ? AND owner = ? AND status = 'running'",
+                (error, now, now, job_id, owner),
+            )
+        if cursor.rowcount:
+            self.discard_input(job_id)
+
+    def release(self, owner: str) -> int:
+        """Devuelve a la cola los trabajos en curso de `owner` (apagado)."""
+        with self._connect(write=True) as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = 'queued', owner = NULL, pages = 0, updated = ? "
+                "WHERE owner = ? AND status = 'running'",
+                (time.time(), owner),
+            )
+        return cursor.rowcount
+
+    def requeue_stale(self, stale_after: float) -> int:
+        """Devuelve a la cola los trabajos "running" sin latido reciente."""
+        now = time.time()
+        with self._connect(write=True) as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = 'queued', owner = NULL, pages = 0, updated = ? "
+                "WHERE status = 'running' AND updated < ?",
+                (now, now - stale_after),
+            )
+        return cursor.rowcount
+
+    def purge_expired(self, ttl: float) -> int:
+        """Elimina trabajos terminados hace más de `ttl` segundos y sus archivos."""
+        with self._connect(write=True) as conn:
+            rows = conn.execute(
+                "SELECT id, result FROM jobs WHERE finished IS NOT NULL AND finished < ?",
+                (time.time() - ttl,),
+            ).fetchall()
+            conn.executemany("DELETE FROM jobs WHERE id = ?", [(row["id"],) for row in rows])
+        for row in rows:
+            self.discard_input(row["id"])
+            if row["result"]:
+                try:
+                    os.unlink(row["result"])
+                except OSError:
+                    pass
+        return len(rows)
+
+    def result_path(self, job_id: str, extension: str) -> Path:
+        """Ruta del archivo de resultado de un trabajo."""
+        return self.results_dir / f"{job_id}.{extension}"
+
+    def input_path(self, job_id: str) -> Path:
+        """Ruta del texto de entrada (UTF-8) de un trabajo."""
+        return self.inputs_dir / f"{job_id}.txt"
+
+    def discard_input(self, job_id: str) -> None:
+        """Elimina el texto de entrada de un trabajo (si existe)."""
+        try:
+            os.unlink(self.input_path(job_id))
+        except OSError:
+            pass
+
+
+class JobRunner:
+    """
+    Ejecutor de trabajos de un proceso.
+
+    Un bucle asyncio reclama trabajos del JobStore mientras haya hilos
+    libres en su pool y los renderiza con el backend del formato.
+
+    Attributes:
+        store (JobStore): Almacén compartido
+        pool (WorkerPool): Hilos de renderizado de trabajos
+        owner (str): Identificador único de este ejecutor
+    """
+
+    def __init__(self, store: JobStore, workers: Optional[int] = None):
+        self.store = store
+        self.pool = WorkerPool("jobs", workers or settings.jobs_workers)
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._executing: Set[asyncio.Task] = set()
+
+    @property
+    def running(self) -> bool:
+        """Indica si el bucle del ejecutor está activo."""
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Arranca el bucle en el event loop actual (idempotente)."""
+        if self.running:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run(), name="job-runner")
+
+    async def stop(self) -> None:
+        """Detiene el bucle y devuelve a la cola los trabajos en curso."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self.pool.shutdown(wait=False)
+        released = await asyncio.to_thread(self.store.release, self.owner)
+        if released:
+            logger.info("%d trabajos devueltos a la cola al apagar", released)
+
+    def notify(self) -> None:
+        """Despierta el bucle (seguro desde cualquier hilo)."""
+        if self._loop is not None and self._wakeup is not None:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    def submit(self, client: str, fmt: str, text: str, options: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Encola un trabajo y despierta al ejecutor.
+
+        Raises:
+            RateLimitError: Límite de trabajos activos del cliente excedido
+        """
+        job = self.store.create(client, fmt, text, options, settings.jobs_max_per_client)
+        log_event(logger, "Trabajo encolado", job_id=job["id"], format=fmt, chars=len(text))
+        self.notify()
+        return job
+
+    async def _run(self) -> None:
+        last_maintenance = 0.0
+        while True:
+            try:
+                if time.monotonic() - last_maintenance >= MAINTENANCE_INTERVAL:
+                    last_maintenance = time.monotonic()
+                    await asyncio.to_thread(self._maintenance)
+
+                free = self.pool.max_workers - len(self._executing)
+                jobs = await asyncio.to_thread(self.store.claim, self.owner, free)
+                for job in jobs:
+                    task = asyncio.create_task(self._execute(job))
+                    self._executing.add(task)
+                    task.add_done_callback(self._executing.discard)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("Error en el ejecutor de trabajos: %s", e, exc_info=True)
+
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=settings.jobs_poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    def _maintenance(self) -> None:
+        purged = self.store.purge_expired(settings.jobs_ttl_seconds)
+        requeued = self.store.requeue_stale(settings.jobs_stale_after)
+        if purged or requeued:
+            logger.info("Trabajos expirados: %d, re-encolados: %d", purged, requeued)
+
+    async def _execute(self, job: Dict[str, Any]) -> None:
+        try:
+            await self.pool.run(self._render, job)
+        finally:
+            self._wakeup.set()
+
+    def _render(self, job: Dict[str, Any]) -> None:
+        """Renderiza un trabajo en un hilo del pool y guarda el resultado."""
+        job_id = job["id"]
+        params = job["params"]
+        try:
+            renderer = get_renderer(job["format"])
+            text = iter_mapped_text(self.store.input_path(job_id))
+            if job["format"] == "pdf":
+                # El PDF se maqueta sobre el texto completo
+                text = "".join(text)
+            buffer = renderer(
+                text,
+                on_page=lambda pages: self.store.update_progress(job_id, self.owner, pages),
+                **params["options"]
+            )
+            path = self.store.result_path(job_id, renderer.extension)
+            tmp_path = path.with_suffix(".tmp")
+            tmp_path.write_bytes(buffer.getbuffer())
+            os.replace(tmp_path, path)
+
+            filename = f"braille_{params['preview'].replace(' ', '_')}.{renderer.extension}"
+            self.store.finish(job_id, self.owner, path, filename)
+            JOBS_FINISHED.labels("done").inc()
+            log_event(logger, "Trabajo completado", job_id=job_id, size_bytes=path.stat().st_size)
+        except Exception as e:
+            logger.error("Error en trabajo %s: %s", job_id, e, exc_info=True)
+            self.store.fail(job_id, self.owner, str(e))
+            JOBS_FINISHED.labels("failed").inc()
@@ -0,0 +1,141 @@
+"""
+Kits de señalética: muchas etiquetas en un único ZIP emitido en streaming.
+
+Cada entrada del kit (etiqueta × formato) se renderiza en el pool de
+renderizado; el ZIP se escribe a medida que las entradas terminan y cada
+fragmento se envía al cliente en cuanto está listo.
+
+Memoria acotada:
+    - Como mucho `window` renderizados en vuelo a la vez; el resto de
+      entradas esperan a que se libere un hueco
+    - El ZIP se escribe sobre un sumidero no posicionable (sin seek): zipfile
+      usa descriptores de datos y no necesita volver atrás, así que cada
+      entrada se descarta en cuanto se ha enviado
+    - Solo el directorio central (unos 100 bytes por entrada) permanece
+      hasta el final
+
+Compresión por entrada: PNG se almacena tal cual (ya está comprimido con
+deflate); el resto de formatos se comprimen con deflate.
+
+Las entradas que fallan no interrumpen el kit: se listan en ERRORES.txt al
+final del archivo.
+"""
+
+import asyncio
+import logging
+import time
+import zipfile
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, NamedTuple
+
+from app.logger import get_logger, log_event
+from .workers import render_pool
+
+
+logger = get_logger(__name__)
+
+# Formatos que ya vienen comprimidos y no ganan nada con deflate
+STORED_FORMATS = frozenset({"png"})
+
+ERRORS_ENTRY = "ERRORES.txt"
+
+
+class KitEntry(NamedTuple):
+    """Un archivo del kit: nombre dentro del ZIP y cómo renderizarlo."""
+
+    name: str
+    format: str
+    text: str
+    options: Dict[str, Any]
+
+
+class _ChunkSink:
+    """Archivo de solo escritura que acumula bytes hasta que se drenan."""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def entry_name(index: int, label: str, extension: str) -> str:
+    """
+    Nombre de archivo seguro y único para una etiqueta.
+
+    Example:
+        >>> entry_name(3, "Piso 1/A", "png")
+        '003_Piso_1_A.png'
+    """
+    safe = "".join(c if c.isalnum() or c in "-_." else "_" for c in label.strip())
+    return f"{index:03d}_{safe[:40] or 'etiqueta'}.{extension}"
+
+
+async def iter_kit(entries: List[KitEntry], render: Callable[[KitEntry], Awaitable[bytes]],
+                   window: int = 0) -> AsyncIterator[bytes]:
+    """
+    Renderiza las entradas en paralelo y produce el ZIP por fragmentos.
+
+    Las entradas se añaden al archivo en el orden en que terminan.
+
+    Args:
+        entries: Archivos del kit
+        render: Corrutina que devuelve el contenido de una entrada
+        window (int): Renderizados simultáneos (Default: 2 × hilos del pool)
+
+    Yields:
+        bytes: Fragmentos consecutivos del archivo ZIP
+    """
+    window = window or 2 * render_pool.max_workers
+    sink = _ChunkSink()
+    archive = zipfile.ZipFile(sink, mode="w")
+    date_time = time.localtime()[:6]
+    pending = iter(entries)
+    in_flight: Dict["asyncio.Future[bytes]", KitEntry] = {}
+    errors: List[str] = []
+
+    def fill() -> None:
+        while len(in_flight) < window:
+            entry = next(pending, None)
+            if entry is None:
+                return
+            in_flight[asyncio.ensure_future(render(entry))] = entry
+
+    def add(name: str, data: bytes, fmt: str) -> None:
+        info = zipfile.ZipInfo(name, date_time=date_time)
+        info.compress_type = zipfile.ZIP_STORED if fmt in STORED_FORMATS else zipfile.ZIP_DEFLATED
+        archive.writestr(info, data)
+
+    try:
+        fill()
+        while in_flight:
+            done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+            for future in done:
+                entry = in_flight.pop(future)
+                try:
+                    data = future.result()
+                except Exception as exc:
+                    errors.append(f"{entry.name}: {exc}")
+                    log_event(logger, "Entrada de kit fallida", level=logging.WARNING,
+                              entry=entry.name, error=str(exc))
+                    continue
+                # La compresión también es trabajo de CPU: fuera del event loop
+                await render_pool.run(add, entry.name, data, entry.format)
+                yield sink.drain()
+            fill()
+        if errors:
+            add(ERRORS_ENTRY, "\n".join(errors).encode("utf-8"), "txt")
+        archive.close()
+        yield sink.drain()
+    finally:
+        # Cliente desconectado o error: no dejar renderizados huérfanos
+        for future in in_flight:
+            future.cancel()
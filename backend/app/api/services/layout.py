@@ -0,0 +1,286 @@
+"""
+Maquetación compartida de celdas Braille en líneas y páginas.
+
+Calcula una sola vez los saltos de línea y de página de una secuencia de
+celdas empaquetadas (un byte por celda, ver PackedTranslator) y la expone
+a todos los consumidores:
+
+    - BraillePDFGenerator: una página PDF por página de maquetación
+    - BrailleImageGenerator: PNG de una página concreta o TIFF multipágina
+    - BrailleBRFGenerator / BraillePEFGenerator: mismas líneas y páginas
+    - POST /generation/layout: índice para el paginador del frontend
+
+Reglas:
+    - Sin guiones: las líneas se cortan en el último espacio (celda 0) que
+      cabe, que se descarta; una palabra más larga que la línea se corta
+    - Los saltos de línea del texto son saltos de párrafo (from_text)
+    - La primera página puede tener menos líneas (cabecera del PDF)
+
+Índice:
+    El documento se recorre una sola vez y cada línea se guarda como dos
+    desplazamientos (inicio, fin) sobre el buffer de celdas, en arrays
+    compactos de enteros de 32 bits (8 bytes por línea). Las páginas se
+    obtienen por aritmética sobre el número de línea, así que acceder a una
+    página es O(líneas de la página).
+
+Caché:
+    get_layout() conserva las últimas LAYOUT_CACHE_SIZE maquetaciones por
+    (hash del texto, geometría): el paginador, las páginas PNG sucesivas y
+    las descargas BRF/PEF del mismo documento no vuelven a maquetarlo.
+
+Ejemplo:
+    >>> layout = BrailleLayout.from_text("Salida de emergencia", 8, 2)
+    >>> [layout.line_span(i) for i in range(layout.line_count)]
+    [(0, 7), (8, 10), (11, 19), (19, 21)]
+    >>> layout.page_count
+    2
+"""
+
+import hashlib
+import threading
+from array import array
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from app.config import settings
+from app.metrics import record_cache
+from .translator import PackedTranslator
+
+
+# Separador de párrafos dentro del buffer de celdas (fuera del rango 0-63
+# de las celdas, nunca forma parte de una línea)
+PARAGRAPH_BREAK = 0xFF
+
+
+class PageGeometry(NamedTuple):
+    """Dimensiones de página en celdas y líneas (clave de caché)."""
+
+    cells_per_line: int
+    lines_per_page: int
+    first_page_lines: int
+
+
+def iter_line_spans(cells: bytes, width: int, start: int = 0,
+                    end: Optional[int] = None) -> Iterator[Tuple[int, int]]:
+    """
+    Recorre los cortes de línea de `cells[start:end]` sin copiar celdas.
+
+    Args:
+        cells (bytes): Celdas empaquetadas
+        width (int): Celdas por línea
+        start, end (int): Tramo a maquetar (Default: todo el buffer)
+
+    Yields:
+        Tuple[int, int]: Rango [inicio, fin) de cada línea en `cells`
+    """
+    if width < 1:
+        raise ValueError("width debe ser positivo")
+    end = len(cells) if end is None else end
+    first = start
+    while end - start > width:
+        cut = cells.rfind(b"\x00", start, start + width + 1)
+        if cut <= start:
+            yield start, start + width
+            start += width
+        else:
+            yield start, cut
+            start = cut + 1
+    if start < end or end == first:
+        yield start, end
+
+
+def paragraph_cells(text: str) -> bytes:
+    """
+    Traduce un texto conservando sus párrafos como separadores.
+
+    Cada salto de línea se traduce como PARAGRAPH_BREAK (y reinicia el
+    modo numérico), en una sola pasada sobre el texto. Un salto de línea
+    final no abre otro párrafo.
+    """
+    cells = PackedTranslator(line_break=PARAGRAPH_BREAK).feed(text)
+    return cells[:-1] if text.endswith("\n") else cells
+
+
+class BrailleLayout:
+    """
+    Índice de líneas y páginas de un documento Braille.
+
+    Attributes:
+        cells (bytes): Celdas empaquetadas (con separadores de párrafo)
+        geometry (PageGeometry): Dimensiones de página
+        line_starts (array): Desplazamiento inicial de cada línea en `cells`
+        line_ends (array): Desplazamiento final (exclusivo) de cada línea
+        page_count (int): Número de páginas (al menos 1)
+    """
+
+    def __init__(self, cells: bytes, cells_per_line: int, lines_per_page: int,
+                 first_page_lines: Optional[int] = None):
+        """
+        Args:
+            cells (bytes): Celdas empaquetadas; PARAGRAPH_BREAK fuerza un
+                salto de línea
+            cells_per_line (int): Celdas por línea
+            lines_per_page (int): Líneas por página
+            first_page_lines (int, optional): Líneas de la primera página
+                (Default: lines_per_page)
+
+        Raises:
+            ValueError: Si alguna dimensión no es positiva
+        """
+        first_page_lines = first_page_lines or lines_per_page
+        if cells_per_line < 1 or lines_per_page < 1 or first_page_lines < 1:
+            raise ValueError("Las dimensiones de página deben ser positivas")
+        self.cells = cells
+        self.geometry = PageGeometry(cells_per_line, lines_per_page, first_page_lines)
+        self.line_starts = array("I")
+        self.line_ends = array("I")
+
+        # Una única pasada lineal: párrafo a párrafo, línea a línea
+        paragraph_start = 0
+        while True:
+            paragraph_end = cells.find(PARAGRAPH_BREAK, paragraph_start)
+            if paragraph_end < 0:
+                paragraph_end = len(cells)
+            for start, end in iter_line_spans(cells, cells_per_line, paragraph_start, paragraph_end):
+                self.line_starts.append(start)
+                self.line_ends.append(end)
+            if paragraph_end == len(cells):
+                break
+            paragraph_start = paragraph_end + 1
+
+        rest = max(self.line_count - first_page_lines, 0)
+        self.page_count = 1 + -(-rest // lines_per_page)
+
+    @classmethod
+    def from_text(cls, text: str, cells_per_line: int, lines_per_page: int,
+                  first_page_lines: Optional[int] = None) -> "BrailleLayout":
+        """Traduce el texto (respetando párrafos) y maqueta sus celdas."""
+        return cls(paragraph_cells(text), cells_per_line, lines_per_page, first_page_lines)
+
+    @classmethod
+    def from_chunks(cls, chunks: Iterable[str], cells_per_line: int, lines_per_page: int,
+                    first_page_lines: Optional[int] = None) -> "BrailleLayout":
+        """
+        Como from_text, pero traduce el texto por fragmentos (ej. un archivo
+        leído con ingest.iter_mapped_text) sin reunirlo antes en un str.
+        """
+        translator = PackedTranslator(line_break=PARAGRAPH_BREAK)
+        cells = bytearray()
+        last = ""
+        for chunk in chunks:
+            if chunk:
+                cells += translator.feed(chunk)
+                last = chunk
+        if last.endswith("\n"):
+            del cells[-1]
+        return cls(bytes(cells), cells_per_line, lines_per_page, first_page_lines)
+
+    @property
+    def cells_per_line(self) -> int:
+        return self.geometry.cells_per_line
+
+    @property
+    def lines_per_page(self) -> int:
+        return self.geometry.lines_per_page
+
+    @property
+    def first_page_lines(self) -> int:
+        return self.geometry.first_page_lines
+
+    @property
+    def line_count(self) -> int:
+        return len(self.line_starts)
+
+    def line_span(self, index: int) -> Tuple[int, int]:
+        """Rango [inicio, fin) de una línea en `cells`."""
+        return self.line_starts[index], self.line_ends[index]
+
+    def page_lines(self, number: int) -> range:
+        """
+        Índices de las líneas de una página.
+
+        Args:
+            number (int): Número de página (desde 1)
+
+        Raises:
+            IndexError: Si la página no existe
+        """
+        if not 1 <= number <= self.page_count:
+            raise IndexError(f"Página {number} fuera de rango (1-{self.page_count})")
+        first = self.first_page_lines
+        if number == 1:
+            return range(0, min(first, self.line_count))
+        start = first + (number - 2) * self.lines_per_page
+        return range(start, min(start + self.lines_per_page, self.line_count))
+
+    def page(self, number: int) -> List[bytes]:
+        """Celdas de cada línea de una página (desde 1)."""
+        cells, starts, ends = self.cells, self.line_starts, self.line_ends
+        return [cells[starts[i]:ends[i]] for i in self.page_lines(number)]
+
+    def iter_pages(self) -> Iterator[List[bytes]]:
+        """Recorre todas las páginas en orden."""
+        for number in range(1, self.page_count + 1):
+            yield self.page(number)
+
+    def to_index(self) -> Dict[str, Any]:
+        """
+        Índice serializable para el paginador del frontend.
+
+        Cada página indica su primera línea, su número de líneas y el
+        tramo [start, end) de celdas que cubre.
+        """
+        pages = []
+        for number in range(1, self.page_count + 1):
+            lines = self.page_lines(number)
+            if len(lines):
+                start, end = self.line_starts[lines[0]], self.line_ends[lines[-1]]
+            else:
+                start = end = 0
+            pages.append({
+                "number": number,
+                "first_line": lines.start,
+                "lines": len(lines),
+                "start": start,
+                "end": end,
+            })
+        return {
+            "cells_per_line": self.cells_per_line,
+            "lines_per_page": self.lines_per_page,
+            "first_page_lines": self.first_page_lines,
+            "line_count": self.line_count,
+            "page_count": self.page_count,
+            "pages": pages,
+        }
+
+
+_layout_cache: "OrderedDict[Tuple[bytes, PageGeometry], BrailleLayout]" = OrderedDict()
+_layout_lock = threading.Lock()
+
+
+def get_layout(text: str, cells_per_line: int, lines_per_page: int,
+               first_page_lines: Optional[int] = None) -> BrailleLayout:
+    """
+    Devuelve la maquetación de un texto, reutilizando la de la caché.
+
+    La clave es (hash BLAKE2 del texto, geometría); la caché es LRU con
+    LAYOUT_CACHE_SIZE entradas (0 la desactiva).
+
+    Returns:
+        BrailleLayout: Maquetación (compartida, no debe modificarse)
+    """
+    geometry = PageGeometry(cells_per_line, lines_per_page, first_page_lines or lines_per_page)
+    key = (hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest(), geometry)
+    with _layout_lock:
+        layout = _layout_cache.get(key)
+        if layout is not None:
+            _layout_cache.move_to_end(key)
+    record_cache("layout", layout is not None)
+    if layout is None:
+        layout = BrailleLayout.from_text(text, *geometry)
+        if settings.layout_cache_size > 0:
+            with _layout_lock:
+                _layout_cache[key] = layout
+                while len(_layout_cache) > settings.layout_cache_size:
+                    _layout_cache.popitem(last=False)
+    return layout
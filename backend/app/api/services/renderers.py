@@ -0,0 +1,128 @@
+"""
+Registro de backends de renderizado.
+
+Asocia cada formato de salida (png, pdf, ...) con la función que lo
+genera, su media type y su extensión. La función se resuelve a partir de
+una ruta "modulo:atributo" en el primer uso, de modo que ni el módulo del
+backend ni sus dependencias (Pillow, ReportLab, NumPy) se importan al arrancar.
+
+Un worker de solo traducción (GENERATION_ENABLED=false) nunca llega a
+cargar ningún backend.
+
+Uso:
+    from app.api.services.renderers import get_renderer
+
+    renderer = get_renderer("png")
+    buffer = renderer("Hola", mirror=False)
+    renderer.media_type   # "image/png"
+"""
+
+import importlib
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+from app.exceptions import GenerationError
+
+
+class Renderer:
+    """
+    Backend de renderizado registrado, cargado de forma perezosa.
+
+    Attributes:
+        name (str): Nombre del formato (ej. "png")
+        target (str): Ruta "modulo:funcion" de la implementación
+        media_type (str): Content-Type de la salida
+        extension (str): Extensión de archivo sugerida
+        version (str): Versión de la salida; se incrementa cuando el mismo
+            texto pasa a producir bytes distintos (invalida los ETag)
+    """
+
+    def __init__(self, name: str, target: str, media_type: str, extension: str,
+                 version: str = "1"):
+        self.name = name
+        self.target = target
+        self.media_type = media_type
+        self.extension = extension
+        self.version = version
+        self._func: Optional[Callable[..., Any]] = None
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        """Indica si la implementación ya fue importada."""
+        return self._func is not None
+
+    def load(self) -> Callable[..., Any]:
+        """Importa (una sola vez) y devuelve la función de renderizado."""
+        if self._func is None:
+            with self._lock:
+                if self._func is None:
+                    module_name, attr = self.target.split(":")
+                    self._func = getattr(importlib.import_module(module_name), attr)
+        return self._func
+
+    def __call__(self, *args, **kwargs) -> Any:
+        return self.load()(*args, **kwargs)
+
+    def render_bytes(self, *args, **kwargs) -> bytes:
+        """
+        Renderiza y devuelve el contenido como bytes inmutables.
+
+        BytesIO.getvalue() entrega el buffer interno sin copiarlo (el
+        BytesIO se descarta a continuación), así que el resultado es la
+        única copia del contenido codificado.
+        """
+        return self(*args, **kwargs).getvalue()
+
+    def __repr__(self) -> str:
+        return f"Renderer({self.name!r}, {self.target!r})"
+
+
+_renderers: Dict[str, Renderer] = {}
+
+
+def register_renderer(name: str, target: str, media_type: str, extension: str,
+                      version: str = "1") -> Renderer:
+    """
+    Registra (o reemplaza) el backend de un formato.
+
+    Args:
+        name (str): Nombre del formato
+        target (str): Ruta "modulo:funcion" de la implementación
+        media_type (str): Content-Type de la salida
+        extension (str): Extensión de archivo sin punto
+        version (str): Versión de la salida (ver Renderer)
+
+    Returns:
+        Renderer: Entrada registrada
+    """
+    renderer = Renderer(name, target, media_type, extension, version)
+    _renderers[name] = renderer
+    return renderer
+
+
+def get_renderer(name: str) -> Renderer:
+    """
+    Devuelve el backend registrado para un formato.
+
+    Raises:
+        GenerationError: Si el formato no está registrado
+    """
+    renderer = _renderers.get(name)
+    if renderer is None:
+        raise GenerationError(f"Formato no soportado: {name}", code="UNSUPPORTED_FORMAT")
+    return renderer
+
+
+def available_renderers() -> List[str]:
+    """Formatos registrados, en orden de registro."""
+    return list(_renderers)
+
+
+register_renderer("png", "app.api.services.generator:generate_braille_image", "image/png", "png")
+register_renderer("pdf", "app.api.services.generator:generate_braille_pdf", "application/pdf", "pdf")
+register_renderer("tiff", "app.api.services.generator:generate_braille_tiff", "image/tiff", "tiff")
+register_renderer("svg", "app.api.services.svg:generate_braille_svg", "image/svg+xml", "svg")
+register_renderer("stl", "app.api.services.tactile:generate_braille_stl", "model/stl", "stl")
+register_renderer("brf", "app.api.services.embosser:generate_braille_brf", "text/plain; charset=us-ascii", "brf")
+register_renderer("pef", "app.api.services.embosser:generate_braille_pef", "application/x-pef+xml", "pef")
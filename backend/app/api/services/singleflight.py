@@ -0,0 +1,81 @@
+"""
+Coalescencia de peticiones idénticas concurrentes (single-flight).
+
+Cuando muchos clientes piden a la vez la misma imagen (ej. al cargar una
+página de señalética), todas las peticiones con los mismos parámetros
+esperan un único renderizado en curso y comparten sus bytes, en lugar de
+renderizar N veces lo mismo.
+
+Características:
+    - Solo coalesce peticiones simultáneas: no es una caché, la entrada se
+      descarta en cuanto termina el renderizado
+    - El renderizado corre en su propia tarea: si el cliente que lo inició
+      se desconecta, los demás siguen esperando el mismo resultado
+    - Los errores se propagan a todas las peticiones coalescidas
+    - Ámbito por proceso (cada worker del servidor tiene sus vuelos)
+    - Métrica braille_coalesced_requests_total{endpoint}
+
+Uso:
+    flight = SingleFlight("image")
+    data = await flight.do(("Hola", False), lambda: render_pool.run(...))
+"""
+
+import asyncio
+from typing import Awaitable, Callable, Dict, Hashable, TypeVar
+
+from app.metrics import COALESCED_REQUESTS
+
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    Agrupa llamadas concurrentes con la misma clave en una sola ejecución.
+
+    Debe usarse desde un único event loop.
+
+    Attributes:
+        name (str): Nombre del grupo (etiqueta `endpoint` de la métrica)
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._flights: Dict[Hashable, asyncio.Future] = {}
+        self._coalesced = COALESCED_REQUESTS.labels(name)
+
+    @property
+    def in_flight(self) -> int:
+        """Número de claves con un renderizado en curso."""
+        return len(self._flights)
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[T]]) -> T:
+        """
+        Ejecuta `func()` una sola vez por clave entre llamadas concurrentes.
+
+        Args:
+            key: Parámetros normalizados de la petición (hashable)
+            func: Fábrica de la corrutina que produce el resultado
+
+        Returns:
+            El resultado compartido; debe ser inmutable (ej. bytes)
+
+        Raises:
+            La excepción lanzada por `func`, en todas las llamadas coalescidas
+        """
+        future = self._flights.get(key)
+        if future is None:
+            future = asyncio.ensure_future(func())
+            self._flights[key] = future
+            future.add_done_callback(lambda done: self._finish(key, done))
+        else:
+            self._coalesced.inc()
+        # shield: cancelar a un solicitante no cancela el vuelo compartido
+        return await asyncio.shield(future)
+
+    def _finish(self, key: Hashable, future: asyncio.Future) -> None:
+        if self._flights.get(key) is future:
+            del self._flights[key]
+        if not future.cancelled():
+            # Marca la excepción como recuperada aunque nadie la espere ya
+            future.exception()
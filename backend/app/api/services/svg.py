@@ -0,0 +1,176 @@
+"""
+Generación de señalética Braille en SVG (vectorial).
+
+A diferencia del PNG, el SVG escala sin pérdida y lo aceptan directamente
+las cortadoras láser y el software de rotulación.
+
+Estructura del documento:
+    - Cada celda distinta se define una sola vez como <symbol> (máximo 64)
+    - Cada celda del texto es un <use> de una línea que referencia su
+      símbolo, así que el tamaño crece con un elemento corto por celda
+
+Unidades (según el perfil de geometría, ver geometry.py):
+    - "px": misma geometría que el PNG
+    - "mm": medidas físicas del PDF (en "standard": puntos a 5 mm, radio
+      2 mm, paso de celda 15 mm), con width/height en milímetros
+
+Ejemplo:
+    >>> gen = BrailleSVGGenerator(units="mm")
+    >>> svg = "".join(gen.iter_svg("Salida"))
+"""
+
+from io import BytesIO
+from typing import Iterator, NamedTuple, Optional, Tuple
+
+from app.metrics import stage_timer
+from app.utils import xml_escape
+from .generator import mirror_mask
+from .geometry import GeometryProfile, get_profile
+from .translator import text_to_packed
+
+
+class SVGGeometry(NamedTuple):
+    """Medidas de una celda en las unidades del documento."""
+
+    offsets: Tuple[Tuple[float, float], ...]  # (x, y) de los puntos 1-6
+    dot_radius: float
+    cell_width: float
+    cell_height: float
+    pitch: float  # Avance horizontal entre celdas
+    margin: float
+
+
+# Margen del documento en milímetros
+MM_MARGIN = 10
+
+
+def svg_geometry(profile: GeometryProfile, units: str) -> SVGGeometry:
+    """
+    Geometría SVG de un perfil en píxeles o en milímetros.
+
+    Raises:
+        ValueError: Si las unidades no son "px" ni "mm"
+    """
+    if units == "px":
+        # Igual que el PNG: tabla de posiciones en píxeles del perfil
+        return SVGGeometry(
+            offsets=profile.pixel_offsets, dot_radius=profile.dot_radius,
+            cell_width=profile.cell_width, cell_height=profile.cell_height,
+            pitch=profile.cell_width + profile.spacing, margin=profile.margin,
+        )
+    if units == "mm":
+        # Igual que el PDF: medidas físicas, con el punto 1 a un radio del borde
+        r, step = profile.dot_radius_mm, profile.dot_spacing_mm
+        return SVGGeometry(
+            offsets=tuple((r + (dot // 3) * step, r + (dot % 3) * step) for dot in range(6)),
+            dot_radius=r, cell_width=2 * r + step, cell_height=2 * r + 2 * step,
+            pitch=profile.cell_pitch_mm, margin=MM_MARGIN,
+        )
+    raise ValueError(f"Unidades no soportadas: {units}")
+
+
+# Número de <use> agrupados en cada fragmento emitido
+USES_PER_CHUNK = 256
+
+
+def _fmt(value: float) -> str:
+    return f"{value:g}"
+
+
+class BrailleSVGGenerator:
+    """
+    Generador de SVG con reutilización de símbolos por celda.
+
+    Ejemplo:
+        >>> gen = BrailleSVGGenerator()
+        >>> buffer = gen.generate_svg("Baño", mirror=True)
+    """
+
+    def __init__(self, units: str = "px", show_empty: bool = True, profile: Optional[str] = None):
+        """
+        Args:
+            units (str): "px" (geometría del PNG) o "mm" (geometría del PDF)
+            show_empty (bool): Dibujar el contorno de los puntos inactivos
+                (desactivar para corte láser, donde solo importan los puntos)
+            profile (str): Perfil de geometría (Default: DEFAULT_GEOMETRY_PROFILE)
+
+        Raises:
+            ValueError: Si las unidades no son "px" ni "mm"
+        """
+        self.units = units
+        self.geometry = svg_geometry(get_profile(profile), units)
+        self.show_empty = show_empty
+
+    def _symbol(self, mask: int) -> str:
+        g = self.geometry
+        circles = []
+        for dot, (cx, cy) in enumerate(g.offsets):
+            active = mask & (1 << dot)
+            if not active and not self.show_empty:
+                continue
+            circles.append(
+                f'<circle cx="{_fmt(cx)}" cy="{_fmt(cy)}" r="{_fmt(g.dot_radius)}"'
+                + ('/>' if active else ' class="e"/>')
+            )
+        return f'<symbol id="c{mask}" overflow="visible">{"".join(circles)}</symbol>\n'
+
+    def iter_svg(self, text: str, mirror: bool = False) -> Iterator[str]:
+        """
+        Produce el documento SVG en fragmentos de texto.
+
+        Args:
+            text (str): Texto en español a convertir
+            mirror (bool): Modo espejo (celdas invertidas y orden inverso,
+                como en el PDF)
+
+        Yields:
+            str: Cabecera con <defs>, grupos de <use> y cierre
+        """
+        g = self.geometry
+        cells = text_to_packed(text)
+        if mirror:
+            cells = bytes(mirror_mask(mask) for mask in reversed(cells))
+
+        width = 2 * g.margin + max(len(cells) * g.pitch - (g.pitch - g.cell_width), 0)
+        height = 2 * g.margin + g.cell_height
+        size = "mm" if self.units == "mm" else ""
+        yield (
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            '<svg xmlns="http://www.w3.org/2000/svg" '
+            'xmlns:xlink="http://www.w3.org/1999/xlink" '
+            f'width="{_fmt(width)}{size}" height="{_fmt(height)}{size}" '
+            f'viewBox="0 0 {_fmt(width)} {_fmt(height)}">\n'
+            f'<title>{xml_escape(text)}</title>\n'
+            '<style>circle{fill:#000}.e{fill:#fff;stroke:#808080}</style>\n'
+            '<defs>\n'
+            + "".join(self._symbol(mask) for mask in sorted(set(cells)))
+            + '</defs>\n'
+            f'<g transform="translate({_fmt(g.margin)} {_fmt(g.margin)})">\n'
+        )
+        for start in range(0, len(cells), USES_PER_CHUNK):
+            yield "".join(
+                f'<use xlink:href="#c{mask}" x="{_fmt(i * g.pitch)}"/>\n'
+                for i, mask in enumerate(cells[start:start + USES_PER_CHUNK], start)
+            )
+        yield '</g>\n</svg>\n'
+
+    def generate_svg(self, text: str, mirror: bool = False) -> BytesIO:
+        """
+        Genera el SVG completo en memoria.
+
+        Returns:
+            BytesIO: Documento SVG (UTF-8) posicionado al inicio
+        """
+        buffer = BytesIO()
+        with stage_timer("rendering"):
+            for chunk in self.iter_svg(text, mirror=mirror):
+                buffer.write(chunk.encode("utf-8"))
+        buffer.seek(0)
+        return buffer
+
+
+# Función de conveniencia (registrada en renderers.py)
+def generate_braille_svg(text: str, mirror: bool = False, units: str = "px",
+                         show_empty: bool = True, profile: Optional[str] = None) -> BytesIO:
+    """Genera un SVG con la geometría indicada."""
+    return BrailleSVGGenerator(units, show_empty, profile).generate_svg(text, mirror=mirror)
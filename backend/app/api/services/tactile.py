@@ -0,0 +1,223 @@
+"""
+Placas táctiles imprimibles en 3D (STL binario).
+
+Convierte el texto en una malla con una placa base y puntos en cúpula a
+las dimensiones estándar de la señalética Braille, lista para un
+laminador (slicer) de impresión 3D.
+
+Construcción de la malla (NumPy, sin bucles por punto):
+    1. La cúpula de un punto se triangula una sola vez por proceso
+       (casquete esférico cerrado por un disco inferior)
+    2. Se calculan los centros de todos los puntos activos a partir de las
+       máscaras de las celdas (desplazamientos de bits vectorizados)
+    3. Los vértices finales son la suma por difusión (broadcasting) de la
+       cúpula y los centros; las normales no cambian con la traslación
+    4. Los triángulos se escriben en un array estructurado con el formato
+       exacto de un registro STL (50 bytes) y se vuelcan sin copias
+       intermedias
+
+Cada punto es un sólido cerrado apoyado sobre la placa; los laminadores
+unen los sólidos superpuestos al imprimir.
+
+Ejemplo:
+    >>> buffer = generate_braille_stl("Aula 12", cells_per_line=20)
+    >>> open("placa.stl", "wb").write(buffer.getvalue())
+"""
+
+import math
+import struct
+import sys
+import threading
+from io import BytesIO
+from typing import TYPE_CHECKING, Optional
+
+# NumPy solo se importa al generar una placa (ver renderers.py)
+if TYPE_CHECKING:
+    import numpy as np
+
+from app.metrics import stage_timer
+from .embosser import iter_braille_pages
+
+
+# Dimensiones en milímetros (señalética: ADA 703.3 / Marburg medium)
+DOT_BASE_DIAMETER = 1.5  # Diámetro de la base del punto
+DOT_HEIGHT = 0.7  # Altura del punto sobre la placa
+DOT_SPACING = 2.5  # Distancia entre centros de puntos de una celda
+CELL_PITCH = 6.2  # Distancia entre celdas consecutivas
+LINE_PITCH = 10.0  # Distancia entre líneas
+PLATE_THICKNESS = 2.0  # Grosor de la placa base
+PLATE_MARGIN = 5.0  # Margen entre los puntos y el borde de la placa
+
+# Resolución de la cúpula: segmentos alrededor y anillos hasta la cima
+DOME_SEGMENTS = 12
+DOME_RINGS = 3
+
+STL_HEADER = b"Senaletica Braille - placa tactil".ljust(80, b" ")
+
+_dome_cache = {}
+_dome_lock = threading.Lock()
+
+
+def _stl_dtype():
+    import numpy as np
+    return np.dtype([
+        ("normal", "<f4", (3,)),
+        ("vertices", "<f4", (3, 3)),
+        ("attr", "<u2"),
+    ])
+
+
+def _normals(triangles: "np.ndarray") -> "np.ndarray":
+    """Normales unitarias de un array de triángulos (T, 3, 3)."""
+    import numpy as np
+    normals = np.cross(triangles[:, 1] - triangles[:, 0], triangles[:, 2] - triangles[:, 0])
+    lengths = np.linalg.norm(normals, axis=1, keepdims=True)
+    return normals / np.where(lengths == 0, 1, lengths)
+
+
+def dot_mesh(base_radius: float = DOT_BASE_DIAMETER / 2, height: float = DOT_HEIGHT,
+             segments: int = DOME_SEGMENTS, rings: int = DOME_RINGS) -> "np.ndarray":
+    """
+    Devuelve la malla de un punto centrado en el origen (z=0 en la base).
+
+    La malla se calcula una vez por geometría y se comparte (solo lectura).
+
+    Returns:
+        np.ndarray: Triángulos (T, 3, 3) en float32, orientados hacia fuera
+    """
+    key = (base_radius, height, segments, rings)
+    mesh = _dome_cache.get(key)
+    if mesh is not None:
+        return mesh
+    import numpy as np
+
+    with _dome_lock:
+        mesh = _dome_cache.get(key)
+        if mesh is not None:
+            return mesh
+        # Casquete esférico de radio R cuyo centro queda bajo la placa
+        sphere = (base_radius ** 2 + height ** 2) / (2 * height)
+        theta = np.linspace(math.asin(base_radius / sphere), 0, rings + 1)
+        phi = np.linspace(0, 2 * math.pi, segments, endpoint=False)
+        ring_r = sphere * np.sin(theta)[:, None]
+        ring_z = sphere * np.cos(theta)[:, None] - (sphere - height)
+        rings_xyz = np.stack([
+            ring_r * np.cos(phi),
+            ring_r * np.sin(phi),
+            np.broadcast_to(ring_z, (rings + 1, segments)),
+        ], axis=-1)  # (rings + 1, segments, 3); el último anillo es la cima
+        nxt = np.roll(np.arange(segments), -1)
+
+        lower, upper = rings_xyz[:-2], rings_xyz[1:-1]
+        quads_a = np.stack([lower, lower[:, nxt], upper], axis=2)
+        quads_b = np.stack([upper, lower[:, nxt], upper[:, nxt]], axis=2)
+        apex = np.broadcast_to(rings_xyz[-1, 0], (segments, 3))
+        top = np.stack([rings_xyz[-2], rings_xyz[-2, nxt], apex], axis=1)
+        center = np.zeros((segments, 3))
+        bottom = np.stack([rings_xyz[0, nxt], rings_xyz[0], center], axis=1)
+
+        mesh = np.concatenate([
+            quads_a.reshape(-1, 3, 3), quads_b.reshape(-1, 3, 3), top, bottom
+        ]).astype(np.float32)
+        mesh.setflags(write=False)
+        _dome_cache[key] = mesh
+    return mesh
+
+
+def _box(width: float, depth: float, height: float) -> "np.ndarray":
+    """Triángulos (12, 3, 3) de un prisma rectangular desde el origen."""
+    import numpy as np
+    c = np.array([[x, y, z] for z in (0, height) for y in (0, depth) for x in (0, width)])
+    faces = [
+        (0, 2, 3, 1),  # inferior
+        (4, 5, 7, 6),  # superior
+        (0, 1, 5, 4),  # frontal
+        (2, 6, 7, 3),  # trasera
+        (0, 4, 6, 2),  # izquierda
+        (1, 3, 7, 5),  # derecha
+    ]
+    tris = [(a, b, c_) for a, b, c_, d in faces] + [(a, c_, d) for a, b, c_, d in faces]
+    return c[np.array(tris)].astype(np.float32)
+
+
+class BrailleSTLGenerator:
+    """
+    Generador de placas táctiles en STL binario.
+
+    Ejemplo:
+        >>> gen = BrailleSTLGenerator(cells_per_line=20)
+        >>> buffer = gen.generate_stl("Sala de reuniones")
+    """
+
+    def __init__(self, cells_per_line: Optional[int] = None):
+        """
+        Args:
+            cells_per_line (int, optional): Celdas por línea; sin valor,
+                cada línea del texto ocupa una sola línea de la placa
+        """
+        self.cells_per_line = cells_per_line or sys.maxsize
+
+    def build_mesh(self, text: str) -> "np.ndarray":
+        """
+        Construye los triángulos de la placa y sus puntos.
+
+        Returns:
+            np.ndarray: Triángulos (T, 3, 3) en milímetros, float32
+        """
+        import numpy as np
+
+        lines = [line for page in iter_braille_pages(text, self.cells_per_line, sys.maxsize)
+                 for line in page]
+        masks = np.frombuffer(b"".join(lines), dtype=np.uint8)
+        lengths = np.array([len(line) for line in lines], dtype=np.intp)
+        line_index = np.repeat(np.arange(len(lines)), lengths)
+        starts = np.cumsum(lengths) - lengths
+        column = np.arange(len(masks)) - np.repeat(starts, lengths)
+
+        # Puntos activos: (celda, punto) con el bit correspondiente a 1
+        cell, dot = np.nonzero((masks[:, None] >> np.arange(6)) & 1)
+
+        radius = DOT_BASE_DIAMETER / 2
+        max_cells = int(lengths.max(initial=0))
+        width = 2 * (PLATE_MARGIN + radius) + max(max_cells - 1, 0) * CELL_PITCH + DOT_SPACING
+        depth = 2 * (PLATE_MARGIN + radius) + max(len(lines) - 1, 0) * LINE_PITCH + 2 * DOT_SPACING
+
+        centers = np.empty((len(cell), 3), dtype=np.float32)
+        centers[:, 0] = PLATE_MARGIN + radius + column[cell] * CELL_PITCH + (dot // 3) * DOT_SPACING
+        centers[:, 1] = depth - PLATE_MARGIN - radius - line_index[cell] * LINE_PITCH - (dot % 3) * DOT_SPACING
+        centers[:, 2] = PLATE_THICKNESS
+
+        dome = dot_mesh()
+        dots = (dome[None, :, :, :] + centers[:, None, None, :]).reshape(-1, 3, 3)
+        return np.concatenate([_box(width, depth, PLATE_THICKNESS), dots])
+
+    def generate_stl(self, text: str) -> BytesIO:
+        """
+        Genera la placa en formato STL binario.
+
+        Returns:
+            BytesIO: Archivo STL posicionado al inicio
+        """
+        import numpy as np
+
+        with stage_timer("rendering"):
+            triangles = self.build_mesh(text)
+            records = np.zeros(len(triangles), dtype=_stl_dtype())
+            records["vertices"] = triangles
+            # Normales: las de la cúpula se repiten para cada punto
+            records["normal"][:12] = _normals(triangles[:12])
+            dome_normals = _normals(dot_mesh())
+            records["normal"][12:] = np.tile(dome_normals, ((len(triangles) - 12) // len(dome_normals), 1))
+
+            buffer = BytesIO()
+            buffer.write(STL_HEADER)
+            buffer.write(struct.pack("<I", len(records)))
+            buffer.write(memoryview(records).cast("B"))
+        buffer.seek(0)
+        return buffer
+
+
+# Función de conveniencia (registrada en renderers.py)
+def generate_braille_stl(text: str, cells_per_line: Optional[int] = None) -> BytesIO:
+    """Genera una placa táctil STL."""
+    return BrailleSTLGenerator(cells_per_line).generate_stl(text)
@@ -0,0 +1,112 @@
+"""
+Pool de workers para trabajo de renderizado intensivo en CPU.
+
+Los endpoints de generación son asíncronos, pero Pillow y ReportLab son
+síncronos: ejecutarlos directamente bloquea el event loop y serializa
+todas las peticiones del proceso. Este módulo delega ese trabajo a un
+ThreadPoolExecutor acotado y expone su profundidad de cola como métrica.
+
+Características:
+    - Executor creado de forma perezosa (no consume hilos si no se usa)
+    - Propaga contextvars al hilo worker (perfil de la petición incluido)
+    - Gauges braille_worker_queue_depth / braille_worker_active
+
+Uso:
+    from app.api.services.workers import render_pool
+
+    buffer = await render_pool.run(generate_braille_image, "Hola")
+"""
+
+import asyncio
+import contextvars
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from app.config import settings
+from app.metrics import WORKER_QUEUE_DEPTH, WORKER_ACTIVE
+from app.profiling import profiled_call
+
+
+class WorkerPool:
+    """
+    Executor acotado con contadores de tareas en espera y en ejecución.
+
+    Attributes:
+        name (str): Nombre del pool (etiqueta `pool` de las métricas)
+        max_workers (int): Número máximo de hilos
+    """
+
+    def __init__(self, name: str, max_workers: int):
+        self.name = name
+        self.max_workers = max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._active = 0
+
+        WORKER_QUEUE_DEPTH.labels(name).set_function(lambda: self._pending)
+        WORKER_ACTIVE.labels(name).set_function(lambda: self._active)
+
+    @property
+    def queue_depth(self) -> int:
+        """Tareas enviadas que aún esperan un hilo libre."""
+        return self._pending
+
+    @property
+    def active(self) -> int:
+        """Tareas ejecutándose en este momento."""
+        return self._active
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers,
+                        thread_name_prefix=f"{self.name}-worker",
+                    )
+        return self._executor
+
+    async def run(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Ejecuta `func(*args, **kwargs)` en el pool y espera el resultado.
+
+        Args:
+            func: Función síncrona a ejecutar
+            *args, **kwargs: Argumentos para `func`
+
+        Returns:
+            El valor devuelto por `func`
+
+        Raises:
+            Cualquier excepción lanzada por `func`
+        """
+        loop = asyncio.get_running_loop()
+        context = contextvars.copy_context()
+
+        with self._lock:
+            self._pending += 1
+
+        def call():
+            with self._lock:
+                self._pending -= 1
+                self._active += 1
+            try:
+                return context.run(profiled_call, func, *args, **kwargs)
+            finally:
+                with self._lock:
+                    self._active -= 1
+
+        return await loop.run_in_executor(self._get_executor(), call)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Detiene el executor (se recrea en el próximo uso)."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+
+# Pool global para renderizado de imágenes y PDFs
+render_pool = WorkerPool("render", settings.render_workers)
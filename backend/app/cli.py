@@ -0,0 +1,394 @@
+"""
+Transcriptor Braille por lotes desde la línea de comandos.
+
+Transcribe documentos (txt, Markdown, DOCX o EPUB, ver ingest.py) sin
+pasar por la API:
+
+    - txt: Braille Unicode (U+2800-U+283F) en `<nombre>.braille.txt`,
+      respetando los saltos de línea
+    - brf: ASCII Braille para impresoras (ver embosser.BrailleBRFGenerator)
+    - png: una imagen por página (`<nombre>.001.png`, `<nombre>.002.png`, ...)
+    - pdf: documento paginado (ver generator.BraillePDFGenerator)
+
+Los .txt se leen mapeados en memoria (ingest.iter_mapped_text, bloques
+de MAPPED_BLOCK_SIZE bytes), los demás documentos con ingest.DocumentReader
+y stdin por fragmentos de CHUNK_SIZE caracteres. txt y brf se traducen en
+streaming (memoria constante); png necesita las celdas de todo el
+documento y pdf el texto completo. Los archivos
+se reparten entre `--jobs` procesos (ProcessPoolExecutor): la traducción
+es CPU pura y el GIL impide paralelizarla con hilos.
+
+Las entradas pueden ser archivos, directorios (se recorren buscando
+documentos por extensión), patrones glob (`libros/**/*.epub`) o `-` para
+leer texto de stdin y escribir en stdout. Directorios y patrones omiten las salidas
+*.braille.txt de ejecuciones anteriores. El progreso y el resumen final
+(MB/s sobre el tamaño de entrada) se escriben en stderr.
+
+Uso (desde backend/):
+    $ python -m app.cli libro.txt
+    $ python -m app.cli corpus/ --format brf --output-dir salida --jobs 8
+    $ cat aviso.txt | python -m app.cli - > aviso-braille.txt
+"""
+
+import argparse
+import glob
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import IO, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, TextIO
+
+from app.api.services.embosser import BrailleBRFGenerator
+from app.api.services.ingest import (
+    DOCUMENT_EXTENSIONS, DocumentReader, detect_document_type, iter_mapped_text,
+)
+from app.api.services.translator import PackedTranslator
+
+
+FORMATS = ("txt", "brf", "png", "pdf")
+
+# Sufijo de los archivos de salida (txt no puede reutilizar el de la entrada)
+OUTPUT_SUFFIXES = {"txt": ".braille.txt", "brf": ".brf", "png": ".png", "pdf": ".pdf"}
+
+# Caracteres leídos por fragmento de stdin
+CHUNK_SIZE = 1 << 20
+
+STDIN = "-"
+
+# Marca de salto de línea entre las celdas (fuera del rango de máscaras)
+_NEWLINE = 0x40
+
+# Máscara de celda → último byte de su patrón Braille en UTF-8; la marca de
+# salto de línea deja E2 A0 0A, que iter_unicode reduce a "\n"
+_UTF8_LAST_BYTE = bytes.maketrans(bytes(range(64)) + bytes([_NEWLINE]),
+                                  bytes(range(0x80, 0xC0)) + b"\n")
+
+
+class Options(NamedTuple):
+    """Opciones de transcripción que reciben los workers."""
+
+    fmt: str
+    cells_per_line: Optional[int]
+    lines_per_page: Optional[int]
+
+
+class Result(NamedTuple):
+    """Resultado de transcribir un archivo."""
+
+    source: str
+    outputs: List[str]
+    bytes_in: int
+    bytes_out: int
+
+
+def _iter_chunks(stream: TextIO, size: int = CHUNK_SIZE) -> Iterator[str]:
+    return iter(lambda: stream.read(size), "")
+
+
+def cells_to_utf8(cells: bytes) -> bytearray:
+    """
+    Codifica celdas empaquetadas como Braille Unicode en UTF-8.
+
+    U+2800 + máscara se codifica como E2 A0 (80 + máscara): basta con
+    intercalar el tercer byte, sin pasar por str (str.translate con
+    UNICODE_TABLE es el doble de lento que la propia traducción).
+    """
+    out = bytearray(b"\xe2\xa0\x80" * len(cells))
+    out[2::3] = cells.translate(_UTF8_LAST_BYTE)
+    return out
+
+
+def iter_unicode(chunks: Iterable[str]) -> Iterator[bytes]:
+    """
+    Traduce un texto por fragmentos a Braille Unicode (UTF-8).
+
+    Los saltos de línea se conservan y reinician el modo numérico, igual
+    que en text_to_braille.
+
+    Args:
+        chunks: Fragmentos del texto (ej. lecturas de un archivo)
+
+    Yields:
+        bytes: Celdas de cada fragmento codificadas en UTF-8
+    """
+    translator = PackedTranslator(line_break=_NEWLINE)
+    for chunk in chunks:
+        yield cells_to_utf8(translator.feed(chunk)).replace(b"\xe2\xa0\n", b"\n")
+
+
+def transcribe_stream(chunks: Iterable[str], target: IO[bytes], options: Options) -> int:
+    """
+    Transcribe un texto por fragmentos y escribe la salida en `target`.
+
+    Solo para formatos de un único archivo de salida (todos salvo png).
+
+    Returns:
+        int: Bytes escritos
+    """
+    written = 0
+    if options.fmt == "txt":
+        for data in iter_unicode(chunks):
+            written += target.write(data)
+    elif options.fmt == "brf":
+        generator = BrailleBRFGenerator(options.cells_per_line, options.lines_per_page)
+        for page in generator.iter_brf(chunks):
+            written += target.write(page)
+    elif options.fmt == "pdf":
+        from app.api.services.generator import generate_braille_pdf
+
+        written += target.write(generate_braille_pdf("".join(chunks)).getvalue())
+    else:
+        raise ValueError(f"Formato sin salida única: {options.fmt}")
+    return written
+
+
+def _transcribe_png(chunks: Iterable[str], stem: Path, options: Options) -> Result:
+    from app.api.services.generator import BrailleImageGenerator
+    from app.api.services.layout import BrailleLayout
+    from app.config import settings
+
+    generator = BrailleImageGenerator()
+    # Sin get_layout: un libro no debe quedarse en la caché de maquetación
+    layout = BrailleLayout.from_chunks(
+        chunks,
+        options.cells_per_line or settings.image_cells_per_line,
+        options.lines_per_page or settings.image_lines_per_page,
+    )
+    width = max(len(str(layout.page_count)), 3)
+    outputs = []
+    written = 0
+    for number in range(1, layout.page_count + 1):
+        path = stem.with_name(f"{stem.name}.{number:0{width}d}.png")
+        written += path.write_bytes(generator.generate_page(layout, number).getvalue())
+        outputs.append(str(path))
+    return Result("", outputs, 0, written)
+
+
+def output_stem(source: str, output_dir: Optional[str]) -> Path:
+    """Ruta de salida sin sufijo de formato (junto a la entrada o en `output_dir`)."""
+    path = Path(source)
+    return Path(output_dir or path.parent) / path.stem
+
+
+def transcribe_file(source: str, output_dir: Optional[str], options: Options) -> Result:
+    """
+    Transcribe un archivo (se ejecuta en los procesos worker).
+
+    Args:
+        source (str): Ruta del documento de entrada (tipo por extensión)
+        output_dir (str, optional): Directorio de salida (Default: el de
+            la entrada)
+        options (Options): Formato y geometría
+
+    Returns:
+        Result: Archivos escritos y tamaños de entrada y salida
+    """
+    path = Path(source)
+    stem = output_stem(source, output_dir)
+    doc_type = detect_document_type(path.name)
+    reader = None
+    if doc_type == "txt":
+        chunks = iter_mapped_text(path)
+    else:
+        reader = DocumentReader(open(path, "rb"), doc_type)
+        chunks = reader.iter_text()
+    try:
+        if options.fmt == "png":
+            result = _transcribe_png(chunks, stem, options)
+        else:
+            target = stem.with_name(stem.name + OUTPUT_SUFFIXES[options.fmt])
+            if target.resolve() == path.resolve():
+                raise ValueError(f"La salida sobrescribiría la entrada: {target}")
+            with open(target, "wb") as output:
+                written = transcribe_stream(chunks, output, options)
+            result = Result("", [str(target)], 0, written)
+    finally:
+        chunks.close()
+        if reader is not None:
+            reader.close()
+    return result._replace(source=source, bytes_in=path.stat().st_size)
+
+
+def collect_inputs(patterns: Sequence[str]) -> List[str]:
+    """
+    Expande las entradas de la línea de comandos a una lista de archivos.
+
+    Los directorios se recorren recursivamente buscando documentos con
+    extensión conocida (ver DOCUMENT_EXTENSIONS) y los patrones glob
+    admiten `**`; ambos omiten las salidas *.braille.txt.
+    Se eliminan duplicados conservando el orden.
+
+    Raises:
+        FileNotFoundError: Si una entrada no existe o un patrón no encuentra nada
+    """
+    files: List[str] = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            found = [str(p) for p in Path(pattern).rglob("*")
+                     if p.suffix.lower() in DOCUMENT_EXTENSIONS]
+        elif os.path.exists(pattern):
+            files.append(pattern)
+            continue
+        else:
+            found = glob.glob(pattern, recursive=True)
+        found = sorted(p for p in found
+                       if os.path.isfile(p) and not p.endswith(OUTPUT_SUFFIXES["txt"]))
+        if not found:
+            raise FileNotFoundError(f"No existe o no coincide con ningún archivo: {pattern}")
+        files.extend(found)
+    return list(dict.fromkeys(files))
+
+
+class Progress:
+    """Progreso en stderr: archivos terminados, MB leídos y MB/s."""
+
+    def __init__(self, total_files: int, total_bytes: int, stream: TextIO, enabled: bool = True):
+        self.total_files = total_files
+        self.total_bytes = total_bytes
+        self.stream = stream
+        self.enabled = enabled
+        self.done_files = 0
+        self.done_bytes = 0
+        self.start = time.perf_counter()
+        # En un terminal se reescribe la misma línea; si no, una por archivo
+        self._inline = stream.isatty()
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.start
+
+    @property
+    def throughput(self) -> float:
+        """MB de entrada transcritos por segundo."""
+        return self.done_bytes / 1e6 / max(self.elapsed, 1e-9)
+
+    def update(self, result: Result) -> None:
+        self.done_files += 1
+        self.done_bytes += result.bytes_in
+        if not self.enabled:
+            return
+        line = (f"[{self.done_files}/{self.total_files}] "
+                f"{self.done_bytes / 1e6:.1f}/{self.total_bytes / 1e6:.1f} MB "
+                f"{self.throughput:.1f} MB/s")
+        if self._inline:
+            self.stream.write(f"\r{line}")
+        else:
+            self.stream.write(f"{line} {result.source}\n")
+        self.stream.flush()
+
+    def summary(self, failed: int) -> str:
+        if self._inline and self.enabled:
+            self.stream.write("\n")
+        text = (f"{self.done_files} archivos, {self.done_bytes / 1e6:.1f} MB en "
+                f"{self.elapsed:.2f} s ({self.throughput:.1f} MB/s)")
+        if failed:
+            text += f", {failed} con errores"
+        return text
+
+
+def run(files: Sequence[str], output_dir: Optional[str], options: Options, jobs: int,
+        progress: Progress) -> int:
+    """
+    Transcribe los archivos en paralelo.
+
+    Un error en un archivo se informa en stderr y no detiene el resto.
+    Dos entradas con la misma salida (ej. a/libro.txt y b/libro.txt con
+    --output-dir, o libro.txt y libro.md) no se transcriben a la vez: la
+    segunda se informa como error.
+
+    Returns:
+        int: Número de archivos con error
+    """
+    failed = 0
+
+    def report_error(source: str, exc: Exception) -> None:
+        nonlocal failed
+        failed += 1
+        progress.stream.write(f"error: {source}: {exc}\n")
+
+    owners: Dict[Path, str] = {}
+    for source in files:
+        owner = owners.setdefault(output_stem(source, output_dir).resolve(), source)
+        if owner != source:
+            report_error(source, ValueError(f"Misma salida que {owner}"))
+    files = list(owners.values())
+
+    if jobs <= 1 or len(files) <= 1:
+        for source in files:
+            try:
+                progress.update(transcribe_file(source, output_dir, options))
+            except Exception as exc:
+                report_error(source, exc)
+        return failed
+
+    with ProcessPoolExecutor(max_workers=min(jobs, len(files))) as pool:
+        futures = {pool.submit(transcribe_file, source, output_dir, options): source
+                   for source in files}
+        for future in as_completed(futures):
+            try:
+                progress.update(future.result())
+            except Exception as exc:
+                report_error(futures[future], exc)
+    return failed
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m app.cli",
+        description="Transcribe archivos de texto a Braille (txt Unicode, brf, png o pdf).",
+    )
+    parser.add_argument("inputs", nargs="+",
+                        help="Documentos (txt, md, docx, epub), directorios, patrones glob o - para stdin")
+    parser.add_argument("-f", "--format", choices=FORMATS, default="txt", dest="fmt",
+                        help="Formato de salida (Default: txt)")
+    parser.add_argument("-o", "--output-dir",
+                        help="Directorio de salida (Default: junto a cada entrada)")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1,
+                        help="Procesos en paralelo (Default: uno por CPU)")
+    parser.add_argument("--cells-per-line", type=int,
+                        help="Celdas por línea en brf y png (Default: según formato)")
+    parser.add_argument("--lines-per-page", type=int,
+                        help="Líneas por página en brf y png (Default: según formato)")
+    parser.add_argument("-q", "--quiet", action="store_true",
+                        help="No mostrar el progreso ni el resumen")
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """
+    Punto de entrada de `python -m app.cli`.
+
+    Returns:
+        int: Código de salida (0 si todos los archivos se transcribieron)
+    """
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    options = Options(args.fmt, args.cells_per_line, args.lines_per_page)
+
+    if args.inputs == [STDIN]:
+        if args.fmt == "png":
+            parser.error("png genera un archivo por página; no admite stdin")
+        transcribe_stream(_iter_chunks(sys.stdin), sys.stdout.buffer, options)
+        sys.stdout.flush()
+        return 0
+    if STDIN in args.inputs:
+        parser.error("- (stdin) no se puede combinar con otras entradas")
+
+    try:
+        files = collect_inputs(args.inputs)
+    except FileNotFoundError as exc:
+        parser.error(str(exc))
+    if args.output_dir:
+        os.makedirs(args.output_dir, exist_ok=True)
+
+    total = sum(os.path.getsize(source) for source in files)
+    progress = Progress(len(files), total, sys.stderr, enabled=not args.quiet)
+    failed = run(files, args.output_dir, options, args.jobs, progress)
+    if not args.quiet:
+        sys.stderr.write(progress.summary(failed) + "\n")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
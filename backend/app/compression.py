@@ -0,0 +1,262 @@
+"""
+Compresión de respuestas HTTP (gzip y, si está instalado, brotli).
+
+Las respuestas JSON de traducción (celdas como listas anidadas) y los
+formatos de texto (SVG, BRF, PEF) se comprimen muy bien; las imágenes PNG,
+los PDF, los TIFF y los ZIP ya vienen comprimidos y se envían tal cual.
+
+Reglas (ver COMPRESSION_* en config.py):
+    - Codificación según Accept-Encoding: brotli si el cliente lo acepta y
+      el paquete `brotli` está instalado; si no, gzip
+    - Respuestas menores que COMPRESSION_MIN_SIZE se envían sin comprimir
+      (la cabecera gzip y la latencia no compensan)
+    - Se omiten los media types de COMPRESSION_EXCLUDED_TYPES y las
+      respuestas que ya traen Content-Encoding
+    - Respuestas de un solo cuerpo: se comprimen de una vez y se envían con
+      su Content-Length; por encima de OFFLOAD_SIZE la compresión corre en
+      un hilo para no bloquear el event loop
+    - Respuestas en streaming: se retienen los primeros trozos hasta
+      reunir COMPRESSION_MIN_SIZE bytes (si el cuerpo termina antes, se
+      envía sin comprimir); a partir de ahí se comprimen trozo a trozo
+      (sin Content-Length), vaciando el compresor en cada trozo para que
+      el cliente reciba los datos a medida que se generan
+    - Los ETag fuertes pasan a débiles (W/) en las respuestas comprimidas
+
+Los niveles de compresión (GZIP_LEVEL, BROTLI_LEVEL) se eligieron con
+benchmarks/bench_compression.py.
+"""
+
+import zlib
+from typing import Dict, List, Optional, Tuple
+
+from starlette.concurrency import run_in_threadpool
+
+from app.config import settings
+from app.metrics import stage_timer
+
+# brotli es opcional: sin él solo se ofrece gzip
+try:
+    import brotli
+except ImportError:  # pragma: no cover - depende del entorno
+    brotli = None
+
+
+# Cuerpos a partir de este tamaño se comprimen fuera del event loop
+OFFLOAD_SIZE = 256 * 1024
+
+
+def _qualities(header: str) -> Dict[str, float]:
+    """Calidad (q) de cada codificación de Accept-Encoding."""
+    qualities: Dict[str, float] = {}
+    for item in header.split(","):
+        name, _, params = item.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        name = name.strip().lower()
+        if name:
+            qualities[name] = quality
+    return qualities
+
+
+def parse_accept_encoding(header: str) -> List[str]:
+    """
+    Codificaciones aceptadas por el cliente, de mayor a menor preferencia.
+
+    Las que llevan q=0 se descartan; a igual q se conserva el orden de la
+    cabecera.
+
+    Examples:
+        >>> parse_accept_encoding("gzip;q=0.8, br, identity;q=0")
+        ['br', 'gzip']
+    """
+    qualities = _qualities(header)
+    accepted = [name for name, quality in qualities.items() if quality > 0 and name != "identity"]
+    return sorted(accepted, key=lambda name: -qualities[name])
+
+
+def choose_encoding(header: str) -> Optional[str]:
+    """
+    Codificación a usar para una petición ("br", "gzip" o None).
+
+    A igual q se prefiere brotli (los navegadores envían "gzip, deflate, br"
+    sin pesos).
+    """
+    qualities = _qualities(header)
+    wildcard = qualities.get("*", 0.0)
+    candidates = []
+    if brotli is not None and settings.brotli_enabled:
+        candidates.append(("br", qualities.get("br", wildcard)))
+    candidates.append(("gzip", qualities.get("gzip", wildcard)))
+    encoding, quality = max(candidates, key=lambda item: item[1])
+    return encoding if quality > 0 else None
+
+
+class _Compressor:
+    """Compresor incremental con la misma interfaz para gzip y brotli."""
+
+    def __init__(self, encoding: str):
+        if encoding == "br":
+            self._br = brotli.Compressor(quality=settings.brotli_level)
+            self._zlib = None
+        else:
+            self._br = None
+            # wbits=31: formato gzip (cabecera y CRC)
+            self._zlib = zlib.compressobj(settings.gzip_level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes, flush: bool = False) -> bytes:
+        if self._br is not None:
+            return self._br.process(data) + (self._br.flush() if flush else b"")
+        return self._zlib.compress(data) + (self._zlib.flush(zlib.Z_SYNC_FLUSH) if flush else b"")
+
+    def finish(self, data: bytes = b"") -> bytes:
+        if self._br is not None:
+            return self._br.process(data) + self._br.finish()
+        return self._zlib.compress(data) + self._zlib.flush()
+
+
+def compress(data: bytes, encoding: str) -> bytes:
+    """Comprime un cuerpo completo con la codificación indicada."""
+    return _Compressor(encoding).finish(data)
+
+
+def _media_type(headers: List[Tuple[bytes, bytes]]) -> str:
+    for key, value in headers:
+        if key == b"content-type":
+            return value.split(b";", 1)[0].strip().decode("latin-1").lower()
+    return ""
+
+
+class CompressionMiddleware:
+    """
+    Middleware ASGI que comprime las respuestas según Accept-Encoding.
+
+    Solo se instala si COMPRESSION_ENABLED es True.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.min_size = settings.compression_min_size
+        self.excluded = frozenset(media_type.lower() for media_type in settings.compression_excluded_types)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        accept = ""
+        for key, value in scope.get("headers", []):
+            if key == b"accept-encoding":
+                accept = value.decode("latin-1")
+                break
+        encoding = choose_encoding(accept) if accept else None
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+        compressor: Optional[_Compressor] = None
+        passthrough = False
+        # Trozos retenidos hasta saber si el cuerpo llega a min_size
+        pending = bytearray()
+
+        async def send_wrapper(message):
+            nonlocal start_message, compressor, passthrough
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                length = None
+                for key, value in headers:
+                    if key == b"content-encoding":
+                        passthrough = True
+                    elif key == b"content-length":
+                        length = int(value)
+                if (passthrough
+                        or _media_type(headers) in self.excluded
+                        or (length is not None and length < self.min_size)):
+                    passthrough = True
+                    await send(message)
+                    return
+                # Se decide al reunir min_size bytes o al terminar el cuerpo
+                start_message = {**message, "headers": headers}
+                return
+
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            body = bytes(message.get("body", b""))
+            more_body = message.get("more_body", False)
+
+            if compressor is None:
+                if pending or more_body:
+                    pending.extend(body)
+                    if more_body and len(pending) < self.min_size:
+                        return
+                    body = bytes(pending)
+                    pending.clear()
+                headers = start_message["headers"]
+                if not more_body:
+                    # Cuerpo completo: comprimir de una vez si merece la pena
+                    if len(body) < self.min_size:
+                        passthrough = True
+                        await send(start_message)
+                        await send({"type": "http.response.body", "body": body})
+                        return
+                    with stage_timer("compression"):
+                        if len(body) >= OFFLOAD_SIZE:
+                            body = await run_in_threadpool(compress, body, encoding)
+                        else:
+                            body = compress(body, encoding)
+                    headers = [(k, v) for k, v in headers if k != b"content-length"]
+                    headers += [
+                        (b"content-encoding", encoding.encode("latin-1")),
+                        (b"content-length", str(len(body)).encode("latin-1")),
+                    ]
+                    _add_vary(headers)
+                    _weaken_etag(headers)
+                    await send({**start_message, "headers": headers})
+                    await send({"type": "http.response.body", "body": body})
+                    return
+                # Streaming: cabeceras sin Content-Length y compresión incremental
+                compressor = _Compressor(encoding)
+                headers = [(k, v) for k, v in headers if k != b"content-length"]
+                headers.append((b"content-encoding", encoding.encode("latin-1")))
+                _add_vary(headers)
+                _weaken_etag(headers)
+                await send({**start_message, "headers": headers})
+
+            with stage_timer("compression"):
+                if more_body:
+                    chunk = compressor.compress(body, flush=True)
+                else:
+                    chunk = compressor.finish(body)
+            if chunk or not more_body:
+                await send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+
+        await self.app(scope, receive, send_wrapper)
+
+
+def _add_vary(headers: List[Tuple[bytes, bytes]]) -> None:
+    """Añade Accept-Encoding a Vary (las cachés deben distinguir codificaciones)."""
+    for index, (key, value) in enumerate(headers):
+        if key == b"vary":
+            if b"accept-encoding" not in value.lower():
+                headers[index] = (key, value + b", Accept-Encoding")
+            return
+    headers.append((b"vary", b"Accept-Encoding"))
+
+
+def _weaken_etag(headers: List[Tuple[bytes, bytes]]) -> None:
+    """
+    Convierte un ETag fuerte en débil (W/"...").
+
+    El cuerpo comprimido no es idéntico byte a byte al original, así que el
+    ETag fuerte de la respuesta sin comprimir deja de ser válido para él.
+    """
+    for index, (key, value) in enumerate(headers):
+        if key == b"etag" and not value.startswith(b"W/"):
+            headers[index] = (key, b"W/" + value)
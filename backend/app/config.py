@@ -19,7 +19,7 @@ Uso:
     CORS_ORIGINS = settings.cors_origins
 """
 
-from typing import List
+from typing import Dict, List
 from pydantic_settings import BaseSettings
 from pydantic import Field
 
@@ -55,13 +55,123 @@ class Settings(BaseSettings):
     cors_allow_methods: List[str] = Field(default=["*"], description="Métodos permitidos en CORS")
     cors_allow_headers: List[str] = Field(default=["*"], description="Headers permitidos en CORS")
     
+    # Compresión de respuestas (ver compression.py)
+    compression_enabled: bool = Field(default=True, description="Comprimir respuestas según Accept-Encoding")
+    compression_min_size: int = Field(default=1024, description="Bytes mínimos de una respuesta para comprimirla")
+    compression_excluded_types: List[str] = Field(
+        default=["image/png", "application/pdf", "image/tiff", "application/zip"],
+        description="Media types ya comprimidos que se envían tal cual"
+    )
+    gzip_level: int = Field(default=5, description="Nivel de compresión gzip (1-9)")
+    brotli_enabled: bool = Field(default=True, description="Usar brotli si el cliente lo acepta y está instalado")
+    brotli_level: int = Field(default=4, description="Nivel de compresión brotli (0-11)")
+    
+    # Caché HTTP (variantes GET deterministas, ver app/http_cache.py)
+    http_cache_max_age: int = Field(default=31536000, description="max-age (segundos) de las respuestas GET con ETag")
+    
     # Logging
     log_level: str = Field(default="INFO", description="Nivel de logging")
+    log_format: str = Field(default="json", description="Formato de logs (json, text)")
+    log_sample_rate: float = Field(default=1.0, description="Fracción de logs INFO por petición que se emiten (0-1)")
+    log_max_field_length: int = Field(default=80, description="Longitud máxima de campos de texto en logs")
     
     # Límites
     max_text_length: int = Field(default=10000, description="Longitud máxima de texto a traducir")
     max_braille_cells: int = Field(default=10000, description="Máximo de celdas Braille a procesar")
     
+    # Funcionalidades
+    generation_enabled: bool = Field(default=True, description="Montar las rutas de generación (False = worker de solo traducción)")
+    
+    # Impresoras Braille (BRF / PEF)
+    embosser_cells_per_line: int = Field(default=40, description="Celdas por línea en salidas BRF/PEF")
+    embosser_lines_per_page: int = Field(default=25, description="Líneas por página en salidas BRF/PEF")
+    
+    # Geometría de celdas (ver app/api/services/geometry.py)
+    geometry_profiles: Dict[str, Dict[str, float]] = Field(
+        default={
+            "standard": {
+                "cell_width": 40, "cell_height": 60, "dot_radius": 6, "spacing": 10, "margin": 20,
+                "dot_spacing_mm": 5.0, "dot_radius_mm": 2.0, "cell_pitch_mm": 15.0, "line_pitch_mm": 30.0,
+            },
+            "jumbo": {
+                "cell_width": 80, "cell_height": 120, "dot_radius": 12, "spacing": 20, "margin": 40,
+                "dot_spacing_mm": 8.0, "dot_radius_mm": 3.0, "cell_pitch_mm": 24.0, "line_pitch_mm": 45.0,
+            },
+            "marburg_medium": {
+                "cell_width": 30, "cell_height": 40, "dot_radius": 4, "spacing": 6, "margin": 20,
+                "dot_spacing_mm": 2.5, "dot_radius_mm": 0.75, "cell_pitch_mm": 6.0, "line_pitch_mm": 10.0,
+            },
+        },
+        description="Perfiles de geometría por nombre (píxeles y milímetros)"
+    )
+    default_geometry_profile: str = Field(default="standard", description="Perfil de geometría por defecto")
+    
+    # Imágenes paginadas (PNG por página / TIFF)
+    image_cells_per_line: int = Field(default=30, description="Celdas por línea en imágenes paginadas")
+    image_lines_per_page: int = Field(default=20, description="Líneas por página en imágenes paginadas")
+    layout_cache_size: int = Field(default=32, description="Maquetaciones de documentos conservadas en caché (0 = sin caché)")
+    
+    # Resolución y calidad de imagen
+    image_dpi_values: List[int] = Field(default=[150, 300, 600], description="Resoluciones admitidas además de la base (72 dpi)")
+    image_supersampling: int = Field(default=4, description="Factor de sobremuestreo de los sprites de celda (1 = sin antialiasing)")
+    image_max_pixels: int = Field(default=100_000_000, description="Píxeles máximos de una imagen o página generada")
+    image_mode: str = Field(default="P", description="Modo de imagen: RGB, L (grises), P (16 grises, 4 bits) o 1 (blanco y negro)")
+    png_compress_level: int = Field(default=6, description="Nivel de compresión zlib del PNG (0-9)")
+    png_optimize: bool = Field(default=False, description="Pasada extra de optimización del PNG (más lenta)")
+    
+    # Rendimiento
+    render_workers: int = Field(default=4, description="Hilos del pool de renderizado (PNG/PDF)")
+    response_chunk_size: int = Field(default=256 * 1024, description="Respuestas binarias mayores se envían en trozos de este tamaño")
+    kit_max_labels: int = Field(default=200, description="Etiquetas máximas por kit de señalética (/generation/kit)")
+    
+    # Control de admisión (ver app/ratelimit.py)
+    rate_limit_enabled: bool = Field(default=True, description="Limitar peticiones y concurrencia por cliente")
+    rate_limit_generation_rate: float = Field(default=5.0, description="Peticiones por segundo y cliente a /generation (reposición del bucket)")
+    rate_limit_generation_burst: int = Field(default=30, description="Ráfaga máxima de peticiones a /generation por cliente")
+    rate_limit_translation_rate: float = Field(default=50.0, description="Peticiones por segundo y cliente a /translation")
+    rate_limit_translation_burst: int = Field(default=200, description="Ráfaga máxima de peticiones a /translation por cliente")
+    rate_limit_client_concurrency: int = Field(default=4, description="Peticiones de generación simultáneas por cliente (por proceso)")
+    rate_limit_global_concurrency: int = Field(default=32, description="Peticiones de generación simultáneas en total (por proceso)")
+    rate_limit_store: str = Field(default="", description="Almacén de buckets como 'modulo:atributo' (vacío = memoria del proceso)")
+    
+    # Planificador por prioridad (ver app/scheduler.py)
+    scheduler_enabled: bool = Field(default=True, description="Priorizar traducción sobre generación y descartar por sobrecarga")
+    scheduler_slots: int = Field(default=32, description="Peticiones planificadas en ejecución simultánea (todas las clases)")
+    scheduler_render_slots: int = Field(default=8, description="De ellas, máximo de peticiones de generación")
+    scheduler_max_queue: int = Field(default=200, description="Peticiones en espera como máximo (se descarta la de menor prioridad)")
+    scheduler_interactive_deadline_ms: int = Field(default=1000, description="Espera máxima en cola de una traducción (ms)")
+    scheduler_render_deadline_ms: int = Field(default=10000, description="Espera máxima en cola de una generación (ms)")
+    scheduler_deadline_header: str = Field(default="X-Deadline-Ms", description="Header con la espera máxima aceptada por el cliente (ms)")
+    
+    # Trabajos asíncronos de generación
+    jobs_dir: str = Field(default="jobs", description="Directorio de la base de datos y resultados de trabajos")
+    jobs_workers: int = Field(default=2, description="Hilos por proceso dedicados a trabajos")
+    jobs_max_per_client: int = Field(default=3, description="Trabajos activos (en cola o en curso) por cliente")
+    jobs_max_text_length: int = Field(default=200000, description="Longitud máxima de texto de un trabajo")
+    jobs_ttl_seconds: int = Field(default=3600, description="Segundos que se conserva un resultado terminado")
+    jobs_poll_interval: float = Field(default=1.0, description="Segundos entre consultas de trabajos pendientes")
+    jobs_stale_after: int = Field(default=300, description="Segundos sin progreso tras los que un trabajo vuelve a la cola")
+    
+    # Ingesta de documentos (/generation/documents)
+    ingest_max_upload_bytes: int = Field(default=52428800, description="Tamaño máximo de un documento subido (bytes)")
+    ingest_max_uncompressed_bytes: int = Field(default=209715200, description="Tamaño máximo descomprimido del contenido de un DOCX/EPUB (bytes)")
+    ingest_spool_bytes: int = Field(default=1048576, description="Bytes de un documento subido que se guardan en memoria antes de pasar a disco")
+    
+    # Servidor de producción (app.server)
+    workers: int = Field(default=0, description="Procesos worker (0 = uno por CPU)")
+    max_requests: int = Field(default=1000, description="Peticiones atendidas antes de reciclar un worker (0 = nunca)")
+    max_requests_jitter: int = Field(default=100, description="Variación aleatoria de max_requests entre workers")
+    graceful_timeout: int = Field(default=30, description="Segundos para terminar peticiones en curso al reiniciar")
+    worker_timeout: int = Field(default=60, description="Segundos sin respuesta antes de reiniciar un worker")
+    
+    # Observabilidad
+    metrics_enabled: bool = Field(default=False, description="Exponer métricas Prometheus en /metrics")
+    profiling_enabled: bool = Field(default=False, description="Permitir profiling por petición (cProfile)")
+    profiling_sample_rate: float = Field(default=0.0, description="Fracción de peticiones perfiladas automáticamente (0-1)")
+    profiling_header: str = Field(default="X-Profile", description="Header que solicita perfilar una petición")
+    profiling_dir: str = Field(default="profiles", description="Directorio donde se guardan los perfiles")
+    profiling_max_files: int = Field(default=50, description="Número máximo de perfiles conservados")
+    
     class Config:
         """Configuración de Pydantic Settings."""
         env_file = ".env"
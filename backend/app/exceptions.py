@@ -9,6 +9,8 @@ Jerarquía de Excepciones:
     ├── TranslationError: Error en traducción
     ├── ValidationError: Error en validación de entrada
     ├── GenerationError: Error en generación de imágenes/PDFs
+    ├── RateLimitError: Límite de peticiones o concurrencia excedido
+    ├── OverloadError: Petición descartada por sobrecarga (503)
     └── InternalError: Error interno del servidor
 
 Uso:
@@ -17,12 +19,15 @@ Uso:
     try:
         result = translate(text)
     except ValidationError as e:
-        logger.warning(f"Validación fallida: {e}")
+        logger.warning("Validación fallida: %s", e)
     except TranslationError as e:
-        logger.error(f"Error en traducción: {e}")
+        logger.error("Error en traducción: %s", e)
 """
 
 
+from fastapi.responses import JSONResponse
+
+
 class BrailleException(Exception):
     """Excepción base para todas las excepciones de la aplicación."""
     
@@ -62,8 +67,59 @@ class GenerationError(BrailleException):
         super().__init__(message, code, status_code=500)
 
 
+class RateLimitError(BrailleException):
+    """Límite de peticiones o concurrencia excedido (429 Too Many Requests)."""
+    
+    def __init__(self, message: str, retry_after: int = 1, code: str = "RATE_LIMITED"):
+        """
+        Args:
+            message (str): Mensaje de error descriptivo
+            retry_after (int): Segundos sugeridos antes de reintentar
+                               (se envía en el header Retry-After)
+            code (str): Código de error interno
+        """
+        super().__init__(message, code, status_code=429)
+        self.retry_after = retry_after
+
+
+class OverloadError(BrailleException):
+    """Petición descartada por sobrecarga del servidor (503 Service Unavailable)."""
+    
+    def __init__(self, message: str, retry_after: int = 1, code: str = "OVERLOADED"):
+        """
+        Args:
+            message (str): Mensaje de error descriptivo
+            retry_after (int): Segundos sugeridos antes de reintentar
+                               (se envía en el header Retry-After)
+            code (str): Código de error interno
+        """
+        super().__init__(message, code, status_code=503)
+        self.retry_after = retry_after
+
+
 class InternalError(BrailleException):
     """Error interno del servidor."""
     
     def __init__(self, message: str, code: str = "INTERNAL_ERROR"):
         super().__init__(message, code, status_code=500)
+
+
+def error_response(exc: BrailleException) -> JSONResponse:
+    """
+    Respuesta JSON estándar de una excepción de la aplicación.
+    
+    La usan el handler de excepciones de main.py y los middlewares que
+    rechazan peticiones antes de llegar a las rutas.
+    """
+    headers = None
+    if isinstance(exc, (RateLimitError, OverloadError)):
+        headers = {"Retry-After": str(exc.retry_after)}
+    return JSONResponse(
+        status_code=exc.status_code,
+        content={
+            "error": exc.code,
+            "message": exc.message,
+            "status_code": exc.status_code
+        },
+        headers=headers
+    )
@@ -0,0 +1,104 @@
+"""
+Caché HTTP de las respuestas deterministas (ETag y Cache-Control).
+
+Cada traducción o renderizado es una función pura de sus parámetros, de
+las tablas de traducción (TABLE_VERSION), de la versión del renderer y de
+la configuración que afecta a la salida (OUTPUT_SETTINGS). El ETag se
+calcula a partir de ellos, sin generar la respuesta: una petición
+condicional con un ETag vigente recibe 304 sin traducir ni renderizar.
+
+Las variantes GET de /translation y /generation usan este módulo:
+    - ETag fuerte: hash de (tipo, versión, tabla, configuración, parámetros)
+    - Cache-Control: public, max-age=HTTP_CACHE_MAX_AGE, immutable (la URL
+      identifica el contenido, así que un CDN o proxy puede servirla sin
+      revalidar)
+    - If-None-Match → 304 Not Modified con el mismo ETag
+
+Ejemplo:
+    etag = make_etag("png", renderer.version, params)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return not_modified(etag)
+"""
+
+import hashlib
+import json
+from typing import Any, Dict, Optional
+
+from fastapi.responses import Response
+
+from app.config import settings
+from app.metrics import record_cache
+from app.api.services.translator import TABLE_VERSION
+
+
+# Ajustes que cambian los bytes generados para unos mismos parámetros
+OUTPUT_SETTINGS = (
+    "geometry_profiles",
+    "default_geometry_profile",
+    "embosser_cells_per_line",
+    "embosser_lines_per_page",
+    "image_cells_per_line",
+    "image_lines_per_page",
+    "image_supersampling",
+    "image_mode",
+    "png_compress_level",
+    "png_optimize",
+)
+
+
+def make_etag(kind: str, version: str, params: Dict[str, Any]) -> str:
+    """
+    ETag fuerte (entre comillas) de una respuesta determinista.
+
+    Args:
+        kind (str): Tipo de respuesta (formato del renderer o endpoint)
+        version (str): Versión de la salida (Renderer.version)
+        params (dict): Parámetros de la petición
+    """
+    payload = json.dumps(
+        [kind, version, TABLE_VERSION,
+         {name: getattr(settings, name) for name in OUTPUT_SETTINGS}, params],
+        sort_keys=True, ensure_ascii=False, default=str,
+    )
+    return '"' + hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32] + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Indica si If-None-Match incluye el ETag (comparación débil, RFC 9110).
+
+    Se ignora el prefijo W/ para que coincidan también los ETag debilitados
+    por la compresión (ver app/compression.py).
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        hit = True
+    else:
+        tags = (tag.strip() for tag in if_none_match.split(","))
+        hit = etag in (tag[2:] if tag.startswith("W/") else tag for tag in tags)
+    record_cache("http_etag", hit)
+    return hit
+
+
+def cache_headers(etag: str, immutable: bool = True) -> Dict[str, str]:
+    """
+    Cabeceras de una respuesta cacheable.
+
+    Args:
+        etag (str): ETag de la respuesta
+        immutable (bool): True si la URL identifica el contenido (se cachea
+            HTTP_CACHE_MAX_AGE sin revalidar); False si el contenido puede
+            cambiar con un despliegue (se guarda, pero se revalida con
+            If-None-Match en cada uso)
+    """
+    if immutable:
+        cache_control = f"public, max-age={settings.http_cache_max_age}, immutable"
+    else:
+        cache_control = "public, no-cache"
+    return {"ETag": etag, "Cache-Control": cache_control}
+
+
+def not_modified(etag: str, immutable: bool = True) -> Response:
+    """Respuesta 304 para una petición condicional con ETag vigente."""
+    return Response(status_code=304, headers=cache_headers(etag, immutable))
@@ -1,67 +1,208 @@
 """
 Configuración de logging centralizado.
 
-Este módulo configura logging estructurado para toda la aplicación.
+Este módulo configura logging estructurado y de bajo coste para toda la
+aplicación.
 
 Características:
     - Logs con niveles (DEBUG, INFO, WARNING, ERROR, CRITICAL)
-    - Formato consistente con timestamp y módulo
-    - Rotación de archivos (si aplica)
-    - Outputs: consola y archivo
+    - Salida JSON estructurada (LOG_FORMAT=json) o texto clásico (text)
+    - QueueHandler/QueueListener: la E/S a stdout ocurre en un hilo propio,
+      fuera del camino de la petición
+    - Formateo perezoso: el mensaje se interpola en el hilo del listener,
+      y nunca si el nivel está deshabilitado
+    - Muestreo de logs INFO de alto volumen (LOG_SAMPLE_RATE)
+    - Campos de payload truncados con truncate_text (LOG_MAX_FIELD_LENGTH)
 
 Uso:
-    from app.logger import get_logger
-    
+    from app.logger import get_logger, log_event
+
     logger = get_logger(__name__)
-    logger.info("Mensaje informativo")
-    logger.error("Error detectado", extra={"user_id": 123})
+    logger.info("Mensaje informativo: %s", valor)
+    log_event(logger, "Traducción solicitada", sampled=True, text=texto)
 """
 
+import atexit
+import json
 import logging
+import os
+import queue
+import random
 import sys
+from logging.handlers import QueueHandler, QueueListener
 from typing import Optional
 
+from app.config import settings
+from app.utils import truncate_text
+
+
+# Atributos estándar de LogRecord: todo lo demás se considera campo extra
+_RESERVED_ATTRS = frozenset(
+    vars(logging.LogRecord("", 0, "", 0, "", (), None)).keys()
+) | {"message", "asctime", "taskName"}
+
+
+class JSONFormatter(logging.Formatter):
+    """
+    Formatea cada registro como una línea JSON.
+
+    Los campos pasados en `extra` se incluyen como claves de primer nivel;
+    los valores de texto se truncan para que un payload de usuario enorme
+    no infle cada línea de log.
+    """
+
+    def __init__(self, max_field_length: int = 80):
+        super().__init__()
+        self.max_field_length = max_field_length
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "ts": self.formatTime(record, "%Y-%m-%dT%H:%M:%S"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key in _RESERVED_ATTRS or key.startswith("_"):
+                continue
+            if isinstance(value, str):
+                value = truncate_text(value, self.max_field_length)
+            payload[key] = value
+        if record.exc_info:
+            payload["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+class _DeferredQueueHandler(QueueHandler):
+    """
+    QueueHandler que no formatea en el hilo que emite el log.
+
+    El QueueHandler estándar interpola el mensaje en `prepare()` (pensado
+    para colas entre procesos). Con una cola en memoria podemos pasar el
+    registro tal cual y dejar todo el formateo al QueueListener.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+class _StdoutHandler(logging.StreamHandler):
+    """StreamHandler que siempre escribe en el sys.stdout vigente."""
+
+    @property
+    def stream(self):
+        return sys.stdout
+
+    @stream.setter
+    def stream(self, value):
+        pass
+
+
+def _build_formatter() -> logging.Formatter:
+    if settings.log_format.lower() == "json":
+        return JSONFormatter(max_field_length=settings.log_max_field_length)
+    return logging.Formatter(
+        fmt='[%(asctime)s] [%(name)s] [%(levelname)s] %(message)s',
+        datefmt='%Y-%m-%d %H:%M:%S'
+    )
+
+
+_log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+_queue_handler = _DeferredQueueHandler(_log_queue)
+_listener: Optional[QueueListener] = None
+
+
+def _start_listener() -> None:
+    """Arranca (o re-arranca tras un fork) el hilo que escribe los logs."""
+    global _listener
+    output = _StdoutHandler()
+    output.setFormatter(_build_formatter())
+    _listener = QueueListener(_log_queue, output)
+    _listener.start()
+
+
+def _stop_listener() -> None:
+    if _listener is not None:
+        _listener.stop()
+
+
+def _after_fork_in_child() -> None:
+    # El hilo del listener no sobrevive a fork(): cada worker necesita su
+    # propia cola y su propio listener, o los logs se acumularían sin salida.
+    global _log_queue
+    _log_queue = queue.SimpleQueue()
+    _queue_handler.queue = _log_queue
+    _start_listener()
+
+
+_start_listener()
+atexit.register(_stop_listener)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
+
 
 def get_logger(name: str, level: Optional[str] = None) -> logging.Logger:
     """
     Obtiene un logger configurado para un módulo específico.
-    
+
     Args:
         name (str): Nombre del logger (usualmente __name__)
-        level (str, optional): Nivel de logging (DEBUG, INFO, WARNING, ERROR, CRITICAL)
-    
+        level (str, optional): Nivel de logging (DEBUG, INFO, WARNING, ERROR, CRITICAL).
+                              Default: LOG_LEVEL de la configuración
+
     Returns:
         logging.Logger: Logger configurado
-    
+
     Example:
         >>> logger = get_logger(__name__)
         >>> logger.info("Aplicación iniciada")
     """
     logger = logging.getLogger(name)
-    
+
     # Evitar agregar handlers múltiples
-    if logger.hasHandlers():
+    if _queue_handler in logger.handlers:
         return logger
-    
+
     # Configurar nivel
-    if level:
-        logger.setLevel(getattr(logging, level.upper(), logging.INFO))
-    else:
-        logger.setLevel(logging.INFO)
-    
-    # Formato del log
-    formatter = logging.Formatter(
-        fmt='[%(asctime)s] [%(name)s] [%(levelname)s] %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
-    )
-    
-    # Handler para consola
-    console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
-    
+    level_name = (level or settings.log_level).upper()
+    logger.setLevel(getattr(logging, level_name, logging.INFO))
+
+    # Todos los loggers comparten la cola; la E/S la hace el listener
+    logger.addHandler(_queue_handler)
+
     return logger
 
 
+def log_event(logger: logging.Logger, message: str, *args,
+              level: int = logging.INFO, sampled: bool = False, **fields) -> None:
+    """
+    Emite un log estructurado con coste mínimo en rutas calientes.
+
+    No crea el LogRecord si el nivel está deshabilitado o si el evento se
+    descarta por muestreo. Los `fields` se adjuntan como campos JSON y los
+    de texto se truncan en el formateador.
+
+    Args:
+        logger (logging.Logger): Logger destino
+        message (str): Mensaje (admite interpolación perezosa con %s)
+        *args: Argumentos de interpolación del mensaje
+        level (int): Nivel de logging (Default: INFO)
+        sampled (bool): Si True y el nivel es INFO o inferior, se aplica
+                        LOG_SAMPLE_RATE (útil para logs por petición)
+        **fields: Campos estructurados (no usar nombres de LogRecord como
+                  "filename" o "message")
+
+    Example:
+        >>> log_event(logger, "Imagen generada", sampled=True, size_bytes=1234)
+    """
+    if not logger.isEnabledFor(level):
+        return
+    if sampled and level <= logging.INFO:
+        rate = settings.log_sample_rate
+        if rate < 1.0 and random.random() >= rate:
+            return
+    logger.log(level, message, *args, extra=fields)
+
+
 # Logger global de la aplicación
 app_logger = get_logger("braille-translator")
@@ -3,29 +3,73 @@ Punto de entrada principal de la aplicación FastAPI.
 
 Configura:
     - Middleware CORS
+    - Control de admisión: token bucket y concurrencia por cliente (opcional)
+    - Planificador por prioridad con descarte por sobrecarga (opcional)
+    - Compresión de respuestas gzip/brotli (opcional)
+    - Middleware de métricas (opcional)
+    - Middleware de profiling por petición (opcional)
     - Rutas de API
     - Handlers de excepciones
     - Documentación OpenAPI
 
 Estructura:
     GET  /                          → Información de la API
+    GET  /ready                     → Readiness (200 tras el warm-up, 503 antes)
     GET  /docs                      → Documentación interactiva (Swagger)
     GET  /redoc                     → Documentación ReDoc
+    GET  /metrics                   → Métricas Prometheus (si METRICS_ENABLED)
+    GET  /api/v1/profiles           → Perfiles guardados (si PROFILING_ENABLED)
     
     POST /api/v1/translation/to-braille       → Español → Braille
     POST /api/v1/translation/to-text          → Braille → Español
-    POST /api/v1/generation/image             → Generar PNG
-    POST /api/v1/generation/pdf               → Generar PDF
+    POST /api/v1/generation/image             → Generar PNG (si GENERATION_ENABLED)
+    POST /api/v1/generation/pdf               → Generar PDF (si GENERATION_ENABLED)
+    POST /api/v1/generation/documents/{fmt}   → Transcribir TXT/MD/DOCX/EPUB subido a BRF o PEF
+    POST /api/v1/generation/jobs              → Encolar documento grande (si GENERATION_ENABLED)
+    GET  /api/v1/generation/jobs/{id}         → Estado y progreso del trabajo
+    GET  /api/v1/generation/jobs/{id}/result  → Descargar resultado
 """
 
+import threading
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 
+from app import metrics
 from app.config import settings
 from app.logger import app_logger
-from app.exceptions import BrailleException
-from app.api.routes import translation, generation
+from app.exceptions import BrailleException, error_response
+from app.compression import CompressionMiddleware
+from app.ratelimit import RateLimitMiddleware
+from app.scheduler import SchedulerMiddleware
+from app.profiling import ProfilingMiddleware
+from app.warmup import warm_up, is_ready
+from app.api.routes import translation, profiling
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Ciclo de vida de la aplicación.
+    
+    Si el proceso no se precalentó antes (app.server lo hace en el padre
+    antes del fork), lanza el warm-up en segundo plano: el servidor
+    acepta conexiones de inmediato y /ready responde 503 hasta que termine.
+    
+    También arranca y detiene el ejecutor de trabajos asíncronos.
+    """
+    if not is_ready():
+        threading.Thread(target=warm_up, name="warm-up", daemon=True).start()
+    
+    # Ejecutor de trabajos asíncronos (uno por proceso worker)
+    job_runner = getattr(app.state, "jobs", None)
+    if job_runner is not None:
+        job_runner.start()
+    yield
+    if job_runner is not None:
+        await job_runner.stop()
 
 
 def create_app() -> FastAPI:
@@ -42,9 +86,19 @@ def create_app() -> FastAPI:
         version=settings.app_version,
         docs_url="/docs",
         redoc_url="/redoc",
-        openapi_url="/openapi.json"
+        openapi_url="/openapi.json",
+        lifespan=lifespan
     )
     
+    # Planificador por prioridad: tras el control de admisión (los 429 no
+    # llegan a ocupar la cola)
+    if settings.scheduler_enabled:
+        app.add_middleware(SchedulerMiddleware)
+    
+    # Control de admisión: dentro de CORS, para que los 429 lleven sus cabeceras
+    if settings.rate_limit_enabled:
+        app.add_middleware(RateLimitMiddleware)
+    
     # Middleware CORS
     app.add_middleware(
         CORSMiddleware,
@@ -54,19 +108,25 @@ def create_app() -> FastAPI:
         allow_headers=settings.cors_allow_headers,
     )
     
+    # Compresión: dentro de métricas y profiling, que miden su coste
+    if settings.compression_enabled:
+        app.add_middleware(CompressionMiddleware)
+    
+    # Middleware de métricas: solo se instala si está habilitado
+    metrics.configure(settings.metrics_enabled)
+    if settings.metrics_enabled:
+        app.add_middleware(metrics.MetricsMiddleware)
+    
+    # Profiling por petición: sin coste alguno si está deshabilitado
+    if settings.profiling_enabled:
+        app.add_middleware(ProfilingMiddleware)
+    
     # Handler de excepciones personalizado
     @app.exception_handler(BrailleException)
     async def braille_exception_handler(request, exc: BrailleException):
         """Maneja excepciones personalizadas de la aplicación."""
-        app_logger.error(f"Error [{exc.code}]: {exc.message}")
-        return JSONResponse(
-            status_code=exc.status_code,
-            content={
-                "error": exc.code,
-                "message": exc.message,
-                "status_code": exc.status_code
-            }
-        )
+        app_logger.error("Error [%s]: %s", exc.code, exc.message)
+        return error_response(exc)
     
     # Incluir routers de API
     app.include_router(
@@ -74,11 +134,35 @@ def create_app() -> FastAPI:
         prefix=f"{settings.api_prefix}/translation",
         tags=["Translation"]
     )
-    app.include_router(
-        generation.router,
-        prefix=f"{settings.api_prefix}/generation",
-        tags=["Generation"]
-    )
+    
+    # Generación: los workers de solo traducción ni siquiera importan el router
+    if settings.generation_enabled:
+        from app.api.routes import documents, generation, jobs
+        from app.api.services.jobs import JobRunner, JobStore
+        
+        app.state.jobs = JobRunner(JobStore(settings.jobs_dir))
+        app.include_router(
+            jobs.router,
+            prefix=f"{settings.api_prefix}/generation/jobs",
+            tags=["Jobs"]
+        )
+        app.include_router(
+            documents.router,
+            prefix=f"{settings.api_prefix}/generation/documents",
+            tags=["Documents"]
+        )
+        app.include_router(
+            generation.router,
+            prefix=f"{settings.api_prefix}/generation",
+            tags=["Generation"]
+        )
+    
+    if settings.profiling_enabled:
+        app.include_router(
+            profiling.router,
+            prefix=f"{settings.api_prefix}/profiles",
+            tags=["Profiling"]
+        )
     
     # Rutas de salud
     @app.get("/", tags=["Health"])
@@ -94,21 +178,37 @@ def create_app() -> FastAPI:
     @app.get("/health", tags=["Health"])
     def health_detailed():
         """Información detallada de salud."""
+        features = {"translation": "Español ↔ Braille"}
+        if settings.generation_enabled:
+            features["image_generation"] = "PNG"
+            features["pdf_generation"] = "PDF A4"
         return {
             "status": "operational",
             "app_name": settings.app_name,
             "version": settings.app_version,
             "environment": settings.environment,
-            "features": {
-                "translation": "Español ↔ Braille",
-                "image_generation": "PNG",
-                "pdf_generation": "PDF A4"
-            }
+            "features": features
         }
     
+    @app.get("/ready", tags=["Health"])
+    def readiness():
+        """Readiness: 200 solo cuando el warm-up ha terminado."""
+        if not is_ready():
+            return JSONResponse(status_code=503, content={"ready": False})
+        return {"ready": True}
+    
+    if settings.metrics_enabled:
+        @app.get("/metrics", tags=["Health"], include_in_schema=False)
+        def metrics_endpoint():
+            """Exposición de métricas en formato de texto Prometheus."""
+            return PlainTextResponse(
+                metrics.REGISTRY.render(),
+                media_type=metrics.CONTENT_TYPE
+            )
+    
     # Log de inicialización
-    app_logger.info(f"Aplicación iniciada: {settings.app_name} v{settings.app_version}")
-    app_logger.info(f"Ambiente: {settings.environment}")
+    app_logger.info("Aplicación iniciada: %s v%s", settings.app_name, settings.app_version)
+    app_logger.info("Ambiente: %s", settings.environment)
     
     return app
 
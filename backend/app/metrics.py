@@ -0,0 +1,466 @@
+"""
+Métricas estilo Prometheus e instrumentación de tiempos por etapa.
+
+Implementa un registro de métricas en memoria (sin dependencias externas)
+y lo expone en formato de texto de Prometheus en el endpoint /metrics.
+
+Series Expuestas:
+    - braille_http_requests_total: Conteo de peticiones por endpoint
+    - braille_http_request_duration_seconds: Latencia por endpoint
+    - braille_stage_duration_seconds: Tiempo por etapa (validation,
+      translation, rendering, png_encode, pdf_save)
+    - braille_input_size_chars: Distribución de tamaños de entrada
+    - braille_cache_requests_total: Aciertos/fallos por caché
+    - braille_worker_queue_depth: Profundidad de cola del pool de workers
+    - braille_scheduler_queue_wait_seconds / braille_scheduler_queue_depth /
+      braille_scheduler_shed_total: Cola del planificador por clase
+
+Características:
+    - Middleware ASGI puro (sin BaseHTTPMiddleware) para bajo overhead
+    - Temporizadores por etapa como context manager o decorador
+    - Coste prácticamente nulo cuando las métricas están deshabilitadas:
+      los temporizadores devuelven un context manager vacío compartido
+
+Uso:
+    from app.metrics import stage_timer, timed
+
+    with stage_timer("rendering"):
+        dibujar_celdas()
+
+    @timed("translation")
+    def traducir(texto): ...
+"""
+
+import threading
+from bisect import bisect_left
+from contextlib import nullcontext
+from functools import wraps
+from time import perf_counter
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+
+# Buckets de latencia en segundos (de sub-milisegundo a 10s)
+LATENCY_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+# Buckets de tamaño de entrada (caracteres o celdas)
+SIZE_BUCKETS = (1, 10, 50, 100, 250, 500, 1000, 5000, 10000, 100000, 1000000)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+_enabled = False
+
+
+def configure(enabled: bool) -> None:
+    """
+    Activa o desactiva la recolección de métricas.
+
+    Args:
+        enabled (bool): Si False, los temporizadores y el middleware
+                        no registran nada.
+    """
+    global _enabled
+    _enabled = enabled
+
+
+def is_enabled() -> bool:
+    """Indica si la recolección de métricas está activa."""
+    return _enabled
+
+
+def _format_labels(labelnames: Sequence[str], values: Tuple[str, ...],
+                   extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = [
+        f'{name}="{_escape(value)}"' for name, value in zip(labelnames, values)
+    ]
+    if extra:
+        pairs.append(f'{extra[0]}="{extra[1]}"')
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    """Base común: nombre, documentación, etiquetas e hijos por valor."""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values: str):
+        """
+        Obtiene (o crea) la serie hija para los valores de etiqueta dados.
+
+        Args:
+            *values: Valores de etiqueta en el orden de `labelnames`
+
+        Returns:
+            Serie hija con métodos inc/set/observe según el tipo
+        """
+        key = tuple(str(v) for v in values)
+        child = self._children.get(key)
+        if child is None:
+            if len(key) != len(self.labelnames):
+                raise ValueError(
+                    f"{self.name}: se esperaban {len(self.labelnames)} etiquetas, "
+                    f"recibidas {len(key)}"
+                )
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def collect(self) -> List[str]:
+        """Genera las líneas de exposición de texto de esta métrica."""
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.kind}",
+        ]
+        for key, child in sorted(self._children.items()):
+            lines.extend(self._collect_child(key, child))
+        return lines
+
+    def _collect_child(self, key, child) -> List[str]:
+        labels = _format_labels(self.labelnames, key)
+        return [f"{self.name}{labels} {_format_value(child.get())}"]
+
+
+class _ValueChild:
+    __slots__ = ("_value", "_lock", "_function")
+
+    def __init__(self):
+        self._value = 0.0
+        self._lock = threading.Lock()
+        self._function: Optional[Callable[[], float]] = None
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self._value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self._value -= amount
+
+    def set(self, value: float) -> None:
+        with self._lock:
+            self._value = value
+
+    def set_function(self, function: Callable[[], float]) -> None:
+        """Calcula el valor en cada scrape en lugar de almacenarlo."""
+        self._function = function
+
+    def get(self) -> float:
+        if self._function is not None:
+            return float(self._function())
+        return self._value
+
+
+class Counter(_Metric):
+    """Contador monótono creciente."""
+
+    kind = "counter"
+
+    def _new_child(self):
+        return _ValueChild()
+
+
+class Gauge(_Metric):
+    """Valor que puede subir y bajar (ej. profundidad de cola)."""
+
+    kind = "gauge"
+
+    def _new_child(self):
+        return _ValueChild()
+
+
+class _HistogramChild:
+    __slots__ = ("_bounds", "_counts", "_sum", "_lock")
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self._bounds = bounds
+        self._counts = [0] * (len(bounds) + 1)
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        index = bisect_left(self._bounds, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+
+    def snapshot(self) -> Tuple[List[int], float]:
+        with self._lock:
+            return list(self._counts), self._sum
+
+
+class Histogram(_Metric):
+    """Histograma con buckets acumulativos al estilo Prometheus."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def _collect_child(self, key, child) -> List[str]:
+        counts, total = child.snapshot()
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float("inf"),), counts):
+            cumulative += count
+            labels = _format_labels(self.labelnames, key, ("le", _format_value(bound)))
+            lines.append(f"{self.name}_bucket{labels} {cumulative}")
+        labels = _format_labels(self.labelnames, key)
+        lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+        lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class Registry:
+    """Colección de métricas expuestas en /metrics."""
+
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        """
+        Serializa todas las métricas en formato de texto de Prometheus.
+
+        Returns:
+            str: Cuerpo de respuesta para el endpoint /metrics
+        """
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.collect())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+HTTP_REQUESTS = REGISTRY.register(Counter(
+    "braille_http_requests_total",
+    "Peticiones HTTP procesadas",
+    ["method", "endpoint", "status"],
+))
+HTTP_LATENCY = REGISTRY.register(Histogram(
+    "braille_http_request_duration_seconds",
+    "Latencia de peticiones HTTP en segundos",
+    ["method", "endpoint"],
+))
+STAGE_DURATION = REGISTRY.register(Histogram(
+    "braille_stage_duration_seconds",
+    "Tiempo por etapa de procesamiento en segundos",
+    ["stage"],
+))
+INPUT_SIZE = REGISTRY.register(Histogram(
+    "braille_input_size_chars",
+    "Tamaño de la entrada por endpoint (caracteres o celdas)",
+    ["endpoint"],
+    buckets=SIZE_BUCKETS,
+))
+CACHE_REQUESTS = REGISTRY.register(Counter(
+    "braille_cache_requests_total",
+    "Accesos a cachés internas por resultado (hit/miss)",
+    ["cache", "result"],
+))
+WORKER_QUEUE_DEPTH = REGISTRY.register(Gauge(
+    "braille_worker_queue_depth",
+    "Tareas en espera de un worker libre",
+    ["pool"],
+))
+WORKER_ACTIVE = REGISTRY.register(Gauge(
+    "braille_worker_active",
+    "Tareas ejecutándose en el pool de workers",
+    ["pool"],
+))
+COALESCED_REQUESTS = REGISTRY.register(Counter(
+    "braille_coalesced_requests_total",
+    "Peticiones servidas por un renderizado idéntico ya en curso",
+    ["endpoint"],
+))
+JOBS_FINISHED = REGISTRY.register(Counter(
+    "braille_jobs_finished_total",
+    "Trabajos asíncronos de generación terminados por resultado",
+    ["status"],
+))
+SCHEDULER_QUEUE_WAIT = REGISTRY.register(Histogram(
+    "braille_scheduler_queue_wait_seconds",
+    "Espera en la cola del planificador por clase de prioridad",
+    ["class"],
+))
+SCHEDULER_QUEUE_DEPTH = REGISTRY.register(Gauge(
+    "braille_scheduler_queue_depth",
+    "Peticiones en espera en el planificador por clase de prioridad",
+    ["class"],
+))
+SCHEDULER_SHED = REGISTRY.register(Counter(
+    "braille_scheduler_shed_total",
+    "Peticiones descartadas por el planificador por clase y motivo",
+    ["class", "reason"],
+))
+
+
+class _StageTimer:
+    __slots__ = ("_child", "_start")
+
+    def __init__(self, stage: str):
+        self._child = STAGE_DURATION.labels(stage)
+
+    def __enter__(self):
+        self._start = perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._child.observe(perf_counter() - self._start)
+        return False
+
+
+_NULL_TIMER = nullcontext()
+
+
+def stage_timer(stage: str):
+    """
+    Context manager que mide la duración de una etapa.
+
+    Args:
+        stage (str): Nombre de la etapa (validation, translation,
+                     rendering, png_encode, pdf_save, ...)
+
+    Returns:
+        Context manager; uno vacío y compartido si las métricas están
+        deshabilitadas.
+
+    Example:
+        >>> with stage_timer("png_encode"):
+        ...     img.save(buffer, format="PNG")
+    """
+    if not _enabled:
+        return _NULL_TIMER
+    return _StageTimer(stage)
+
+
+def timed(stage: str):
+    """
+    Decorador que registra la duración de cada llamada como una etapa.
+
+    Args:
+        stage (str): Nombre de la etapa
+
+    Example:
+        >>> @timed("translation")
+        ... def text_to_braille(text): ...
+    """
+    def decorator(func):
+        child = STAGE_DURATION.labels(stage)
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            start = perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                child.observe(perf_counter() - start)
+
+        return wrapper
+    return decorator
+
+
+def observe_input_size(endpoint: str, size: int) -> None:
+    """Registra el tamaño de entrada de una petición."""
+    if _enabled:
+        INPUT_SIZE.labels(endpoint).observe(size)
+
+
+def observe_queue_wait(priority_class: str, seconds: float) -> None:
+    """Registra la espera en cola de una petición admitida por el planificador."""
+    if _enabled:
+        SCHEDULER_QUEUE_WAIT.labels(priority_class).observe(seconds)
+
+
+def record_shed(priority_class: str, reason: str) -> None:
+    """Registra una petición descartada por el planificador."""
+    if _enabled:
+        SCHEDULER_SHED.labels(priority_class, reason).inc()
+
+
+def record_cache(cache: str, hit: bool) -> None:
+    """Registra un acierto o fallo en una caché interna."""
+    if _enabled:
+        CACHE_REQUESTS.labels(cache, "hit" if hit else "miss").inc()
+
+
+def _route_template(scope) -> str:
+    """
+    Plantilla de ruta completa (con prefijo) de la petición atendida.
+
+    FastAPI reciente monta los routers incluidos de forma anidada y deja la
+    ruta completa en `scope["fastapi"]["effective_route_context"]`; versiones
+    anteriores la exponen directamente en `scope["route"].path`.
+    """
+    context = scope.get("fastapi", {}).get("effective_route_context")
+    path = getattr(context, "path", None) or getattr(scope.get("route"), "path", None)
+    return path or "<unmatched>"
+
+
+class MetricsMiddleware:
+    """
+    Middleware ASGI que cuenta peticiones y mide su latencia.
+
+    Etiqueta cada petición con la plantilla de ruta (ej.
+    "/api/v1/generation/image") y no con la URL cruda, para mantener
+    acotada la cardinalidad de las series.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not _enabled:
+            await self.app(scope, receive, send)
+            return
+
+        start = perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            endpoint = _route_template(scope)
+            method = scope.get("method", "")
+            HTTP_REQUESTS.labels(method, endpoint, status_code).inc()
+            HTTP_LATENCY.labels(method, endpoint).observe(perf_counter() - start)
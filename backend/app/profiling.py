@@ -0,0 +1,257 @@
+"""
+Profiling opcional por petición con cProfile.
+
+Permite averiguar dónde se va el tiempo de una petición lenta (ReportLab,
+Pillow, traducción) en producción sin instrumentar el código a mano.
+
+Activación (solo si PROFILING_ENABLED=true):
+    - Header `X-Profile: 1` en la petición (configurable con PROFILING_HEADER)
+    - Muestreo aleatorio con PROFILING_SAMPLE_RATE (0-1)
+
+Características:
+    - Perfila el hilo del event loop y, además, el trabajo que la petición
+      delega al pool de renderizado (workers.py), donde corren Pillow y
+      ReportLab
+    - Guarda un archivo pstats (.prof) por petición en PROFILING_DIR,
+      conservando solo los PROFILING_MAX_FILES más recientes
+    - Devuelve el nombre del perfil en el header `X-Profile-Id`
+    - Deshabilitado por defecto: el middleware ni siquiera se instala
+
+Limitaciones:
+    - El perfil del event loop incluye cualquier otra corrutina que se
+      ejecute en paralelo durante la petición
+    - Los endpoints síncronos que FastAPI ejecuta en su propio threadpool
+      (traducción) solo aparecen en la parte del event loop
+    - Desde Python 3.12 cProfile usa sys.monitoring, que admite un solo
+      profiler activo por proceso: si otro está activo (otra petición o
+      el otro hilo de esta) esa parte se ejecuta sin perfilar
+
+Uso:
+    $ curl -H "X-Profile: 1" -X POST .../generation/pdf -d '{"text": "..."}'
+    $ curl .../api/v1/profiles                    # listar
+    $ curl -O .../api/v1/profiles/<X-Profile-Id>  # descargar
+    $ python -m pstats <archivo>.prof
+"""
+
+import cProfile
+import os
+import pstats
+import random
+import re
+import threading
+import time
+import uuid
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Callable, List, Optional
+
+from starlette.concurrency import run_in_threadpool
+
+from app.config import settings
+from app.logger import get_logger
+
+
+logger = get_logger(__name__)
+
+PROFILE_SUFFIX = ".prof"
+_VALID_NAME = re.compile(r"^[A-Za-z0-9_.-]+\.prof$")
+
+
+class RequestProfile:
+    """
+    Perfiles acumulados de una petición (event loop + hilos worker).
+
+    Attributes:
+        name (str): Nombre del archivo .prof que se generará
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._profiles: List[cProfile.Profile] = []
+        self._lock = threading.Lock()
+
+    def start_profiler(self) -> Optional[cProfile.Profile]:
+        """
+        Crea y activa un profiler para el hilo actual y lo asocia a esta petición.
+
+        Returns:
+            El profiler activo, o None si ya hay otro activo en el proceso
+            (Python 3.12+)
+        """
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            return None
+        with self._lock:
+            self._profiles.append(profiler)
+        return profiler
+
+    def dump(self, directory: Path) -> Optional[Path]:
+        """
+        Combina todos los perfiles y los guarda en formato pstats.
+
+        Returns:
+            Path del archivo generado, o None si no hubo datos
+        """
+        stats = None
+        with self._lock:
+            profiles = list(self._profiles)
+        for profiler in profiles:
+            try:
+                if stats is None:
+                    stats = pstats.Stats(profiler)
+                else:
+                    stats.add(profiler)
+            except TypeError:
+                # Profiler sin datos (ej. hilo que no llegó a ejecutar nada)
+                continue
+        if stats is None:
+            return None
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / self.name
+        stats.dump_stats(str(path))
+        return path
+
+
+_current_profile: ContextVar[Optional[RequestProfile]] = ContextVar(
+    "braille_request_profile", default=None
+)
+
+
+def profiled_call(func: Callable[..., Any], *args, **kwargs) -> Any:
+    """
+    Ejecuta `func` bajo cProfile si la petición actual se está perfilando.
+
+    Pensado para los hilos worker: si no hay perfil activo, la llamada es
+    directa (una lectura de ContextVar de coste).
+    """
+    profile = _current_profile.get()
+    profiler = profile.start_profiler() if profile is not None else None
+    if profiler is None:
+        return func(*args, **kwargs)
+    try:
+        return func(*args, **kwargs)
+    finally:
+        profiler.disable()
+
+
+def profile_dir() -> Path:
+    """Directorio donde se guardan los perfiles."""
+    return Path(settings.profiling_dir)
+
+
+def list_profiles() -> List[dict]:
+    """
+    Lista los perfiles guardados, del más reciente al más antiguo.
+
+    Returns:
+        List[dict]: [{"name", "size_bytes", "created"}...]
+    """
+    directory = profile_dir()
+    if not directory.is_dir():
+        return []
+    entries = []
+    for path in directory.glob(f"*{PROFILE_SUFFIX}"):
+        stat = path.stat()
+        entries.append({
+            "name": path.name,
+            "size_bytes": stat.st_size,
+            "created": stat.st_mtime,
+        })
+    entries.sort(key=lambda e: e["created"], reverse=True)
+    return entries
+
+
+def resolve_profile(name: str) -> Optional[Path]:
+    """
+    Devuelve la ruta de un perfil existente, validando el nombre.
+
+    Args:
+        name (str): Nombre del archivo (sin directorios)
+
+    Returns:
+        Path o None si el nombre es inválido o el archivo no existe
+    """
+    if not _VALID_NAME.match(name):
+        return None
+    path = profile_dir() / name
+    return path if path.is_file() else None
+
+
+def _prune(directory: Path, keep: int) -> None:
+    files = sorted(directory.glob(f"*{PROFILE_SUFFIX}"), key=os.path.getmtime, reverse=True)
+    for old in files[keep:]:
+        try:
+            old.unlink()
+        except OSError:
+            pass
+
+
+def _save_profile(profile: RequestProfile) -> None:
+    """Guarda el perfil y poda los antiguos (E/S de disco, fuera del event loop)."""
+    directory = profile_dir()
+    path = profile.dump(directory)
+    if path is not None:
+        _prune(directory, settings.profiling_max_files)
+        logger.info("Perfil guardado: %s", path.name)
+
+
+def _profile_name(scope) -> str:
+    slug = re.sub(r"[^A-Za-z0-9]+", "-", scope.get("path", "")).strip("-") or "root"
+    stamp = time.strftime("%Y%m%dT%H%M%S")
+    return f"{stamp}_{scope.get('method', '')}_{slug}_{uuid.uuid4().hex[:8]}{PROFILE_SUFFIX}"
+
+
+class ProfilingMiddleware:
+    """
+    Middleware ASGI que perfila peticiones marcadas por header o muestreo.
+
+    Solo se instala cuando PROFILING_ENABLED es True, por lo que no añade
+    ningún coste en la configuración por defecto.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.header = settings.profiling_header.lower().encode("latin-1")
+        self.sample_rate = settings.profiling_sample_rate
+        self._loop_busy = threading.Lock()
+
+    def _should_profile(self, scope) -> bool:
+        if "/profiles" in scope.get("path", ""):
+            return False
+        for key, value in scope.get("headers", []):
+            if key == self.header:
+                return value.lower() in (b"1", b"true", b"yes")
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self._should_profile(scope):
+            await self.app(scope, receive, send)
+            return
+
+        profile = RequestProfile(_profile_name(scope))
+        token = _current_profile.set(profile)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((b"x-profile-id", profile.name.encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        # Solo un perfil del event loop a la vez (hasta 3.11 cada hilo tiene
+        # su profiler; desde 3.12 start_profiler falla si hay otro activo)
+        loop_profiler = None
+        if self._loop_busy.acquire(blocking=False):
+            loop_profiler = profile.start_profiler()
+            if loop_profiler is None:
+                self._loop_busy.release()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            if loop_profiler is not None:
+                loop_profiler.disable()
+                self._loop_busy.release()
+            _current_profile.reset(token)
+            await run_in_threadpool(_save_profile, profile)
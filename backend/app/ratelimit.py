@@ -0,0 +1,211 @@
+"""
+Control de admisión: límite de peticiones y de concurrencia por cliente.
+
+Sin él, un cliente que encadena peticiones a /generation/pdf puede ocupar
+todo el pool de renderizado. Las peticiones que exceden un límite se
+rechazan de inmediato con 429 y Retry-After, en lugar de esperar en cola:
+así la latencia de las admitidas no crece con la sobrecarga.
+
+Presupuestos (ver RATE_LIMIT_* en config.py):
+    - /generation: token bucket por cliente (RATE_LIMIT_GENERATION_RATE
+      peticiones/s, ráfaga RATE_LIMIT_GENERATION_BURST) y, además, un máximo
+      de peticiones simultáneas por cliente y en total (por proceso)
+    - /translation: token bucket propio, más generoso y sin límite de
+      concurrencia (la traducción es barata)
+    - /generation/jobs tiene su propio límite de trabajos activos y el
+      resto de rutas (/health, /metrics, ...) no se limitan
+
+Los buckets se guardan en memoria del proceso (MemoryStore). Con varios
+workers o servidores, RATE_LIMIT_STORE puede apuntar ("modulo:atributo") a
+una fábrica de otro almacén con el mismo método take(), por ejemplo uno
+compartido en Redis. Los límites de concurrencia son siempre por proceso.
+
+El cliente se identifica con app.utils.client_key (IP de la conexión).
+"""
+
+import importlib
+import math
+import threading
+import time
+from typing import Dict, NamedTuple, Optional, Tuple
+
+from starlette.requests import Request
+
+from app.config import settings
+from app.exceptions import RateLimitError, error_response
+from app.logger import get_logger, log_event
+from app.utils import client_key
+
+
+logger = get_logger(__name__)
+
+# Segundos sugeridos al cliente que excede un límite de concurrencia
+CONCURRENCY_RETRY_AFTER = 1
+
+
+class Budget(NamedTuple):
+    """Presupuesto de un grupo de rutas."""
+
+    name: str
+    rate: float  # Tokens repuestos por segundo
+    burst: int  # Capacidad del bucket
+    concurrency: bool  # Aplicar los límites de concurrencia
+
+
+class MemoryStore:
+    """
+    Buckets de tokens en memoria del proceso.
+
+    Cada bucket es (tokens, instante de la última actualización, instante
+    en que vuelve a estar lleno). Los buckets llenos equivalen a uno nuevo,
+    así que se descartan cuando hay más de `max_keys`.
+    """
+
+    def __init__(self, max_keys: int = 10000):
+        self.max_keys = max_keys
+        self._buckets: Dict[str, Tuple[float, float, float]] = {}
+        self._lock = threading.Lock()
+
+    def take(self, key: str, rate: float, burst: int) -> float:
+        """
+        Consume un token del bucket `key`.
+
+        Returns:
+            float: 0 si había token; si no, segundos hasta que lo haya
+        """
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated, _ = self._buckets.get(key, (burst, now, now))
+            tokens = min(burst, tokens + (now - updated) * rate)
+            wait = 0.0
+            if tokens >= 1:
+                tokens -= 1
+            else:
+                wait = (1 - tokens) / rate
+            self._buckets[key] = (tokens, now, now + (burst - tokens) / rate)
+            if len(self._buckets) > self.max_keys:
+                self._prune(now)
+        return wait
+
+    def _prune(self, now: float) -> None:
+        for key in [key for key, (_, _, full) in self._buckets.items() if full <= now]:
+            del self._buckets[key]
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+
+def load_store(target: str):
+    """
+    Almacén de buckets configurado.
+
+    Args:
+        target (str): "modulo:atributo" de una fábrica sin argumentos; vacío
+            para MemoryStore
+    """
+    if not target:
+        return MemoryStore()
+    module_name, attr = target.split(":")
+    return getattr(importlib.import_module(module_name), attr)()
+
+
+class RateLimitMiddleware:
+    """
+    Middleware ASGI de control de admisión.
+
+    Solo se instala si RATE_LIMIT_ENABLED es True. Se coloca dentro de
+    CORS para que los 429 lleven las cabeceras CORS y el frontend pueda
+    leer Retry-After.
+    """
+
+    def __init__(self, app, store=None):
+        self.app = app
+        self.store = store if store is not None else load_store(settings.rate_limit_store)
+        prefix = settings.api_prefix
+        self.exempt = f"{prefix}/generation/jobs"
+        self.budgets = (
+            (f"{prefix}/generation", Budget(
+                "generation", settings.rate_limit_generation_rate,
+                settings.rate_limit_generation_burst, concurrency=True,
+            )),
+            (f"{prefix}/translation", Budget(
+                "translation", settings.rate_limit_translation_rate,
+                settings.rate_limit_translation_burst, concurrency=False,
+            )),
+        )
+        self.client_concurrency = settings.rate_limit_client_concurrency
+        self.global_concurrency = settings.rate_limit_global_concurrency
+        # Peticiones de generación en curso (por cliente y total)
+        self._active: Dict[str, int] = {}
+        self._active_total = 0
+
+    def _budget(self, path: str) -> Optional[Budget]:
+        if path.startswith(self.exempt):
+            return None
+        for prefix, budget in self.budgets:
+            if path.startswith(prefix):
+                return budget
+        return None
+
+    def _admit(self, budget: Budget, client: str) -> None:
+        """
+        Comprueba los límites y reserva la plaza de concurrencia.
+
+        Raises:
+            RateLimitError: Si la petición excede algún límite
+        """
+        if budget.concurrency:
+            if self._active_total >= self.global_concurrency:
+                raise RateLimitError(
+                    "Servidor saturado, inténtelo de nuevo en unos segundos",
+                    retry_after=CONCURRENCY_RETRY_AFTER, code="SERVER_BUSY",
+                )
+            if self._active.get(client, 0) >= self.client_concurrency:
+                raise RateLimitError(
+                    f"Máximo de {self.client_concurrency} peticiones de generación simultáneas por cliente",
+                    retry_after=CONCURRENCY_RETRY_AFTER, code="TOO_MANY_CONCURRENT",
+                )
+        wait = self.store.take(f"{budget.name}:{client}", budget.rate, budget.burst)
+        if wait > 0:
+            raise RateLimitError(
+                f"Límite de {budget.rate:g} peticiones por segundo excedido",
+                retry_after=math.ceil(wait),
+            )
+        if budget.concurrency:
+            self._active[client] = self._active.get(client, 0) + 1
+            self._active_total += 1
+
+    def _release(self, client: str) -> None:
+        self._active_total -= 1
+        remaining = self._active[client] - 1
+        if remaining:
+            self._active[client] = remaining
+        else:
+            del self._active[client]
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        budget = self._budget(scope["path"])
+        if budget is None:
+            await self.app(scope, receive, send)
+            return
+
+        client = client_key(Request(scope))
+        try:
+            self._admit(budget, client)
+        except RateLimitError as exc:
+            # Muestreado: bajo sobrecarga habría un log por petición rechazada
+            log_event(logger, "Petición rechazada", sampled=True, client=client,
+                      budget=budget.name, code=exc.code, retry_after=exc.retry_after)
+            await error_response(exc)(scope, receive, send)
+            return
+
+        if not budget.concurrency:
+            await self.app(scope, receive, send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self._release(client)
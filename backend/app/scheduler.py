@@ -0,0 +1,259 @@
+"""
+Planificador por prioridad y descarte por sobrecarga.
+
+Las traducciones (microsegundos, interactivas: vista previa del frontend)
+y los renderizados (cientos de milisegundos) comparten proceso. Sin
+prioridades, una ráfaga de PDFs deja a las traducciones esperando detrás.
+
+Clases de prioridad (ver SCHEDULER_* en config.py):
+    - interactive (/translation): prioridad máxima, hasta SCHEDULER_SLOTS
+      peticiones en ejecución
+    - render (/generation, salvo /generation/jobs): como mucho
+      SCHEDULER_RENDER_SLOTS en ejecución, así que siempre quedan plazas
+      libres para las traducciones
+    - El resto de rutas (/health, /metrics, trabajos) no se planifican
+
+Cuando no hay plaza, la petición espera en la cola de su clase (FIFO). Al
+liberarse una plaza se atiende primero la clase más prioritaria.
+
+Descarte (503 Service Unavailable con Retry-After):
+    - Plazo de espera: cada petición espera como mucho el plazo de su clase
+      (SCHEDULER_*_DEADLINE_MS), o menos si el cliente lo pide con el header
+      SCHEDULER_DEADLINE_HEADER (ms); al vencer, se descarta
+    - Si la primera de la cola ya lleva esperando más que el plazo de la
+      nueva, esta se descarta de inmediato (no llegaría a tiempo)
+    - Con la cola llena (SCHEDULER_MAX_QUEUE), una petición desplaza a la
+      más reciente de una clase menos prioritaria; si no la hay, se descarta
+
+La espera en cola por clase se expone en braille_scheduler_queue_wait_seconds
+y los descartes en braille_scheduler_shed_total.
+
+Todo el estado vive en el event loop del proceso (sin locks).
+"""
+
+import asyncio
+import math
+import time
+from collections import deque
+from typing import Deque, Dict, Iterable, NamedTuple, Optional
+
+from app.config import settings
+from app.exceptions import OverloadError, error_response
+from app.metrics import SCHEDULER_QUEUE_DEPTH, observe_queue_wait, record_shed
+
+
+class PriorityClass(NamedTuple):
+    """Clase de prioridad del planificador."""
+
+    name: str
+    priority: int  # 0 = más prioritaria
+    max_running: int  # Peticiones de la clase en ejecución como máximo
+    deadline: float  # Espera máxima en cola (segundos)
+
+
+class _Waiter:
+    __slots__ = ("priority_class", "future", "enqueued")
+
+    def __init__(self, priority_class: PriorityClass, future: asyncio.Future, enqueued: float):
+        self.priority_class = priority_class
+        self.future = future
+        self.enqueued = enqueued
+
+
+class Scheduler:
+    """
+    Reparte plazas de ejecución entre clases de prioridad.
+
+    Example:
+        >>> await scheduler.acquire(render, deadline=2.0)
+        >>> try:
+        ...     await procesar()
+        ... finally:
+        ...     scheduler.release(render)
+    """
+
+    def __init__(self, classes: Iterable[PriorityClass], slots: int, max_queue: int):
+        self.classes = sorted(classes, key=lambda pc: pc.priority)
+        self.slots = slots
+        self.max_queue = max_queue
+        self._running: Dict[str, int] = {pc.name: 0 for pc in self.classes}
+        self._running_total = 0
+        self._queues: Dict[str, Deque[_Waiter]] = {pc.name: deque() for pc in self.classes}
+        for pc in self.classes:
+            SCHEDULER_QUEUE_DEPTH.labels(pc.name).set_function(
+                lambda queue=self._queues[pc.name]: len(queue)
+            )
+
+    @property
+    def running(self) -> int:
+        """Peticiones en ejecución (todas las clases)."""
+        return self._running_total
+
+    @property
+    def queued(self) -> int:
+        """Peticiones en espera (todas las clases)."""
+        return sum(len(queue) for queue in self._queues.values())
+
+    def _can_run(self, pc: PriorityClass) -> bool:
+        return self._running_total < self.slots and self._running[pc.name] < pc.max_running
+
+    def _start(self, pc: PriorityClass) -> None:
+        self._running[pc.name] += 1
+        self._running_total += 1
+
+    def _head_wait(self, pc: PriorityClass, now: float) -> float:
+        """Segundos que lleva esperando la primera petición de la cola de la clase."""
+        queue = self._queues[pc.name]
+        return now - queue[0].enqueued if queue else 0.0
+
+    def _shed(self, pc: PriorityClass, reason: str, retry_after: float) -> OverloadError:
+        record_shed(pc.name, reason)
+        return OverloadError(
+            "Servidor sobrecargado, petición descartada",
+            retry_after=max(1, math.ceil(retry_after)),
+        )
+
+    def _preempt(self, pc: PriorityClass, now: float) -> bool:
+        """Descarta la petición más reciente de una clase menos prioritaria."""
+        for victim_class in reversed(self.classes):
+            if victim_class.priority <= pc.priority:
+                return False
+            queue = self._queues[victim_class.name]
+            if queue:
+                waiter = queue.pop()
+                waiter.future.set_exception(
+                    self._shed(victim_class, "preempted", self._head_wait(victim_class, now))
+                )
+                return True
+        return False
+
+    async def acquire(self, pc: PriorityClass, deadline: float) -> float:
+        """
+        Espera una plaza de ejecución para la clase `pc`.
+
+        Args:
+            pc (PriorityClass): Clase de la petición
+            deadline (float): Espera máxima en cola (segundos)
+
+        Returns:
+            float: Segundos de espera en cola
+
+        Raises:
+            OverloadError: Si la petición se descarta
+        """
+        now = time.monotonic()
+        waiting_ahead = any(self._queues[c.name] for c in self.classes if c.priority <= pc.priority)
+        if not waiting_ahead and self._can_run(pc):
+            self._start(pc)
+            observe_queue_wait(pc.name, 0.0)
+            return 0.0
+
+        head_wait = self._head_wait(pc, now)
+        if head_wait > deadline:
+            raise self._shed(pc, "deadline", head_wait)
+        if self.queued >= self.max_queue and not self._preempt(pc, now):
+            raise self._shed(pc, "queue_full", head_wait)
+
+        waiter = _Waiter(pc, asyncio.get_running_loop().create_future(), now)
+        self._queues[pc.name].append(waiter)
+        try:
+            await asyncio.wait_for(waiter.future, timeout=deadline)
+        except asyncio.TimeoutError:
+            self._remove(waiter)
+            raise self._shed(pc, "deadline", deadline) from None
+        except asyncio.CancelledError:
+            # Cliente desconectado: devolver la plaza si ya se había concedido
+            future = waiter.future
+            if future.done() and not future.cancelled() and future.exception() is None:
+                self.release(pc)
+            else:
+                self._remove(waiter)
+            raise
+        return time.monotonic() - now
+
+    def _remove(self, waiter: _Waiter) -> None:
+        try:
+            self._queues[waiter.priority_class.name].remove(waiter)
+        except ValueError:
+            pass
+
+    def release(self, pc: PriorityClass) -> None:
+        """Libera una plaza y la concede a la siguiente petición por prioridad."""
+        self._running[pc.name] -= 1
+        self._running_total -= 1
+        now = time.monotonic()
+        for next_class in self.classes:
+            queue = self._queues[next_class.name]
+            while queue and self._can_run(next_class):
+                waiter = queue.popleft()
+                if waiter.future.done():
+                    continue
+                self._start(next_class)
+                observe_queue_wait(next_class.name, now - waiter.enqueued)
+                waiter.future.set_result(None)
+
+
+class SchedulerMiddleware:
+    """
+    Middleware ASGI que pasa las peticiones por el planificador.
+
+    Solo se instala si SCHEDULER_ENABLED es True. La plaza se ocupa hasta
+    que la respuesta termina de enviarse (incluidas las respuestas en
+    streaming).
+    """
+
+    def __init__(self, app, scheduler: Optional[Scheduler] = None):
+        self.app = app
+        prefix = settings.api_prefix
+        self.interactive = PriorityClass(
+            "interactive", 0, settings.scheduler_slots,
+            settings.scheduler_interactive_deadline_ms / 1000,
+        )
+        self.render = PriorityClass(
+            "render", 1, settings.scheduler_render_slots,
+            settings.scheduler_render_deadline_ms / 1000,
+        )
+        self.scheduler = scheduler if scheduler is not None else Scheduler(
+            (self.interactive, self.render), settings.scheduler_slots, settings.scheduler_max_queue,
+        )
+        self.routes = (
+            (f"{prefix}/generation/jobs", None),
+            (f"{prefix}/generation", self.render),
+            (f"{prefix}/translation", self.interactive),
+        )
+        self.deadline_header = settings.scheduler_deadline_header.lower().encode("latin-1")
+
+    def _classify(self, path: str) -> Optional[PriorityClass]:
+        for prefix, pc in self.routes:
+            if path.startswith(prefix):
+                return pc
+        return None
+
+    def _deadline(self, scope, pc: PriorityClass) -> float:
+        """Plazo de la clase, acortado por el header del cliente si lo envía."""
+        for key, value in scope.get("headers", []):
+            if key == self.deadline_header:
+                try:
+                    return min(pc.deadline, max(int(value), 0) / 1000)
+                except ValueError:
+                    break
+        return pc.deadline
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        pc = self._classify(scope["path"])
+        if pc is None:
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            await self.scheduler.acquire(pc, self._deadline(scope, pc))
+        except OverloadError as exc:
+            await error_response(exc)(scope, receive, send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.scheduler.release(pc)
@@ -0,0 +1,114 @@
+"""
+Lanzador de producción multi-worker.
+
+Arranca la API con gunicorn y workers de uvicorn (paquete uvicorn-worker):
+
+    - N procesos worker (WORKERS; 0 = uno por CPU)
+    - preload_app: el proceso padre importa la app y ejecuta el warm-up
+      (tablas, fuentes, sprites) antes de hacer fork, así los workers
+      comparten esa memoria copy-on-write
+    - gc.freeze() tras el warm-up para que el recolector de basura de los
+      hijos no toque (y duplique) las páginas heredadas
+    - Reciclado de workers cada MAX_REQUESTS peticiones (con jitter) para
+      acotar el crecimiento de memoria de Pillow
+    - Reinicio elegante: `kill -HUP <pid>` re-crea los workers sin cortar
+      peticiones en curso; SIGTERM espera GRACEFUL_TIMEOUT segundos
+
+Si gunicorn no está disponible (ej. Windows), recurre a uvicorn con
+múltiples workers, sin preload.
+
+Uso:
+    $ python -m app.server
+    $ WORKERS=8 MAX_REQUESTS=2000 python -m app.server
+"""
+
+import gc
+import os
+from typing import Any, Dict
+
+from app.config import settings
+from app.logger import get_logger
+
+
+logger = get_logger(__name__)
+
+
+def worker_count() -> int:
+    """Número de workers configurado (WORKERS=0 → uno por CPU)."""
+    if settings.workers > 0:
+        return settings.workers
+    return os.cpu_count() or 1
+
+
+def gunicorn_options() -> Dict[str, Any]:
+    """
+    Configuración de gunicorn derivada de Settings.
+
+    Returns:
+        dict: Opciones válidas para `gunicorn.config.Config.set`
+    """
+    return {
+        "bind": f"{settings.host}:{settings.port}",
+        "workers": worker_count(),
+        "worker_class": "uvicorn_worker.UvicornWorker",
+        "preload_app": True,
+        "max_requests": settings.max_requests,
+        "max_requests_jitter": settings.max_requests_jitter,
+        "graceful_timeout": settings.graceful_timeout,
+        "timeout": settings.worker_timeout,
+        "loglevel": settings.log_level.lower(),
+    }
+
+
+def load_application():
+    """
+    Importa la app y la precalienta en el proceso actual.
+
+    Con preload_app esto ocurre una única vez en el proceso padre.
+    """
+    from app.main import app
+    from app.warmup import warm_up
+
+    warm_up()
+    gc.freeze()
+    return app
+
+
+def run() -> None:
+    """Arranca el servidor de producción."""
+    try:
+        from gunicorn.app.base import BaseApplication
+    except ImportError:
+        import uvicorn
+
+        logger.warning("gunicorn no disponible: usando uvicorn sin preload")
+        uvicorn.run(
+            "app.main:app",
+            host=settings.host,
+            port=settings.port,
+            workers=worker_count(),
+            limit_max_requests=settings.max_requests or None,
+            timeout_graceful_shutdown=settings.graceful_timeout,
+            log_level=settings.log_level.lower(),
+        )
+        return
+
+    class BrailleServer(BaseApplication):
+        """Aplicación gunicorn configurada desde Settings."""
+
+        def __init__(self, options: Dict[str, Any]):
+            self.options = options
+            super().__init__()
+
+        def load_config(self):
+            for key, value in self.options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            return load_application()
+
+    BrailleServer(gunicorn_options()).run()
+
+
+if __name__ == "__main__":
+    run()
@@ -6,11 +6,25 @@ Funciones auxiliares y helpers reutilizables:
     - Formateo
     - Conversión de datos
     - Utilidades de string
+    - Escapado de texto para documentos XML
+    - Identificación de clientes HTTP
+    - Troceado de respuestas binarias sin copias
 
 Uso:
     from app.utils import sanitize_text, format_braille_cells
 """
 
+import re
+import unicodedata
+from typing import Iterator
+from urllib.parse import quote
+from xml.sax.saxutils import escape
+
+
+# Caracteres que XML 1.0 no admite ni escapados (controles C0 salvo
+# tabulador y saltos de línea, sustitutos sueltos, U+FFFE y U+FFFF)
+_XML_INVALID = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f\ud800-\udfff\ufffe\uffff]")
+
 
 def sanitize_text(text: str, max_length: int = 1000) -> str:
     """
@@ -101,3 +115,80 @@ def truncate_text(text: str, length: int = 50, suffix: str = "...") -> str:
     if len(text) <= length:
         return text
     return text[:length - len(suffix)] + suffix
+
+
+def content_disposition(filename: str) -> str:
+    """
+    Construye un header Content-Disposition de descarga seguro para HTTP.
+    
+    Los headers HTTP solo admiten latin-1, por lo que un nombre como
+    "braille_Baño.png" no puede enviarse tal cual. Se incluye un nombre
+    ASCII de respaldo y el nombre real codificado según RFC 5987.
+    
+    Args:
+        filename (str): Nombre de archivo sugerido (puede contener Unicode)
+    
+    Returns:
+        str: Valor del header Content-Disposition
+    
+    Examples:
+        >>> content_disposition("braille_Baño.png")
+        'attachment; filename="braille_Bano.png"; filename*=UTF-8\'\'braille_Ba%C3%B1o.png'
+    """
+    fallback = unicodedata.normalize("NFKD", filename).encode("ascii", "ignore").decode("ascii")
+    fallback = fallback.replace('"', "").replace("\\", "") or "braille"
+    return f"attachment; filename=\"{fallback}\"; filename*=UTF-8''{quote(filename)}"
+
+
+def xml_escape(text: str) -> str:
+    """
+    Escapa texto para insertarlo en un documento XML.
+
+    Además de &, < y > (xml.sax.saxutils.escape), elimina los caracteres
+    que XML prohíbe, que dejarían el documento mal formado.
+
+    Examples:
+        >>> xml_escape("a < b\x01")
+        'a &lt; b'
+    """
+    return escape(_XML_INVALID.sub("", text))
+
+
+def iter_chunks(data: bytes, chunk_size: int = 256 * 1024) -> Iterator[memoryview]:
+    """
+    Recorre un contenido binario en trozos de tamaño fijo sin copiarlo.
+    
+    Cada trozo es una vista (memoryview) sobre `data`; solo el último
+    puede ser más corto.
+    
+    Args:
+        data (bytes): Contenido completo
+        chunk_size (int): Tamaño de cada trozo en bytes
+    
+    Yields:
+        memoryview: Trozos consecutivos de `data`
+    
+    Examples:
+        >>> [bytes(chunk) for chunk in iter_chunks(b"abcde", 2)]
+        [b'ab', b'cd', b'e']
+    """
+    view = memoryview(data)
+    for start in range(0, len(view), chunk_size):
+        yield view[start:start + chunk_size]
+
+
+def client_key(request) -> str:
+    """
+    Identifica al cliente de una petición para límites por cliente.
+    
+    Usa la dirección IP de la conexión. Detrás de un proxy inverso, uvicorn
+    debe arrancarse con --proxy-headers para que refleje X-Forwarded-For.
+    
+    Args:
+        request: Petición de Starlette/FastAPI
+    
+    Returns:
+        str: Clave del cliente ("anonymous" si no se conoce la IP)
+    """
+    client = request.client
+    return client.host if client and client.host else "anonymous"
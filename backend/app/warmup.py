@@ -0,0 +1,70 @@
+"""
+Precarga (warm-up) de recursos costosos y estado de readiness.
+
+Reúne en un solo lugar todo lo que conviene cargar antes de atender
+tráfico, para que la primera petición no pague la inicialización:
+
+    - Tablas de traducción (BRAILLE_MAP, REVERSE_BRAILLE_MAP)
+    - Fuente del encabezado de las imágenes
+    - Atlas de sprites de las 64 celdas Braille
+    - Módulos y métricas de fuentes de ReportLab (un PDF de prueba)
+
+Los recursos de renderizado solo se precargan si GENERATION_ENABLED=true.
+
+Con el lanzador de producción (app.server) el warm-up se ejecuta en el
+proceso padre antes de hacer fork, de modo que todos los workers
+comparten estas estructuras en modo copy-on-write.
+
+Uso:
+    from app.warmup import warm_up, is_ready
+
+    warm_up()          # idempotente
+    assert is_ready()
+"""
+
+import threading
+import time
+
+from app.config import settings
+from app.logger import get_logger
+
+
+logger = get_logger(__name__)
+
+_ready = threading.Event()
+_lock = threading.Lock()
+
+
+def is_ready() -> bool:
+    """Indica si el warm-up terminó y el proceso puede recibir tráfico."""
+    return _ready.is_set()
+
+
+def warm_up() -> None:
+    """
+    Carga tablas, fuentes y sprites; marca el proceso como listo.
+
+    Es idempotente y segura entre hilos: llamadas concurrentes esperan a
+    que termine la primera.
+    """
+    if _ready.is_set():
+        return
+    with _lock:
+        if _ready.is_set():
+            return
+        start = time.perf_counter()
+
+        from app.api.services.translator import text_to_braille, braille_to_text
+        braille_to_text(text_to_braille("Señalética Braille 123"))
+
+        # Un worker de solo traducción no carga Pillow ni ReportLab
+        if settings.generation_enabled:
+            from app.api.services.generator import BrailleImageGenerator, load_font
+            from app.api.services.renderers import get_renderer
+
+            load_font(20)
+            BrailleImageGenerator()._cell_sprites()
+            get_renderer("pdf")("Braille")
+
+        _ready.set()
+        logger.info("Warm-up completado en %.0f ms", (time.perf_counter() - start) * 1000)
@@ -0,0 +1,115 @@
+"""
+Benchmark de throughput del transcriptor por lotes (app.cli).
+
+Genera un corpus de libros sintéticos (texto en español con párrafos,
+números y mayúsculas) en un directorio temporal y mide los MB/s de
+entrada transcritos por formato y número de procesos (--jobs). Cada
+medida incluye la lectura de los archivos y la escritura de las salidas.
+
+Uso (desde backend/):
+    python -m benchmarks.bench_cli
+    python -m benchmarks.bench_cli --books 16 --size-mb 4 --jobs 1 2 4 8
+
+Resultado de referencia (8 libros de 2 MB, máquina de 1 CPU, mediana de
+3 repeticiones; los valores varían según la máquina):
+
+    formato  jobs      MB/s
+    txt      1         28.4
+    txt      2         23.1
+    brf      1         14.6
+    brf      2         16.5
+
+Cada worker transcribe un libro entero: txt traduce el archivo mapeado
+en memoria por bloques de MAPPED_BLOCK_SIZE (camino de bytes de
+PackedTranslator, ver bench_mapped.py) y brf párrafo a párrafo, porque el
+paginador corta cada párrafo en líneas. El throughput escala con --jobs
+mientras haya CPUs libres y más libros que procesos; con una sola CPU,
+como en la tabla, el pool solo añade el arranque de los procesos (y
+ruido). txt escribe los bytes UTF-8 directamente (ver
+app.cli.cells_to_utf8); pasar por str.translate lo dejaba en 6.9 MB/s
+con el traductor anterior. png y pdf rinden órdenes de magnitud menos
+(dibujo de páginas) y no se incluyen por defecto.
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List
+
+from app.cli import FORMATS, Options, Progress, collect_inputs, run
+
+
+PARAGRAPH_WORDS = (
+    "la señalética Braille permite a las personas con discapacidad visual "
+    "orientarse de forma autónoma en edificios públicos salida de emergencia "
+    "piso baño ascensor escalera recepción Madrid Chile sección capítulo"
+).split()
+
+
+def write_corpus(directory: Path, books: int, size: int) -> List[str]:
+    """Escribe `books` libros deterministas de unos `size` bytes."""
+    rng = random.Random(0)
+    paths = []
+    for index in range(books):
+        parts = []
+        written = 0
+        while written < size:
+            words = [rng.choice(PARAGRAPH_WORDS) for _ in range(rng.randint(40, 120))]
+            words[0] = words[0].capitalize()
+            words.insert(rng.randrange(len(words)), str(rng.randint(1, 2030)))
+            paragraph = " ".join(words) + ".\n"
+            parts.append(paragraph)
+            written += len(paragraph.encode("utf-8"))
+        path = directory / f"libro_{index:03d}.txt"
+        path.write_text("".join(parts), encoding="utf-8")
+        paths.append(str(path))
+    return paths
+
+
+def measure(files: List[str], output_dir: str, fmt: str, jobs: int, repeat: int) -> float:
+    """MB/s de entrada (mediana de `repeat` ejecuciones)."""
+    total = sum(os.path.getsize(path) for path in files)
+    rates = []
+    for _ in range(repeat):
+        progress = Progress(len(files), total, sys.stderr, enabled=False)
+        start = time.perf_counter()
+        failed = run(files, output_dir, Options(fmt, None, None), jobs, progress)
+        elapsed = time.perf_counter() - start
+        if failed:
+            raise RuntimeError(f"{failed} archivos fallaron en {fmt}")
+        rates.append(total / 1e6 / elapsed)
+    return statistics.median(rates)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--books", type=int, default=8, help="Libros del corpus")
+    parser.add_argument("--size-mb", type=float, default=2.0, help="Tamaño de cada libro (MB)")
+    parser.add_argument("--formats", nargs="+", choices=FORMATS, default=["txt", "brf"])
+    parser.add_argument("--jobs", nargs="+", type=int, default=None,
+                        help="Procesos a medir (Default: 1 y uno por CPU)")
+    parser.add_argument("--repeat", type=int, default=3, help="Repeticiones por medida")
+    args = parser.parse_args()
+    jobs_list = args.jobs or sorted({1, os.cpu_count() or 1})
+
+    with tempfile.TemporaryDirectory() as workdir:
+        corpus = Path(workdir) / "corpus"
+        output = Path(workdir) / "salida"
+        corpus.mkdir()
+        output.mkdir()
+        write_corpus(corpus, args.books, int(args.size_mb * 1e6))
+        files = collect_inputs([str(corpus)])
+        print(f"{'formato':<9}{'jobs':<6}{'MB/s':>8}")
+        for fmt in args.formats:
+            for jobs in jobs_list:
+                rate = measure(files, str(output), fmt, jobs, args.repeat)
+                print(f"{fmt:<9}{jobs:<6}{rate:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+Benchmark de compresión de respuestas: ancho de banda frente a CPU.
+
+Comprime respuestas típicas de la API con gzip y brotli a varios niveles
+y muestra el tamaño resultante, la proporción sobre el original y el
+tiempo de compresión (mediana).
+
+Cargas:
+    - traducción: JSON de /translation/to-braille para un texto de 500
+      caracteres (celdas como listas anidadas)
+    - svg: /generation/svg de una señal de 80 caracteres
+    - brf / pef: documentos de 20.000 caracteres
+    - stl: placa táctil de 40 caracteres
+
+Uso (desde backend/):
+    python -m benchmarks.bench_compression
+    python -m benchmarks.bench_compression --repeat 50
+
+Resultado de referencia (mediana de 20 repeticiones; los tiempos varían
+según la máquina):
+
+    carga           bytes  gzip-1          gzip-5          gzip-6          gzip-9          br-1            br-4            br-6            br-11
+    traducción      7_112  21.0% 0.05ms    14.1% 0.09ms    12.8% 0.10ms    12.5% 0.18ms    23.1% 0.04ms    16.1% 0.11ms    12.7% 0.15ms    11.4% 17.00ms
+    svg             9_646  12.6% 0.04ms    10.1% 0.08ms    9.5% 0.10ms     9.3% 0.12ms     12.4% 0.03ms    9.4% 0.12ms     8.3% 0.16ms     7.4% 32.12ms
+    brf            21_703  24.0% 0.23ms    19.3% 0.49ms    18.5% 0.85ms    18.5% 1.12ms    23.4% 0.10ms    21.8% 0.39ms    18.9% 0.79ms    17.2% 48.84ms
+    pef            77_179  12.8% 0.55ms    8.7% 0.99ms     7.6% 1.84ms     7.1% 9.72ms     11.9% 0.25ms    9.7% 0.76ms     7.5% 1.51ms     6.3% 205.25ms
+    stl           335_484  20.9% 3.63ms    17.4% 7.68ms    17.3% 11.57ms   17.5% 35.04ms   22.9% 1.31ms    16.2% 4.02ms    10.5% 6.93ms    6.0% 810.35ms
+
+gzip 5 (GZIP_LEVEL) deja los formatos de texto entre el 9 y el 19 % de su
+tamaño en menos de un milisegundo; gzip 9 apenas gana y en el PEF es diez
+veces más lento. brotli 4 (BROTLI_LEVEL) no es más rápido que gzip 5 en
+todo: en las respuestas pequeñas tarda algo más (0.11-0.12 ms frente a
+0.08-0.09 ms) y comprime peor la traducción y algo mejor el SVG; en BRF
+y PEF queda uno o dos puntos por detrás con un 20-25 % menos de tiempo,
+y en el STL ocupa menos y tarda la mitad. Los niveles 10-11 multiplican
+el coste por cien y solo tienen sentido para contenido estático.
+"""
+
+import argparse
+import json
+import random
+import statistics
+import time
+import zlib
+from typing import Callable, Dict, List, Tuple
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+from app.api.services.embosser import generate_braille_brf, generate_braille_pef
+from app.api.services.svg import generate_braille_svg
+from app.api.services.tactile import generate_braille_stl
+from app.api.services.translator import text_to_braille
+
+
+SAMPLE = (
+    "La señalética Braille permite a las personas con discapacidad visual "
+    "orientarse de forma autónoma: Salida de emergencia, Piso 2, Baño 12. "
+)
+
+
+def _document(length: int) -> str:
+    """Texto determinista con las palabras de SAMPLE en orden aleatorio."""
+    words = SAMPLE.split()
+    rng = random.Random(0)
+    text = ""
+    while len(text) < length:
+        text += " ".join(rng.choice(words) for _ in range(12)) + "\n"
+    return text[:length]
+
+
+def payloads() -> Dict[str, bytes]:
+    """Cuerpos de respuesta representativos de cada endpoint."""
+    text = _document(500)
+    cells = text_to_braille(text)
+    translation = json.dumps({
+        "original_text": text,
+        "braille_cells": cells,
+        "braille_string_repr": "|".join("".join(map(str, c)) if c else "_" for c in cells),
+    }, ensure_ascii=False).encode("utf-8")
+    document = _document(20000)
+    return {
+        "traducción": translation,
+        "svg": generate_braille_svg(text[:80]).getvalue(),
+        "brf": generate_braille_brf(document).getvalue(),
+        "pef": generate_braille_pef(document).getvalue(),
+        "stl": generate_braille_stl(text[:40]).getvalue(),
+    }
+
+
+def codecs() -> List[Tuple[str, Callable[[bytes], bytes]]]:
+    """Codificaciones y niveles a comparar."""
+    result = [
+        (f"gzip-{level}", lambda data, level=level: zlib.compress(data, level, wbits=31))
+        for level in (1, 5, 6, 9)
+    ]
+    if brotli is not None:
+        result += [
+            (f"br-{level}", lambda data, level=level: brotli.compress(data, quality=level))
+            for level in (1, 4, 6, 11)
+        ]
+    return result
+
+
+def _measure(func: Callable[[bytes], bytes], data: bytes, repeat: int) -> Tuple[float, int]:
+    times = []
+    size = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        size = len(func(data))
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1000, size
+
+
+def run(repeat: int) -> None:
+    selected = codecs()
+    print(f"{'carga':<12}{'bytes':>9}  " + "".join(f"{name:<16}" for name, _ in selected))
+    for name, data in payloads().items():
+        cells = []
+        for _, func in selected:
+            ms, size = _measure(func, data, repeat)
+            cells.append(f"{size / len(data):.1%} {ms:.2f}ms")
+        print(f"{name:<12}{len(data):>9_}  " + "".join(f"{cell:<16}" for cell in cells))
+    if brotli is None:
+        print("\n(brotli no instalado: solo gzip)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=20, help="Repeticiones por medida")
+    args = parser.parse_args()
+    run(args.repeat)
+
+
+if __name__ == "__main__":
+    main()
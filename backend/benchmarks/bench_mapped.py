@@ -0,0 +1,147 @@
+"""
+Benchmark de la traducción de archivos de texto grandes (mmap + bloques).
+
+Mide, sobre libros sintéticos (ver bench_cli.write_corpus):
+
+    - Throughput de traducción en MB/s de entrada: la decodificación UTF-8
+      sola (el techo), PackedTranslator por str.translate y por el camino
+      de bytes que usa con fragmentos largos, y un archivo completo leído
+      mapeado en memoria
+    - Memoria residente máxima (VmHWM de un proceso hijo por medida) al
+      traducir un archivo leyéndolo entero (read + text_to_packed) o
+      mapeado en memoria por bloques (ingest.iter_mapped_text)
+
+Uso (desde backend/):
+    python -m benchmarks.bench_mapped
+    python -m benchmarks.bench_mapped --sizes-mb 16 256 --repeat 5
+
+Resultado de referencia (máquina de 1 CPU, mediana de 3 repeticiones; los
+valores varían según la máquina):
+
+    traducción (libro de 64 MB)           MB/s
+    decodificación UTF-8                 576.0
+    str.translate                         16.7
+    bytes                                 41.9
+    mapeado por bloques (archivo)         64.8
+
+    tamaño    RSS leído entero   RSS mapeado
+    16 MB             147.5 MB       72.9 MB
+    64 MB             391.5 MB       80.9 MB
+    256 MB           1426.8 MB       84.7 MB
+
+El camino de bytes multiplica por 2.5-4 el de str.translate, y por
+bloques de MAPPED_BLOCK_SIZE rinde más que con el libro entero de una vez
+(las copias intermedias caben en caché y no fuerzan a pedir memoria
+nueva al sistema). Sigue lejos de la decodificación: lo que queda es la
+expresión regular de los tramos numéricos y una pasada de bytes.replace
+por cada mayúscula distinta. Leyendo el archivo entero la memoria crece
+con el archivo (texto, celdas y copias intermedias); mapeado, se queda
+en el intérprete más un par de bloques.
+"""
+
+import argparse
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, List
+
+from app.api.services import translator
+from app.api.services.ingest import iter_mapped_text
+from app.api.services.translator import PackedTranslator, text_to_packed
+from benchmarks.bench_cli import write_corpus
+
+
+MODES = ("read", "mapped")
+
+
+def translate_read(path: str) -> int:
+    """Lee el archivo entero y lo traduce de una vez."""
+    with open(path, encoding="utf-8") as file:
+        return len(text_to_packed(file.read()))
+
+
+def translate_mapped(path: str) -> int:
+    """Traduce el archivo mapeado en memoria, bloque a bloque."""
+    packed = PackedTranslator()
+    return sum(len(packed.feed(block)) for block in iter_mapped_text(path))
+
+
+def rate(func: Callable[[], object], size: int, repeat: int) -> float:
+    """MB/s de entrada (mediana de `repeat` ejecuciones)."""
+    rates = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        rates.append(size / 1e6 / (time.perf_counter() - start))
+    return statistics.median(rates)
+
+
+def peak_rss(mode: str, path: str) -> float:
+    """Memoria residente máxima (MB) de un proceso hijo que traduce `path`."""
+    output = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_mapped", "--child", mode, path],
+        capture_output=True, check=True, text=True,
+    ).stdout
+    return float(output)
+
+
+def child(mode: str, path: str) -> None:
+    (translate_read if mode == "read" else translate_mapped)(path)
+    # VmHWM se reinicia con exec; ru_maxrss (KB en Linux) puede heredar
+    # el máximo del proceso padre
+    try:
+        with open("/proc/self/status") as status:
+            peak_kb = next(int(line.split()[1]) for line in status if line.startswith("VmHWM:"))
+    except OSError:
+        peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(peak_kb / 1024)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes-mb", nargs="+", type=int, default=[16, 64, 256],
+                        help="Tamaños de libro a medir (MB)")
+    parser.add_argument("--repeat", type=int, default=3, help="Repeticiones por medida")
+    parser.add_argument("--child", nargs=2, metavar=("MODO", "RUTA"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child(*args.child)
+        return
+
+    with tempfile.TemporaryDirectory() as workdir:
+        books: List[Path] = []
+        for size_mb in args.sizes_mb:
+            directory = Path(workdir) / str(size_mb)
+            directory.mkdir()
+            books.append(Path(write_corpus(directory, 1, size_mb * 1_000_000)[0]))
+
+        book = books[len(books) // 2]
+        data = book.read_bytes()
+        text = data.decode("utf-8")
+        print(f"{'traducción (libro de ' + str(len(data) // 1_000_000) + ' MB)':<34}{'MB/s':>8}")
+        print(f"{'decodificación UTF-8':<34}{rate(lambda: data.decode('utf-8'), len(data), args.repeat):>8.1f}")
+        # Sin umbral, todo fragmento va por str.translate
+        threshold = translator._BYTES_MIN_LENGTH
+        translator._BYTES_MIN_LENGTH = len(text) + 1
+        try:
+            print(f"{'str.translate':<34}{rate(lambda: text_to_packed(text), len(data), args.repeat):>8.1f}")
+        finally:
+            translator._BYTES_MIN_LENGTH = threshold
+        print(f"{'bytes':<34}{rate(lambda: text_to_packed(text), len(data), args.repeat):>8.1f}")
+        print(f"{'mapeado por bloques (archivo)':<34}"
+              f"{rate(lambda: translate_mapped(str(book)), len(data), args.repeat):>8.1f}")
+        del data, text
+
+        print()
+        print(f"{'tamaño':<9}{'RSS leído entero':>17}{'RSS mapeado':>14}")
+        for size_mb, path in zip(args.sizes_mb, books):
+            read_rss, mapped_rss = (peak_rss(mode, str(path)) for mode in MODES)
+            print(f"{str(size_mb) + ' MB':<9}{read_rss:>14.1f} MB{mapped_rss:>11.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Benchmark de codificación PNG por modo de imagen y nivel de compresión.
+
+Mide, para una señal de una línea (/generation/image) y una página
+completa (/generation/image/pages), el tiempo de codificación y el tamaño
+del PNG en cada modo (RGB, L, P, 1), nivel zlib y opción optimize. La
+composición (pegar sprites) se hace una vez por caso y no se mide.
+
+Uso (desde backend/):
+    python -m benchmarks.bench_png
+    python -m benchmarks.bench_png --dpi 300 --repeat 5
+
+Resultado de referencia (72 dpi, página de 30×20 celdas, mediana de 20
+repeticiones; los tiempos varían según la máquina):
+
+    caso    modo  nivel  optimize      ms      bytes
+    señal   RGB   6      no           5.7     10_031
+    señal   P     6      no           2.0      3_374
+    página  RGB   6      no          80.5    103_484
+    página  L     6      no          36.7     43_002
+    página  P     3      no          14.5     44_031
+    página  P     6      no          21.2     31_088
+    página  P     9      sí         105.9     29_658
+    página  1     6      no          16.9     19_436
+
+"P" con nivel 6 es el valor por defecto (IMAGE_MODE, PNG_COMPRESS_LEVEL):
+conserva el antialiasing con 4 bits por píxel, ocupa menos de un tercio
+que RGB y codifica unas 4 veces más rápido. El nivel 9 u optimize apenas
+reducen un 5 % el tamaño y multiplican por 5 el tiempo. "1" es la opción
+más pequeña para impresión en blanco y negro (sin antialiasing).
+"""
+
+import argparse
+import statistics
+import time
+from io import BytesIO
+from typing import List, Tuple
+
+from app.api.services.generator import IMAGE_MODES, BrailleImageGenerator
+
+
+SIGN_TEXT = "Salida de emergencia - Piso 2"
+PAGE_TEXT = (
+    "La señalética Braille permite a las personas con discapacidad visual "
+    "orientarse de forma autónoma en edificios públicos. "
+) * 12
+
+CONFIGS: List[Tuple[int, bool]] = [(1, False), (3, False), (6, False), (9, False), (9, True)]
+
+
+def _measure(generator: BrailleImageGenerator, image, repeat: int) -> Tuple[float, int]:
+    times = []
+    size = 0
+    for _ in range(repeat):
+        buffer = BytesIO()
+        start = time.perf_counter()
+        image.save(buffer, format="PNG", compress_level=generator.compress_level,
+                   optimize=generator.optimize)
+        times.append(time.perf_counter() - start)
+        size = buffer.tell()
+    return statistics.median(times) * 1000, size
+
+
+def _decode(buffer: BytesIO):
+    from PIL import Image
+
+    image = Image.open(buffer)
+    image.load()
+    return image
+
+
+def run(dpi: int, repeat: int) -> None:
+    print(f"{'caso':<8}{'modo':<6}{'nivel':<7}{'optimize':<10}{'ms':>8}{'bytes':>11}")
+    for mode in IMAGE_MODES:
+        base = BrailleImageGenerator(mode=mode, dpi=dpi)
+        layout = base.layout(PAGE_TEXT)
+        cases = {
+            "señal": _decode(base.generate_image(SIGN_TEXT)),
+            "página": base.render_page(layout, 1),
+        }
+        for name, image in cases.items():
+            for level, optimize in CONFIGS:
+                generator = BrailleImageGenerator(mode=mode, dpi=dpi, compress_level=level,
+                                                  optimize=optimize)
+                ms, size = _measure(generator, image, repeat)
+                print(f"{name:<8}{mode:<6}{level:<7}{'sí' if optimize else 'no':<10}"
+                      f"{ms:>8.1f}{size:>11_}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--dpi", type=int, default=None, help="Resolución (Default: 72)")
+    parser.add_argument("--repeat", type=int, default=20, help="Repeticiones por medida")
+    args = parser.parse_args()
+    run(args.dpi, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
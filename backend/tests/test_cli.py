@@ -0,0 +1,156 @@
+"""
+Tests para el transcriptor por lotes de la línea de comandos (app.cli).
+"""
+
+import subprocess
+import sys
+from io import BytesIO
+from pathlib import Path
+
+import pytest
+
+from app import cli
+from app.api.services.embosser import generate_braille_brf
+from app.api.services.generator import cell_to_mask
+from app.api.services.translator import text_to_braille
+from app.cli import Options, cells_to_utf8, collect_inputs, iter_unicode, transcribe_stream
+
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+TEXT = "Hola Mundo, piso 12\nBaño 3.5\n\nSalida de emergencia 2024"
+
+
+def _unicode(text):
+    """Braille Unicode de referencia, línea a línea con text_to_braille."""
+    return "\n".join(
+        "".join(chr(0x2800 + cell_to_mask(cell)) for cell in text_to_braille(line))
+        for line in text.split("\n")
+    )
+
+
+def _corpus(tmp_path):
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "a.txt").write_text(TEXT, encoding="utf-8")
+    (tmp_path / "sub" / "b.txt").write_text("Piso 2\n", encoding="utf-8")
+    (tmp_path / "notas.odt").write_text("no se transcribe", encoding="utf-8")
+    return tmp_path
+
+
+class TestUnicode:
+    """Tests de la salida Braille Unicode."""
+
+    def test_todas_las_celdas(self):
+        cells = bytes(range(64))
+        assert cells_to_utf8(cells).decode("utf-8") == "".join(chr(0x2800 + m) for m in range(64))
+
+    def test_igual_que_text_to_braille(self):
+        assert b"".join(iter_unicode([TEXT])).decode("utf-8") == _unicode(TEXT)
+
+    @pytest.mark.parametrize("size", [1, 2, 5, 17])
+    def test_independiente_de_los_fragmentos(self, size):
+        """El modo numérico y los saltos de línea sobreviven a los cortes."""
+        chunks = [TEXT[i:i + size] for i in range(0, len(TEXT), size)]
+        assert b"".join(iter_unicode(chunks)).decode("utf-8") == _unicode(TEXT)
+
+
+class TestTranscribeStream:
+    """Tests de la transcripción de un flujo."""
+
+    def test_brf_igual_que_el_generador(self):
+        target = BytesIO()
+        written = transcribe_stream([TEXT], target, Options("brf", 20, 5))
+        assert target.getvalue() == generate_braille_brf(TEXT, 20, 5).getvalue()
+        assert written == len(target.getvalue())
+
+    def test_png_no_tiene_salida_unica(self):
+        with pytest.raises(ValueError):
+            transcribe_stream([TEXT], BytesIO(), Options("png", None, None))
+
+
+class TestCollectInputs:
+    """Tests de la expansión de entradas."""
+
+    def test_directorio_y_glob(self, tmp_path):
+        root = _corpus(tmp_path)
+        expected = [str(root / "a.txt"), str(root / "sub" / "b.txt")]
+        assert collect_inputs([str(root)]) == expected
+        assert collect_inputs([str(root / "**" / "*.txt")]) == expected
+
+    def test_sin_duplicados_ni_salidas_previas(self, tmp_path):
+        root = _corpus(tmp_path)
+        (root / "a.braille.txt").write_text("⠁", encoding="utf-8")
+        files = collect_inputs([str(root / "a.txt"), str(root)])
+        assert files == [str(root / "a.txt"), str(root / "sub" / "b.txt")]
+
+    def test_documentos_por_extension(self, tmp_path):
+        root = _corpus(tmp_path)
+        (root / "manual.md").write_text("# Manual", encoding="utf-8")
+        assert str(root / "manual.md") in collect_inputs([str(root)])
+
+    def test_entrada_inexistente(self, tmp_path):
+        with pytest.raises(FileNotFoundError):
+            collect_inputs([str(tmp_path / "*.txt")])
+
+
+class TestMain:
+    """Tests del punto de entrada."""
+
+    def test_txt_junto_a_la_entrada(self, tmp_path, capsys):
+        root = _corpus(tmp_path)
+        assert cli.main([str(root), "--jobs", "1"]) == 0
+        assert (root / "a.braille.txt").read_text(encoding="utf-8") == _unicode(TEXT)
+        assert (root / "sub" / "b.braille.txt").exists()
+        assert "2 archivos" in capsys.readouterr().err
+
+    def test_brf_en_paralelo(self, tmp_path):
+        """Con --jobs > 1 los archivos se reparten en un pool de procesos."""
+        root = _corpus(tmp_path)
+        output = tmp_path / "salida"
+        assert cli.main([str(root), "-f", "brf", "-o", str(output), "-j", "2", "-q"]) == 0
+        assert (output / "a.brf").read_bytes() == generate_braille_brf(TEXT).getvalue()
+        assert (output / "b.brf").exists()
+
+    def test_png_una_imagen_por_pagina(self, tmp_path):
+        root = _corpus(tmp_path)
+        output = tmp_path / "png"
+        args = [str(root / "a.txt"), "-f", "png", "-o", str(output), "--lines-per-page", "2", "-q"]
+        assert cli.main(args) == 0
+        assert sorted(p.name for p in output.iterdir()) == ["a.001.png", "a.002.png"]
+        assert (output / "a.001.png").read_bytes().startswith(b"\x89PNG")
+
+    def test_error_no_detiene_el_lote(self, tmp_path, capsys):
+        """Un archivo ilegible se informa y el resto se transcribe."""
+        root = _corpus(tmp_path)
+        (root / "roto.txt").write_bytes(b"\xff\xfe\x00texto")
+        assert cli.main([str(root), "-j", "1"]) == 1
+        err = capsys.readouterr().err
+        assert "roto.txt" in err and "1 con errores" in err
+        assert (root / "a.braille.txt").exists()
+
+    @pytest.mark.parametrize("jobs", ["1", "2"])
+    def test_salidas_repetidas(self, tmp_path, capsys, jobs):
+        """Dos entradas con la misma salida no se pisan: la segunda es un error."""
+        for name in ("a", "b"):
+            (tmp_path / name).mkdir()
+            (tmp_path / name / "libro.txt").write_text(f"Libro {name}", encoding="utf-8")
+        output = tmp_path / "salida"
+        assert cli.main([str(tmp_path), "-o", str(output), "-j", jobs]) == 1
+        err = capsys.readouterr().err
+        assert f"{tmp_path / 'b' / 'libro.txt'}: Misma salida que {tmp_path / 'a' / 'libro.txt'}" in err
+        assert "1 con errores" in err
+        assert (output / "libro.braille.txt").read_text(encoding="utf-8") == _unicode("Libro a")
+
+    def test_markdown(self, tmp_path):
+        """Los documentos pasan por la ingesta (ver test_ingest.py)."""
+        (tmp_path / "manual.md").write_text("# Manual\nPiso **2**", encoding="utf-8")
+        assert cli.main([str(tmp_path / "manual.md"), "-q"]) == 0
+        output = (tmp_path / "manual.braille.txt").read_text(encoding="utf-8")
+        assert output == _unicode("Manual\n\nPiso 2\n")
+
+    def test_stdin(self):
+        result = subprocess.run(
+            [sys.executable, "-m", "app.cli", "-"],
+            cwd=BACKEND_DIR, input="Piso 1".encode("utf-8"), capture_output=True, check=True,
+        )
+        assert result.stdout.decode("utf-8") == _unicode("Piso 1")
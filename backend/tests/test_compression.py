@@ -0,0 +1,142 @@
+"""
+Tests para la compresión de respuestas (gzip y brotli).
+"""
+
+import gzip
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from app import compression
+from app.compression import CompressionMiddleware, choose_encoding, compress, parse_accept_encoding
+from app.config import settings
+from app.main import create_app
+
+
+LONG_TEXT = "Salida de emergencia, piso 2. " * 40
+
+
+@pytest.fixture
+def client():
+    return TestClient(create_app())
+
+
+class TestAcceptEncoding:
+    """Tests de la negociación de codificación."""
+
+    def test_orden_por_calidad(self):
+        """Las codificaciones se ordenan por q y se descartan las de q=0."""
+        assert parse_accept_encoding("gzip;q=0.8, br, identity;q=0") == ["br", "gzip"]
+        assert parse_accept_encoding("gzip;q=0, deflate") == ["deflate"]
+
+    def test_sin_codificacion_soportada(self):
+        """Sin gzip ni br aceptados no se comprime."""
+        assert choose_encoding("deflate, identity") is None
+
+    def test_brotli_deshabilitado(self, monkeypatch):
+        """Con BROTLI_ENABLED=False se usa gzip aunque el cliente acepte br."""
+        monkeypatch.setattr(settings, "brotli_enabled", False)
+        assert choose_encoding("br, gzip") == "gzip"
+
+    def test_round_trip_gzip(self):
+        """compress() produce gzip válido."""
+        data = LONG_TEXT.encode("utf-8")
+        assert gzip.decompress(compress(data, "gzip")) == data
+
+
+class TestCompressionMiddleware:
+    """Tests del middleware sobre los endpoints."""
+
+    def test_traduccion_gzip(self, client):
+        """El JSON de traducción se comprime con gzip y declara Vary."""
+        response = client.post(
+            f"{settings.api_prefix}/translation/to-braille",
+            json={"text": LONG_TEXT},
+            headers={"Accept-Encoding": "gzip"},
+        )
+        assert response.status_code == 200
+        assert response.headers["content-encoding"] == "gzip"
+        assert "Accept-Encoding" in response.headers["vary"]
+        assert int(response.headers["content-length"]) < len(response.content)
+        assert response.json()["original_text"] == LONG_TEXT
+
+    def test_respuesta_pequena_sin_comprimir(self, client):
+        """Por debajo de COMPRESSION_MIN_SIZE la respuesta va tal cual."""
+        response = client.get("/health", headers={"Accept-Encoding": "gzip"})
+        assert "content-encoding" not in response.headers
+
+    def test_identity_sin_comprimir(self, client):
+        """Sin Accept-Encoding compatible no se comprime."""
+        response = client.post(
+            f"{settings.api_prefix}/translation/to-braille",
+            json={"text": LONG_TEXT},
+            headers={"Accept-Encoding": "identity"},
+        )
+        assert "content-encoding" not in response.headers
+
+    @pytest.mark.parametrize("endpoint", ["image", "pdf"])
+    def test_formatos_comprimidos_excluidos(self, client, endpoint):
+        """PNG y PDF ya están comprimidos y no se recomprimen."""
+        response = client.post(
+            f"{settings.api_prefix}/generation/{endpoint}",
+            json={"text": "Salida de emergencia"},
+            headers={"Accept-Encoding": "gzip, br"},
+        )
+        assert response.status_code == 200
+        assert "content-encoding" not in response.headers
+
+    def test_brotli(self, client):
+        """Si el cliente acepta br y brotli está instalado, se usa brotli."""
+        if compression.brotli is None:
+            pytest.skip("brotli no instalado")
+        response = client.post(
+            f"{settings.api_prefix}/translation/to-braille",
+            json={"text": LONG_TEXT},
+            headers={"Accept-Encoding": "gzip, br"},
+        )
+        assert response.headers["content-encoding"] == "br"
+        assert response.json()["original_text"] == LONG_TEXT
+
+    def test_streaming_brf(self, client):
+        """El BRF en streaming se comprime trozo a trozo sin Content-Length."""
+        response = client.post(
+            f"{settings.api_prefix}/generation/brf",
+            json={"text": LONG_TEXT * 5},
+            headers={"Accept-Encoding": "gzip"},
+        )
+        plain = client.post(
+            f"{settings.api_prefix}/generation/brf",
+            json={"text": LONG_TEXT * 5},
+            headers={"Accept-Encoding": "identity"},
+        )
+        assert response.status_code == 200
+        assert response.headers["content-encoding"] == "gzip"
+        assert "content-length" not in response.headers
+        assert response.content == plain.content
+
+    @pytest.mark.parametrize("chunks", [[b"ab", b"cd"], [b"a" * 600, b"b" * 600]])
+    def test_streaming_segun_tamano_total(self, chunks):
+        """En streaming se decide con el tamaño total, no con el primer trozo."""
+        app = FastAPI()
+        app.add_middleware(CompressionMiddleware)
+
+        @app.get("/stream")
+        def stream():
+            return StreamingResponse(iter(chunks), media_type="text/plain")
+
+        response = TestClient(app).get("/stream", headers={"Accept-Encoding": "gzip"})
+        assert response.content == b"".join(chunks)
+        compressed = sum(map(len, chunks)) >= settings.compression_min_size
+        assert ("content-encoding" in response.headers) == compressed
+
+    def test_brf_pequeno_sin_comprimir(self, client):
+        """Un BRF en streaming menor que COMPRESSION_MIN_SIZE va tal cual."""
+        response = client.get(
+            f"{settings.api_prefix}/generation/brf",
+            params={"text": "Hola"},
+            headers={"Accept-Encoding": "gzip, br"},
+        )
+        assert response.status_code == 200
+        assert "content-encoding" not in response.headers
@@ -0,0 +1,161 @@
+"""
+Tests para la traducción empaquetada y los formatos de impresora BRF/PEF.
+"""
+
+import xml.etree.ElementTree as ET
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.config import settings
+from app.main import create_app
+from app.api.services.generator import cell_to_mask
+from app.api.services.translator import PackedTranslator, text_to_braille, text_to_packed
+from app.api.services.embosser import (
+    PEF_NAMESPACE,
+    BrailleBRFGenerator,
+    BraillePEFGenerator,
+    iter_braille_pages,
+    wrap_cells,
+)
+
+
+SAMPLES = [
+    "Hola",
+    "Señalética Braille",
+    "Piso 3, sala 12.5",
+    "1.000,50 y 2",
+    "ÁRBOL Ñandú",
+    "a\nb 12\n3",
+    "",
+]
+
+
+class TestPackedTranslator:
+    """Tests de la traducción a celdas empaquetadas."""
+
+    @pytest.mark.parametrize("text", SAMPLES)
+    def test_equivalente_a_text_to_braille(self, text):
+        """Produce las mismas celdas que text_to_braille."""
+        expected = bytes(cell_to_mask(cell) for cell in text_to_braille(text))
+        assert text_to_packed(text) == expected
+
+    @pytest.mark.parametrize("text", SAMPLES)
+    def test_fragmentos_conservan_modo_numerico(self, text):
+        """Traducir carácter a carácter da el mismo resultado."""
+        translator = PackedTranslator()
+        assert b"".join(translator.feed(char) for char in text) == text_to_packed(text)
+
+    @pytest.mark.parametrize("text", [
+        " ".join(SAMPLES) * 20,
+        "Año 2024, «Índice» — 3.5 € ẞ İ σ 😀 ² Ø\r\n" * 10,
+        "x" * 100 + "1" * 100 + ".,." + "2" * 100,
+    ])
+    def test_camino_por_bytes(self, text):
+        """Los fragmentos largos (por bytes) dan las mismas celdas que los cortos."""
+        char_by_char = PackedTranslator()
+        expected = b"".join(char_by_char.feed(char) for char in text)
+        assert text_to_packed(text) == expected
+
+        # El modo numérico también se conserva entre fragmentos largos
+        translator = PackedTranslator()
+        half = len(text) // 2
+        assert translator.feed(text[:half]) + translator.feed(text[half:]) == expected
+
+    @pytest.mark.parametrize("text", ["a1\n2\n\nB", "Piso 1\n2 " * 40])
+    def test_saltos_de_linea(self, text):
+        """Con line_break cada salto de línea deja ese byte y reinicia el modo numérico."""
+        expected = b"\xff".join(text_to_packed(line) for line in text.split("\n"))
+        assert PackedTranslator(line_break=0xFF).feed(text) == expected
+
+    def test_salto_de_linea_fuera_de_las_celdas(self):
+        with pytest.raises(ValueError):
+            PackedTranslator(line_break=0x0A)
+
+
+class TestLayout:
+    """Tests de la maquetación en líneas y páginas."""
+
+    def test_corte_en_espacio(self):
+        """Las líneas se parten en el último espacio que cabe."""
+        assert list(wrap_cells(b"\x01\x01\x00\x02\x02\x02", 4)) == [b"\x01\x01", b"\x02\x02\x02"]
+
+    def test_palabra_mas_larga_que_la_linea(self):
+        """Una palabra sin espacios se corta a la anchura de línea."""
+        assert list(wrap_cells(b"\x01" * 5, 2)) == [b"\x01\x01", b"\x01\x01", b"\x01"]
+
+    def test_parrafos_y_paginas(self):
+        """Los saltos de línea se respetan y las páginas se agrupan."""
+        pages = list(iter_braille_pages("a\n\nb\nc", cells_per_line=10, lines_per_page=2))
+        assert pages == [[b"\x01", b""], [b"\x03", b"\x09"]]
+
+
+class TestBRF:
+    """Tests del formato BRF."""
+
+    def test_ascii_braille(self):
+        """Las celdas se codifican con la tabla ASCII Braille (NABCC)."""
+        output = BrailleBRFGenerator(40, 25).generate_brf("Hola 12").read()
+        assert output == b".HOLA #AB\r\n"
+
+    def test_form_feed_entre_paginas(self):
+        """Cada página adicional empieza con form feed."""
+        output = BrailleBRFGenerator(10, 2).generate_brf("a\nb\nc").read()
+        assert output == b"A\r\nB\r\n\fC\r\n"
+
+    def test_libro_en_streaming(self):
+        """Un texto grande se emite por páginas con su progreso."""
+        text = ("Capítulo de prueba con texto suficiente. " * 20 + "\n") * 300
+        progress = []
+        chunks = list(BrailleBRFGenerator(40, 25).iter_brf(text, on_page=progress.append))
+        assert len(chunks) == progress[-1] > 100
+        assert all(len(line) <= 40 for chunk in chunks for line in chunk.lstrip(b"\f").split(b"\r\n"))
+
+
+class TestPEF:
+    """Tests del formato PEF."""
+
+    def test_xml_valido(self):
+        """El documento es XML bien formado con filas Unicode Braille."""
+        output = BraillePEFGenerator(10, 2, title="Prueba <1>").generate_pef("Hola\nmundo\nfin").read()
+        root = ET.fromstring(output)
+        ns = {"pef": PEF_NAMESPACE}
+        pages = root.findall(".//pef:page", ns)
+        assert len(pages) == 2
+        rows = [row.text for row in root.findall(".//pef:row", ns)]
+        assert rows[0] == "⠨⠓⠕⠇⠁"
+        assert root.find(".//{http://purl.org/dc/elements/1.1/}title").text == "Prueba <1>"
+
+    def test_titulo_con_caracteres_de_control(self):
+        """Los caracteres que XML no admite se eliminan de los metadatos."""
+        output = BraillePEFGenerator(title="a\x01b\x0c").generate_pef("Hola").read()
+        root = ET.fromstring(output)
+        assert root.find(".//{http://purl.org/dc/elements/1.1/}title").text == "ab"
+
+    def test_documento_vacio(self):
+        """Un texto sin celdas produce un PEF válido con una página vacía."""
+        output = BraillePEFGenerator().generate_pef("").read()
+        assert len(ET.fromstring(output).findall(f".//{{{PEF_NAMESPACE}}}page")) == 1
+
+
+class TestEmbosserEndpoints:
+    """Tests de los endpoints /brf y /pef."""
+
+    def test_endpoint_brf(self):
+        """El endpoint devuelve el BRF como descarga."""
+        client = TestClient(create_app())
+        response = client.post(
+            f"{settings.api_prefix}/generation/brf",
+            json={"text": "Salida", "cells_per_line": 20}
+        )
+        assert response.status_code == 200
+        assert response.content == b".SALIDA\r\n"
+        assert "braille_Salida.brf" in response.headers["content-disposition"]
+
+    def test_endpoint_pef(self):
+        """El endpoint devuelve un PEF bien formado."""
+        client = TestClient(create_app())
+        response = client.post(f"{settings.api_prefix}/generation/pef", json={"text": "Baño"})
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-pef+xml")
+        ET.fromstring(response.content)
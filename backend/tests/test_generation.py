@@ -145,7 +145,7 @@ class TestIntegration:
         # Verificar que se puede abrir y es válida
         img = Image.open(image_buffer)
         assert img.format == "PNG"
-        assert img.mode == "RGB"
+        assert img.mode == "P"  # 16 grises (IMAGE_MODE por defecto)
         assert img.size[0] > 0
         assert img.size[1] > 0
     
@@ -186,3 +186,546 @@ class TestIntegration:
         pdf_buffer = generate_braille_pdf(text)
         pdf_reader = PdfReader(pdf_buffer)
         assert len(pdf_reader.pages) >= 1
+
+
+class TestRendererRegistry:
+    """Tests del registro de backends de renderizado."""
+    
+    def test_formatos_registrados(self):
+        """PNG y PDF están registrados con su media type."""
+        from app.api.services.renderers import get_renderer
+        assert get_renderer("png").media_type == "image/png"
+        assert get_renderer("pdf").extension == "pdf"
+    
+    def test_renderer_genera_salida(self):
+        """El backend se carga en el primer uso y genera la salida."""
+        from app.api.services.renderers import get_renderer
+        buffer = get_renderer("png")("Hola")
+        assert Image.open(buffer).format == "PNG"
+        assert get_renderer("png").loaded
+    
+    def test_formato_desconocido(self):
+        """Un formato no registrado lanza GenerationError."""
+        from app.api.services.renderers import get_renderer
+        from app.exceptions import GenerationError
+        with pytest.raises(GenerationError):
+            get_renderer("bmp")
+
+
+class TestSingleFlight:
+    """Tests de la coalescencia de renderizados concurrentes."""
+    
+    def test_peticiones_identicas_comparten_renderizado(self):
+        """N llamadas simultáneas con la misma clave ejecutan una sola vez."""
+        import asyncio
+        from app.api.services.singleflight import SingleFlight
+        
+        flight = SingleFlight("test")
+        calls = []
+        
+        async def render():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return b"png"
+        
+        async def main():
+            return await asyncio.gather(*(flight.do("Hola", render) for _ in range(5)))
+        
+        coalesced = flight._coalesced.get()
+        assert asyncio.run(main()) == [b"png"] * 5
+        assert len(calls) == 1
+        assert flight._coalesced.get() - coalesced == 4
+        assert flight.in_flight == 0
+    
+    def test_claves_distintas_no_se_coalescen(self):
+        """Parámetros distintos renderizan por separado."""
+        import asyncio
+        from app.api.services.singleflight import SingleFlight
+        
+        flight = SingleFlight("test")
+        
+        async def main():
+            return await asyncio.gather(
+                flight.do(("a", False), lambda: asyncio.sleep(0, result=b"a")),
+                flight.do(("a", True), lambda: asyncio.sleep(0, result=b"b")),
+            )
+        
+        assert asyncio.run(main()) == [b"a", b"b"]
+    
+    def test_error_se_propaga_y_libera_la_clave(self):
+        """Un fallo llega a todos los solicitantes y no queda cacheado."""
+        import asyncio
+        from app.api.services.singleflight import SingleFlight
+        from app.exceptions import GenerationError
+        
+        flight = SingleFlight("test")
+        
+        async def failing():
+            await asyncio.sleep(0.01)
+            raise GenerationError("fallo")
+        
+        async def main():
+            results = await asyncio.gather(
+                *(flight.do("x", failing) for _ in range(3)), return_exceptions=True
+            )
+            retry = await flight.do("x", lambda: asyncio.sleep(0, result=b"ok"))
+            return results, retry
+        
+        results, retry = asyncio.run(main())
+        assert all(isinstance(r, GenerationError) for r in results)
+        assert retry == b"ok"
+    
+    def test_cancelar_solicitante_no_cancela_el_vuelo(self):
+        """Si el cliente que inició el renderizado se va, los demás lo reciben."""
+        import asyncio
+        from app.api.services.singleflight import SingleFlight
+        
+        flight = SingleFlight("test")
+        
+        async def render():
+            await asyncio.sleep(0.05)
+            return b"pdf"
+        
+        async def main():
+            leader = asyncio.ensure_future(flight.do("k", render))
+            await asyncio.sleep(0)
+            follower = asyncio.ensure_future(flight.do("k", render))
+            await asyncio.sleep(0)
+            leader.cancel()
+            return await follower
+        
+        assert asyncio.run(main()) == b"pdf"
+
+
+class TestBrailleSVGGenerator:
+    """Tests para el generador SVG."""
+    
+    def _parse(self, svg: str):
+        import xml.etree.ElementTree as ET
+        return ET.fromstring(svg.encode("utf-8"))
+    
+    def test_un_simbolo_por_celda_distinta(self):
+        """Cada celda distinta se define una vez y cada celda es un <use>."""
+        from app.api.services.svg import BrailleSVGGenerator
+        
+        root = self._parse("".join(BrailleSVGGenerator().iter_svg("aaaa bb")))
+        ns = "{http://www.w3.org/2000/svg}"
+        assert len(root.findall(f".//{ns}symbol")) == 3
+        assert len(root.findall(f".//{ns}use")) == 7
+    
+    def test_crecimiento_lineal_por_celda(self):
+        """Añadir celdas solo añade un <use> corto por celda."""
+        from app.api.services.svg import BrailleSVGGenerator
+        
+        gen = BrailleSVGGenerator()
+        small = "".join(gen.iter_svg("ab" * 100))
+        large = "".join(gen.iter_svg("ab" * 200))
+        assert (len(large) - len(small)) / 200 < 45
+    
+    def test_unidades_mm(self):
+        """En mm el documento usa medidas físicas como el PDF."""
+        from app.api.services.svg import BrailleSVGGenerator
+        
+        root = self._parse("".join(BrailleSVGGenerator(units="mm").iter_svg("ab")))
+        assert root.get("width") == "44mm"
+        assert root.get("height") == "34mm"
+    
+    def test_espejo_invierte_celdas(self):
+        """El modo espejo invierte el orden y las columnas de puntos."""
+        from app.api.services.svg import BrailleSVGGenerator, mirror_mask
+        
+        gen = BrailleSVGGenerator(show_empty=False)
+        svg = "".join(gen.iter_svg("ab", mirror=True))
+        # a = punto 1 → punto 4 (máscara 8); b = puntos 1,2 → 4,5 (máscara 24)
+        assert mirror_mask(0b000011) == 0b011000
+        assert svg.index('href="#c24"') < svg.index('href="#c8"')
+    
+    def test_endpoint_svg(self):
+        """El endpoint devuelve un SVG descargable."""
+        from fastapi.testclient import TestClient
+        from app.config import settings
+        from app.main import create_app
+        
+        client = TestClient(create_app())
+        response = client.post(
+            f"{settings.api_prefix}/generation/svg",
+            json={"text": "Salida", "units": "mm"}
+        )
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("image/svg+xml")
+        self._parse(response.text)
+
+    def test_titulo_con_caracteres_de_control(self):
+        """Los caracteres que XML no admite no llegan al título."""
+        from app.api.services.svg import BrailleSVGGenerator
+
+        svg = "".join(BrailleSVGGenerator().iter_svg("a<b\x01\x1fc"))
+        root = self._parse(svg)
+        title = root.find("{http://www.w3.org/2000/svg}title")
+        assert title is not None and title.text == "a<bc"
+
+
+class TestBrailleSTLGenerator:
+    """Tests para las placas táctiles STL."""
+    
+    @staticmethod
+    def _volume(triangles):
+        import numpy as np
+        t = triangles.astype(float)
+        return np.einsum("ij,ij->i", t[:, 0], np.cross(t[:, 1], t[:, 2])).sum() / 6
+    
+    def test_stl_binario_valido(self):
+        """El archivo tiene cabecera, número de triángulos y registros de 50 bytes."""
+        import struct
+        from app.api.services.tactile import dot_mesh, generate_braille_stl
+        
+        data = generate_braille_stl("ab").getvalue()
+        (count,) = struct.unpack_from("<I", data, 80)
+        # Placa (12) + 3 puntos activos (a=1, b=1,2)
+        assert count == 12 + 3 * len(dot_mesh())
+        assert len(data) == 84 + 50 * count
+    
+    def test_malla_cerrada_y_orientada(self):
+        """El volumen con signo es el de la placa más el de los puntos."""
+        from app.api.services.tactile import BrailleSTLGenerator, dot_mesh
+        
+        mesh = BrailleSTLGenerator().build_mesh("l")  # puntos 1, 2, 3
+        plate = self._volume(mesh[:12])
+        dome = self._volume(dot_mesh())
+        assert plate > 0 and dome > 0
+        assert abs(self._volume(mesh) - (plate + 3 * dome)) < 1e-3
+    
+    def test_lineas_por_ancho(self):
+        """cells_per_line reparte las celdas en varias líneas de la placa."""
+        from app.api.services.tactile import BrailleSTLGenerator, LINE_PITCH
+        
+        one = BrailleSTLGenerator().build_mesh("aaaa aaaa")
+        two = BrailleSTLGenerator(cells_per_line=5).build_mesh("aaaa aaaa")
+        depth = lambda mesh: mesh[:12, :, 1].max()
+        assert depth(two) - depth(one) == pytest.approx(LINE_PITCH)
+    
+    def test_placa_grande_rapida(self):
+        """Una placa de 1.000 celdas se exporta en menos de un segundo."""
+        import time
+        from app.api.services.tactile import generate_braille_stl
+        
+        start = time.perf_counter()
+        generate_braille_stl("señal " * 167)
+        assert time.perf_counter() - start < 1.0
+    
+    def test_endpoint_stl(self):
+        """El endpoint devuelve el STL como descarga."""
+        from fastapi.testclient import TestClient
+        from app.config import settings
+        from app.main import create_app
+        
+        client = TestClient(create_app())
+        response = client.post(f"{settings.api_prefix}/generation/stl", json={"text": "Aula 12"})
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "model/stl"
+        assert response.content[:80].startswith(b"Senaletica")
+
+
+class TestSignageKit:
+    """Tests del kit de señalética en ZIP."""
+    
+    def _collect(self, entries, render, window=2):
+        import asyncio
+        from app.api.services.kit import iter_kit
+        
+        async def main():
+            return [chunk async for chunk in iter_kit(entries, render, window=window)]
+        
+        return asyncio.run(main())
+    
+    def test_zip_por_fragmentos(self):
+        """Cada entrada terminada produce un fragmento del ZIP."""
+        import asyncio
+        import zipfile
+        from app.api.services.kit import KitEntry
+        
+        entries = [KitEntry(f"{i}.txt", "txt", str(i), {}) for i in range(5)]
+        
+        async def render(entry):
+            await asyncio.sleep(0)
+            return entry.text.encode() * 100
+        
+        chunks = self._collect(entries, render)
+        assert len(chunks) == 6  # una por entrada + directorio central
+        archive = zipfile.ZipFile(BytesIO(b"".join(chunks)))
+        assert archive.testzip() is None
+        assert archive.read("3.txt") == b"3" * 100
+    
+    def test_entrada_fallida_en_errores(self):
+        """Una entrada que falla no rompe el kit y queda en ERRORES.txt."""
+        import zipfile
+        from app.api.services.kit import ERRORS_ENTRY, KitEntry
+        
+        entries = [KitEntry("ok.txt", "txt", "ok", {}), KitEntry("mal.txt", "txt", "mal", {})]
+        
+        async def render(entry):
+            if entry.text == "mal":
+                raise RuntimeError("sin fuente")
+            return b"ok"
+        
+        archive = zipfile.ZipFile(BytesIO(b"".join(self._collect(entries, render))))
+        assert archive.namelist() == ["ok.txt", ERRORS_ENTRY]
+        assert b"mal.txt: sin fuente" in archive.read(ERRORS_ENTRY)
+    
+    def test_endpoint_kit(self):
+        """El endpoint devuelve cada etiqueta en cada formato; PNG sin comprimir."""
+        import zipfile
+        from fastapi.testclient import TestClient
+        from app.config import settings
+        from app.main import create_app
+        
+        client = TestClient(create_app())
+        response = client.post(
+            f"{settings.api_prefix}/generation/kit",
+            json={"labels": ["Baño", "Piso 1/A"], "formats": ["png", "pdf"]}
+        )
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/zip"
+        archive = zipfile.ZipFile(BytesIO(response.content))
+        names = sorted(archive.namelist())
+        assert names == ["001_Baño.pdf", "001_Baño.png", "002_Piso_1_A.pdf", "002_Piso_1_A.png"]
+        assert archive.getinfo("001_Baño.png").compress_type == zipfile.ZIP_STORED
+        assert archive.getinfo("001_Baño.pdf").compress_type == zipfile.ZIP_DEFLATED
+        Image.open(BytesIO(archive.read("001_Baño.png"))).verify()
+    
+    def test_limite_de_etiquetas(self, monkeypatch):
+        """Un kit con demasiadas etiquetas se rechaza."""
+        from fastapi.testclient import TestClient
+        from app.config import settings
+        from app.main import create_app
+        
+        monkeypatch.setattr(settings, "kit_max_labels", 2)
+        client = TestClient(create_app())
+        response = client.post(
+            f"{settings.api_prefix}/generation/kit", json={"labels": ["a", "b", "c"]}
+        )
+        assert response.status_code == 400
+
+
+class TestPagedImages:
+    """Tests de imágenes paginadas (PNG por página y TIFF)."""
+    
+    def test_paginas_mismo_tamano(self):
+        """Todas las páginas de un documento tienen el mismo tamaño."""
+        generator = BrailleImageGenerator()
+        layout = generator.layout("texto de prueba " * 40, cells_per_line=20, lines_per_page=5)
+        assert layout.page_count > 2
+        first = generator.render_page(layout, 1)
+        last = generator.render_page(layout, layout.page_count)
+        assert first.size == last.size
+    
+    def test_tiff_multipagina(self):
+        """El TIFF contiene una imagen por página."""
+        from app.api.services.generator import generate_braille_tiff
+        
+        buffer = generate_braille_tiff("hola mundo " * 30, cells_per_line=10, lines_per_page=4)
+        img = Image.open(buffer)
+        assert img.format == "TIFF"
+        assert img.n_frames == BrailleImageGenerator().layout(
+            "hola mundo " * 30, 10, 4
+        ).page_count
+    
+    def test_endpoint_pagina(self):
+        """El endpoint devuelve la página pedida y el total en headers."""
+        from fastapi.testclient import TestClient
+        from app.config import settings
+        from app.main import create_app
+        
+        client = TestClient(create_app())
+        url = f"{settings.api_prefix}/generation/image/pages"
+        body = {"text": "hola mundo " * 30, "cells_per_line": 10, "lines_per_page": 4}
+        response = client.post(url, params={"page": 2}, json=body)
+        assert response.status_code == 200
+        assert response.headers["x-page"] == "2"
+        total = int(response.headers["x-total-pages"])
+        Image.open(BytesIO(response.content)).verify()
+        assert client.post(url, params={"page": total + 1}, json=body).status_code == 404
+    
+    def test_endpoint_tiff(self):
+        """El endpoint TIFF devuelve image/tiff."""
+        from fastapi.testclient import TestClient
+        from app.config import settings
+        from app.main import create_app
+        
+        client = TestClient(create_app())
+        response = client.post(f"{settings.api_prefix}/generation/tiff", json={"text": "Piso 1"})
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "image/tiff"
+    
+    def test_endpoint_indice_de_maquetacion(self):
+        """El índice coincide con el total de páginas de /image/pages."""
+        from fastapi.testclient import TestClient
+        from app.config import settings
+        from app.main import create_app
+        
+        client = TestClient(create_app())
+        body = {"text": "hola mundo " * 30, "cells_per_line": 10, "lines_per_page": 4}
+        index = client.post(f"{settings.api_prefix}/generation/layout", json=body).json()
+        page = client.post(f"{settings.api_prefix}/generation/image/pages", params={"page": 1}, json=body)
+        assert index["page_count"] == int(page.headers["x-total-pages"])
+        assert len(index["pages"]) == index["page_count"]
+
+
+class TestHighDPI:
+    """Tests de la resolución de salida y el antialiasing."""
+    
+    def test_escala_con_dpi(self):
+        """A 300 dpi la geometría se escala desde la base de 72 dpi."""
+        base = Image.open(BrailleImageGenerator().generate_image("Hola", include_text=False))
+        high = Image.open(BrailleImageGenerator(dpi=300).generate_image("Hola", include_text=False))
+        assert high.width == pytest.approx(base.width * 300 / 72, rel=0.02)
+        # PNG guarda píxeles por metro: el valor leído se redondea
+        assert tuple(map(round, high.info["dpi"])) == (300, 300)
+    
+    def test_sprites_cacheados_por_dpi(self):
+        """Cada resolución tiene su propio atlas, reutilizado entre instancias."""
+        sprites_300 = BrailleImageGenerator(dpi=300)._cell_sprites()
+        assert BrailleImageGenerator(dpi=300)._cell_sprites() is sprites_300
+        assert BrailleImageGenerator(dpi=150)._cell_sprites() is not sprites_300
+        assert sprites_300[0].size == (167, 250)
+    
+    def test_antialiasing(self):
+        """Los bordes de los puntos tienen tonos intermedios."""
+        sprite = BrailleImageGenerator(dpi=150, mode="L")._cell_sprites()[0b111111]
+        levels = {level for _, level in sprite.getcolors()}
+        assert 0 in levels and 255 in levels
+        assert any(0 < level < 255 for level in levels)
+    
+    def test_sin_sobremuestreo(self, monkeypatch):
+        """Con IMAGE_SUPERSAMPLING=1 las celdas se dibujan directamente."""
+        from app.config import settings
+        monkeypatch.setattr(settings, "image_supersampling", 1)
+        sprite = BrailleImageGenerator(dpi=150)._cell_sprites()[0]
+        assert sprite.size == (83, 125)
+    
+    def test_dpi_no_soportado(self):
+        """Solo se admiten las resoluciones configuradas."""
+        from app.exceptions import ValidationError
+        with pytest.raises(ValidationError):
+            BrailleImageGenerator(dpi=123)
+    
+    def test_limite_de_pixeles(self, monkeypatch):
+        """Las imágenes demasiado grandes se rechazan antes de reservar memoria."""
+        from app.config import settings
+        from app.exceptions import ValidationError
+        monkeypatch.setattr(settings, "image_max_pixels", 1_000_000)
+        with pytest.raises(ValidationError):
+            BrailleImageGenerator(dpi=600).generate_image("Salida de emergencia")
+    
+    def test_endpoint_dpi(self):
+        """El endpoint acepta dpi y rechaza valores no configurados."""
+        from fastapi.testclient import TestClient
+        from app.config import settings
+        from app.main import create_app
+        
+        client = TestClient(create_app())
+        url = f"{settings.api_prefix}/generation/image"
+        response = client.post(url, json={"text": "Baño", "dpi": 150})
+        assert response.status_code == 200
+        assert tuple(map(round, Image.open(BytesIO(response.content)).info["dpi"])) == (150, 150)
+        assert client.post(url, json={"text": "Baño", "dpi": 123}).status_code == 400
+
+
+class TestImageModes:
+    """Tests de los modos de imagen y la compresión PNG."""
+    
+    @staticmethod
+    def _png_header(buffer):
+        data = buffer.getvalue()
+        return data[24], data[25]  # Profundidad de bits y tipo de color de IHDR
+    
+    @pytest.mark.parametrize("mode, bits", [("RGB", 8), ("L", 8), ("P", 4), ("1", 1)])
+    def test_modo_de_extremo_a_extremo(self, mode, bits):
+        """Cada modo se compone y codifica en su propia profundidad de bits."""
+        buffer = BrailleImageGenerator(mode=mode).generate_image("Salida 3")
+        assert self._png_header(buffer)[0] == bits
+        img = Image.open(buffer)
+        assert img.mode == mode
+        assert BrailleImageGenerator(mode=mode)._cell_sprites()[0].mode == ("L" if mode == "P" else mode)
+    
+    def test_paleta_de_grises(self):
+        """El modo P usa una paleta de 16 grises y conserva el antialiasing."""
+        img = Image.open(BrailleImageGenerator(mode="P").generate_image("a", include_text=False))
+        palette = img.getpalette()[:48]
+        assert palette[:3] == [0, 0, 0] and palette[-3:] == [255, 255, 255]
+        used = {index for _, index in img.getcolors()}
+        assert 0 in used and 15 in used and used - {0, 15}
+    
+    def test_menos_bytes_que_rgb(self):
+        """Los modos reducidos ocupan menos que RGB."""
+        sizes = {
+            mode: len(BrailleImageGenerator(mode=mode).generate_image("Sala de reuniones").getvalue())
+            for mode in ("RGB", "P", "1")
+        }
+        assert sizes["1"] < sizes["P"] < sizes["RGB"]
+    
+    def test_nivel_de_compresion(self):
+        """El nivel 0 no comprime; optimize no cambia la imagen decodificada."""
+        stored = BrailleImageGenerator(compress_level=0).generate_image("Hola")
+        default = BrailleImageGenerator().generate_image("Hola")
+        optimized = BrailleImageGenerator(optimize=True).generate_image("Hola")
+        assert len(stored.getvalue()) > len(default.getvalue())
+        assert Image.open(optimized).tobytes() == Image.open(default).tobytes()
+    
+    def test_pagina_y_tiff_en_modo(self):
+        """Las páginas y el TIFF usan el mismo modo que el PNG."""
+        generator = BrailleImageGenerator(mode="1")
+        layout = generator.layout("hola mundo " * 20, 10, 4)
+        assert generator.render_page(layout, 1).mode == "1"
+        tiff = Image.open(generator.generate_tiff(layout))
+        assert tiff.mode == "1" and tiff.n_frames == layout.page_count
+    
+    def test_modo_no_soportado(self):
+        """Un modo desconocido es un error de configuración."""
+        with pytest.raises(ValueError):
+            BrailleImageGenerator(mode="CMYK")
+
+
+class TestBinaryResponses:
+    """Tests de las respuestas binarias con Content-Length."""
+    
+    def test_trozos_sin_copia(self):
+        """iter_chunks devuelve vistas del mismo buffer."""
+        from app.utils import iter_chunks
+        data = bytes(range(10))
+        chunks = list(iter_chunks(data, 4))
+        assert [len(chunk) for chunk in chunks] == [4, 4, 2]
+        assert all(chunk.obj is data for chunk in chunks)
+        assert b"".join(chunks) == data
+    
+    @pytest.mark.parametrize("endpoint", ["image", "pdf", "tiff", "stl"])
+    def test_content_length(self, endpoint):
+        """Las descargas declaran su tamaño."""
+        from fastapi.testclient import TestClient
+        from app.config import settings
+        from app.main import create_app
+        
+        client = TestClient(create_app())
+        response = client.post(f"{settings.api_prefix}/generation/{endpoint}", json={"text": "Salida"},
+                               headers={"Accept-Encoding": "identity"})
+        assert response.status_code == 200
+        assert int(response.headers["content-length"]) == len(response.content)
+        assert "chunked" not in response.headers.get("transfer-encoding", "")
+    
+    def test_respuesta_grande_en_trozos(self, monkeypatch):
+        """Por encima de RESPONSE_CHUNK_SIZE el cuerpo se envía en trozos del mismo tamaño."""
+        from fastapi.testclient import TestClient
+        from app.config import settings
+        from app.main import create_app
+        from app.api.routes import generation
+        
+        monkeypatch.setattr(settings, "response_chunk_size", 1024)
+        response = generation._download(b"x" * 5000, "image/png", "a.png")
+        assert response.headers["content-length"] == "5000"
+        
+        client = TestClient(create_app())
+        direct = generate_braille_image("Salida de emergencia").getvalue()
+        response = client.post(f"{settings.api_prefix}/generation/image",
+                               json={"text": "Salida de emergencia"})
+        assert response.content == direct
+        assert int(response.headers["content-length"]) == len(direct) > 1024
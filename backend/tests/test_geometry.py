@@ -0,0 +1,99 @@
+"""
+Tests para los perfiles de geometría de celdas Braille.
+"""
+
+import pytest
+
+from app.config import settings
+from app.exceptions import ValidationError
+from app.api.services.geometry import MM, available_profiles, get_profile, pixel_offsets
+
+
+class TestGeometryProfile:
+    """Tests de las tablas de desplazamiento precalculadas."""
+
+    def test_perfiles_incluidos(self):
+        """Los perfiles por defecto están configurados."""
+        assert {"standard", "jumbo", "marburg_medium"} <= set(available_profiles())
+        assert get_profile().name == settings.default_geometry_profile
+
+    def test_tabla_pixeles_standard(self):
+        """El perfil standard conserva la geometría histórica del PNG."""
+        profile = get_profile("standard")
+        assert profile.pixel_offsets == pixel_offsets(40, 60)
+        assert profile.pixel_offsets[0] == (13, 15)
+        assert profile.pixel_offsets[5] == (26, 45)
+
+    def test_tabla_puntos_pdf(self):
+        """Las columnas avanzan hacia la derecha y las filas hacia abajo."""
+        profile = get_profile("marburg_medium")
+        step = 2.5 * MM
+        assert profile.point_offsets[0] == (0, 0)
+        assert profile.point_offsets[2] == pytest.approx((0, -2 * step))
+        assert profile.point_offsets[3] == pytest.approx((step, 0))
+        assert profile.cell_pitch == pytest.approx(6 * MM)
+
+    def test_perfil_cacheado(self):
+        """Cada perfil se construye una sola vez."""
+        assert get_profile("jumbo") is get_profile("jumbo")
+
+    def test_perfil_desconocido(self):
+        """Un perfil que no existe es un error de validación."""
+        with pytest.raises(ValidationError) as exc:
+            get_profile("gigante")
+        assert exc.value.code == "UNKNOWN_PROFILE"
+
+
+class TestProfileRendering:
+    """Tests de los renderizadores con perfiles."""
+
+    def test_imagen_jumbo_mayor(self):
+        """El perfil jumbo produce una imagen más grande con el mismo texto."""
+        from PIL import Image
+        from app.api.services.generator import generate_braille_image
+
+        standard = Image.open(generate_braille_image("Hola", include_text=False))
+        jumbo = Image.open(generate_braille_image("Hola", include_text=False, profile="jumbo"))
+        assert jumbo.width > standard.width
+        assert jumbo.height > standard.height
+
+    def test_pdf_usa_paso_del_perfil(self):
+        """El paso de celda y de línea del PDF vienen del perfil."""
+        from app.api.services.generator import BraillePDFGenerator
+
+        standard = BraillePDFGenerator()
+        marburg = BraillePDFGenerator(profile="marburg_medium")
+        assert marburg.cell_spacing == pytest.approx(6 * MM)
+        assert marburg.line_height == pytest.approx(10 * MM)
+        # Celdas más pequeñas: caben más por línea
+        assert marburg.layout(b"\x01" * 100).cells_per_line > standard.layout(b"\x01" * 100).cells_per_line
+
+    def test_svg_mm_del_perfil(self):
+        """El SVG en milímetros usa las medidas físicas del perfil."""
+        from app.api.services.svg import BrailleSVGGenerator
+
+        geometry = BrailleSVGGenerator(units="mm", profile="marburg_medium").geometry
+        assert geometry.pitch == 6
+        assert geometry.offsets[3][0] - geometry.offsets[0][0] == 2.5
+
+    def test_endpoint_perfil_desconocido(self):
+        """Los endpoints rechazan perfiles desconocidos con 400."""
+        from fastapi.testclient import TestClient
+        from app.main import create_app
+
+        client = TestClient(create_app())
+        for endpoint in ("image", "pdf", "svg", "tiff"):
+            response = client.post(
+                f"{settings.api_prefix}/generation/{endpoint}",
+                json={"text": "Salida", "profile": "gigante"}
+            )
+            assert response.status_code == 400, endpoint
+
+    def test_endpoint_formatos_lista_perfiles(self):
+        """/formats publica los perfiles disponibles."""
+        from fastapi.testclient import TestClient
+        from app.main import create_app
+
+        client = TestClient(create_app())
+        data = client.get(f"{settings.api_prefix}/generation/formats").json()
+        assert "jumbo" in data["geometry_profiles"]
@@ -0,0 +1,134 @@
+"""
+Tests para las variantes GET cacheables (ETag, Cache-Control y 304).
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.config import settings
+from app.http_cache import etag_matches, make_etag
+from app.main import create_app
+
+
+@pytest.fixture
+def client():
+    return TestClient(create_app())
+
+
+def _get(client, path, **headers):
+    return client.get(f"{settings.api_prefix}{path}",
+                      headers={"Accept-Encoding": "identity", **headers})
+
+
+class TestETag:
+    """Tests del cálculo y la comparación de ETag."""
+
+    def test_determinista(self):
+        """Los mismos parámetros producen el mismo ETag fuerte."""
+        etag = make_etag("png", "1", {"text": "Hola", "mirror": False})
+        assert etag == make_etag("png", "1", {"mirror": False, "text": "Hola"})
+        assert etag.startswith('"') and etag.endswith('"')
+
+    def test_cambia_con_version_y_parametros(self):
+        """Cambiar la versión del renderer o un parámetro cambia el ETag."""
+        etag = make_etag("png", "1", {"text": "Hola"})
+        assert etag != make_etag("png", "2", {"text": "Hola"})
+        assert etag != make_etag("png", "1", {"text": "hola"})
+        assert etag != make_etag("pdf", "1", {"text": "Hola"})
+
+    def test_cambia_con_configuracion_de_salida(self, monkeypatch):
+        """La configuración que afecta a los bytes forma parte del ETag."""
+        etag = make_etag("png", "1", {"text": "Hola"})
+        monkeypatch.setattr(settings, "image_mode", "RGB")
+        assert etag != make_etag("png", "1", {"text": "Hola"})
+
+    def test_if_none_match(self):
+        """Comparación débil: listas, W/ y comodín."""
+        etag = '"abc"'
+        assert etag_matches('"x", "abc"', etag)
+        assert etag_matches('W/"abc"', etag)
+        assert etag_matches("*", etag)
+        assert not etag_matches('"x"', etag)
+        assert not etag_matches(None, etag)
+
+
+class TestCachedTranslation:
+    """Tests de GET /translation."""
+
+    def test_to_braille_cabeceras(self, client):
+        """La respuesta lleva ETag y Cache-Control immutable."""
+        response = _get(client, "/translation/to-braille?text=Hola")
+        assert response.status_code == 200
+        assert response.json()["braille_string_repr"] == "46|125|135|123|1"
+        assert "immutable" in response.headers["cache-control"]
+        assert response.headers["etag"]
+
+    def test_to_braille_304(self, client):
+        """Un If-None-Match vigente recibe 304 sin cuerpo."""
+        etag = _get(client, "/translation/to-braille?text=Hola").headers["etag"]
+        response = _get(client, "/translation/to-braille?text=Hola", **{"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["etag"] == etag
+
+    def test_to_text(self, client):
+        """GET /to-text acepta las celdas de braille_string_repr."""
+        response = _get(client, "/translation/to-text?cells=46|125|135|123|1|_|1")
+        assert response.status_code == 200
+        assert response.json()["translated_text"] == "Hola a"
+
+    def test_to_text_celda_invalida(self, client):
+        """Una celda con puntos fuera de 1-6 es un error 400."""
+        response = _get(client, "/translation/to-text?cells=12|79")
+        assert response.status_code == 400
+        assert "etag" not in response.headers
+
+
+class TestCachedGeneration:
+    """Tests de GET /generation."""
+
+    @pytest.mark.parametrize("path", [
+        "/generation/image?text=Salida&include_text=false",
+        "/generation/pdf?text=Salida&title=Salida",
+        "/generation/svg?text=Salida&units=mm",
+        "/generation/stl?text=Aula",
+        "/generation/brf?text=Salida",
+    ])
+    def test_get_igual_que_post_y_304(self, client, path):
+        """Cada GET es determinista y responde 304 a su propio ETag."""
+        first = _get(client, path)
+        second = _get(client, path)
+        assert first.status_code == 200
+        assert first.content == second.content
+        assert first.headers["etag"] == second.headers["etag"]
+        cached = _get(client, path, **{"If-None-Match": first.headers["etag"]})
+        assert cached.status_code == 304
+
+    def test_get_image_igual_que_post(self, client):
+        """GET /image devuelve los mismos bytes que POST /image."""
+        get = _get(client, "/generation/image?text=Baño&mirror=true")
+        post = client.post(f"{settings.api_prefix}/generation/image",
+                           json={"text": "Baño", "mirror": True})
+        assert get.content == post.content
+        assert "etag" not in post.headers
+
+    def test_etag_distinto_por_parametro(self, client):
+        """Cambiar un parámetro de la query cambia el ETag."""
+        normal = _get(client, "/generation/image?text=Salida")
+        mirror = _get(client, "/generation/image?text=Salida&mirror=true")
+        assert normal.headers["etag"] != mirror.headers["etag"]
+
+    def test_parametros_invalidos(self, client):
+        """La validación de la query es la misma que la del cuerpo POST."""
+        assert _get(client, "/generation/image?text=Salida&profile=gigante").status_code == 400
+        assert _get(client, "/generation/image").status_code == 422
+
+    def test_etag_debil_si_se_comprime(self, client):
+        """La respuesta comprimida lleva el ETag en su forma débil."""
+        response = client.get(f"{settings.api_prefix}/generation/brf?text={'Salida ' * 300}",
+                              headers={"Accept-Encoding": "gzip"})
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.headers["etag"].startswith('W/"')
+        cached = client.get(f"{settings.api_prefix}/generation/brf?text={'Salida ' * 300}",
+                            headers={"Accept-Encoding": "gzip", "If-None-Match": response.headers["etag"]})
+        assert cached.status_code == 304
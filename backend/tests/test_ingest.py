@@ -0,0 +1,375 @@
+"""
+Tests para la ingesta de documentos (TXT, Markdown, DOCX, EPUB) y el
+endpoint /generation/documents.
+"""
+
+import mmap
+import zipfile
+import xml.etree.ElementTree as ET
+from io import BytesIO
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.config import settings
+from app.exceptions import ValidationError
+from app.main import create_app
+from app.api.services import ingest
+from app.api.services.embosser import generate_braille_brf
+from app.api.services.ingest import Block, DocumentReader, detect_document_type
+
+
+DOCX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+
+
+def _docx_paragraph(text, style=None, outline=None):
+    props = ""
+    if style or outline is not None:
+        props = "<w:pPr>"
+        if style:
+            props += f'<w:pStyle w:val="{style}"/>'
+        if outline is not None:
+            props += f'<w:outlineLvl w:val="{outline}"/>'
+        props += "</w:pPr>"
+    runs = "".join(f"<w:r><w:t xml:space=\"preserve\">{part}</w:t></w:r>" for part in text.split("|"))
+    return f"<w:p>{props}{runs}</w:p>"
+
+
+def make_docx(*paragraphs):
+    body = "".join(paragraphs)
+    document = (f'<?xml version="1.0" encoding="UTF-8"?><w:document xmlns:w="{W_NS}">'
+                f"<w:body>{body}<w:sectPr/></w:body></w:document>")
+    buffer = BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("[Content_Types].xml", "<Types/>")
+        archive.writestr("word/document.xml", document)
+    return buffer.getvalue()
+
+
+def make_epub(chapters, doctype=True, opf_padding=0):
+    buffer = BytesIO()
+    manifest = "".join(
+        f'<item id="c{i}" href="texto/cap%20{i}.xhtml" media-type="application/xhtml+xml"/>'
+        for i in range(len(chapters))
+    )
+    # El spine define el orden de lectura (inverso al del manifiesto)
+    spine = "".join(f'<itemref idref="c{i}"/>' for i in reversed(range(len(chapters))))
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("mimetype", "application/epub+zip")
+        archive.writestr("META-INF/container.xml", (
+            '<container xmlns="urn:oasis:names:tc:opendocument:xmlns:container" version="1.0">'
+            '<rootfiles><rootfile full-path="OEBPS/content.opf" '
+            'media-type="application/oebps-package+xml"/></rootfiles></container>'
+        ))
+        archive.writestr("OEBPS/content.opf", (
+            '<package xmlns="http://www.idpf.org/2007/opf" version="3.0">'
+            f'<manifest>{manifest}<item id="css" href="estilo.css" media-type="text/css"/></manifest>'
+            f"<spine>{spine}</spine>{'<x/>' * opf_padding}</package>"
+        ))
+        for i, body in enumerate(chapters):
+            header = ('<!DOCTYPE html PUBLIC "-//W3C//DTD XHTML 1.1//EN" '
+                      '"http://www.w3.org/TR/xhtml11/DTD/xhtml11.dtd">') if doctype else ""
+            archive.writestr(f"OEBPS/texto/cap {i}.xhtml", (
+                f'{header}<html xmlns="http://www.w3.org/1999/xhtml"><head><title>Ignorado</title>'
+                f"<style>p {{}}</style></head><body>{body}</body></html>"
+            ))
+    return buffer.getvalue()
+
+
+def _blocks(data, doc_type, **kwargs):
+    return list(DocumentReader(BytesIO(data), doc_type, **kwargs).iter_blocks())
+
+
+class TestDetectDocumentType:
+    """Tests de la detección del tipo de documento."""
+
+    def test_por_content_type(self):
+        assert detect_document_type(media_type="text/markdown; charset=utf-8") == "md"
+        assert detect_document_type(media_type=DOCX_MEDIA_TYPE) == "docx"
+
+    def test_por_extension(self):
+        assert detect_document_type("Libro.EPUB", "application/octet-stream") == "epub"
+        assert detect_document_type("notas.markdown") == "md"
+
+    def test_no_soportado(self):
+        with pytest.raises(ValidationError) as exc:
+            detect_document_type("hoja.xlsx", "application/octet-stream")
+        assert exc.value.code == "UNSUPPORTED_DOCUMENT"
+
+
+class TestMarkdown:
+    """Tests de la extracción de Markdown."""
+
+    def test_estructura(self):
+        text = (
+            "# Manual de *uso*\n"
+            "Primera línea\n"
+            "del párrafo con [enlace](http://x) y `código`.\n"
+            "\n"
+            "Sección\n"
+            "-------\n"
+            "- uno\n"
+            "- **dos**\n"
+            "2. tres\n"
+            "> cita\n"
+            "\n"
+            "```\n"
+            "# no es encabezado\n"
+            "```\n"
+            "---\n"
+            "Fin ##\n"
+        )
+        assert _blocks(text.encode("utf-8"), "md") == [
+            Block("heading", "Manual de uso", 1),
+            Block("paragraph", "Primera línea del párrafo con enlace y código."),
+            Block("heading", "Sección", 2),
+            Block("paragraph", "uno"),
+            Block("paragraph", "dos"),
+            Block("paragraph", "2. tres"),
+            Block("paragraph", "cita"),
+            Block("paragraph", "# no es encabezado"),
+            Block("paragraph", "Fin ##"),
+        ]
+
+    def test_guiones_bajos_dentro_de_palabras(self):
+        assert _blocks(b"_nota_ sobre archivo_final", "md") == [
+            Block("paragraph", "nota sobre archivo_final")
+        ]
+
+
+class TestTxt:
+    """Tests de la extracción de texto plano."""
+
+    def test_texto_tal_cual(self):
+        """Sin BOM; los CRLF los resuelve el maquetador."""
+        data = "﻿Línea 1\r\n\r\nLínea 2".encode("utf-8")
+        reader = DocumentReader(BytesIO(data), "txt")
+        assert "".join(reader.iter_text()) == "Línea 1\r\n\r\nLínea 2"
+
+    def test_bloques_por_linea(self):
+        data = "Línea 1\r\n\r\nLínea 2".encode("utf-8")
+        assert _blocks(data, "txt") == [
+            Block("paragraph", "Línea 1"), Block("paragraph", ""), Block("paragraph", "Línea 2"),
+        ]
+
+    def test_utf8_invalido(self):
+        reader = DocumentReader(BytesIO(b"\xff\xfe"), "txt")
+        with pytest.raises(ValidationError):
+            list(reader.iter_text())
+
+
+class TestDocx:
+    """Tests de la extracción de DOCX."""
+
+    def test_encabezados_y_parrafos(self):
+        data = make_docx(
+            _docx_paragraph("Manual", style="Title"),
+            _docx_paragraph("Capítulo 1", style="Heading1"),
+            _docx_paragraph("Texto |en dos |runs"),
+            _docx_paragraph("Apartado", style="Ttulo2"),
+            _docx_paragraph("Por esquema", outline=2),
+            _docx_paragraph("   "),
+        )
+        assert _blocks(data, "docx") == [
+            Block("heading", "Manual", 1),
+            Block("heading", "Capítulo 1", 1),
+            Block("paragraph", "Texto en dos runs"),
+            Block("heading", "Apartado", 2),
+            Block("heading", "Por esquema", 3),
+        ]
+
+    def test_extraccion_incremental(self, monkeypatch):
+        """Los primeros bloques salen antes de leer el documento completo."""
+        monkeypatch.setattr(ingest, "READ_SIZE", 64)
+        data = make_docx(*(_docx_paragraph(f"Párrafo {i}") for i in range(500)))
+        reader = DocumentReader(BytesIO(data), "docx")
+        blocks = reader.iter_blocks()
+        assert next(blocks) == Block("paragraph", "Párrafo 0")
+        assert reader._zip is not None
+        assert sum(1 for _ in blocks) == 499
+
+    def test_no_es_zip(self):
+        with pytest.raises(ValidationError) as exc:
+            DocumentReader(BytesIO(b"no soy un zip"), "docx")
+        assert exc.value.code == "INVALID_DOCUMENT"
+
+    def test_falta_document_xml(self):
+        buffer = BytesIO()
+        with zipfile.ZipFile(buffer, "w") as archive:
+            archive.writestr("otro.xml", "<x/>")
+        with pytest.raises(ValidationError):
+            DocumentReader(buffer, "docx")
+
+    def test_bomba_zip(self):
+        """El tamaño descomprimido se comprueba antes de extraer nada."""
+        data = make_docx(_docx_paragraph("a" * 100000))
+        assert len(data) < 5000
+        with pytest.raises(ValidationError) as exc:
+            DocumentReader(BytesIO(data), "docx", max_uncompressed=10000)
+        assert exc.value.code == "DOCUMENT_TOO_LARGE"
+
+
+class TestEpub:
+    """Tests de la extracción de EPUB."""
+
+    def test_orden_del_spine_y_bloques(self):
+        data = make_epub([
+            "<h2>Capítulo 2</h2><p>Fin.</p>",
+            "<h1>Capítulo&nbsp;1</h1><p>Hola <em>mundo</em>,<br/>adiós.</p>"
+            "<ul><li>uno</li><li><p>dos</p></li></ul><script>ignorar()</script>"
+            "<div>Antes<p>dentro</p>después</div>",
+        ])
+        assert _blocks(data, "epub") == [
+            Block("heading", "Capítulo 1", 1),
+            Block("paragraph", "Hola mundo, adiós."),
+            Block("paragraph", "uno"),
+            Block("paragraph", "dos"),
+            Block("paragraph", "Antes"),
+            Block("paragraph", "dentro"),
+            Block("paragraph", "después"),
+            Block("heading", "Capítulo 2", 2),
+            Block("paragraph", "Fin."),
+        ]
+
+    def test_xml_invalido(self):
+        """Sin DOCTYPE, una entidad HTML es XML inválido."""
+        reader = DocumentReader(BytesIO(make_epub(["<p>a&nbsp;b</p>"], doctype=False)), "epub")
+        with pytest.raises(ValidationError) as exc:
+            list(reader.iter_blocks())
+        assert exc.value.code == "INVALID_DOCUMENT"
+
+    def test_opf_demasiado_grande(self, monkeypatch):
+        """El paquete OPF se comprueba antes de analizarlo entero."""
+        data = make_epub(["<p>a</p>"], opf_padding=5000)
+        with pytest.raises(ValidationError) as exc:
+            DocumentReader(BytesIO(data), "epub", max_uncompressed=1000)
+        assert exc.value.code == "DOCUMENT_TOO_LARGE"
+
+        monkeypatch.setattr(ingest, "METADATA_MAX_BYTES", 1000)
+        with pytest.raises(ValidationError) as exc:
+            DocumentReader(BytesIO(data), "epub")
+        assert exc.value.code == "DOCUMENT_TOO_LARGE"
+
+    def test_sin_paquete(self):
+        buffer = BytesIO()
+        with zipfile.ZipFile(buffer, "w") as archive:
+            archive.writestr("mimetype", "application/epub+zip")
+        with pytest.raises(ValidationError):
+            DocumentReader(buffer, "epub")
+
+
+class TestMappedText:
+    """Tests de la lectura de txt mapeados en memoria."""
+
+    def test_caracter_partido_entre_bloques(self, tmp_path):
+        """Un carácter multibyte en el borde de un bloque sale completo."""
+        # BOM (3 bytes) + ñ (2) + relleno: el € (3 bytes) cruza el borde
+        text = "ñ" + "a" * (mmap.PAGESIZE - 6) + "€" + "😀 fin"
+        path = tmp_path / "libro.txt"
+        path.write_bytes("﻿".encode("utf-8") + text.encode("utf-8"))
+        chunks = list(ingest.iter_mapped_text(path, block_size=mmap.PAGESIZE))
+        assert len(chunks) == 2
+        assert "".join(chunks) == text
+
+    def test_vacio(self, tmp_path):
+        path = tmp_path / "vacio.txt"
+        path.write_bytes(b"")
+        assert list(ingest.iter_mapped_text(path)) == []
+
+    def test_utf8_truncado(self, tmp_path):
+        path = tmp_path / "roto.txt"
+        path.write_bytes("año".encode("utf-8")[:2])
+        with pytest.raises(ValidationError):
+            list(ingest.iter_mapped_text(path))
+
+    def test_cierre_anticipado(self, tmp_path):
+        """Abandonar la lectura a mitad libera el mapa."""
+        path = tmp_path / "libro.txt"
+        path.write_bytes(b"a" * 3 * mmap.PAGESIZE)
+        chunks = ingest.iter_mapped_text(path, block_size=mmap.PAGESIZE)
+        assert next(chunks) == "a" * mmap.PAGESIZE
+        chunks.close()
+
+
+class TestIterText:
+    """Tests del texto entregado al traductor."""
+
+    def test_lineas_en_blanco_alrededor_de_encabezados(self):
+        data = b"# Uno\n## Dos\ntexto\n# Tres\nfin"
+        reader = DocumentReader(BytesIO(data), "md")
+        assert "".join(reader.iter_text()) == "Uno\n\nDos\n\ntexto\n\nTres\n\nfin\n"
+
+
+class TestDocumentsEndpoint:
+    """Tests de POST /generation/documents/{format}."""
+
+    url = f"{settings.api_prefix}/generation/documents"
+
+    def test_docx_a_brf(self):
+        data = make_docx(_docx_paragraph("Capítulo 1", style="Heading1"),
+                         _docx_paragraph("Salida de emergencia 12"))
+        client = TestClient(create_app())
+        response = client.post(f"{self.url}/brf?cells_per_line=20", content=data,
+                               headers={"Content-Type": DOCX_MEDIA_TYPE})
+        assert response.status_code == 200
+        expected = generate_braille_brf("Capítulo 1\n\nSalida de emergencia 12\n", 20)
+        assert response.content == expected.getvalue()
+        assert "braille_documento.brf" in response.headers["content-disposition"]
+
+    def test_epub_a_pef_por_nombre(self):
+        data = make_epub(["<h1>Libro</h1><p>Texto</p>"])
+        client = TestClient(create_app())
+        response = client.post(f"{self.url}/pef?filename=mi_libro.epub", content=data,
+                               headers={"Content-Type": "application/octet-stream"})
+        assert response.status_code == 200
+        assert "<dc:title>mi_libro</dc:title>" in response.text
+        assert "braille_mi_libro.pef" in response.headers["content-disposition"]
+
+    def test_titulo_con_caracteres_de_control(self):
+        client = TestClient(create_app())
+        response = client.post(f"{self.url}/pef?filename=a.txt&title=a%01b", content=b"Hola",
+                               headers={"Content-Type": "application/octet-stream"})
+        assert response.status_code == 200
+        ET.fromstring(response.content)
+        assert "<dc:title>ab</dc:title>" in response.text
+
+    def test_tipo_no_soportado(self):
+        client = TestClient(create_app())
+        response = client.post(f"{self.url}/brf", content=b"x",
+                               headers={"Content-Type": "application/octet-stream"})
+        assert response.status_code == 400
+        assert response.json()["error"] == "UNSUPPORTED_DOCUMENT"
+
+    @pytest.mark.parametrize("filename, data", [
+        ("a.txt", "Año".encode("latin-1")),
+        ("a.md", "# Capítulo\n".encode("utf-8") * 50000 + "Año".encode("latin-1")),
+        ("a.docx", make_docx("<w:p>sin cerrar")),
+        ("a.epub", make_epub(["<p>a&nbsp;b</p>"], doctype=False)),
+    ])
+    def test_contenido_invalido_antes_de_responder(self, filename, data):
+        """Los errores de contenido son un 400, no una respuesta 200 cortada."""
+        client = TestClient(create_app())
+        response = client.post(f"{self.url}/brf?filename={filename}", content=data,
+                               headers={"Content-Type": "application/octet-stream"})
+        assert response.status_code == 400
+        assert response.json()["error"] == "INVALID_DOCUMENT"
+
+    def test_demasiado_grande(self, monkeypatch):
+        monkeypatch.setattr(settings, "ingest_max_upload_bytes", 10)
+        client = TestClient(create_app())
+        response = client.post(f"{self.url}/brf?filename=a.txt", content=b"x" * 11)
+        assert response.status_code == 400
+        assert response.json()["error"] == "DOCUMENT_TOO_LARGE"
+
+    def test_vacio(self):
+        client = TestClient(create_app())
+        response = client.post(f"{self.url}/brf?filename=a.md", content=b"")
+        assert response.status_code == 400
+
+    def test_documento_invalido(self):
+        client = TestClient(create_app())
+        response = client.post(f"{self.url}/brf?filename=a.docx", content=b"PK roto")
+        assert response.status_code == 400
+        assert response.json()["error"] == "INVALID_DOCUMENT"
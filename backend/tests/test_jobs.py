@@ -0,0 +1,170 @@
+"""
+Tests para los trabajos asíncronos de generación.
+"""
+
+import time
+from io import BytesIO
+
+import pytest
+from fastapi.testclient import TestClient
+from pypdf import PdfReader
+
+from app.config import settings
+from app.exceptions import RateLimitError
+from app.main import create_app
+from app.api.services.jobs import JobStore
+
+
+JOBS_URL = f"{settings.api_prefix}/generation/jobs"
+
+
+@pytest.fixture
+def jobs_app(monkeypatch, tmp_path):
+    """Aplicación con el almacén de trabajos en un directorio temporal."""
+    monkeypatch.setattr(settings, "jobs_dir", str(tmp_path / "jobs"))
+    monkeypatch.setattr(settings, "jobs_poll_interval", 0.05)
+    return create_app()
+
+
+def _wait_for(client: TestClient, job_id: str, timeout: float = 30) -> dict:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        status = client.get(f"{JOBS_URL}/{job_id}").json()
+        if status["status"] in ("done", "failed"):
+            return status
+        time.sleep(0.05)
+    raise AssertionError(f"El trabajo {job_id} no terminó a tiempo")
+
+
+class TestJobsAPI:
+    """Tests de los endpoints de trabajos."""
+
+    def test_trabajo_completo(self, jobs_app):
+        """Un documento grande se encola, progresa y se descarga."""
+        with TestClient(jobs_app) as client:
+            response = client.post(JOBS_URL, json={"text": "a" * 2000, "title": "Libro"})
+            assert response.status_code == 202
+            job = response.json()
+            assert job["status"] == "queued"
+            assert response.headers["location"].endswith(job["id"])
+
+            status = _wait_for(client, job["id"])
+            assert status["status"] == "done"
+            assert status["pages"] > 1
+
+            result = client.get(status["result_url"])
+            assert result.status_code == 200
+            assert result.headers["content-type"] == "application/pdf"
+            assert len(PdfReader(BytesIO(result.content)).pages) == status["pages"]
+
+    def test_trabajo_brf(self, jobs_app):
+        """Los trabajos pueden producir BRF para impresoras Braille."""
+        with TestClient(jobs_app) as client:
+            job = client.post(JOBS_URL, json={
+                "text": "hola\n" * 30, "format": "brf", "lines_per_page": 10
+            }).json()
+            status = _wait_for(client, job["id"])
+            assert status["status"] == "done"
+            assert status["pages"] == 3
+            result = client.get(status["result_url"])
+            assert result.content.count(b"\f") == 2
+
+    def test_trabajo_inexistente(self, jobs_app):
+        """Un id desconocido responde 404."""
+        client = TestClient(jobs_app)
+        assert client.get(f"{JOBS_URL}/desconocido").status_code == 404
+        assert client.get(f"{JOBS_URL}/desconocido/result").status_code == 404
+
+    def test_resultado_no_listo(self, jobs_app):
+        """Sin ejecutor activo, el resultado responde 409."""
+        client = TestClient(jobs_app)
+        job = client.post(JOBS_URL, json={"text": "Hola"}).json()
+        assert client.get(f"{JOBS_URL}/{job['id']}/result").status_code == 409
+
+    def test_limite_por_cliente(self, jobs_app, monkeypatch):
+        """Exceder los trabajos activos por cliente responde 429 con Retry-After."""
+        monkeypatch.setattr(settings, "jobs_max_per_client", 1)
+        client = TestClient(jobs_app)
+        assert client.post(JOBS_URL, json={"text": "uno"}).status_code == 202
+        response = client.post(JOBS_URL, json={"text": "dos"})
+        assert response.status_code == 429
+        assert int(response.headers["retry-after"]) > 0
+
+    def test_formato_no_soportado(self, jobs_app):
+        """Un formato sin soporte de trabajos responde 400."""
+        client = TestClient(jobs_app)
+        response = client.post(JOBS_URL, json={"text": "Hola", "format": "png"})
+        assert response.status_code == 400
+
+
+class TestJobStore:
+    """Tests del almacén persistente."""
+
+    def test_sobrevive_reinicio(self, tmp_path):
+        """Un trabajo encolado sigue disponible desde otra instancia."""
+        job = JobStore(tmp_path).create("c", "pdf", "Hola", {}, max_active=3)
+        reopened = JobStore(tmp_path)
+        assert reopened.get(job["id"])["status"] == "queued"
+        assert [j["id"] for j in reopened.claim("otro", 5)] == [job["id"]]
+
+    def test_limite_activos(self, tmp_path):
+        """El límite cuenta trabajos en cola y en curso del mismo cliente."""
+        store = JobStore(tmp_path)
+        store.create("c", "pdf", "uno", {}, max_active=1)
+        with pytest.raises(RateLimitError):
+            store.create("c", "pdf", "dos", {}, max_active=1)
+        store.create("otro", "pdf", "tres", {}, max_active=1)
+
+    def test_reclamo_atomico(self, tmp_path):
+        """Un trabajo solo puede reclamarlo un ejecutor."""
+        store = JobStore(tmp_path)
+        store.create("c", "pdf", "Hola", {}, max_active=3)
+        assert len(store.claim("a", 5)) == 1
+        assert store.claim("b", 5) == []
+
+    def test_trabajo_huerfano_vuelve_a_la_cola(self, tmp_path):
+        """Un trabajo sin latido se re-encola; release devuelve los propios."""
+        store = JobStore(tmp_path)
+        job = store.create("c", "pdf", "Hola", {}, max_active=3)
+        store.claim("a", 1)
+        assert store.requeue_stale(stale_after=60) == 0
+        assert store.requeue_stale(stale_after=-1) == 1
+        store.claim("b", 1)
+        assert store.release("b") == 1
+        assert store.get(job["id"])["status"] == "queued"
+
+    def test_texto_fuera_de_la_base_de_datos(self, tmp_path):
+        """El texto se guarda en inputs/ y se elimina al terminar el trabajo."""
+        store = JobStore(tmp_path)
+        job = store.create("c", "brf", "Hola mundo largo", {}, max_active=3)
+        assert "text" not in job["params"]
+        assert job["params"]["preview"] == "Hola mundo"
+        path = store.input_path(job["id"])
+        assert path.read_text(encoding="utf-8") == "Hola mundo largo"
+
+        store.claim("a", 1)
+        store.fail(job["id"], "otro", "sin efecto")
+        assert path.exists()
+        store.fail(job["id"], "a", "error")
+        assert not path.exists()
+
+    def test_limite_no_deja_entradas(self, tmp_path):
+        store = JobStore(tmp_path)
+        store.create("c", "pdf", "uno", {}, max_active=1)
+        with pytest.raises(RateLimitError):
+            store.create("c", "pdf", "dos", {}, max_active=1)
+        assert len(list(store.inputs_dir.iterdir())) == 1
+
+    def test_purga_por_ttl(self, tmp_path):
+        """Los resultados expirados se eliminan junto con su archivo."""
+        store = JobStore(tmp_path)
+        job = store.create("c", "pdf", "Hola", {}, max_active=3)
+        store.claim("a", 1)
+        path = store.result_path(job["id"], "pdf")
+        path.write_bytes(b"%PDF")
+        store.finish(job["id"], "a", path, "braille_Hola.pdf")
+
+        assert store.purge_expired(ttl=3600) == 0
+        assert store.purge_expired(ttl=-1) == 1
+        assert store.get(job["id"]) is None
+        assert not path.exists()
@@ -0,0 +1,123 @@
+"""
+Tests para la maquetación compartida en líneas y páginas.
+"""
+
+import pytest
+
+from app.api.services.layout import (
+    PARAGRAPH_BREAK,
+    BrailleLayout,
+    get_layout,
+    iter_line_spans,
+    paragraph_cells,
+)
+from app.api.services.generator import BraillePDFGenerator
+
+
+class TestLineSpans:
+    """Tests de los cortes de línea."""
+
+    def test_corte_por_palabras(self):
+        """Se corta en el último espacio que cabe y el espacio se descarta."""
+        cells = b"\x01\x01\x00\x02\x02\x00\x03"
+        assert list(iter_line_spans(cells, 5)) == [(0, 5), (6, 7)]
+        assert list(iter_line_spans(cells, 4)) == [(0, 2), (3, 7)]
+
+    def test_palabra_larga(self):
+        """Una palabra más larga que la línea se corta sin guion."""
+        assert list(iter_line_spans(b"\x01" * 7, 3)) == [(0, 3), (3, 6), (6, 7)]
+
+    def test_vacio(self):
+        """Un documento vacío tiene una línea vacía."""
+        assert list(iter_line_spans(b"", 10)) == [(0, 0)]
+
+
+class TestBrailleLayout:
+    """Tests de la paginación."""
+
+    def test_paginas(self):
+        """Las líneas se agrupan en páginas; la última puede ser parcial."""
+        layout = BrailleLayout(b"\x01" * 25, cells_per_line=5, lines_per_page=2)
+        assert layout.page_count == 3
+        assert layout.page(3) == [b"\x01" * 5]
+
+    def test_primera_pagina_mas_corta(self):
+        """La primera página admite menos líneas (cabecera)."""
+        layout = BrailleLayout(b"\x01" * 50, 5, lines_per_page=4, first_page_lines=2)
+        assert [len(page) for page in layout.iter_pages()] == [2, 4, 4]
+
+    def test_pagina_fuera_de_rango(self):
+        """Pedir una página inexistente lanza IndexError."""
+        layout = BrailleLayout(b"\x01", 5, 5)
+        with pytest.raises(IndexError):
+            layout.page(2)
+
+    def test_acceso_aleatorio(self):
+        """Cualquier página coincide con la misma página al recorrer todas."""
+        layout = BrailleLayout.from_text("palabra corta " * 2000, 30, 20)
+        pages = list(layout.iter_pages())
+        assert layout.page(17) == pages[16]
+
+    def test_geometria_pdf_a4(self):
+        """En A4 el PDF mantiene 9 celdas por línea y 7/9 líneas por página."""
+        layout = BraillePDFGenerator().layout(b"\x01" * 2000)
+        assert layout.cells_per_line == 9
+        assert layout.first_page_lines == 7
+        assert layout.lines_per_page == 9
+        assert layout.page_count == 25
+
+    def test_parrafos(self):
+        """Los saltos de línea del texto fuerzan un salto de línea."""
+        cells = paragraph_cells("a\n\nb\n")
+        assert cells == bytes([1, PARAGRAPH_BREAK, PARAGRAPH_BREAK, 3])
+        layout = BrailleLayout(cells, 10, 10)
+        assert layout.page(1) == [b"\x01", b"", b"\x03"]
+
+    @pytest.mark.parametrize("text", ["a\n\nb\n", "Piso 1\r\n2\n", "", "\n"])
+    def test_desde_fragmentos(self, text):
+        """from_chunks maqueta igual que from_text sin reunir el texto."""
+        chunks = [text[i:i + 3] for i in range(0, len(text), 3)]
+        layout = BrailleLayout.from_chunks(chunks, 10, 10)
+        assert layout.cells == paragraph_cells(text)
+        assert list(layout.iter_pages()) == list(BrailleLayout.from_text(text, 10, 10).iter_pages())
+
+    def test_indice_compacto(self):
+        """Las líneas se indexan con desplazamientos sobre el buffer de celdas."""
+        layout = BrailleLayout.from_text("aaa bbb ccc", 4, 2)
+        assert layout.line_starts.itemsize == 4
+        assert [layout.line_span(i) for i in range(layout.line_count)] == [(0, 3), (4, 7), (8, 11)]
+        index = layout.to_index()
+        assert index["page_count"] == 2
+        assert index["pages"][1] == {"number": 2, "first_line": 2, "lines": 1, "start": 8, "end": 11}
+
+
+class TestLayoutCache:
+    """Tests de la caché de maquetaciones."""
+
+    def test_misma_clave_misma_maquetacion(self):
+        """El mismo texto con la misma geometría reutiliza la maquetación."""
+        text = "documento en caché " * 50
+        assert get_layout(text, 30, 20) is get_layout(text, 30, 20)
+        assert get_layout(text, 30, 20) is not get_layout(text, 31, 20)
+
+    def test_lru(self, monkeypatch):
+        """La caché descarta las entradas menos usadas."""
+        from app.config import settings
+        from app.api.services import layout as layout_module
+
+        monkeypatch.setattr(settings, "layout_cache_size", 2)
+        monkeypatch.setattr(layout_module, "_layout_cache", type(layout_module._layout_cache)())
+        first = get_layout("uno", 10, 10)
+        get_layout("dos", 10, 10)
+        get_layout("tres", 10, 10)
+        assert get_layout("uno", 10, 10) is not first
+
+    def test_brf_identico_con_maquetacion(self):
+        """El BRF en streaming y el BRF desde una maquetación coinciden."""
+        from app.api.services.embosser import BrailleBRFGenerator
+
+        text = "Capítulo 1\n\nTexto del capítulo con 123 números.\n" * 20
+        generator = BrailleBRFGenerator(20, 5)
+        streamed = b"".join(generator.iter_brf(text))
+        cached = b"".join(generator.iter_brf(get_layout(text, 20, 5)))
+        assert streamed == cached
@@ -0,0 +1,211 @@
+"""
+Tests para métricas, logging y profiling.
+"""
+
+import cProfile
+import json
+import logging
+import pstats
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import metrics
+from app.config import settings
+from app.logger import JSONFormatter, get_logger, log_event, _DeferredQueueHandler
+from app.main import create_app
+
+
+@pytest.fixture
+def metrics_client(monkeypatch):
+    """Cliente HTTP con métricas habilitadas."""
+    monkeypatch.setattr(settings, "metrics_enabled", True)
+    client = TestClient(create_app())
+    yield client
+    metrics.configure(False)
+
+
+def _sample(body: str, series: str) -> float:
+    """Valor de una serie en la exposición de texto (0 si no existe)."""
+    for line in body.splitlines():
+        if line.startswith(series + " "):
+            return float(line.rsplit(" ", 1)[1])
+    return 0.0
+
+
+class TestMetricsRegistry:
+    """Tests del registro de métricas en memoria."""
+
+    def test_histogram_buckets_acumulativos(self):
+        """Verifica que los buckets se expongan de forma acumulativa."""
+        hist = metrics.Histogram("test_hist", "ayuda", ["stage"], buckets=(0.1, 1.0))
+        child = hist.labels("x")
+        child.observe(0.05)
+        child.observe(0.5)
+        child.observe(5)
+
+        lines = hist.collect()
+        assert 'test_hist_bucket{stage="x",le="0.1"} 1' in lines
+        assert 'test_hist_bucket{stage="x",le="1"} 2' in lines
+        assert 'test_hist_bucket{stage="x",le="+Inf"} 3' in lines
+        assert 'test_hist_count{stage="x"} 3' in lines
+
+    def test_stage_timer_deshabilitado_no_registra(self):
+        """Sin métricas activas, el temporizador es un no-op compartido."""
+        metrics.configure(False)
+        assert metrics.stage_timer("rendering") is metrics.stage_timer("validation")
+
+    def test_etiquetas_incorrectas(self):
+        """Verifica que se rechace un número incorrecto de etiquetas."""
+        counter = metrics.Counter("test_counter", "ayuda", ["a", "b"])
+        with pytest.raises(ValueError):
+            counter.labels("solo-una")
+
+
+class TestMetricsEndpoint:
+    """Tests del endpoint /metrics y del middleware."""
+
+    def test_endpoint_no_existe_si_deshabilitado(self, monkeypatch):
+        """Por defecto /metrics no se expone."""
+        monkeypatch.setattr(settings, "metrics_enabled", False)
+        client = TestClient(create_app())
+        assert client.get("/metrics").status_code == 404
+
+    def test_conteo_por_endpoint(self, metrics_client):
+        """Verifica conteo y latencia etiquetados por plantilla de ruta."""
+        series = (
+            'braille_http_requests_total{method="POST",'
+            'endpoint="/api/v1/translation/to-braille",status="200"}'
+        )
+        before = _sample(metrics_client.get("/metrics").text, series)
+        metrics_client.post("/api/v1/translation/to-braille", json={"text": "Hola"})
+
+        body = metrics_client.get("/metrics").text
+        assert _sample(body, series) == before + 1
+        assert "braille_http_request_duration_seconds_bucket" in body
+
+    def test_tiempos_por_etapa(self, metrics_client):
+        """Verifica que se registren las etapas de generación de imagen y PDF."""
+        stages = ("validation", "translation", "rendering", "png_encode", "pdf_save")
+        before = metrics_client.get("/metrics").text
+        assert metrics_client.post("/api/v1/generation/image", json={"text": "Baño"}).status_code == 200
+        assert metrics_client.post("/api/v1/generation/pdf", json={"text": "Baño"}).status_code == 200
+
+        body = metrics_client.get("/metrics").text
+        for stage in stages:
+            series = f'braille_stage_duration_seconds_count{{stage="{stage}"}}'
+            assert _sample(body, series) > _sample(before, series)
+        series = 'braille_input_size_chars_count{endpoint="image"}'
+        assert _sample(body, series) == _sample(before, series) + 1
+        assert 'braille_worker_queue_depth{pool="render"} 0' in body
+
+
+class TestStructuredLogging:
+    """Tests del logging estructurado y asíncrono."""
+
+    def test_formato_json_con_campos_truncados(self):
+        """Verifica que los campos extra se incluyan y se trunquen."""
+        record = logging.LogRecord("test", logging.INFO, __file__, 1, "Imagen %s", ("ok",), None)
+        record.text = "x" * 500
+        record.size_bytes = 1024
+
+        payload = json.loads(JSONFormatter(max_field_length=20).format(record))
+        assert payload["message"] == "Imagen ok"
+        assert payload["level"] == "INFO"
+        assert payload["size_bytes"] == 1024
+        assert len(payload["text"]) == 20
+        assert payload["text"].endswith("...")
+
+    def test_handler_no_formatea_en_el_hilo_emisor(self):
+        """El mensaje se interpola en el listener, no al encolar."""
+        class Contador:
+            llamadas = 0
+
+            def __str__(self):
+                Contador.llamadas += 1
+                return "valor"
+
+        record = logging.LogRecord("test", logging.INFO, __file__, 1, "%s", (Contador(),), None)
+        prepared = _DeferredQueueHandler(None).prepare(record)
+        assert prepared.args == record.args
+        assert Contador.llamadas == 0
+
+    def test_muestreo_descarta_eventos(self, monkeypatch, caplog):
+        """Con LOG_SAMPLE_RATE=0 los eventos muestreados no se emiten."""
+        logger = get_logger("test.sampling")
+        monkeypatch.setattr(settings, "log_sample_rate", 0.0)
+        with caplog.at_level(logging.INFO, logger="test.sampling"):
+            log_event(logger, "descartado", sampled=True)
+            log_event(logger, "siempre", sampled=False)
+            log_event(logger, "advertencia", level=logging.WARNING, sampled=True)
+
+        messages = [r.getMessage() for r in caplog.records]
+        assert messages == ["siempre", "advertencia"]
+
+
+@pytest.fixture
+def profiling_client(monkeypatch, tmp_path):
+    """Cliente HTTP con profiling habilitado en un directorio temporal."""
+    monkeypatch.setattr(settings, "profiling_enabled", True)
+    monkeypatch.setattr(settings, "profiling_dir", str(tmp_path))
+    return TestClient(create_app())
+
+
+class TestProfiling:
+    """Tests del profiling opcional por petición."""
+
+    def test_sin_header_no_se_perfila(self, profiling_client, tmp_path):
+        """Sin header ni muestreo no se genera ningún perfil."""
+        response = profiling_client.post("/api/v1/generation/pdf", json={"text": "Hola"})
+        assert response.status_code == 200
+        assert "x-profile-id" not in response.headers
+        assert list(tmp_path.iterdir()) == []
+
+    def test_header_genera_perfil_descargable(self, profiling_client, tmp_path):
+        """Con X-Profile se guarda un pstats que incluye el trabajo del worker."""
+        response = profiling_client.post(
+            "/api/v1/generation/pdf", json={"text": "Hola"}, headers={"X-Profile": "1"}
+        )
+        assert response.status_code == 200
+        name = response.headers["x-profile-id"]
+
+        listing = profiling_client.get("/api/v1/profiles").json()
+        assert name in [p["name"] for p in listing["profiles"]]
+
+        stats = pstats.Stats(str(tmp_path / name))
+        functions = {func for _, _, func in stats.stats}
+        assert "generate_pdf" in functions
+
+        download = profiling_client.get(f"/api/v1/profiles/{name}")
+        assert download.status_code == 200
+        assert profiling_client.get("/api/v1/profiles/..%2Fsecreto.prof").status_code == 404
+
+    def test_profiler_ocupado_no_falla(self, profiling_client, tmp_path, monkeypatch):
+        """
+        Si no se puede activar otro profiler (Python 3.12+ admite uno por
+        proceso), el trabajo del worker se ejecuta sin perfilar.
+        """
+        from app import profiling
+
+        enabled = []
+
+        class SingleProfile(cProfile.Profile):
+            def enable(self):
+                if enabled:
+                    raise ValueError("Another profiling tool is already active")
+                enabled.append(self)
+                super().enable()
+
+        monkeypatch.setattr(profiling.cProfile, "Profile", SingleProfile)
+        response = profiling_client.post(
+            "/api/v1/generation/pdf", json={"text": "Hola"}, headers={"X-Profile": "1"}
+        )
+        assert response.status_code == 200
+        assert len(enabled) == 1
+        assert (tmp_path / response.headers["x-profile-id"]).is_file()
+
+    def test_rutas_no_registradas_por_defecto(self):
+        """Con la configuración por defecto no existen rutas de profiling."""
+        client = TestClient(create_app())
+        assert client.get("/api/v1/profiles").status_code == 404
+
@@ -0,0 +1,182 @@
+"""
+Tests para el control de admisión (token bucket y límites de concurrencia).
+"""
+
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import ratelimit
+from app.config import settings
+from app.exceptions import RateLimitError
+from app.main import create_app
+from app.ratelimit import MemoryStore, RateLimitMiddleware, load_store
+
+
+class _Clock:
+    """Reloj manual para time.monotonic."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(ratelimit.time, "monotonic", clock)
+    return clock
+
+
+class TestMemoryStore:
+    """Tests del bucket de tokens en memoria."""
+
+    def test_rafaga_y_espera(self, clock):
+        """Tras agotar la ráfaga se indica cuánto esperar."""
+        store = MemoryStore()
+        assert [store.take("a", 2.0, 3) for _ in range(3)] == [0, 0, 0]
+        assert store.take("a", 2.0, 3) == pytest.approx(0.5)
+
+    def test_reposicion(self, clock):
+        """Los tokens se reponen al ritmo configurado, sin superar la ráfaga."""
+        store = MemoryStore()
+        for _ in range(3):
+            store.take("a", 2.0, 3)
+        clock.now += 0.5
+        assert store.take("a", 2.0, 3) == 0
+        assert store.take("a", 2.0, 3) > 0
+        clock.now += 100
+        assert [store.take("a", 2.0, 3) for _ in range(4)][-1] > 0
+
+    def test_claves_independientes(self, clock):
+        """Cada cliente tiene su propio bucket."""
+        store = MemoryStore()
+        store.take("a", 1.0, 1)
+        assert store.take("a", 1.0, 1) > 0
+        assert store.take("b", 1.0, 1) == 0
+
+    def test_descarta_buckets_llenos(self, clock):
+        """Por encima de max_keys se olvidan los buckets ya repuestos."""
+        store = MemoryStore(max_keys=2)
+        store.take("a", 1.0, 1)
+        store.take("b", 1.0, 1)
+        clock.now += 10
+        store.take("c", 1.0, 1)
+        assert len(store) == 1
+
+    def test_almacen_configurable(self):
+        """RATE_LIMIT_STORE carga una fábrica "modulo:atributo"."""
+        assert isinstance(load_store(""), MemoryStore)
+        assert isinstance(load_store("app.ratelimit:MemoryStore"), MemoryStore)
+
+
+class TestRateLimitMiddleware:
+    """Tests del middleware sobre la aplicación."""
+
+    def test_429_con_retry_after(self, monkeypatch):
+        """Al agotar el presupuesto de generación se responde 429."""
+        monkeypatch.setattr(settings, "rate_limit_generation_burst", 2)
+        monkeypatch.setattr(settings, "rate_limit_generation_rate", 0.1)
+        client = TestClient(create_app())
+        url = f"{settings.api_prefix}/generation/brf"
+        responses = [client.post(url, json={"text": "Salida"}) for _ in range(3)]
+        assert [r.status_code for r in responses] == [200, 200, 429]
+        assert responses[2].headers["retry-after"] == "10"
+        assert responses[2].json()["error"] == "RATE_LIMITED"
+
+    def test_presupuesto_de_traduccion_separado(self, monkeypatch):
+        """Agotar /generation no afecta a /translation."""
+        monkeypatch.setattr(settings, "rate_limit_generation_burst", 1)
+        monkeypatch.setattr(settings, "rate_limit_generation_rate", 0.1)
+        client = TestClient(create_app())
+        client.get(f"{settings.api_prefix}/generation/formats")
+        assert client.get(f"{settings.api_prefix}/generation/formats").status_code == 429
+        response = client.post(f"{settings.api_prefix}/translation/to-braille", json={"text": "Hola"})
+        assert response.status_code == 200
+
+    def test_rutas_sin_limite(self, monkeypatch):
+        """/health no consume presupuesto."""
+        monkeypatch.setattr(settings, "rate_limit_generation_burst", 1)
+        monkeypatch.setattr(settings, "rate_limit_translation_burst", 1)
+        client = TestClient(create_app())
+        assert all(client.get("/health").status_code == 200 for _ in range(5))
+
+    def test_deshabilitado(self, monkeypatch):
+        """Con RATE_LIMIT_ENABLED=False no se instala el middleware."""
+        monkeypatch.setattr(settings, "rate_limit_enabled", False)
+        monkeypatch.setattr(settings, "rate_limit_translation_burst", 1)
+        client = TestClient(create_app())
+        url = f"{settings.api_prefix}/translation/to-braille"
+        assert all(client.post(url, json={"text": "a"}).status_code == 200 for _ in range(3))
+
+
+class TestConcurrencyLimits:
+    """Tests de los límites de concurrencia."""
+
+    def _middleware(self, monkeypatch, per_client, total, app=None):
+        monkeypatch.setattr(settings, "rate_limit_client_concurrency", per_client)
+        monkeypatch.setattr(settings, "rate_limit_global_concurrency", total)
+        return RateLimitMiddleware(app, store=MemoryStore())
+
+    def test_por_cliente(self, monkeypatch):
+        middleware = self._middleware(monkeypatch, per_client=1, total=10)
+        budget = middleware._budget(f"{settings.api_prefix}/generation/pdf")
+        middleware._admit(budget, "a")
+        with pytest.raises(RateLimitError) as exc:
+            middleware._admit(budget, "a")
+        assert exc.value.code == "TOO_MANY_CONCURRENT"
+        middleware._admit(budget, "b")
+        middleware._release("a")
+        middleware._admit(budget, "a")
+
+    def test_global(self, monkeypatch):
+        middleware = self._middleware(monkeypatch, per_client=5, total=2)
+        budget = middleware._budget(f"{settings.api_prefix}/generation/pdf")
+        middleware._admit(budget, "a")
+        middleware._admit(budget, "b")
+        with pytest.raises(RateLimitError) as exc:
+            middleware._admit(budget, "c")
+        assert exc.value.code == "SERVER_BUSY"
+
+    def test_traduccion_sin_limite_de_concurrencia(self, monkeypatch):
+        middleware = self._middleware(monkeypatch, per_client=1, total=1)
+        budget = middleware._budget(f"{settings.api_prefix}/translation/to-braille")
+        for _ in range(3):
+            middleware._admit(budget, "a")
+
+    def test_exceso_rechazado_sin_esperar(self, monkeypatch):
+        """Las peticiones sobre el límite se rechazan al instante, sin cola."""
+        release = asyncio.Event()
+
+        async def slow_app(scope, receive, send):
+            await release.wait()
+            await send({"type": "http.response.start", "status": 200, "headers": []})
+            await send({"type": "http.response.body", "body": b"ok"})
+
+        middleware = self._middleware(monkeypatch, per_client=2, total=10, app=slow_app)
+
+        async def call():
+            statuses = []
+
+            async def send(message):
+                if message["type"] == "http.response.start":
+                    statuses.append(message["status"])
+
+            scope = {"type": "http", "method": "POST", "headers": [], "client": ("10.0.0.1", 1),
+                     "path": f"{settings.api_prefix}/generation/pdf"}
+            await middleware(scope, None, send)
+            return statuses[0]
+
+        async def main():
+            tasks = [asyncio.create_task(call()) for _ in range(4)]
+            await asyncio.sleep(0.01)
+            # Los dos excedentes ya terminaron mientras los admitidos esperan
+            rejected = [task for task in tasks if task.done()]
+            release.set()
+            results = await asyncio.gather(*tasks)
+            return len(rejected), sorted(results), middleware._active_total
+
+        assert asyncio.run(main()) == (2, [200, 200, 429, 429], 0)
@@ -0,0 +1,234 @@
+"""
+Tests para el planificador por prioridad y el descarte por sobrecarga.
+"""
+
+import asyncio
+
+import pytest
+
+from app import metrics
+from app.config import settings
+from app.exceptions import OverloadError
+from app.metrics import SCHEDULER_QUEUE_WAIT, SCHEDULER_SHED
+from app.scheduler import PriorityClass, Scheduler, SchedulerMiddleware
+
+
+INTERACTIVE = PriorityClass("interactive", 0, max_running=10, deadline=1.0)
+RENDER = PriorityClass("render", 1, max_running=1, deadline=1.0)
+
+
+def _scheduler(slots=10, max_queue=10):
+    return Scheduler((INTERACTIVE, RENDER), slots=slots, max_queue=max_queue)
+
+
+class TestScheduler:
+    """Tests del reparto de plazas."""
+
+    def test_admision_inmediata(self):
+        async def main():
+            scheduler = _scheduler()
+            wait = await scheduler.acquire(RENDER, 1.0)
+            return wait, scheduler.running
+
+        assert asyncio.run(main()) == (0.0, 1)
+
+    def test_render_limitado_y_traduccion_libre(self):
+        """Con las plazas de render ocupadas, las traducciones siguen entrando."""
+        async def main():
+            scheduler = _scheduler()
+            await scheduler.acquire(RENDER, 1.0)
+            waiting = asyncio.create_task(scheduler.acquire(RENDER, 1.0))
+            await asyncio.sleep(0)
+            assert await scheduler.acquire(INTERACTIVE, 1.0) == 0.0
+            assert not waiting.done()
+            scheduler.release(RENDER)
+            await waiting
+            return scheduler.running
+
+        assert asyncio.run(main()) == 2
+
+    def test_prioridad_al_liberar(self):
+        """Al liberar una plaza se atiende antes la clase interactiva."""
+        async def main():
+            scheduler = _scheduler(slots=1)
+            await scheduler.acquire(RENDER, 1.0)
+            order = []
+
+            async def request(pc):
+                await scheduler.acquire(pc, 1.0)
+                order.append(pc.name)
+                scheduler.release(pc)
+
+            tasks = [asyncio.create_task(request(RENDER)), asyncio.create_task(request(INTERACTIVE))]
+            await asyncio.sleep(0)
+            scheduler.release(RENDER)
+            await asyncio.gather(*tasks)
+            return order
+
+        assert asyncio.run(main()) == ["interactive", "render"]
+
+    def test_plazo_vencido(self):
+        """Una petición que espera más que su plazo se descarta."""
+        async def main():
+            scheduler = _scheduler()
+            await scheduler.acquire(RENDER, 1.0)
+            with pytest.raises(OverloadError) as exc:
+                await scheduler.acquire(RENDER, 0.01)
+            return exc.value, scheduler.queued
+
+        error, queued = asyncio.run(main())
+        assert error.status_code == 503
+        assert error.retry_after >= 1
+        assert queued == 0
+
+    def test_descarte_inmediato_si_la_cola_va_atrasada(self):
+        """Si la primera de la cola ya superó el plazo, la nueva no espera."""
+        async def main():
+            scheduler = _scheduler()
+            await scheduler.acquire(RENDER, 1.0)
+            waiting = asyncio.create_task(scheduler.acquire(RENDER, 1.0))
+            await asyncio.sleep(0.05)
+            loop = asyncio.get_running_loop()
+            start = loop.time()
+            with pytest.raises(OverloadError):
+                await scheduler.acquire(RENDER, 0.02)
+            elapsed = loop.time() - start
+            waiting.cancel()
+            return elapsed
+
+        assert asyncio.run(main()) < 0.01
+
+    def test_cola_llena_desplaza_menor_prioridad(self):
+        """Con la cola llena, una traducción desplaza al render más reciente."""
+        async def main():
+            scheduler = _scheduler(slots=1, max_queue=1)
+            await scheduler.acquire(RENDER, 1.0)
+            victim = asyncio.create_task(scheduler.acquire(RENDER, 1.0))
+            await asyncio.sleep(0)
+            interactive = asyncio.create_task(scheduler.acquire(INTERACTIVE, 1.0))
+            await asyncio.sleep(0)
+            with pytest.raises(OverloadError):
+                await victim
+            # Un render no puede desplazar a la traducción en cola
+            with pytest.raises(OverloadError):
+                await scheduler.acquire(RENDER, 1.0)
+            scheduler.release(RENDER)
+            await interactive
+
+        asyncio.run(main())
+
+    def test_cancelacion_en_cola(self):
+        """Un cliente que se desconecta mientras espera sale de la cola."""
+        async def main():
+            scheduler = _scheduler()
+            await scheduler.acquire(RENDER, 1.0)
+            waiting = asyncio.create_task(scheduler.acquire(RENDER, 1.0))
+            await asyncio.sleep(0)
+            waiting.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await waiting
+            return scheduler.running, scheduler.queued
+
+        assert asyncio.run(main()) == (1, 0)
+
+    def test_cancelacion_tras_conceder_plaza(self):
+        """Si la plaza ya se había concedido, la cancelación no la pierde."""
+        async def main():
+            scheduler = _scheduler()
+            await scheduler.acquire(RENDER, 1.0)
+            waiting = asyncio.create_task(scheduler.acquire(RENDER, 1.0))
+            await asyncio.sleep(0)
+            scheduler.release(RENDER)
+            waiting.cancel()
+            try:
+                await waiting
+            except asyncio.CancelledError:
+                pass
+            else:
+                # Python < 3.12: wait_for devuelve el resultado ya disponible
+                # y el llamador libera la plaza como siempre
+                scheduler.release(RENDER)
+            return scheduler.running, scheduler.queued
+
+        assert asyncio.run(main()) == (0, 0)
+
+    def test_metricas_por_clase(self):
+        """La espera en cola y los descartes se registran por clase."""
+        metrics.configure(True)
+        try:
+            shed = SCHEDULER_SHED.labels("render", "deadline").get()
+            waits = SCHEDULER_QUEUE_WAIT.labels("interactive").snapshot()[0]
+
+            async def main():
+                scheduler = _scheduler()
+                await scheduler.acquire(INTERACTIVE, 1.0)
+                await scheduler.acquire(RENDER, 1.0)
+                with pytest.raises(OverloadError):
+                    await scheduler.acquire(RENDER, 0.01)
+
+            asyncio.run(main())
+            assert SCHEDULER_SHED.labels("render", "deadline").get() == shed + 1
+            assert sum(SCHEDULER_QUEUE_WAIT.labels("interactive").snapshot()[0]) == sum(waits) + 1
+        finally:
+            metrics.configure(False)
+
+
+class TestSchedulerMiddleware:
+    """Tests del middleware."""
+
+    def _middleware(self, monkeypatch, app=None):
+        monkeypatch.setattr(settings, "scheduler_render_slots", 1)
+        return SchedulerMiddleware(app)
+
+    def test_clasificacion(self, monkeypatch):
+        middleware = self._middleware(monkeypatch)
+        prefix = settings.api_prefix
+        assert middleware._classify(f"{prefix}/translation/to-braille").name == "interactive"
+        assert middleware._classify(f"{prefix}/generation/pdf").name == "render"
+        assert middleware._classify(f"{prefix}/generation/jobs") is None
+        assert middleware._classify("/health") is None
+
+    def test_header_de_plazo(self, monkeypatch):
+        """El cliente puede acortar el plazo, no alargarlo."""
+        middleware = self._middleware(monkeypatch)
+        header = settings.scheduler_deadline_header.lower().encode()
+        render = middleware.render
+        assert middleware._deadline({"headers": [(header, b"250")]}, render) == 0.25
+        assert middleware._deadline({"headers": [(header, b"99999999")]}, render) == render.deadline
+        assert middleware._deadline({"headers": [(header, b"abc")]}, render) == render.deadline
+        assert middleware._deadline({"headers": []}, render) == render.deadline
+
+    def test_503_por_plazo(self, monkeypatch):
+        """Una generación que no consigue plaza a tiempo recibe 503."""
+        release = asyncio.Event()
+
+        async def slow_app(scope, receive, send):
+            await release.wait()
+            await send({"type": "http.response.start", "status": 200, "headers": []})
+            await send({"type": "http.response.body", "body": b"ok"})
+
+        middleware = self._middleware(monkeypatch, slow_app)
+        header = settings.scheduler_deadline_header.lower().encode()
+
+        async def call(deadline_ms):
+            messages = []
+
+            async def send(message):
+                messages.append(message)
+
+            scope = {"type": "http", "method": "POST", "path": f"{settings.api_prefix}/generation/pdf",
+                     "headers": [(header, deadline_ms)]}
+            await middleware(scope, None, send)
+            return messages[0]
+
+        async def main():
+            first = asyncio.create_task(call(b"5000"))
+            await asyncio.sleep(0)
+            shed = await call(b"10")
+            release.set()
+            return (await first)["status"], shed
+
+        status, shed = asyncio.run(main())
+        assert status == 200
+        assert shed["status"] == 503
+        assert (b"retry-after", b"1") in shed["headers"]
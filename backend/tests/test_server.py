@@ -0,0 +1,126 @@
+"""
+Tests para el warm-up, la readiness, el arranque en frío y el lanzador de producción.
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import server, warmup
+from app.config import settings
+from app.main import create_app
+
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# Presupuesto de arranque en frío para el código propio de la app (sin
+# contar FastAPI/Pydantic), medido con `python -X importtime`
+COLD_START_BUDGET_MS = 250
+
+
+def _import_times(**env) -> dict:
+    """
+    Importa app.main en un proceso nuevo con `-X importtime`.
+    
+    Returns:
+        dict: {modulo: (self_us, acumulado_us)}
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        cwd=BACKEND_DIR,
+        env={**os.environ, **env},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, module = line[len("import time:"):].split("|")
+        times[module.strip()] = (int(self_us), int(cumulative_us))
+    return times
+
+
+def _heavy_modules(times: dict) -> list:
+    return [m for m in times if m.split(".")[0] in ("PIL", "reportlab")]
+
+
+@pytest.fixture
+def cold_process(monkeypatch):
+    """Simula un proceso que aún no ha ejecutado el warm-up."""
+    monkeypatch.setattr(warmup, "_ready", warmup.threading.Event())
+
+
+class TestReadiness:
+    """Tests del endpoint /ready."""
+
+    def test_no_listo_antes_del_warm_up(self, cold_process):
+        """Sin warm-up (y sin lifespan), /ready responde 503."""
+        client = TestClient(create_app())
+        response = client.get("/ready")
+        assert response.status_code == 503
+        assert response.json() == {"ready": False}
+
+    def test_listo_tras_warm_up(self, cold_process):
+        """Tras warm_up(), /ready responde 200."""
+        client = TestClient(create_app())
+        warmup.warm_up()
+        response = client.get("/ready")
+        assert response.status_code == 200
+        assert response.json() == {"ready": True}
+
+    def test_lifespan_lanza_warm_up(self, cold_process, monkeypatch, tmp_path):
+        """Al arrancar la app, el warm-up se ejecuta en segundo plano."""
+        monkeypatch.setattr(settings, "jobs_dir", str(tmp_path / "jobs"))
+        with TestClient(create_app()) as client:
+            assert warmup._ready.wait(timeout=30)
+            assert client.get("/ready").status_code == 200
+
+
+class TestServerConfig:
+    """Tests de la configuración del lanzador multi-worker."""
+
+    def test_workers_por_cpu(self, monkeypatch):
+        """WORKERS=0 usa un worker por CPU."""
+        monkeypatch.setattr(settings, "workers", 0)
+        monkeypatch.setattr(server.os, "cpu_count", lambda: 6)
+        assert server.worker_count() == 6
+
+    def test_opciones_gunicorn(self, monkeypatch):
+        """Precarga, reciclado y reinicio elegante vienen de Settings."""
+        monkeypatch.setattr(settings, "workers", 3)
+        monkeypatch.setattr(settings, "max_requests", 500)
+        options = server.gunicorn_options()
+        assert options["workers"] == 3
+        assert options["preload_app"] is True
+        assert options["max_requests"] == 500
+        assert options["worker_class"] == "uvicorn_worker.UvicornWorker"
+        assert options["graceful_timeout"] == settings.graceful_timeout
+
+
+class TestColdStart:
+    """Tests del arranque en frío (importaciones perezosas)."""
+
+    def test_solo_traduccion_sin_renderizado(self):
+        """GENERATION_ENABLED=false no importa rutas de generación ni backends."""
+        times = _import_times(GENERATION_ENABLED="false")
+        assert "app.api.routes.generation" not in times
+        assert _heavy_modules(times) == []
+
+    def test_generacion_perezosa(self):
+        """Con generación habilitada, Pillow y ReportLab esperan al primer uso."""
+        times = _import_times(GENERATION_ENABLED="true")
+        assert "app.api.routes.generation" in times
+        assert _heavy_modules(times) == []
+
+    def test_presupuesto_de_arranque(self):
+        """El código propio de la app se importa dentro del presupuesto."""
+        times = _import_times(GENERATION_ENABLED="true")
+        own_us = sum(self_us for module, (self_us, _) in times.items()
+                     if module == "app" or module.startswith("app."))
+        assert own_us / 1000 < COLD_START_BUDGET_MS
@@ -0,0 +1,107 @@
+"""
+Tests para la exportación de las tablas de traducción (GET /translation/table)
+y los casos de conformidad compartidos con los clientes.
+"""
+
+import json
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.config import settings
+from app.main import create_app
+from app.api.core.braille_logic import BRAILLE_MAP, REVERSE_BRAILLE_MAP
+from app.api.services.translator import TABLE_VERSION, text_to_braille, text_to_packed
+
+
+FIXTURES = Path(__file__).parent / "fixtures" / "translation_conformance.json"
+CONFORMANCE = json.loads(FIXTURES.read_text(encoding="utf-8"))
+
+
+@pytest.fixture(scope="module")
+def table():
+    client = TestClient(create_app())
+    return client.get(f"{settings.api_prefix}/translation/table").json()
+
+
+def _repr(cells):
+    return "|".join("".join(map(str, cell)) if cell else "_" for cell in cells)
+
+
+def translate_with_table(table, text):
+    """Cliente de referencia: traduce usando solo la tabla exportada."""
+    forward = table["forward"]
+    separators = table["number_separators"]
+    cells = []
+    number_mode = False
+    for char in text:
+        if char in table["digits"]:
+            if not number_mode:
+                cells.append(table["prefixes"]["number"])
+                number_mode = True
+            cells.append(forward[table["digits"][char]])
+            continue
+        if number_mode and char in separators:
+            cells.append(forward[char])
+            continue
+        number_mode = False
+        if char.isupper():
+            cells.append(table["prefixes"]["capital"])
+            if char.lower() in forward:
+                cells.append(forward[char.lower()])
+        elif char in forward:
+            cells.append(forward[char])
+    return "|".join(cells)
+
+
+class TestTranslationTable:
+    """Tests del endpoint de exportación."""
+
+    def test_contenido(self, table):
+        """La tabla describe los mapeos, prefijos y dígitos activos."""
+        assert table["version"] == TABLE_VERSION
+        assert table["forward"]["b"] == "12"
+        assert table["forward"][" "] == "_"
+        assert table["prefixes"] == {"number": "3456", "capital": "46"}
+        assert table["digits"]["1"] == "a"
+        assert not any(char.startswith("_") for char in table["forward"])
+        assert len(table["forward"]) == sum(1 for char in BRAILLE_MAP if not char.startswith("_"))
+
+    def test_inversa_con_prioridades_resueltas(self, table):
+        """La tabla inversa ya aplica las prioridades (ñ sobre ú)."""
+        assert table["reverse"]["12456"] == "ñ"
+        assert len(table["reverse"]) == len(REVERSE_BRAILLE_MAP)
+
+    def test_etag_y_revalidacion(self):
+        """ETag = versión de la tabla; la copia se revalida (no-cache) con 304."""
+        client = TestClient(create_app())
+        url = f"{settings.api_prefix}/translation/table"
+        response = client.get(url, headers={"Accept-Encoding": "identity"})
+        assert response.headers["etag"] == f'"{TABLE_VERSION}"'
+        assert "no-cache" in response.headers["cache-control"]
+        cached = client.get(url, headers={"If-None-Match": response.headers["etag"]})
+        assert cached.status_code == 304
+
+
+class TestConformance:
+    """Casos de conformidad de tests/fixtures/translation_conformance.json."""
+
+    def test_version_de_fixtures(self):
+        """Si cambia la tabla hay que regenerar y revisar los casos."""
+        assert CONFORMANCE["table_version"] == TABLE_VERSION
+
+    @pytest.mark.parametrize("case", CONFORMANCE["cases"], ids=lambda case: repr(case["text"]))
+    def test_text_to_braille(self, case):
+        assert _repr(text_to_braille(case["text"])) == case["cells"]
+
+    @pytest.mark.parametrize("case", CONFORMANCE["cases"], ids=lambda case: repr(case["text"]))
+    def test_text_to_packed(self, case):
+        expected = [[dot for dot in range(1, 7) if mask & (1 << (dot - 1))]
+                    for mask in text_to_packed(case["text"])]
+        assert _repr(expected) == case["cells"]
+
+    @pytest.mark.parametrize("case", CONFORMANCE["cases"], ids=lambda case: repr(case["text"]))
+    def test_cliente_con_tabla(self, table, case):
+        """Un cliente que solo usa la tabla exportada produce las mismas celdas."""
+        assert translate_with_table(table, case["text"]) == case["cells"]